@@ -20,6 +20,9 @@ import contextlib
 import logging
 import os
 import sys
+import threading
+import time
+from functools import partial
 
 import manhole
 import requests_cache
@@ -34,6 +37,12 @@ from paasta_tools import marathon_tools
 from paasta_tools.api import settings
 from paasta_tools.api.tweens import profiling
 from paasta_tools.api.tweens import request_logger
+from paasta_tools.async_utils import report_async_ttl_cache_metrics
+from paasta_tools.kubernetes.object_cache import KubeObjectCache
+from paasta_tools.metrics import metrics_lib
+from paasta_tools.metrics.capacity_snapshot import capacity_snapshot_from_kube
+from paasta_tools.metrics.capacity_snapshot import capacity_snapshot_from_mesos
+from paasta_tools.metrics.capacity_snapshot import CapacitySnapshotCache
 from paasta_tools.utils import load_system_paasta_config
 
 try:
@@ -74,6 +83,37 @@ def parse_paasta_api_args():
         dest="max_request_seconds",
         help="Maximum seconds allowed for a worker to process a request",
     )
+    parser.add_argument(
+        "--kube-object-cache",
+        dest="kube_object_cache",
+        action="store_true",
+        default=False,
+        help=(
+            "Keep watch-driven caches of pods, replicasets, controller revisions "
+            "and HPAs in each worker, and serve instance status from them"
+        ),
+    )
+    parser.add_argument(
+        "--kube-object-cache-namespaces",
+        dest="kube_object_cache_namespaces",
+        default=None,
+        help=(
+            "Comma-separated namespaces to keep --kube-object-cache caches of. "
+            "Defaults to all namespaces"
+        ),
+    )
+    parser.add_argument(
+        "--capacity-snapshot",
+        dest="capacity_snapshot",
+        choices=["mesos", "kubernetes"],
+        default=None,
+        help=(
+            "Answer resource utilization requests from a snapshot of the cluster "
+            "taken every 30 seconds instead of asking Mesos on every request. "
+            "Each worker takes its own snapshots, so with kubernetes every worker "
+            "lists all the nodes and pods in the cluster every 30 seconds"
+        ),
+    )
     parser.add_argument(
         "-w",
         "--workers",
@@ -98,6 +138,8 @@ def make_app(global_config=None):
             "pyramid_swagger.skip_validation": [
                 "/(static)\\b",
                 "/(status)\\b",
+                # streamed as newline-delimited JSON, which pyramid_swagger can't validate
+                "/v1/services/[^/]+/status$",
                 "/(swagger.json)\\b",
             ],
             "pyramid_swagger.swagger_versions": ["2.0"],
@@ -149,6 +191,7 @@ def make_app(global_config=None):
         "service.instance.tasks.task",
         "/v1/services/{service}/{instance}/tasks/{task_id}",
     )
+    config.add_route("service.status", "/v1/services/{service}/status")
     config.add_route("service.list", "/v1/services/{service}")
     config.add_route("services", "/v1/services")
     config.add_route(
@@ -182,6 +225,7 @@ def make_app(global_config=None):
     )
     config.add_route("metastatus", "/v1/metastatus")
     config.add_route("deploy_queue.list", "/v1/deploy_queue")
+    config.add_route("bounce_status.bulk", "/v1/bounce_status", request_method="POST")
     config.scan()
     return CORS(
         config.make_wsgi_app(), headers="*", methods="*", maxage="180", origin="*"
@@ -204,6 +248,17 @@ def application(env, start_response):
     return _app(env, start_response)
 
 
+def report_cache_metrics_forever(
+    metrics_interface: metrics_lib.BaseMetrics, interval: float = 60
+) -> None:
+    while True:
+        try:
+            report_async_ttl_cache_metrics(metrics_interface)
+        except Exception:
+            log.exception("Error while reporting cache metrics")
+        time.sleep(interval)
+
+
 def setup_paasta_api():
     if os.environ.get("PAASTA_API_DEBUG"):
         logging.basicConfig(level=logging.DEBUG)
@@ -239,6 +294,42 @@ def setup_paasta_api():
         log.exception("Error while initializing KubeClient")
         settings.kubernetes_client = None
 
+    metrics_interface = metrics_lib.get_metrics_interface("paasta")
+    metrics_lib.export_time_cache_metrics(metrics_interface)
+    threading.Thread(
+        target=report_cache_metrics_forever,
+        args=(metrics_interface,),
+        name="cache-metrics",
+        daemon=True,
+    ).start()
+
+    if settings.kubernetes_client is not None and os.environ.get(
+        "PAASTA_API_KUBE_OBJECT_CACHE"
+    ):
+        cached_namespaces = os.environ.get("PAASTA_API_KUBE_OBJECT_CACHE_NAMESPACES")
+        settings.kube_object_cache = KubeObjectCache(
+            settings.kubernetes_client,
+            metrics_interface=metrics_interface,
+            namespaces=cached_namespaces.split(",") if cached_namespaces else None,
+        )
+        settings.kube_object_cache.start()
+        kubernetes_tools.enable_kube_object_cache(settings.kube_object_cache)
+
+    settings.capacity_snapshot_source = os.environ.get("PAASTA_API_CAPACITY_SNAPSHOT")
+    if settings.capacity_snapshot_source == "mesos":
+        settings.capacity_snapshot_cache = CapacitySnapshotCache(
+            capacity_snapshot_from_mesos
+        )
+    elif settings.capacity_snapshot_source == "kubernetes":
+        if settings.kubernetes_client is not None:
+            settings.capacity_snapshot_cache = CapacitySnapshotCache(
+                partial(capacity_snapshot_from_kube, settings.kubernetes_client)
+            )
+        else:
+            log.warning("Can't take capacity snapshots without Kubernetes")
+    if settings.capacity_snapshot_cache is not None:
+        settings.capacity_snapshot_cache.start()
+
     # Set up transparent cache for http API calls. With expire_after, responses
     # are removed only when the same request is made. Expired storage is not a
     # concern here. Thus remove_expired_responses is not needed.
@@ -273,6 +364,17 @@ def main(argv=None):
     if args.cluster:
         os.environ["PAASTA_API_CLUSTER"] = args.cluster
 
+    if args.kube_object_cache:
+        os.environ["PAASTA_API_KUBE_OBJECT_CACHE"] = "1"
+
+    if args.kube_object_cache_namespaces:
+        os.environ[
+            "PAASTA_API_KUBE_OBJECT_CACHE_NAMESPACES"
+        ] = args.kube_object_cache_namespaces
+
+    if args.capacity_snapshot:
+        os.environ["PAASTA_API_CAPACITY_SNAPSHOT"] = args.capacity_snapshot
+
     gunicorn_args = [
         "gunicorn",
         "-w",
@@ -18,8 +18,10 @@ import os
 from typing import Optional
 
 from paasta_tools import utils
+from paasta_tools.kubernetes.object_cache import KubeObjectCache
 from paasta_tools.kubernetes_tools import KubeClient
 from paasta_tools.marathon_tools import MarathonClients
+from paasta_tools.metrics.capacity_snapshot import CapacitySnapshotCache
 from paasta_tools.utils import DEFAULT_SOA_DIR
 from paasta_tools.utils import SystemPaastaConfig
 
@@ -32,4 +34,8 @@ cluster: str = None  # type: ignore
 hostname: str = utils.get_hostname()
 marathon_clients: MarathonClients = None  # type: ignore
 kubernetes_client: Optional[KubeClient] = None
+kube_object_cache: Optional[KubeObjectCache] = None
+capacity_snapshot_cache: Optional[CapacitySnapshotCache] = None
+# "mesos" or "kubernetes", when resource utilization should come from snapshots
+capacity_snapshot_source: Optional[str] = None
 system_paasta_config: Optional[SystemPaastaConfig]
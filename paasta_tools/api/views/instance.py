@@ -20,6 +20,7 @@ import datetime
 import logging
 import re
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 from typing import Dict
 from typing import List
@@ -80,6 +81,9 @@ from paasta_tools.utils import validate_service_instance
 
 log = logging.getLogger(__name__)
 
+# how many instances' bounce status to get at the same time in a bulk request
+BULK_BOUNCE_STATUS_MAX_WORKERS = 8
+
 
 def tron_instance_status(
     instance_status: Mapping[str, Any], service: str, instance: str, verbose: int
@@ -636,10 +640,6 @@ def no_configuration_for_service_message(cluster, service, instance):
     route_name="service.instance.status", request_method="GET", renderer="json"
 )
 def instance_status(request):
-    service = request.swagger_data.get("service")
-    instance = request.swagger_data.get("instance")
-    verbose = request.swagger_data.get("verbose") or 0
-    use_new = request.swagger_data.get("new") or False
     include_smartstack = request.swagger_data.get("include_smartstack")
     if include_smartstack is None:
         include_smartstack = True
@@ -650,6 +650,31 @@ def instance_status(request):
     if include_mesos is None:
         include_mesos = True
 
+    return get_instance_status(
+        service=request.swagger_data.get("service"),
+        instance=request.swagger_data.get("instance"),
+        verbose=request.swagger_data.get("verbose") or 0,
+        use_new=request.swagger_data.get("new") or False,
+        include_smartstack=include_smartstack,
+        include_envoy=include_envoy,
+        include_mesos=include_mesos,
+    )
+
+
+def get_instance_status(
+    service: str,
+    instance: str,
+    verbose: int,
+    use_new: bool,
+    include_smartstack: bool,
+    include_envoy: bool,
+    include_mesos: bool,
+    actual_deployments: Optional[Mapping[str, DeploymentVersion]] = None,
+    service_objects: Optional[pik.ServiceKubeObjects] = None,
+) -> Dict[str, Any]:
+    """The body of the service.instance.status endpoint. actual_deployments
+    and service_objects let callers that get the status of several instances
+    of the same service share those between them."""
     instance_status: Dict[str, Any] = {}
     instance_status["service"] = service
     instance_status["instance"] = instance
@@ -669,11 +694,12 @@ def instance_status(request):
         raise ApiFailure(error_message, 500)
 
     if instance_type != "tron":
-        try:
-            actual_deployments = get_actual_deployments(service, settings.soa_dir)
-        except Exception:
-            error_message = traceback.format_exc()
-            raise ApiFailure(error_message, 500)
+        if actual_deployments is None:
+            try:
+                actual_deployments = get_actual_deployments(service, settings.soa_dir)
+            except Exception:
+                error_message = traceback.format_exc()
+                raise ApiFailure(error_message, 500)
 
         version = get_deployment_version(actual_deployments, settings.cluster, instance)
         # exit if the deployment key is not found
@@ -717,6 +743,7 @@ def instance_status(request):
                     use_new=use_new,
                     instance_type=instance_type,
                     settings=settings,
+                    service_objects=service_objects,
                 )
             )
         elif instance_type == "tron":
@@ -841,14 +868,9 @@ def instance_delay(request):
         return response
 
 
-@view_config(
-    route_name="service.instance.bounce_status",
-    request_method="GET",
-    renderer="json",
-)
-def bounce_status(request):
-    service = request.swagger_data.get("service")
-    instance = request.swagger_data.get("instance")
+def get_bounce_status(service: str, instance: str) -> Optional[Dict[str, Any]]:
+    """The bounce status of an instance, or None if it exists but isn't one we
+    can get a bounce status for (i.e. isn't on Kubernetes)."""
     try:
         instance_type = validate_service_instance(
             service, instance, settings.cluster, settings.soa_dir
@@ -865,12 +887,7 @@ def bounce_status(request):
         raise ApiFailure(error_message, 500)
 
     if instance_type != "kubernetes":
-        # We are using HTTP 204 to indicate that the instance exists but has
-        # no bounce status to be returned.  The client should just mark the
-        # instance as bounced.
-        response = Response()
-        response.status_int = 204
-        return response
+        return None
 
     try:
         return pik.bounce_status(service, instance, settings)
@@ -883,6 +900,67 @@ def bounce_status(request):
         raise ApiFailure(error_message, 500)
 
 
+@view_config(
+    route_name="service.instance.bounce_status",
+    request_method="GET",
+    renderer="json",
+)
+def bounce_status(request):
+    service = request.swagger_data.get("service")
+    instance = request.swagger_data.get("instance")
+    status = get_bounce_status(service, instance)
+    if status is None:
+        # We are using HTTP 204 to indicate that the instance exists but has
+        # no bounce status to be returned.  The client should just mark the
+        # instance as bounced.
+        response = Response()
+        response.status_int = 204
+        return response
+    return status
+
+
+def _bounce_status_result(service: str, instance: str) -> Dict[str, Any]:
+    result: Dict[str, Any] = {"service": service, "instance": instance}
+    try:
+        status = get_bounce_status(service, instance)
+    except ApiFailure as e:
+        result["status_code"] = e.err
+        result["error_message"] = e.msg
+        return result
+    if status is None:
+        result["status_code"] = 204
+    else:
+        result["status_code"] = 200
+        result["status"] = status
+    return result
+
+
+@view_config(route_name="bounce_status.bulk", request_method="POST", renderer="json")
+def bulk_bounce_status(request):
+    """The bounce status of many instances at once, so that clients waiting on
+    a deployment can poll a cluster with one request instead of one per
+    instance. Each result carries the status code that the single-instance
+    endpoint would have returned."""
+    service_instances = request.swagger_data["json_body"].get("instances", [])
+    if not service_instances:
+        return {"statuses": []}
+    for si in service_instances:
+        if not isinstance(si, dict) or not si.get("service") or not si.get("instance"):
+            raise ApiFailure(
+                "Each of instances must have a service and an instance", 400
+            )
+    with ThreadPoolExecutor(
+        max_workers=min(BULK_BOUNCE_STATUS_MAX_WORKERS, len(service_instances))
+    ) as executor:
+        statuses = list(
+            executor.map(
+                lambda si: _bounce_status_result(si["service"], si["instance"]),
+                service_instances,
+            )
+        )
+    return {"statuses": statuses}
+
+
 def add_executor_info(task):
     task._Task__items["executor"] = a_sync.block(task.executor).copy()
     task._Task__items["executor"].pop("tasks", None)
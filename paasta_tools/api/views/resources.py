@@ -19,9 +19,15 @@ from a_sync import block
 from pyramid.response import Response
 from pyramid.view import view_config
 
+from paasta_tools.api import settings
+from paasta_tools.api.views.exception import ApiFailure
 from paasta_tools.mesos_tools import get_mesos_master
 from paasta_tools.metrics import metastatus_lib
 
+# how many seconds old the snapshot the utilization was worked out from is,
+# when it was worked out from one
+SNAPSHOT_AGE_HEADER = "X-Paasta-Capacity-Snapshot-Age"
+
 
 def parse_filters(filters):
     # The swagger config verifies that the data is in this format
@@ -35,29 +41,38 @@ def parse_filters(filters):
 
 @view_config(route_name="resources.utilization", request_method="GET", renderer="json")
 def resources_utilization(request):
-    master = get_mesos_master()
-    mesos_state = block(master.state)
-
     groupings = request.swagger_data.get("groupings", ["superregion"])
     # swagger actually makes the key None if it's not set
     if groupings is None:
         groupings = ["superregion"]
-    grouping_function = metastatus_lib.key_func_for_attribute_multi(groupings)
-    sorting_function = metastatus_lib.sort_func_for_attributes(groupings)
 
     filters = request.swagger_data.get("filter", [])
     filters = parse_filters(filters)
-    filter_funcs = [
-        metastatus_lib.make_filter_slave_func(attr, vals)
-        for attr, vals in filters.items()
-    ]
 
-    resource_info_dict = metastatus_lib.get_resource_utilization_by_grouping(
-        grouping_func=grouping_function,
-        mesos_state=mesos_state,
-        filters=filter_funcs,
-        sort_func=sorting_function,
-    )
+    snapshot = None
+    if settings.capacity_snapshot_cache is not None:
+        snapshot = settings.capacity_snapshot_cache.get()
+    if snapshot is not None:
+        resource_info_dict = snapshot.utilization(groupings, filters)
+    elif settings.capacity_snapshot_source == "kubernetes":
+        # Mesos doesn't know about the Kubernetes nodes, so there's nothing to
+        # fall back to until the first snapshot has been taken
+        raise ApiFailure("No capacity snapshot has been taken yet", 503)
+    else:
+        master = get_mesos_master()
+        mesos_state = block(master.state)
+        grouping_function = metastatus_lib.key_func_for_attribute_multi(groupings)
+        sorting_function = metastatus_lib.sort_func_for_attributes(groupings)
+        filter_funcs = [
+            metastatus_lib.make_filter_slave_func(attr, vals)
+            for attr, vals in filters.items()
+        ]
+        resource_info_dict = metastatus_lib.get_resource_utilization_by_grouping(
+            grouping_func=grouping_function,
+            mesos_state=mesos_state,
+            filters=filter_funcs,
+            sort_func=sorting_function,
+        )
 
     response_body = []
     for k, v in resource_info_dict.items():
@@ -73,4 +88,7 @@ def resources_utilization(request):
 
         response_body.append(group)
 
-    return Response(json_body=response_body, status_code=200)
+    response = Response(json_body=response_body, status_code=200)
+    if snapshot is not None:
+        response.headers[SNAPSHOT_AGE_HEADER] = f"{snapshot.age():.0f}"
+    return response
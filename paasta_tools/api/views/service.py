@@ -15,12 +15,35 @@
 """
 PaaSTA service list (instances) etc.
 """
+import json
+import logging
+import traceback
+from concurrent.futures import as_completed
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+from typing import Dict
+from typing import Iterator
+from typing import Mapping
+from typing import Optional
+from typing import Sequence
+
+from pyramid.response import Response
 from pyramid.view import view_config
 
 from paasta_tools.api import settings
+from paasta_tools.api.views.exception import ApiFailure
+from paasta_tools.api.views.instance import get_instance_status
+from paasta_tools.cli.cmds.status import get_actual_deployments
+from paasta_tools.instance import kubernetes as pik
+from paasta_tools.utils import DeploymentVersion
 from paasta_tools.utils import get_services_for_cluster
 from paasta_tools.utils import list_all_instances_for_service
 
+log = logging.getLogger(__name__)
+
+# how many instances of a service to get the status of at the same time
+SERVICE_STATUS_MAX_WORKERS = 8
+
 
 @view_config(route_name="service.list", request_method="GET", renderer="json")
 def list_instances(request):
@@ -33,3 +56,111 @@ def list_instances(request):
 def list_services_for_cluster(request):
     services_for_cluster = get_services_for_cluster(cluster=settings.cluster)
     return {"services": services_for_cluster}
+
+
+def _bool_param(request, name: str, default: bool) -> bool:
+    # this route isn't validated by pyramid_swagger (so that its response can
+    # be streamed), so parse the query parameters ourselves
+    value = request.params.get(name)
+    if value is None:
+        return default
+    return value.lower() in ("true", "1")
+
+
+def iter_instance_statuses(
+    service: str,
+    instances: Sequence[str],
+    actual_deployments: Optional[Mapping[str, DeploymentVersion]],
+    service_objects: Optional[pik.ServiceKubeObjects],
+    **kwargs: Any,
+) -> Iterator[Dict[str, Any]]:
+    """Yield the status of each instance of a service as soon as it is ready.
+    Failures are yielded as an error_message/error_code for that instance
+    rather than failing the whole request."""
+    executor = ThreadPoolExecutor(
+        max_workers=max(1, min(len(instances), SERVICE_STATUS_MAX_WORKERS))
+    )
+    futures = {
+        executor.submit(
+            get_instance_status,
+            service=service,
+            instance=instance,
+            actual_deployments=actual_deployments,
+            service_objects=service_objects,
+            **kwargs,
+        ): instance
+        for instance in instances
+    }
+    try:
+        for future in as_completed(futures):
+            instance = futures[future]
+            try:
+                yield future.result()
+            except ApiFailure as e:
+                log.error(e.msg)
+                yield {
+                    "service": service,
+                    "instance": instance,
+                    "error_message": e.msg,
+                    "error_code": e.err,
+                }
+            except Exception:
+                error_message = traceback.format_exc()
+                log.error(error_message)
+                yield {
+                    "service": service,
+                    "instance": instance,
+                    "error_message": error_message,
+                    "error_code": 500,
+                }
+    finally:
+        # the client may have gone away before we were done
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+
+@view_config(route_name="service.status", request_method="GET")
+def service_status(request):
+    service = request.matchdict["service"]
+    try:
+        verbose = int(request.params.get("verbose", 0))
+    except ValueError:
+        raise ApiFailure("verbose must be an integer", 400)
+
+    instances = sorted(
+        list_all_instances_for_service(service, clusters=[settings.cluster])
+    )
+    if not instances:
+        raise ApiFailure(
+            f"No instances of {service} have been configured to run in the "
+            f"{settings.cluster} cluster",
+            404,
+        )
+
+    try:
+        actual_deployments = get_actual_deployments(service, settings.soa_dir)
+    except Exception:
+        # let each instance that needs it report the error
+        actual_deployments = None
+
+    if settings.kubernetes_client is not None:
+        service_objects = pik.ServiceKubeObjects(service, settings.kubernetes_client)
+    else:
+        service_objects = None
+
+    statuses = iter_instance_statuses(
+        service=service,
+        instances=instances,
+        actual_deployments=actual_deployments,
+        service_objects=service_objects,
+        verbose=verbose,
+        use_new=_bool_param(request, "new", False),
+        include_smartstack=_bool_param(request, "include_smartstack", True),
+        include_envoy=_bool_param(request, "include_envoy", True),
+        include_mesos=_bool_param(request, "include_mesos", True),
+    )
+    return Response(
+        content_type="application/x-ndjson",
+        app_iter=(json.dumps(status).encode() + b"\n" for status in statuses),
+    )
@@ -7,14 +7,51 @@ from typing import AsyncIterable
 from typing import Awaitable
 from typing import Callable
 from typing import Dict
+from typing import Iterable
 from typing import List
 from typing import Optional
+from typing import TYPE_CHECKING
 from typing import TypeVar
 
+if TYPE_CHECKING:
+    from paasta_tools.metrics.metrics_lib import BaseMetrics
+
 
 T = TypeVar("T")
 
 
+class AsyncTTLCacheStats:
+    """Counts the hits, misses and evictions of one async_ttl_cache, and knows
+    how many entries it holds."""
+
+    def __init__(self, name: str, size: Callable[[], int]) -> None:
+        self.name = name
+        self.size = size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+# the stats of every async_ttl_cache, by the name of the function it wraps
+ASYNC_TTL_CACHES: Dict[str, AsyncTTLCacheStats] = {}
+
+
+def report_async_ttl_cache_metrics(metrics_interface: "BaseMetrics") -> None:
+    """Sets the size and hit rate gauges of every async_ttl_cache."""
+    for name, stats in list(ASYNC_TTL_CACHES.items()):
+        metrics_interface.create_gauge("async_ttl_cache.size", cache=name).set(
+            stats.size()
+        )
+        metrics_interface.create_gauge("async_ttl_cache.hit_rate", cache=name).set(
+            stats.hit_rate()
+        )
+
+
 # NOTE: this method is not thread-safe due to lack of locking while checking
 # and updating the cache
 def async_ttl_cache(
@@ -22,24 +59,68 @@ def async_ttl_cache(
     cleanup_self: bool = False,
     *,
     cache: Optional[Dict] = None,
+    maxsize: Optional[int] = None,
+    sweep_interval: Optional[float] = None,
 ) -> Callable[
     [Callable[..., Awaitable[T]]], Callable[..., Awaitable[T]]  # wrapped  # inner
 ]:
-    async def call_or_get_from_cache(cache, async_func, args_for_key, args, kwargs):
+    """Caches the results of a coroutine function for ttl seconds (forever if
+    ttl is None). Concurrent calls with the same arguments share a single call
+    of the wrapped function.
+
+    :param cleanup_self: keep a separate cache for each instance the method is
+        called on, which is dropped when that instance is garbage collected
+    :param maxsize: how many results to keep (for each instance, with
+        cleanup_self); when there are more, the least recently used one is
+        evicted. None means unbounded.
+    :param sweep_interval: how often to drop the expired results of every key,
+        rather than only replacing them when the same key is requested again.
+        Sweeps happen while the cache is being called. Defaults to ttl.
+    """
+    if sweep_interval is None:
+        sweep_interval = ttl
+    last_sweep = time.time()
+
+    def sweep(caches: Iterable[Dict], stats: AsyncTTLCacheStats) -> None:
+        nonlocal last_sweep
+        now = time.time()
+        if ttl is None or sweep_interval is None or now - last_sweep < sweep_interval:
+            return
+        last_sweep = now
+        for c in list(caches):
+            # in-flight calls are stored with a last_update of +infinity, so
+            # they're never expired
+            expired = [
+                k for k, (_, last_update) in c.items() if now - last_update > ttl
+            ]
+            for k in expired:
+                del c[k]
+            stats.expirations += len(expired)
+
+    async def call_or_get_from_cache(
+        cache, stats, async_func, args_for_key, args, kwargs
+    ):
         # Please note that anything which is put into `key` will be in the
-        # cache forever, potentially causing memory leaks.  The most common
-        # case is the `self` arg pointing to a huge object.  To mitigate that
-        # we're using `args_for_key`, which is supposed not contain any huge
-        # objects.
+        # cache until it expires or is evicted. The most common case is the
+        # `self` arg pointing to a huge object.  To mitigate that we're using
+        # `args_for_key`, which is supposed not contain any huge objects.
         key = functools._make_key(args_for_key, kwargs, typed=False)
         try:
             future, last_update = cache[key]
             if ttl is not None and time.time() - last_update > ttl:
                 raise KeyError
+            stats.hits += 1
+            # move it to the end, so that it's evicted last
+            cache[key] = cache.pop(key)
         except KeyError:
+            stats.misses += 1
             future = asyncio.ensure_future(async_func(*args, **kwargs))
-            # set the timestamp to +infinity so that we always wait on the in-flight request.
+            # set the timestamp to +infinity so that we always wait on the in-flight request.
+            cache.pop(key, None)
             cache[key] = (future, float("Inf"))
+            while maxsize is not None and len(cache) > maxsize:
+                del cache[next(iter(cache))]
+                stats.evictions += 1
 
         try:
             value = await future
@@ -63,14 +144,22 @@ def async_ttl_cache(
             del instance_caches[w]
 
         def outer(wrapped):
+            stats = AsyncTTLCacheStats(
+                name=f"{wrapped.__module__}.{wrapped.__qualname__}",
+                size=lambda: sum(len(c) for c in list(instance_caches.values())),
+            )
+            ASYNC_TTL_CACHES[stats.name] = stats
+
             @functools.wraps(wrapped)
             async def inner(self, *args, **kwargs):
+                sweep(instance_caches.values(), stats)
                 w = weakref.ref(self, on_delete)
                 self_cache = instance_caches[w]
                 return await call_or_get_from_cache(
-                    self_cache, wrapped, args, (self,) + args, kwargs
+                    self_cache, stats, wrapped, args, (self,) + args, kwargs
                 )
 
+            inner.cache_stats = stats
             return inner
 
     else:
@@ -79,10 +168,20 @@ def async_ttl_cache(
         )  # Should be Dict[Any, T] but that doesn't work.
 
         def outer(wrapped):
+            stats = AsyncTTLCacheStats(
+                name=f"{wrapped.__module__}.{wrapped.__qualname__}",
+                size=lambda: len(cache2),
+            )
+            ASYNC_TTL_CACHES[stats.name] = stats
+
             @functools.wraps(wrapped)
             async def inner(*args, **kwargs):
-                return await call_or_get_from_cache(cache2, wrapped, args, args, kwargs)
+                sweep([cache2], stats)
+                return await call_or_get_from_cache(
+                    cache2, stats, wrapped, args, args, kwargs
+                )
 
+            inner.cache_stats = stats
             return inner
 
     return outer
@@ -38,6 +38,8 @@ from marathon.models.app import MarathonApp
 from marathon.models.app import MarathonTask
 
 from paasta_tools.autoscaling.forecasting import get_forecast_policy
+from paasta_tools.autoscaling.forecasting import STATEFUL_FORECAST_POLICIES
+from paasta_tools.autoscaling.historical_load import HistoricalLoad
 from paasta_tools.autoscaling.utils import get_autoscaling_component
 from paasta_tools.autoscaling.utils import register_autoscaling_component
 from paasta_tools.bounce_lib import filter_tasks_in_smartstack
@@ -167,11 +169,14 @@ def proportional_decision_policy(
                    e.g. if the metric you're using is CPU, then how much CPU an idle container would use.
                    This should never be more than your setpoint. (If it takes 50% cpu to run an idle container, we can't
                    get your utilization below 50% no matter how many containers we run.)
-    :param forecast_policy: The method for forecasting future load values. Currently, only two forecasters exist:
+    :param forecast_policy: The method for forecasting future load values. Some of the available forecasters:
                             - "current", which assumes that the load will remain the same as the current value for the
                             near future.
                             - "moving_average", which assumes that total load will remain near the average of data
                             points within a window.
+                            - "holt" and "holt_winters", which smooth the load's level and trend (and, for
+                            holt_winters, its daily pattern) and extrapolate them. Their model is saved next to the
+                            historical load.
     :param good_enough_window: A tuple/array of two utilization values, (low, high). If the utilization per container at
                                the forecasted total load is within this window with the current number of instances,
                                leave the number of instances alone. This can reduce churn. Setpoint should lie within
@@ -187,7 +192,14 @@ def proportional_decision_policy(
     if persist_data:
         save_historical_load(historical_load, zk_path_prefix=zookeeper_path)
 
+    forecast_state = None
+    if forecast_policy in STATEFUL_FORECAST_POLICIES:
+        forecast_state = fetch_forecast_state(zk_path_prefix=zookeeper_path)
+        kwargs["forecast_state"] = forecast_state
+
     predicted_load = forecast_policy_func(historical_load, **kwargs)
+    if forecast_state is not None and persist_data:
+        save_forecast_state(forecast_state, zk_path_prefix=zookeeper_path)
 
     desired_number_instances = int(round(predicted_load / (setpoint - offset)))
 
@@ -232,10 +244,7 @@ def save_historical_load(historical_load, zk_path_prefix):
 
 def serialize_historical_load(historical_load):
     max_records = 1000000 // SIZE_PER_HISTORICAL_LOAD_RECORD
-    historical_load = historical_load[-max_records:]
-    return b"".join(
-        [struct.pack(HISTORICAL_LOAD_SERIALIZATION_FORMAT, *x) for x in historical_load]
-    )
+    return HistoricalLoad.from_records(historical_load[-max_records:]).to_bytes()
 
 
 def fetch_historical_load(zk_path_prefix):
@@ -244,22 +253,33 @@ def fetch_historical_load(zk_path_prefix):
             historical_load_bytes, _ = zk.get(zk_historical_load_path(zk_path_prefix))
             return deserialize_historical_load(historical_load_bytes)
         except NoNodeError:
-            return []
+            return HistoricalLoad()
 
 
 def deserialize_historical_load(historical_load_bytes):
-    historical_load = []
-
-    for pos in range(0, len(historical_load_bytes), SIZE_PER_HISTORICAL_LOAD_RECORD):
-        historical_load.append(
-            struct.unpack(
-                # unfortunately struct.unpack doesn't like kwargs.
-                HISTORICAL_LOAD_SERIALIZATION_FORMAT,
-                historical_load_bytes[pos : pos + SIZE_PER_HISTORICAL_LOAD_RECORD],
-            )
+    return HistoricalLoad.from_bytes(historical_load_bytes)
+
+
+def zk_forecast_state_path(zk_path_prefix):
+    return "%s/forecast_state" % zk_path_prefix
+
+
+def save_forecast_state(forecast_state, zk_path_prefix):
+    with ZookeeperPool() as zk:
+        zk.ensure_path(zk_forecast_state_path(zk_path_prefix))
+        zk.set(
+            zk_forecast_state_path(zk_path_prefix),
+            json.dumps(forecast_state).encode("utf8"),
         )
 
-    return historical_load
+
+def fetch_forecast_state(zk_path_prefix):
+    with ZookeeperPool() as zk:
+        try:
+            forecast_state_bytes, _ = zk.get(zk_forecast_state_path(zk_path_prefix))
+            return json.loads(forecast_state_bytes.decode("utf8"))
+        except (NoNodeError, ValueError):
+            return {}
 
 
 async def get_json_body_from_service(host, port, endpoint, session):
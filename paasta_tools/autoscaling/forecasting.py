@@ -1,3 +1,7 @@
+import itertools
+import operator
+
+from paasta_tools.autoscaling.historical_load import HistoricalLoad
 from paasta_tools.autoscaling.utils import get_autoscaling_component
 from paasta_tools.autoscaling.utils import register_autoscaling_component
 from paasta_tools.long_running_service_tools import (
@@ -26,12 +30,12 @@ def current_value_forecast_policy(historical_load, **kwargs):
 
 
 def window_historical_load(historical_load, window_begin, window_end):
-    """Filter historical_load down to just the datapoints lying between times window_begin and window_end, inclusive."""
-    filtered = []
-    for timestamp, value in historical_load:
-        if timestamp >= window_begin and timestamp <= window_end:
-            filtered.append((timestamp, value))
-    return filtered
+    """Filter historical_load down to just the datapoints lying between times window_begin and window_end, inclusive.
+
+    :param historical_load: a HistoricalLoad, or a list of (timestamp, value)s.
+    :returns: a HistoricalLoad
+    """
+    return HistoricalLoad.from_records(historical_load).window(window_begin, window_end)
 
 
 def trailing_window_historical_load(historical_load, window_size):
@@ -52,8 +56,7 @@ def moving_average_forecast_policy(
     windowed_data = trailing_window_historical_load(
         historical_load, moving_average_window_seconds
     )
-    windowed_values = [value for timestamp, value in windowed_data]
-    return sum(windowed_values) / len(windowed_values)
+    return sum(windowed_data.loads) / len(windowed_data)
 
 
 @register_autoscaling_component("linreg", FORECAST_POLICY_KEY)
@@ -80,15 +83,17 @@ def linreg_forecast_policy(
 
     window = trailing_window_historical_load(historical_load, linreg_window_seconds)
 
-    loads = [load for timestamp, load in window]
-    times = [timestamp for timestamp, load in window]
+    loads = window.loads
+    times = window.timestamps
 
     mean_time = sum(times) / len(times)
     mean_load = sum(loads) / len(loads)
 
     if len(window) > 1:
-        slope = sum((t - mean_time) * (l - mean_load) for t, l in window) / sum(
-            (t - mean_time) ** 2 for t in times
+        time_deltas = list(map(operator.sub, times, itertools.repeat(mean_time)))
+        load_deltas = map(operator.sub, loads, itertools.repeat(mean_load))
+        slope = sum(map(operator.mul, time_deltas, load_deltas)) / sum(
+            map(operator.mul, time_deltas, time_deltas)
         )
     else:
         slope = linreg_default_slope
@@ -104,3 +109,273 @@ def linreg_forecast_policy(
     now, _ = historical_load[-1]
     forecasted_values = [predict(now + delta) for delta in linreg_extrapolation_seconds]
     return max(forecasted_values)
+
+
+# Forecast policies that keep state between runs. The decision policy passes
+# them a `forecast_state` dict (persisted next to the historical load), which
+# they update in place.
+STATEFUL_FORECAST_POLICIES = frozenset(["holt", "holt_winters"])
+
+HOLT_WINTERS_STATE_VERSION = 1
+DEFAULT_HOLT_WINTERS_BUCKET_SECONDS = 300
+DEFAULT_HOLT_WINTERS_SEASON_SECONDS = 24 * 60 * 60
+
+
+class HoltWinters:
+    """Additive Holt-Winters (level, trend and optionally seasonality) over the
+    historical load, resampled into fixed-size time buckets by averaging the
+    datapoints in each bucket.
+
+    Only complete buckets are fed to the model, and the model keeps track of
+    the last one it saw, so that it can be saved with to_state() and carried
+    forward with just the new datapoints on the next run.
+    """
+
+    def __init__(
+        self,
+        alpha: float,
+        beta: float,
+        gamma: float,
+        bucket_seconds: float,
+        season_seconds: float,
+    ) -> None:
+        self.alpha = alpha
+        self.beta = beta
+        self.gamma = gamma
+        self.bucket_seconds = bucket_seconds
+        self.season_length = int(round(season_seconds / bucket_seconds))
+        self.last_bucket = None
+        self.level = 0.0
+        self.trend = 0.0
+        self.seasonals = [0.0] * self.season_length
+
+    def params(self):
+        return [
+            self.alpha,
+            self.beta,
+            self.gamma,
+            self.bucket_seconds,
+            self.season_length,
+        ]
+
+    def to_state(self):
+        return {
+            "version": HOLT_WINTERS_STATE_VERSION,
+            "params": self.params(),
+            "last_bucket": self.last_bucket,
+            "level": self.level,
+            "trend": self.trend,
+            "seasonals": self.seasonals,
+        }
+
+    def load_state(self, state):
+        """Restores a model saved by to_state(), unless it was saved with
+        different parameters. Returns whether it was restored."""
+        if (
+            not state
+            or state.get("version") != HOLT_WINTERS_STATE_VERSION
+            or state.get("params") != self.params()
+        ):
+            return False
+        self.last_bucket = state["last_bucket"]
+        self.level = state["level"]
+        self.trend = state["trend"]
+        self.seasonals = list(state["seasonals"])
+        return True
+
+    def bucket_averages(self, historical_load, first_bucket, end_bucket):
+        """Average load of each bucket in [first_bucket, end_bucket) that has
+        datapoints."""
+        window = historical_load.window(
+            first_bucket * self.bucket_seconds, end_bucket * self.bucket_seconds
+        )
+        buckets = map(
+            int,
+            map(
+                operator.floordiv,
+                window.timestamps,
+                itertools.repeat(self.bucket_seconds),
+            ),
+        )
+        sums = {}
+        counts = {}
+        for bucket, load in zip(buckets, window.loads):
+            if bucket < end_bucket:
+                sums[bucket] = sums.get(bucket, 0.0) + load
+                counts[bucket] = counts.get(bucket, 0) + 1
+        return {bucket: sums[bucket] / counts[bucket] for bucket in sums}
+
+    def initialize(self, averages):
+        first_bucket = min(averages)
+        self.last_bucket = first_bucket
+        self.level = averages[first_bucket]
+        self.trend = 0.0
+        if self.season_length:
+            # start from the average shape of the seasons we have, if we have
+            # at least one
+            if max(averages) - first_bucket + 1 >= self.season_length:
+                mean = sum(averages.values()) / len(averages)
+                slot_sums = [0.0] * self.season_length
+                slot_counts = [0] * self.season_length
+                for bucket, load in averages.items():
+                    slot_sums[bucket % self.season_length] += load
+                    slot_counts[bucket % self.season_length] += 1
+                self.seasonals = [
+                    total / count - mean if count else 0.0
+                    for total, count in zip(slot_sums, slot_counts)
+                ]
+            else:
+                self.seasonals = [0.0] * self.season_length
+            self.level -= self.seasonals[first_bucket % self.season_length]
+
+    def observe(self, bucket, load):
+        if self.season_length:
+            seasonal = self.seasonals[bucket % self.season_length]
+        else:
+            seasonal = 0.0
+        previous_level = self.level
+        self.level = self.alpha * (load - seasonal) + (1 - self.alpha) * (
+            self.level + self.trend
+        )
+        self.trend = (
+            self.beta * (self.level - previous_level) + (1 - self.beta) * self.trend
+        )
+        if self.season_length:
+            self.seasonals[bucket % self.season_length] = (
+                self.gamma * (load - self.level) + (1 - self.gamma) * seasonal
+            )
+        self.last_bucket = bucket
+
+    def update(self, historical_load):
+        """Feeds the model every complete bucket it hasn't seen yet, i.e. up
+        to but excluding the bucket of the latest datapoint."""
+        historical_load = HistoricalLoad.from_records(historical_load)
+        first_bucket = int(min(historical_load.timestamps) // self.bucket_seconds)
+        end_bucket = int(historical_load[-1][0] // self.bucket_seconds)
+        # a model that is older than the whole history has missed datapoints
+        # that we no longer have, so start over
+        if self.last_bucket is not None and self.last_bucket < first_bucket - 1:
+            self.last_bucket = None
+
+        if self.last_bucket is None:
+            averages = self.bucket_averages(historical_load, first_bucket, end_bucket)
+            if not averages:
+                return
+            self.initialize(averages)
+        else:
+            averages = self.bucket_averages(
+                historical_load, self.last_bucket + 1, end_bucket
+            )
+
+        for bucket in range(self.last_bucket + 1, end_bucket):
+            if bucket in averages:
+                self.observe(bucket, averages[bucket])
+            else:
+                # nothing was recorded for this bucket, carry the forecast
+                self.level += self.trend
+                self.last_bucket = bucket
+
+    def forecast(self, timestamp):
+        bucket = int(timestamp // self.bucket_seconds)
+        steps = bucket - self.last_bucket
+        prediction = self.level + steps * self.trend
+        if self.season_length:
+            prediction += self.seasonals[bucket % self.season_length]
+        return prediction
+
+
+def _holt_winters_forecast(
+    historical_load,
+    forecast_state,
+    alpha,
+    beta,
+    gamma,
+    bucket_seconds,
+    season_seconds,
+    extrapolation_seconds,
+):
+    model = HoltWinters(
+        alpha=alpha,
+        beta=beta,
+        gamma=gamma,
+        bucket_seconds=bucket_seconds,
+        season_seconds=season_seconds,
+    )
+    if forecast_state is not None:
+        model.load_state(forecast_state)
+    model.update(historical_load)
+    if forecast_state is not None:
+        forecast_state.clear()
+        forecast_state.update(model.to_state())
+
+    if model.last_bucket is None:
+        # not even one complete bucket of history yet
+        return current_value_forecast_policy(historical_load)
+
+    if isinstance(extrapolation_seconds, (int, float)):
+        extrapolation_seconds = [extrapolation_seconds]
+    now, _ = historical_load[-1]
+    return max(model.forecast(now + delta) for delta in extrapolation_seconds)
+
+
+@register_autoscaling_component("holt", FORECAST_POLICY_KEY)
+def holt_forecast_policy(
+    historical_load,
+    holt_winters_alpha=0.3,
+    holt_winters_beta=0.05,
+    holt_winters_bucket_seconds=DEFAULT_HOLT_WINTERS_BUCKET_SECONDS,
+    holt_winters_extrapolation_seconds=0,
+    forecast_state=None,
+    **kwargs,
+):
+    """Double exponential smoothing (Holt's linear method): tracks a smoothed level and trend of the load, and
+    forecasts along that trend. Takes the same parameters as holt_winters, minus the seasonal ones.
+    """
+    return _holt_winters_forecast(
+        historical_load,
+        forecast_state,
+        alpha=holt_winters_alpha,
+        beta=holt_winters_beta,
+        gamma=0,
+        bucket_seconds=holt_winters_bucket_seconds,
+        season_seconds=0,
+        extrapolation_seconds=holt_winters_extrapolation_seconds,
+    )
+
+
+@register_autoscaling_component("holt_winters", FORECAST_POLICY_KEY)
+def holt_winters_forecast_policy(
+    historical_load,
+    holt_winters_alpha=0.3,
+    holt_winters_beta=0.05,
+    holt_winters_gamma=0.3,
+    holt_winters_bucket_seconds=DEFAULT_HOLT_WINTERS_BUCKET_SECONDS,
+    holt_winters_season_seconds=DEFAULT_HOLT_WINTERS_SEASON_SECONDS,
+    holt_winters_extrapolation_seconds=0,
+    forecast_state=None,
+    **kwargs,
+):
+    """Triple exponential smoothing (additive Holt-Winters): like holt, but also learns how the load typically
+    deviates from its level at each point of a season (a day, by default), so that it can forecast predictable daily
+    peaks before they happen.
+
+    :param holt_winters_alpha: Smoothing factor for the level, between 0 and 1.
+    :param holt_winters_beta: Smoothing factor for the trend, between 0 and 1.
+    :param holt_winters_gamma: Smoothing factor for the seasonal component, between 0 and 1.
+    :param holt_winters_bucket_seconds: The history is averaged into buckets of this many seconds before smoothing.
+    :param holt_winters_season_seconds: The length of a season.
+    :param holt_winters_extrapolation_seconds: A number, or list of numbers, of seconds in the future at which to
+                                               predict the load. The highest prediction will be returned.
+    :param forecast_state: A dict to resume the model from and save it to, so that each run only needs to feed it
+                           the history recorded since the previous one.
+    """
+    return _holt_winters_forecast(
+        historical_load,
+        forecast_state,
+        alpha=holt_winters_alpha,
+        beta=holt_winters_beta,
+        gamma=holt_winters_gamma,
+        bucket_seconds=holt_winters_bucket_seconds,
+        season_seconds=holt_winters_season_seconds,
+        extrapolation_seconds=holt_winters_extrapolation_seconds,
+    )
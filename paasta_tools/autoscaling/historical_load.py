@@ -0,0 +1,175 @@
+# Copyright 2015-2021 Yelp Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+A compact store for the (timestamp, load) history kept by the autoscaler.
+
+Timestamps and loads live in two ``array.array("d")`` columns instead of a list
+of tuples, so that loading them from (and saving them to) the bytes kept in
+ZooKeeper is a couple of memcpys, and so that the forecasting policies can
+window and aggregate them with C-level loops (``sum``, ``map``,
+``itertools.compress``) instead of per-record Python code.
+
+The serialized form is unchanged: native-endian (timestamp, load) pairs of
+doubles, i.e. ``struct`` format ``"dd"`` repeated.
+"""
+import itertools
+import operator
+from array import array
+from typing import Iterable
+from typing import Iterator
+from typing import overload
+from typing import Sequence
+from typing import Tuple
+from typing import Union
+
+HistoricalLoadRecord = Tuple[float, float]
+
+RECORD_SIZE = 2 * array("d").itemsize
+# stay under ZooKeeper's default 1MB znode size limit
+MAX_HISTORICAL_LOAD_BYTES = 1000000
+MAX_HISTORICAL_LOAD_RECORDS = MAX_HISTORICAL_LOAD_BYTES // RECORD_SIZE
+
+
+class HistoricalLoad(Sequence[HistoricalLoadRecord]):
+    """A bounded, append-only sequence of (timestamp, load) records.
+
+    Once it holds max_records, appending a record drops the oldest one, like
+    a ring buffer. Dropped records are only removed from the underlying arrays
+    once they make up half of them, so appends stay O(1) amortized.
+    """
+
+    def __init__(
+        self,
+        timestamps: Iterable[float] = (),
+        loads: Iterable[float] = (),
+        max_records: int = MAX_HISTORICAL_LOAD_RECORDS,
+    ) -> None:
+        self.max_records = max_records
+        self._timestamps = array("d", timestamps)
+        self._loads = array("d", loads)
+        if len(self._timestamps) != len(self._loads):
+            raise ValueError("timestamps and loads must have the same length")
+        self._start = 0
+        self._trim()
+
+    @classmethod
+    def from_records(
+        cls,
+        records: Iterable[HistoricalLoadRecord],
+        max_records: int = MAX_HISTORICAL_LOAD_RECORDS,
+    ) -> "HistoricalLoad":
+        if isinstance(records, HistoricalLoad):
+            return records
+        timestamps: "array[float]" = array("d")
+        loads: "array[float]" = array("d")
+        for timestamp, load in records:
+            timestamps.append(timestamp)
+            loads.append(load)
+        return cls(timestamps, loads, max_records=max_records)
+
+    @classmethod
+    def from_bytes(
+        cls, data: bytes, max_records: int = MAX_HISTORICAL_LOAD_RECORDS
+    ) -> "HistoricalLoad":
+        """Inverse of to_bytes. A trailing partial record is ignored."""
+        pairs: "array[float]" = array("d")
+        complete = len(data) - len(data) % RECORD_SIZE
+        pairs.frombytes(data if complete == len(data) else data[:complete])
+        return cls(pairs[0::2], pairs[1::2], max_records=max_records)
+
+    def to_bytes(self) -> bytes:
+        pairs: "array[float]" = array("d", bytes(len(self) * RECORD_SIZE))
+        pairs[0::2] = self.timestamps
+        pairs[1::2] = self.loads
+        return pairs.tobytes()
+
+    @property
+    def timestamps(self) -> "array[float]":
+        if self._start:
+            self._compact()
+        return self._timestamps
+
+    @property
+    def loads(self) -> "array[float]":
+        if self._start:
+            self._compact()
+        return self._loads
+
+    def _compact(self) -> None:
+        del self._timestamps[: self._start]
+        del self._loads[: self._start]
+        self._start = 0
+
+    def _trim(self) -> None:
+        excess = len(self) - self.max_records
+        if excess > 0:
+            self._start += excess
+            if self._start >= len(self._timestamps) // 2:
+                self._compact()
+
+    def append(self, record: HistoricalLoadRecord) -> None:
+        timestamp, load = record
+        self._timestamps.append(timestamp)
+        self._loads.append(load)
+        self._trim()
+
+    def window(self, window_begin: float, window_end: float) -> "HistoricalLoad":
+        """The records with a timestamp between window_begin and window_end,
+        inclusive."""
+        timestamps = self.timestamps
+        selectors = list(
+            map(
+                operator.and_,
+                map(float(window_begin).__le__, timestamps),
+                map(float(window_end).__ge__, timestamps),
+            )
+        )
+        return HistoricalLoad(
+            itertools.compress(timestamps, selectors),
+            itertools.compress(self.loads, selectors),
+            max_records=self.max_records,
+        )
+
+    def __len__(self) -> int:
+        return len(self._timestamps) - self._start
+
+    def __iter__(self) -> Iterator[HistoricalLoadRecord]:
+        return zip(self.timestamps, self.loads)
+
+    @overload
+    def __getitem__(self, index: int) -> HistoricalLoadRecord:
+        ...
+
+    @overload  # noqa: F811
+    def __getitem__(self, index: slice) -> "HistoricalLoad":
+        ...
+
+    def __getitem__(  # noqa: F811
+        self, index: Union[int, slice]
+    ) -> Union[HistoricalLoadRecord, "HistoricalLoad"]:
+        if isinstance(index, slice):
+            return HistoricalLoad(
+                self.timestamps[index], self.loads[index], max_records=self.max_records
+            )
+        return self.timestamps[index], self.loads[index]
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, HistoricalLoad):
+            return self.timestamps == other.timestamps and self.loads == other.loads
+        if isinstance(other, Sequence):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"HistoricalLoad({list(self)!r})"
@@ -0,0 +1,302 @@
+#!/usr/bin/env python
+# Copyright 2015-2021 Yelp Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+paasta_cgroup_oom_collector counts the OOM kills of the Kubernetes pods on a
+host from the cgroup v2 hierarchy, rather than by parsing kernel messages like
+paasta_oom_logger does, and keeps per-minute counts by service and instance in a
+small JSON file that check_oom_events can read with --oom-events-store.
+
+Every pod's cgroup has a memory.events file whose oom_kill counter includes
+the kills of all of its containers, even ones that have since been restarted,
+so polling it every few seconds doesn't miss kills of short-lived containers.
+Both the cgroupfs (kubepods/burstable/pod<uid>/<container id>) and the systemd
+(kubepods.slice/.../kubepods-burstable-pod<uid>.slice/docker-<id>.scope)
+layouts are supported. Pods are attributed to a service and instance by the
+labels of the pod with that uid in the kubelet's pod list, so it doesn't
+matter which container runtime the host uses.
+"""
+import argparse
+import json
+import logging
+import os
+import re
+import time
+from typing import Callable
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Set
+from typing import Tuple
+
+import requests
+
+from paasta_tools.kubernetes_tools import get_k8s_pods
+from paasta_tools.utils import atomic_file_write
+
+log = logging.getLogger(__name__)
+
+DEFAULT_CGROUP_ROOT = "/sys/fs/cgroup"
+DEFAULT_OOM_EVENTS_STORE = "/var/lib/paasta/oom_events.json"
+
+KUBEPODS_CGROUPS = ("kubepods", "kubepods.slice")
+POD_CGROUP_REGEX = re.compile(r"(?:^|-)pod(?P<pod_uid>[0-9a-f_\-]+)(?:\.slice)?$")
+CONTAINER_CGROUP_REGEX = re.compile(
+    r"^(?:(?:docker|cri-containerd|crio)-)?(?P<container_id>[0-9a-f]{64})(?:\.scope)?$"
+)
+
+# (service, instance) of a pod uid, or None if it isn't a paasta pod
+PodResolver = Callable[[str], Optional[Tuple[str, str]]]
+
+
+def find_pod_cgroups(cgroup_root: str) -> Iterator[str]:
+    """The cgroup directory of every pod, with any QoS class."""
+    for kubepods in KUBEPODS_CGROUPS:
+        kubepods_path = os.path.join(cgroup_root, kubepods)
+        if not os.path.isdir(kubepods_path):
+            continue
+        for entry in os.scandir(kubepods_path):
+            if not entry.is_dir():
+                continue
+            if POD_CGROUP_REGEX.search(entry.name):
+                # guaranteed pods are directly under kubepods
+                yield entry.path
+            else:
+                for pod in os.scandir(entry.path):
+                    if pod.is_dir() and POD_CGROUP_REGEX.search(pod.name):
+                        yield pod.path
+
+
+def find_container_cgroups(pod_cgroup: str) -> Iterator[Tuple[str, str]]:
+    """(short container id, cgroup directory) of every container in a pod."""
+    for entry in os.scandir(pod_cgroup):
+        match = CONTAINER_CGROUP_REGEX.match(entry.name)
+        if match and entry.is_dir():
+            yield match.group("container_id")[:12], entry.path
+
+
+def read_oom_kills(cgroup: str) -> Optional[int]:
+    """The oom_kill counter of a cgroup's memory.events, or None if it can't
+    be read (e.g. the cgroup has just been removed)."""
+    try:
+        with open(os.path.join(cgroup, "memory.events")) as f:
+            for line in f:
+                key, _, value = line.partition(" ")
+                if key == "oom_kill":
+                    return int(value)
+    except (OSError, ValueError):
+        return None
+    return 0
+
+
+def get_pod_uid(pod_cgroup: str) -> str:
+    """The uid of the pod a pod cgroup directory belongs to. The systemd layout
+    has underscores where the uid has dashes."""
+    match = POD_CGROUP_REGEX.search(os.path.basename(pod_cgroup))
+    assert match is not None
+    return match.group("pod_uid").replace("_", "-")
+
+
+def get_kubelet_pod_resolver() -> PodResolver:
+    """Resolves pod uids from the kubelet's pod list, which is only fetched
+    again when a pod we haven't seen before turns up."""
+    pods: Dict[str, Tuple[str, str]] = {}
+
+    def resolve(pod_uid: str) -> Optional[Tuple[str, str]]:
+        if pod_uid not in pods:
+            try:
+                items = get_k8s_pods()["items"]
+            except (requests.exceptions.RequestException, ValueError) as e:
+                log.warning(f"Couldn't list the pods on this host: {e}")
+                return None
+            pods.clear()
+            for pod in items:
+                labels = pod["metadata"].get("labels") or {}
+                try:
+                    pods[pod["metadata"]["uid"]] = (
+                        labels["paasta.yelp.com/service"],
+                        labels["paasta.yelp.com/instance"],
+                    )
+                except KeyError:
+                    continue
+        return pods.get(pod_uid)
+
+    return resolve
+
+
+class OOMEventStore:
+    """Counts of OOM kills by service, instance, container and minute, and the
+    oom_kill counter last seen in each pod's cgroup, saved as JSON."""
+
+    def __init__(self, path: str, retention_seconds: int = 3600) -> None:
+        self.path = path
+        self.retention_seconds = retention_seconds
+        # None until the collector has looked at the cgroups once
+        self.pod_oom_kills: Optional[Dict[str, int]] = None
+        # [minute, service, instance, container_id, count]
+        self.events: List[List] = []
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        self.pod_oom_kills = data["pod_oom_kills"]
+        self.events = data["events"]
+
+    def save(self) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with atomic_file_write(self.path) as f:
+            json.dump({"pod_oom_kills": self.pod_oom_kills, "events": self.events}, f)
+
+    def record(
+        self,
+        timestamp: float,
+        service: str,
+        instance: str,
+        container_id: str,
+        count: int,
+    ) -> None:
+        minute = int(timestamp) // 60 * 60
+        for event in self.events:
+            if event[:4] == [minute, service, instance, container_id]:
+                event[4] += count
+                return
+        self.events.append([minute, service, instance, container_id, count])
+
+    def prune(self, now: float) -> None:
+        self.events = [
+            event for event in self.events if event[0] > now - self.retention_seconds
+        ]
+
+    def latest_oom_events(
+        self, now: float, interval: int = 60
+    ) -> Dict[Tuple[str, str], List[str]]:
+        """Like check_oom_events.latest_oom_events: the ids of the containers
+        of each service and instance that had processes killed in the last
+        interval seconds, once for every kill, so that they can be counted
+        against the alert threshold even when the container isn't known."""
+        res: Dict[Tuple[str, str], List[str]] = {}
+        for minute, service, instance, container_id, count in self.events:
+            # kills are only known to the minute, so count a whole minute as
+            # recent if any of it is
+            if minute + 60 > now - interval:
+                res.setdefault((service, instance), []).extend([container_id] * count)
+        return res
+
+    def service_instances(self) -> Set[Tuple[str, str]]:
+        """The services and instances that had processes killed on this host
+        in the last retention_seconds."""
+        return {(service, instance) for _, service, instance, _, _ in self.events}
+
+
+def collect_oom_kills(
+    cgroup_root: str,
+    store: OOMEventStore,
+    resolve: PodResolver,
+    now: float,
+) -> int:
+    """Records the OOM kills since the last collection in store.
+
+    The first collection only notes the current counters, since the kills
+    they include happened at some unknown time.
+
+    :returns: how many kills were recorded
+    """
+    previous_oom_kills = store.pod_oom_kills
+    pod_oom_kills: Dict[str, int] = {}
+    recorded = 0
+    for pod_cgroup in find_pod_cgroups(cgroup_root):
+        oom_kills = read_oom_kills(pod_cgroup)
+        if oom_kills is None:
+            continue
+        key = os.path.relpath(pod_cgroup, cgroup_root)
+        pod_oom_kills[key] = oom_kills
+        if previous_oom_kills is None:
+            continue
+        # pods we haven't seen before were created since the last collection
+        new_oom_kills = oom_kills - previous_oom_kills.get(key, 0)
+        if new_oom_kills <= 0:
+            continue
+
+        service_instance = resolve(get_pod_uid(pod_cgroup))
+        if service_instance is None:
+            log.warning(f"Couldn't tell which instance {pod_cgroup} belongs to")
+            continue
+        service, instance = service_instance
+        # the container that was killed, if it hasn't been restarted yet
+        killed = [
+            cid
+            for cid, cgroup in find_container_cgroups(pod_cgroup)
+            if read_oom_kills(cgroup)
+        ]
+        store.record(now, service, instance, killed[0] if killed else "", new_oom_kills)
+        recorded += new_oom_kills
+    store.pod_oom_kills = pod_oom_kills
+    store.prune(now)
+    return recorded
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Counts the OOM kills of Kubernetes pods on this host from cgroup v2."
+    )
+    parser.add_argument(
+        "--cgroup-root", default=DEFAULT_CGROUP_ROOT, help="Default %(default)s"
+    )
+    parser.add_argument(
+        "--store",
+        default=DEFAULT_OOM_EVENTS_STORE,
+        help="Where to keep the counts. Default %(default)s",
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=10,
+        help="How often to look at the cgroups, in seconds. Default %(default)s",
+    )
+    parser.add_argument(
+        "--retention",
+        type=int,
+        default=3600,
+        help="How long to keep counts for, in seconds. Default %(default)s",
+    )
+    parser.add_argument(
+        "--once", action="store_true", help="Collect once and exit, e.g. from cron"
+    )
+    parser.add_argument("-v", "--verbose", action="store_true", default=False)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.WARNING)
+
+    store = OOMEventStore(args.store, retention_seconds=args.retention)
+    resolve = get_kubelet_pod_resolver()
+    while True:
+        try:
+            recorded = collect_oom_kills(args.cgroup_root, store, resolve, time.time())
+            log.debug(f"Recorded {recorded} OOM kills")
+            store.save()
+        except Exception:
+            # try again next time rather than stop counting altogether
+            log.exception("Failed to collect OOM kills")
+        if args.once:
+            break
+        time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    main()
@@ -25,9 +25,9 @@ import pysensu_yelp
 from paasta_tools import flink_tools
 from paasta_tools.check_services_replication_tools import main
 from paasta_tools.flink_tools import FlinkDeploymentConfig
+from paasta_tools.kubernetes_tools import AnyPod
 from paasta_tools.kubernetes_tools import filter_pods_by_service_instance
 from paasta_tools.kubernetes_tools import is_pod_ready
-from paasta_tools.kubernetes_tools import V1Pod
 from paasta_tools.monitoring_tools import check_under_replication
 from paasta_tools.monitoring_tools import send_replication_event
 from paasta_tools.smartstack_tools import KubeSmartstackEnvoyReplicationChecker
@@ -38,14 +38,17 @@ log = logging.getLogger(__name__)
 
 
 def container_lifetime(
-    pod: V1Pod,
+    pod: AnyPod,
 ) -> datetime.timedelta:
     """Return a time duration for how long the pod is alive"""
     st = pod.status.start_time
+    if st is None:
+        # not started yet
+        return datetime.timedelta(0)
     return datetime.datetime.now(st.tzinfo) - st
 
 
-def healthy_flink_containers_cnt(si_pods: Sequence[V1Pod], container_type: str) -> int:
+def healthy_flink_containers_cnt(si_pods: Sequence[AnyPod], container_type: str) -> int:
     """Return count of healthy Flink containers with given type"""
     return len(
         [
@@ -110,7 +113,7 @@ Things you can do:
     return unhealthy, output, description
 
 
-def get_cr_name(si_pods: Sequence[V1Pod]) -> str:
+def get_cr_name(si_pods: Sequence[AnyPod]) -> str:
     """Returns the flink custom resource name based on the pod name.  We are randomly choosing jobmanager pod here.
     This change is related to FLINK-3129
     """
@@ -129,7 +132,7 @@ def get_cr_name(si_pods: Sequence[V1Pod]) -> str:
 
 def check_flink_service_health(
     instance_config: FlinkDeploymentConfig,
-    all_tasks_or_pods: Sequence[V1Pod],
+    all_tasks_or_pods: Sequence[AnyPod],
     replication_checker: KubeSmartstackEnvoyReplicationChecker,
     dry_run: bool = False,
 ) -> None:
@@ -37,10 +37,10 @@ from typing import Sequence
 from paasta_tools import kubernetes_tools
 from paasta_tools import monitoring_tools
 from paasta_tools.check_services_replication_tools import main
+from paasta_tools.kubernetes_tools import AnyPod
 from paasta_tools.kubernetes_tools import filter_pods_by_service_instance
 from paasta_tools.kubernetes_tools import is_pod_ready
 from paasta_tools.kubernetes_tools import KubernetesDeploymentConfig
-from paasta_tools.kubernetes_tools import V1Pod
 from paasta_tools.long_running_service_tools import get_proxy_port_for_instance
 from paasta_tools.smartstack_tools import KubeSmartstackEnvoyReplicationChecker
 
@@ -52,7 +52,7 @@ DEFAULT_ALERT_AFTER = "10m"
 def check_healthy_kubernetes_tasks_for_service_instance(
     instance_config: KubernetesDeploymentConfig,
     expected_count: int,
-    all_pods: Sequence[V1Pod],
+    all_pods: Sequence[AnyPod],
     dry_run: bool = False,
 ) -> None:
     si_pods = filter_pods_by_service_instance(
@@ -74,7 +74,7 @@ def check_healthy_kubernetes_tasks_for_service_instance(
 
 def check_kubernetes_pod_replication(
     instance_config: KubernetesDeploymentConfig,
-    all_tasks_or_pods: Sequence[V1Pod],
+    all_tasks_or_pods: Sequence[AnyPod],
     replication_checker: KubeSmartstackEnvoyReplicationChecker,
     dry_run: bool = False,
 ) -> Optional[bool]:
@@ -20,6 +20,7 @@ import time
 from pysensu_yelp import Status
 
 from paasta_tools import monitoring_tools
+from paasta_tools.cgroup_oom_collector import OOMEventStore
 from paasta_tools.cli.cmds.logs import scribe_env_to_locations
 from paasta_tools.cli.utils import get_instance_config
 from paasta_tools.utils import DEFAULT_SOA_DIR
@@ -80,16 +81,27 @@ def parse_args(args):
         "-s",
         "--superregion",
         dest="superregion",
-        required=True,
         help="The superregion to read OOM events from.",
     )
+    parser.add_argument(
+        "--oom-events-store",
+        dest="oom_events_store",
+        help=(
+            "Read OOM events from the counts paasta_cgroup_oom_collector keeps "
+            "in this file, instead of from the %s stream. Only the instances "
+            "with kills in this file are reported on." % OOM_EVENTS_STREAM
+        ),
+    )
     parser.add_argument(
         "--dry-run",
         dest="dry_run",
         action="store_true",
         help="Print Sensu alert events instead of sending them",
     )
-    return parser.parse_args(args)
+    parsed_args = parser.parse_args(args)
+    if not parsed_args.superregion and not parsed_args.oom_events_store:
+        parser.error("one of --superregion or --oom-events-store is required")
+    return parsed_args
 
 
 def read_oom_events_from_scribe(cluster, superregion, num_lines=1000):
@@ -221,11 +233,26 @@ def send_sensu_event(instance, oom_events, args):
 def main(sys_argv):
     args = parse_args(sys_argv[1:])
     cluster = load_system_paasta_config().get_cluster()
-    victims = latest_oom_events(
-        cluster, args.superregion, interval=(60 * args.check_interval)
-    )
+    service_instances = get_services_for_cluster(cluster, soa_dir=args.soa_dir)
+    if args.oom_events_store:
+        store = OOMEventStore(args.oom_events_store)
+        victims = store.latest_oom_events(
+            now=time.time(), interval=(60 * args.check_interval)
+        )
+        # the store only knows about this host's containers, so leave the
+        # alerts of instances that haven't had kills here to the hosts that
+        # have: only the instances this host has seen kills of are resolved
+        # by it once their kills are older than the check interval
+        killed_here = store.service_instances()
+        service_instances = [si for si in service_instances if si in killed_here]
+    else:
+        victims = latest_oom_events(
+            cluster=cluster,
+            superregion=args.superregion,
+            interval=(60 * args.check_interval),
+        )
 
-    for (service, instance) in get_services_for_cluster(cluster, soa_dir=args.soa_dir):
+    for (service, instance) in service_instances:
         try:
             instance_config = get_instance_config(
                 service=service,
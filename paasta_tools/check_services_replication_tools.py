@@ -30,19 +30,23 @@ from marathon.models.task import MarathonTask
 from mypy_extensions import Arg
 from mypy_extensions import NamedArg
 
+from paasta_tools.kubernetes_tools import AnyPod
 from paasta_tools.kubernetes_tools import get_all_namespaces
 from paasta_tools.kubernetes_tools import get_all_nodes
-from paasta_tools.kubernetes_tools import get_all_pods
+from paasta_tools.kubernetes_tools import get_all_pods_slim_in_namespaces
 from paasta_tools.kubernetes_tools import get_matching_namespaces
 from paasta_tools.kubernetes_tools import KubeClient
+from paasta_tools.kubernetes_tools import PodIndex
+from paasta_tools.kubernetes_tools import SlimPod
 from paasta_tools.kubernetes_tools import V1Node
-from paasta_tools.kubernetes_tools import V1Pod
 from paasta_tools.marathon_tools import get_marathon_clients
 from paasta_tools.marathon_tools import get_marathon_servers
 from paasta_tools.mesos_tools import get_slaves
 from paasta_tools.monitoring_tools import ReplicationChecker
 from paasta_tools.paasta_service_config_loader import PaastaServiceConfigLoader
+from paasta_tools.smartstack_tools import DiscoverySnapshotCache
 from paasta_tools.smartstack_tools import KubeSmartstackEnvoyReplicationChecker
+from paasta_tools.soa_config_index import use_soa_config_index
 from paasta_tools.utils import DEFAULT_SOA_DIR
 from paasta_tools.utils import InstanceConfig_T
 from paasta_tools.utils import list_services
@@ -60,7 +64,7 @@ log = logging.getLogger(__name__)
 CheckServiceReplication = Callable[
     [
         Arg(InstanceConfig_T, "instance_config"),
-        Arg(Sequence[Union[MarathonTask, V1Pod]], "all_tasks_or_pods"),
+        Arg(Sequence[Union[MarathonTask, AnyPod]], "all_tasks_or_pods"),
         Arg(Any, "replication_checker"),
         NamedArg(bool, "dry_run"),
     ],
@@ -139,7 +143,7 @@ def check_services_replication(
     instance_type_class: Type[InstanceConfig_T],
     check_service_replication: CheckServiceReplication,
     replication_checker: ReplicationChecker,
-    all_tasks_or_pods: Sequence[Union[MarathonTask, V1Pod]],
+    all_tasks_or_pods: Sequence[Union[MarathonTask, AnyPod]],
     dry_run: bool = False,
 ) -> Tuple[int, int]:
     service_instances_set = set(service_instances)
@@ -207,36 +211,48 @@ def main(
     system_paasta_config = load_system_paasta_config()
     cluster = system_paasta_config.get_cluster()
     replication_checker: ReplicationChecker
+    # instances in the same location all read the same haproxy/envoy data, so
+    # fetch it once per host and share it
+    snapshot_cache = DiscoverySnapshotCache(system_paasta_config)
 
     if namespace:
         # Note: we will have by default namespace_prefix always set to paastasvc
         # which means we could have namespace and namespace_prefix set at the same time
         # what differentiate between which one we will use, will be this if statement
-        tasks_or_pods, nodes = get_kubernetes_pods_and_nodes(namespace=namespace)
+        pods, nodes = get_kubernetes_pods_and_nodes(namespace=namespace)
         replication_checker = KubeSmartstackEnvoyReplicationChecker(
             nodes=nodes,
             system_paasta_config=system_paasta_config,
+            snapshot_cache=snapshot_cache,
         )
     else:
-        tasks_or_pods, nodes = get_kubernetes_pods_and_nodes(
+        pods, nodes = get_kubernetes_pods_and_nodes(
             namespace_prefix=args.namespace_prefix,
             additional_namespaces=args.additional_namespaces,
         )
         replication_checker = KubeSmartstackEnvoyReplicationChecker(
             nodes=nodes,
             system_paasta_config=system_paasta_config,
+            snapshot_cache=snapshot_cache,
         )
+    # every instance looks up its own pods, so index them once up front
+    tasks_or_pods = PodIndex(pods)
 
-    count_under_replicated, total = check_services_replication(
+    with use_soa_config_index(
+        index_path=system_paasta_config.get_soa_config_index_path(),
         soa_dir=args.soa_dir,
-        cluster=cluster,
-        service_instances=args.service_instance_list,
-        instance_type_class=instance_type_class,
-        check_service_replication=check_service_replication,
-        replication_checker=replication_checker,
-        all_tasks_or_pods=tasks_or_pods,
-        dry_run=args.dry_run,
-    )
+    ):
+        count_under_replicated, total = check_services_replication(
+            soa_dir=args.soa_dir,
+            cluster=cluster,
+            service_instances=args.service_instance_list,
+            instance_type_class=instance_type_class,
+            check_service_replication=check_service_replication,
+            replication_checker=replication_checker,
+            all_tasks_or_pods=tasks_or_pods,
+            dry_run=args.dry_run,
+        )
+    snapshot_cache.close()
     pct_under_replicated = 0 if total == 0 else 100 * count_under_replicated / total
     if yelp_meteorite is not None:
         emit_cluster_replication_metrics(
@@ -276,20 +292,19 @@ def get_kubernetes_pods_and_nodes(
     namespace_prefix: Optional[str] = None,
     namespace: Optional[str] = None,
     additional_namespaces: Optional[Container[str]] = None,
-) -> Tuple[List[V1Pod], List[V1Node]]:
+) -> Tuple[List[SlimPod], List[V1Node]]:
     kube_client = KubeClient()
 
-    all_pods: List[V1Pod] = []
     if namespace:
-        all_pods = get_all_pods(kube_client=kube_client, namespace=namespace)
+        namespaces = [namespace]
     else:
         all_namespaces = get_all_namespaces(kube_client)
-        for matching_namespace in get_matching_namespaces(
+        namespaces = get_matching_namespaces(
             all_namespaces, namespace_prefix, additional_namespaces
-        ):
-            all_pods.extend(
-                get_all_pods(kube_client=kube_client, namespace=matching_namespace)
-            )
+        )
+    # the checks only look at a few fields of each pod, so don't build whole
+    # V1Pods, which takes minutes and gigabytes on the largest clusters
+    all_pods = get_all_pods_slim_in_namespaces(kube_client, namespaces)
 
     all_nodes = get_all_nodes(kube_client)
 
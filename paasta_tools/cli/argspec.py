@@ -0,0 +1,213 @@
+#!/usr/bin/env python
+# Copyright 2015-2021 Yelp Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+A precomputed description of the arguments of every paasta subcommand, so that
+tab completion doesn't have to import the module implementing a subcommand
+(and with it, the Kubernetes, Marathon, etc. client libraries) just to find
+out which options it takes.
+
+The description is checked in as argspec.json. Regenerate it with
+``make cli-argspec`` (or ``python -m paasta_tools.cli.argspec``) after changing
+the arguments of a subcommand; tests/cli/test_argspec.py fails until you do
+if the options themselves changed.
+
+Completers are recorded by name and only imported when argcomplete calls
+them. Completers that aren't module-level functions (e.g. completing from the
+keys of a constant dict) are recorded as the fixed list of values they return.
+This module must stay cheap to import: it is imported on every tab completion.
+"""
+import argparse
+import importlib
+import inspect
+import json
+import os
+import sys
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+
+ARGSPEC_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "argspec.json")
+
+ArgSpec = Dict[str, Any]
+
+
+def _action_names() -> Dict[type, str]:
+    registry = argparse.ArgumentParser()._registries["action"]
+    return {
+        action_class: name
+        for name, action_class in registry.items()
+        if name is not None and isinstance(action_class, type)
+    }
+
+
+def _is_jsonable(value: Any) -> bool:
+    return value is None or isinstance(value, (str, int, float, bool))
+
+
+def _completer_spec(completer: Callable) -> Optional[ArgSpec]:
+    # lazy_choices_completer closes over the function that lists the options
+    closure = getattr(completer, "__closure__", None) or ()
+    list_func = dict(zip(completer.__code__.co_freevars, closure)).get("list_func")
+    if list_func is not None:
+        list_func = list_func.cell_contents
+        if inspect.isfunction(list_func) and "<locals>" not in list_func.__qualname__:
+            return {"choices_from": f"{list_func.__module__}:{list_func.__qualname__}"}
+        return {"completion_choices": sorted(str(option) for option in list_func())}
+    if "<locals>" in completer.__qualname__:
+        # can't be imported again when completing
+        return None
+    return {"completer": f"{completer.__module__}:{completer.__qualname__}"}
+
+
+def describe_parser(parser: argparse.ArgumentParser) -> ArgSpec:
+    action_names = _action_names()
+    spec: ArgSpec = {"description": parser.description, "arguments": []}
+    for action in parser._actions:
+        if isinstance(action, argparse._SubParsersAction):
+            helps = {a.dest: a.help for a in action._choices_actions}
+            spec["subcommands"] = {
+                name: dict(describe_parser(subparser), help=helps.get(name))
+                for name, subparser in action.choices.items()
+            }
+            continue
+        argument: ArgSpec = {
+            "option_strings": action.option_strings,
+            "dest": action.dest,
+            "action": action_names.get(type(action), "store"),
+            "help": action.help,
+        }
+        # the other actions don't take nargs
+        if action.nargs is not None and argument["action"] in ("store", "append"):
+            argument["nargs"] = action.nargs
+        if (
+            argument["action"] in ("store_const", "append_const")
+            or action.nargs == argparse.OPTIONAL
+        ) and _is_jsonable(action.const):
+            argument["const"] = action.const
+        if action.choices is not None:
+            argument["choices"] = sorted(str(choice) for choice in action.choices)
+        if action.required and action.option_strings:
+            argument["required"] = True
+        if action.metavar is not None and _is_jsonable(action.metavar):
+            argument["metavar"] = action.metavar
+        completer = getattr(action, "completer", None)
+        if completer is not None:
+            argument.update(_completer_spec(completer) or {})
+        spec["arguments"].append(argument)
+    return spec
+
+
+def generate_argspec() -> ArgSpec:
+    """Describes every built-in subcommand by importing each of them."""
+    from paasta_tools.cli.cli import add_subparser
+    from paasta_tools.cli.cli import PAASTA_SUBCOMMANDS
+
+    subcommands: ArgSpec = {}
+    for module_name in sorted(set(PAASTA_SUBCOMMANDS.values())):
+        parser = argparse.ArgumentParser()
+        add_subparser(module_name, parser.add_subparsers())
+        subcommands.update(describe_parser(parser)["subcommands"])
+    return {command: subcommands[command] for command in sorted(PAASTA_SUBCOMMANDS)}
+
+
+def load_argspec(path: str = ARGSPEC_PATH) -> Optional[ArgSpec]:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _import_attribute(reference: str) -> Any:
+    module_name, _, qualname = reference.partition(":")
+    attribute: Any = importlib.import_module(module_name)
+    for name in qualname.split("."):
+        attribute = getattr(attribute, name)
+    return attribute
+
+
+def _lazy_completer(argument: ArgSpec) -> Optional[Callable[..., List[str]]]:
+    if "choices_from" in argument:
+
+        def complete_choices_from(prefix: str, **kwargs: Any) -> List[str]:
+            list_func = _import_attribute(argument["choices_from"])
+            return [o for o in list_func(**kwargs) if o.startswith(prefix)]
+
+        return complete_choices_from
+    if "completer" in argument:
+
+        def complete(*args: Any, **kwargs: Any) -> List[str]:
+            return _import_attribute(argument["completer"])(*args, **kwargs)
+
+        return complete
+    if "completion_choices" in argument:
+        choices = argument["completion_choices"]
+        return lambda prefix, **kwargs: [c for c in choices if c.startswith(prefix)]
+    return None
+
+
+def add_parser_from_spec(
+    subparsers: argparse._SubParsersAction, name: str, spec: ArgSpec
+) -> argparse.ArgumentParser:
+    """Adds a parser that takes the same arguments as the one spec describes
+    to subparsers. It is only good for tab completion: argument types and
+    defaults aren't recorded, and it doesn't know which function runs the
+    subcommand."""
+    parser = subparsers.add_parser(
+        name, help=spec.get("help"), description=spec.get("description")
+    )
+    add_arguments_from_spec(parser, spec)
+    return parser
+
+
+def add_arguments_from_spec(parser: argparse.ArgumentParser, spec: ArgSpec) -> None:
+    for argument in spec["arguments"]:
+        if argument["action"] in ("help", "version"):
+            continue
+        kwargs: Dict[str, Any] = {
+            "action": argument["action"],
+            "help": argument["help"],
+        }
+        if not argument["option_strings"]:
+            # positional arguments get their name from dest
+            args = [argument["dest"]]
+        else:
+            args = argument["option_strings"]
+            kwargs["dest"] = argument["dest"]
+        for key in ("nargs", "const", "choices", "required", "metavar"):
+            if key in argument:
+                kwargs[key] = argument[key]
+        action = parser.add_argument(*args, **kwargs)
+        completer = _lazy_completer(argument)
+        if completer is not None:
+            action.completer = completer  # type: ignore
+
+    if "subcommands" in spec:
+        subparsers = parser.add_subparsers()
+        for name, subcommand_spec in spec["subcommands"].items():
+            add_parser_from_spec(subparsers, name, subcommand_spec)
+
+
+def write_argspec(path: str = ARGSPEC_PATH) -> None:
+    with open(path, "w") as f:
+        # formatted the way the pretty-format-json pre-commit hook wants it
+        json.dump(generate_argspec(), f, indent=4)
+        f.write("\n")
+
+
+if __name__ == "__main__":
+    write_argspec(sys.argv[1] if len(sys.argv) > 1 else ARGSPEC_PATH)
@@ -15,6 +15,7 @@
 # PYTHON_ARGCOMPLETE_OK
 """A command line tool for viewing information from the PaaSTA stack."""
 import argparse
+import functools
 import logging
 import os
 import pkgutil
@@ -23,12 +24,16 @@ import sys
 import warnings
 from typing import Any
 from typing import List
+from typing import Optional
 from typing import Tuple
 
 import argcomplete
 
 import paasta_tools
 from paasta_tools.cli import cmds
+from paasta_tools.cli.argspec import add_parser_from_spec
+from paasta_tools.cli.argspec import ArgSpec
+from paasta_tools.cli.argspec import load_argspec
 
 
 def load_method(module_name, method_name):
@@ -65,6 +70,7 @@ class PrintsHelpOnErrorArgumentParser(argparse.ArgumentParser):
         sys.exit(1)
 
 
+@functools.lru_cache(maxsize=1)
 def list_external_commands():
     p = subprocess.check_output(["/bin/bash", "-p", "-c", "compgen -A command paasta-"])
     lines = p.decode("utf-8").strip().split("\n")
@@ -135,13 +141,16 @@ PAASTA_SUBCOMMANDS = {
 }
 
 
-def get_argparser(commands=None):
+def get_argparser(commands=None, argspec: Optional[ArgSpec] = None):
     """Create and return argument parser for a set of subcommands.
 
     :param commands: Union[None, List[str]] If `commands` argument is `None`,
     add full parsers for all subcommands, if `commands` is empty list -
     add thin parsers for all subcommands, otherwise - add full parsers for
     subcommands in the argument.
+    :param argspec: if given, build the full parsers of the subcommands it
+    describes from it instead of importing their modules. Those parsers are
+    only good for tab completion.
     """
 
     parser = PrintsHelpOnErrorArgumentParser(
@@ -189,6 +198,18 @@ def get_argparser(commands=None):
             if command not in PAASTA_SUBCOMMANDS:
                 # could be external subcommand
                 continue
+            if argspec is not None and command in argspec:
+                command_choices.append(
+                    (
+                        command,
+                        (
+                            add_parser_from_spec,
+                            [subparsers, command, argspec[command]],
+                            {},
+                        ),
+                    )
+                )
+                continue
             command_choices.append(
                 (
                     command,
@@ -215,12 +236,44 @@ def get_argparser(commands=None):
     return parser
 
 
+def get_completing_command() -> Optional[str]:
+    """The subcommand whose arguments are being tab-completed, if the
+    subcommand's name has been typed in full."""
+    comp_line = os.environ.get("COMP_LINE", "")
+    comp_line = comp_line[: int(os.environ.get("COMP_POINT", len(comp_line)))]
+    words = comp_line.split()
+    if comp_line[-1:].isspace():
+        complete_words = words[1:]
+    else:
+        complete_words = words[1:-1]
+    for word in complete_words:
+        if not word.startswith("-"):
+            return word
+    return None
+
+
+def autocomplete_from_argspec() -> None:
+    """Tab-complete the arguments of a subcommand from the checked-in
+    description of its arguments, without importing the module implementing
+    it. Exits if it completed anything."""
+    command = get_completing_command()
+    if command is None:
+        return
+    argspec = load_argspec()
+    if argspec is None or command not in argspec:
+        return
+    argcomplete.autocomplete(get_argparser(commands=[command], argspec=argspec))
+
+
 def parse_args(argv):
     """Initialize autocompletion and configure the argument parser.
 
     :return: an argparse.Namespace object mapping parameter names to the inputs
              from sys.argv
     """
+    if "_ARGCOMPLETE" in os.environ:
+        autocomplete_from_argspec()
+
     parser = get_argparser(commands=[])
     argcomplete.autocomplete(parser)
 
@@ -14,29 +14,44 @@
 # limitations under the License.
 """PaaSTA log reader for humans"""
 import argparse
+import bisect
 import datetime
+import glob
+import heapq
+import itertools
 import json
 import logging
+import mmap
+import os
 import re
+import string
 import sys
+import threading
+from collections import deque
 from collections import namedtuple
 from contextlib import contextmanager
+from functools import partial
 from multiprocessing import Process
 from multiprocessing import Queue
 from queue import Empty
+from queue import Queue as ThreadQueue
 from time import sleep
 from typing import Any
 from typing import Callable
 from typing import ContextManager
+from typing import Deque
 from typing import Dict
 from typing import Iterable
+from typing import Iterator
 from typing import List
 from typing import Mapping
-from typing import MutableSequence
+from typing import NamedTuple
+from typing import Optional
 from typing import Sequence
 from typing import Set
 from typing import Tuple
 from typing import Type
+from urllib.parse import quote
 
 import isodate
 import pytz
@@ -57,6 +72,7 @@ from paasta_tools.cli.utils import lazy_choices_completer
 from paasta_tools.cli.utils import verify_instances
 from paasta_tools.utils import list_services
 from paasta_tools.utils import ANY_CLUSTER
+from paasta_tools.utils import atomic_file_write
 from paasta_tools.utils import datetime_convert_timezone
 from paasta_tools.utils import datetime_from_utc_to_local
 from paasta_tools.utils import DEFAULT_LOGLEVEL
@@ -265,6 +281,144 @@ def check_timestamp_in_range(
         return True
 
 
+class LogRecord(NamedTuple):
+    """A JSON log line, decoded once so that it can be filtered and sorted
+    without parsing it again."""
+
+    raw_line: str
+    fields: Dict[str, Any]
+    # None if the line has no timestamp or it isn't valid
+    timestamp: Optional[datetime.datetime]
+
+
+def parse_log_timestamp(timestamp: str) -> datetime.datetime:
+    """isodate.parse_datetime, but without its regexes and Decimals for the
+    timestamps in paasta's logs: 2016-06-08T06:31:52.706609135Z, or without
+    the fraction or Z. Anything else is left to isodate."""
+    if (
+        len(timestamp) >= 19
+        and timestamp[4] == "-"
+        and timestamp[7] == "-"
+        and timestamp[10] == "T"
+        and timestamp[13] == ":"
+        and timestamp[16] == ":"
+    ):
+        end = 19
+        microsecond = 0
+        if timestamp[19:20] == ".":
+            end = 20
+            while end < len(timestamp) and timestamp[end].isdigit():
+                end += 1
+            # truncated to microseconds, like current versions of isodate
+            microsecond = int(timestamp[20:end][:6].ljust(6, "0"))
+        zone = timestamp[end:]
+        # a "." without a fraction is left to isodate too
+        if end != 20 and zone in ("", "Z"):
+            try:
+                return datetime.datetime(
+                    int(timestamp[0:4]),
+                    int(timestamp[5:7]),
+                    int(timestamp[8:10]),
+                    int(timestamp[11:13]),
+                    int(timestamp[14:16]),
+                    int(timestamp[17:19]),
+                    microsecond,
+                    datetime.timezone.utc if zone else None,
+                )
+            except ValueError:
+                pass
+    return isodate.parse_datetime(timestamp)
+
+
+def decode_log_line(line: str) -> Optional[LogRecord]:
+    """Decodes a JSON log line, or returns None if it isn't one."""
+    try:
+        fields = json.loads(line)
+    except ValueError:
+        log.debug("Trouble parsing line as json. Skipping. Line: %r" % line)
+        return None
+    if not isinstance(fields, dict):
+        return None
+    try:
+        timestamp = parse_log_timestamp(fields["timestamp"])
+    except (KeyError, TypeError, ValueError):
+        timestamp = None
+    return LogRecord(raw_line=line, fields=fields, timestamp=timestamp)
+
+
+_MIN_SORT_KEY = pytz.utc.localize(datetime.datetime.min)
+
+
+def log_record_sort_key(record: LogRecord) -> datetime.datetime:
+    """The timestamp to sort a line by, in UTC. Lines without one sort first."""
+    if record.timestamp is None:
+        return _MIN_SORT_KEY
+    if not record.timestamp.tzinfo:
+        return pytz.utc.localize(record.timestamp)
+    return record.timestamp
+
+
+def log_line_may_pass_filter(
+    line: str, clusters: Sequence[str], instances: Optional[List[str]]
+) -> bool:
+    """A quick check, before decoding a line, that it has one of the clusters
+    and one of the instances in it somewhere. Cluster and instance names don't
+    have any characters that JSON escapes, so a line without any of them can't
+    be for any of them."""
+    if not any(cluster in line for cluster in clusters) and ANY_CLUSTER not in line:
+        return False
+    return instances is None or any(instance in line for instance in instances)
+
+
+def paasta_log_record_passes_filter(
+    record: LogRecord,
+    levels: Sequence[str],
+    service: str,
+    components: Iterable[str],
+    clusters: Sequence[str],
+    instances: List[str],
+    pods: Iterable[str] = None,
+    start_time: datetime.datetime = None,
+    end_time: datetime.datetime = None,
+) -> bool:
+    """paasta_log_line_passes_filter for a line that's already decoded."""
+    if not check_timestamp_in_range(record.timestamp, start_time, end_time):
+        return False
+    fields = record.fields
+    return (
+        fields.get("level") in levels
+        and fields.get("component") in components
+        and (fields.get("cluster") in clusters or fields.get("cluster") == ANY_CLUSTER)
+        and (instances is None or fields.get("instance") in instances)
+    )
+
+
+def paasta_app_output_record_passes_filter(
+    record: LogRecord,
+    levels: Sequence[str],
+    service: str,
+    components: Iterable[str],
+    clusters: Sequence[str],
+    instances: List[str],
+    pods: Iterable[str] = None,
+    start_time: datetime.datetime = None,
+    end_time: datetime.datetime = None,
+) -> bool:
+    """paasta_app_output_passes_filter for a line that's already decoded."""
+    # https://github.com/gweis/isodate/issues/53
+    if record.timestamp is None:
+        return True
+    if not check_timestamp_in_range(record.timestamp, start_time, end_time):
+        return False
+    fields = record.fields
+    return (
+        fields.get("component") in components
+        and (fields.get("cluster") in clusters or fields.get("cluster") == ANY_CLUSTER)
+        and (instances is None or fields.get("instance") in instances)
+        and (pods is None or fields.get("pod_name") in pods)
+    )
+
+
 def paasta_log_line_passes_filter(
     line: str,
     levels: Sequence[str],
@@ -282,22 +436,19 @@ def paasta_log_line_passes_filter(
 
     NOTE: Pods are optional as services that use Marathon do not operate with pods.
     """
-    try:
-        parsed_line = json.loads(line)
-    except ValueError:
-        log.debug("Trouble parsing line as json. Skipping. Line: %r" % line)
+    record = decode_log_line(line)
+    if record is None:
         return False
-    timestamp = isodate.parse_datetime(parsed_line.get("timestamp"))
-    if not check_timestamp_in_range(timestamp, start_time, end_time):
-        return False
-    return (
-        parsed_line.get("level") in levels
-        and parsed_line.get("component") in components
-        and (
-            parsed_line.get("cluster") in clusters
-            or parsed_line.get("cluster") == ANY_CLUSTER
-        )
-        and (instances is None or parsed_line.get("instance") in instances)
+    return paasta_log_record_passes_filter(
+        record,
+        levels,
+        service,
+        components,
+        clusters,
+        instances,
+        pods,
+        start_time=start_time,
+        end_time=end_time,
     )
 
 
@@ -312,26 +463,19 @@ def paasta_app_output_passes_filter(
     start_time: datetime.datetime = None,
     end_time: datetime.datetime = None,
 ) -> bool:
-    try:
-        parsed_line = json.loads(line)
-    except ValueError:
-        log.debug("Trouble parsing line as json. Skipping. Line: %r" % line)
+    record = decode_log_line(line)
+    if record is None:
         return False
-    try:
-        timestamp = isodate.parse_datetime(parsed_line.get("timestamp"))
-    # https://github.com/gweis/isodate/issues/53
-    except ValueError:
-        return True
-    if not check_timestamp_in_range(timestamp, start_time, end_time):
-        return False
-    return (
-        parsed_line.get("component") in components
-        and (
-            parsed_line.get("cluster") in clusters
-            or parsed_line.get("cluster") == ANY_CLUSTER
-        )
-        and (instances is None or parsed_line.get("instance") in instances)
-        and (pods is None or parsed_line.get("pod_name") in pods)
+    return paasta_app_output_record_passes_filter(
+        record,
+        levels,
+        service,
+        components,
+        clusters,
+        instances,
+        pods,
+        start_time=start_time,
+        end_time=end_time,
     )
 
 
@@ -419,6 +563,123 @@ def print_log(
         )
 
 
+# Lines from a time range or the last lines of several streams, e.g. of the
+# same stream in several scribe envs, are merged as they come in rather than
+# read into memory and sorted. This is how many lines of one stream can be read
+# ahead of the stream whose next line is the earliest.
+STREAM_BUFFER_LINES = 1000
+# How far out of order the lines of a scribe stream can be, since many hosts
+# write to it. Each stream is put back in order within this window before the
+# streams are merged.
+SCRIBE_STREAM_SORT_WINDOW = datetime.timedelta(minutes=1)
+# The same line can be in more than one of the streams. It's only printed
+# once, as long as its copies are less than this far apart in the merged
+# output, which they always are when each stream is in order.
+LOG_DEDUP_WINDOW = datetime.timedelta(minutes=1)
+
+
+class _StreamError(NamedTuple):
+    error: BaseException
+
+
+_STREAM_DONE = object()
+
+
+def _read_stream_into_queue(
+    read_stream: Callable[[], Iterable[Dict[str, Any]]], queue: ThreadQueue
+) -> None:
+    try:
+        for line in read_stream():
+            queue.put(line)
+    except BaseException as e:
+        queue.put(_StreamError(e))
+    else:
+        queue.put(_STREAM_DONE)
+
+
+def _iter_queue(queue: ThreadQueue) -> Iterator[Dict[str, Any]]:
+    while True:
+        item = queue.get()
+        if item is _STREAM_DONE:
+            return
+        if isinstance(item, _StreamError):
+            raise item.error
+        yield item
+
+
+def sort_within_window(
+    lines: Iterable[Dict[str, Any]], window: datetime.timedelta
+) -> Iterator[Dict[str, Any]]:
+    """Sorts lines by sort_key, given that none of them is more than window
+    older than a line before it, holding back only the lines of the last
+    window. Lines with the same sort_key keep their order."""
+    pending: List[Tuple[datetime.datetime, int, Dict[str, Any]]] = []
+    latest = None
+    for i, line in enumerate(lines):
+        heapq.heappush(pending, (line["sort_key"], i, line))
+        if latest is None or line["sort_key"] > latest:
+            latest = line["sort_key"]
+        # nothing still to come can sort before this
+        while pending[0][0] + window < latest:
+            yield heapq.heappop(pending)[2]
+    while pending:
+        yield heapq.heappop(pending)[2]
+
+
+def merge_log_streams(
+    read_streams: Sequence[Callable[[], Iterable[Dict[str, Any]]]],
+    buffer_lines: int = STREAM_BUFFER_LINES,
+) -> Iterator[Dict[str, Any]]:
+    """Reads every stream at once, each in its own thread, and yields the
+    lines of all of them in order of their sort_key, as soon as the next line
+    of every stream that hasn't finished is known.
+
+    :param read_streams: functions that return the lines of a stream, as
+        dicts with a "sort_key", in order of sort_key
+    :param buffer_lines: how many lines of a stream can be read before they
+        are needed
+    """
+    queues = []
+    for read_stream in read_streams:
+        queue: ThreadQueue = ThreadQueue(maxsize=buffer_lines)
+        threading.Thread(
+            target=_read_stream_into_queue, args=(read_stream, queue), daemon=True
+        ).start()
+        queues.append(queue)
+    return iter(
+        heapq.merge(
+            *(_iter_queue(queue) for queue in queues),
+            key=lambda line: line["sort_key"],
+        )
+    )
+
+
+def dedup_log_lines(
+    lines: Iterable[Dict[str, Any]],
+    window: datetime.timedelta = LOG_DEDUP_WINDOW,
+) -> Iterator[Dict[str, Any]]:
+    """Yields the lines whose raw_line hasn't been seen within window of
+    their sort_key, only remembering the lines within that window."""
+    recent: Deque[Tuple[datetime.datetime, str]] = deque()
+    seen: Set[str] = set()
+    latest = None
+    for line in lines:
+        if latest is None or line["sort_key"] > latest:
+            latest = line["sort_key"]
+            try:
+                cutoff = latest - window
+            except OverflowError:
+                # lines without a timestamp sort as datetime.min
+                cutoff = latest
+            while recent and recent[0][0] < cutoff:
+                seen.discard(recent.popleft()[1])
+        if line["raw_line"] in seen:
+            continue
+        seen.add(line["raw_line"])
+        recent.append((line["sort_key"], line["raw_line"]))
+        yield line
+
+
 def prettify_timestamp(timestamp: datetime.datetime) -> str:
     """Returns more human-friendly form of 'timestamp' without microseconds and
     in local time.
@@ -587,7 +848,10 @@ class LogReader:
 
 
 ScribeComponentStreamInfo = namedtuple(
-    "ScribeComponentStreamInfo", "per_cluster, stream_name_fn, filter_fn, parse_fn"
+    "ScribeComponentStreamInfo",
+    "per_cluster, stream_name_fn, filter_fn, parse_fn, record_filter_fn",
+    # filter_fn for a LogRecord, for streams of JSON lines
+    defaults=(None,),
 )
 
 
@@ -603,6 +867,7 @@ class ScribeLogReader(LogReader):
             stream_name_fn=get_log_name_for_service,
             filter_fn=paasta_log_line_passes_filter,
             parse_fn=None,
+            record_filter_fn=paasta_log_record_passes_filter,
         ),
         "stdout": ScribeComponentStreamInfo(
             per_cluster=False,
@@ -611,6 +876,7 @@ class ScribeLogReader(LogReader):
             ),
             filter_fn=paasta_app_output_passes_filter,
             parse_fn=None,
+            record_filter_fn=paasta_app_output_record_passes_filter,
         ),
         "stderr": ScribeComponentStreamInfo(
             per_cluster=False,
@@ -619,6 +885,7 @@ class ScribeLogReader(LogReader):
             ),
             filter_fn=paasta_app_output_passes_filter,
             parse_fn=None,
+            record_filter_fn=paasta_app_output_record_passes_filter,
         ),
         "marathon": ScribeComponentStreamInfo(
             per_cluster=True,
@@ -838,7 +1105,7 @@ class ScribeLogReader(LogReader):
         raw_mode: bool,
         strip_headers: bool,
     ) -> None:
-        aggregated_logs: List[Dict[str, Any]] = []
+        read_streams: List[Callable[[], Iterable[Dict[str, Any]]]] = []
 
         if "marathon" in components:
             print(
@@ -860,36 +1127,37 @@ class ScribeLogReader(LogReader):
             else:
                 stream_name = stream_info.stream_name_fn(service)
 
-            ctx = self.scribe_get_from_time(
-                scribe_env, stream_name, start_time, end_time
-            )
-            self.filter_and_aggregate_scribe_logs(
-                scribe_reader_ctx=ctx,
-                scribe_env=scribe_env,
-                stream_name=stream_name,
-                levels=levels,
-                service=service,
-                components=components,
-                clusters=clusters,
-                instances=instances,
-                aggregated_logs=aggregated_logs,
-                pods=pods,
-                filter_fn=stream_info.filter_fn,
-                parser_fn=stream_info.parse_fn,
-                start_time=start_time,
-                end_time=end_time,
-            )
+            def read_stream() -> Iterable[Dict[str, Any]]:
+                ctx = self.scribe_get_from_time(
+                    scribe_env, stream_name, start_time, end_time
+                )
+                return sort_within_window(
+                    self.filter_scribe_logs(
+                        scribe_reader_ctx=ctx,
+                        scribe_env=scribe_env,
+                        stream_name=stream_name,
+                        levels=levels,
+                        service=service,
+                        components=components,
+                        clusters=clusters,
+                        instances=instances,
+                        pods=pods,
+                        filter_fn=stream_info.filter_fn,
+                        parser_fn=stream_info.parse_fn,
+                        record_filter_fn=stream_info.record_filter_fn,
+                        start_time=start_time,
+                        end_time=end_time,
+                    ),
+                    SCRIBE_STREAM_SORT_WINDOW,
+                )
+
+            read_streams.append(read_stream)
 
         self.run_code_over_scribe_envs(
             clusters=clusters, components=components, callback=callback
         )
 
-        aggregated_logs = list(
-            {line["raw_line"]: line for line in aggregated_logs}.values()
-        )
-        aggregated_logs.sort(key=lambda log_line: log_line["sort_key"])
-
-        for line in aggregated_logs:
+        for line in dedup_log_lines(merge_log_streams(read_streams)):
             print_log(line["raw_line"], levels, raw_mode, strip_headers)
 
     def print_last_n_logs(
@@ -904,7 +1172,7 @@ class ScribeLogReader(LogReader):
         raw_mode: bool,
         strip_headers: bool,
     ) -> None:
-        aggregated_logs: List[Dict[str, Any]] = []
+        read_streams: List[Callable[[], Iterable[Dict[str, Any]]]] = []
 
         def callback(
             components: Iterable[str],
@@ -918,34 +1186,36 @@ class ScribeLogReader(LogReader):
             else:
                 stream_name = stream_info.stream_name_fn(service)
 
-            ctx = self.scribe_get_last_n_lines(scribe_env, stream_name, line_count)
-            self.filter_and_aggregate_scribe_logs(
-                scribe_reader_ctx=ctx,
-                scribe_env=scribe_env,
-                stream_name=stream_name,
-                levels=levels,
-                service=service,
-                components=components,
-                clusters=clusters,
-                instances=instances,
-                aggregated_logs=aggregated_logs,
-                pods=pods,
-                filter_fn=stream_info.filter_fn,
-                parser_fn=stream_info.parse_fn,
-            )
+            def read_stream() -> Iterable[Dict[str, Any]]:
+                ctx = self.scribe_get_last_n_lines(scribe_env, stream_name, line_count)
+                return sort_within_window(
+                    self.filter_scribe_logs(
+                        scribe_reader_ctx=ctx,
+                        scribe_env=scribe_env,
+                        stream_name=stream_name,
+                        levels=levels,
+                        service=service,
+                        components=components,
+                        clusters=clusters,
+                        instances=instances,
+                        pods=pods,
+                        filter_fn=stream_info.filter_fn,
+                        parser_fn=stream_info.parse_fn,
+                        record_filter_fn=stream_info.record_filter_fn,
+                    ),
+                    SCRIBE_STREAM_SORT_WINDOW,
+                )
+
+            read_streams.append(read_stream)
 
         self.run_code_over_scribe_envs(
             clusters=clusters, components=components, callback=callback
         )
-        aggregated_logs = list(
-            {line["raw_line"]: line for line in aggregated_logs}.values()
-        )
-        aggregated_logs.sort(key=lambda log_line: log_line["sort_key"])
 
-        for line in aggregated_logs:
+        for line in dedup_log_lines(merge_log_streams(read_streams)):
             print_log(line["raw_line"], levels, raw_mode, strip_headers)
 
-    def filter_and_aggregate_scribe_logs(
+    def filter_scribe_logs(
         self,
         scribe_reader_ctx: ContextManager,
         scribe_env: str,
@@ -955,13 +1225,19 @@ class ScribeLogReader(LogReader):
         components: Iterable[str],
         clusters: Sequence[str],
         instances: List[str],
-        aggregated_logs: MutableSequence[Dict[str, Any]],
         pods: Iterable[str] = None,
         parser_fn: Callable = None,
         filter_fn: Callable = None,
         start_time: datetime.datetime = None,
         end_time: datetime.datetime = None,
-    ) -> None:
+        record_filter_fn: Callable = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Yields the lines of a stream that pass filter_fn, as they're read,
+        as dicts of the line and its timestamp to sort it by.
+
+        With a record_filter_fn, each line is only decoded once, for both
+        filtering and sorting, and not at all if it can't be for any of the
+        clusters and instances."""
         with scribe_reader_ctx as scribe_reader:
             try:
                 for line in scribe_reader:
@@ -970,7 +1246,27 @@ class ScribeLogReader(LogReader):
                         line = line.decode("utf-8")
                     if parser_fn:
                         line = parser_fn(line, clusters, service)
-                    if filter_fn:
+                    if record_filter_fn:
+                        if not log_line_may_pass_filter(line, clusters, instances):
+                            continue
+                        record = decode_log_line(line)
+                        if record is None or not record_filter_fn(
+                            record,
+                            levels,
+                            service,
+                            components,
+                            clusters,
+                            instances,
+                            pods,
+                            start_time=start_time,
+                            end_time=end_time,
+                        ):
+                            continue
+                        yield {
+                            "raw_line": line,
+                            "sort_key": log_record_sort_key(record),
+                        }
+                    elif filter_fn:
                         if filter_fn(
                             line,
                             levels,
@@ -992,8 +1288,7 @@ class ScribeLogReader(LogReader):
                             except ValueError:
                                 timestamp = pytz.utc.localize(datetime.datetime.min)
 
-                            line = {"raw_line": line, "sort_key": timestamp}
-                            aggregated_logs.append(line)
+                            yield {"raw_line": line, "sort_key": timestamp}
             except StreamTailerSetupError as e:
                 if "No data in stream" in str(e):
                     log.warning(f"Scribe stream {stream_name} is empty on {scribe_env}")
@@ -1165,6 +1460,465 @@ class ScribeLogReader(LogReader):
             return env
 
 
+# How far out of order the lines of a log file can be, e.g. when several
+# paasta commands log to it at once. Reading a time range out of a file reads
+# this far past the end of the range, and lines are put back in order within
+# this window before the files are merged.
+LOG_FILE_INDEX_SLACK = datetime.timedelta(minutes=1)
+
+_LOG_LINE_TIMESTAMP = b'"timestamp": "'
+_INDEX_MINUTE_FORMAT = "%Y-%m-%dT%H:%M"
+
+
+def _index_minute(timestamp: datetime.datetime) -> str:
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone(pytz.utc)
+    return timestamp.strftime(_INDEX_MINUTE_FORMAT)
+
+
+class LogFileIndex:
+    """A sparse index of a log file written by FileLogWriter: the minute and
+    byte offset of each line from a later minute than every line before it.
+
+    The lines between two entries are never from later than the minute of the
+    first one, so the lines from a given minute onwards all start at the first
+    entry from that minute or later, whatever order the lines are in.
+    """
+
+    def __init__(
+        self,
+        inode: int = 0,
+        size: int = 0,
+        minutes: List[str] = None,
+        offsets: List[int] = None,
+    ) -> None:
+        self.inode = inode
+        # how much of the file is indexed, up to the end of its last whole line
+        self.size = size
+        self.minutes = minutes or []
+        self.offsets = offsets or []
+
+    @classmethod
+    def load(cls, index_path: str) -> "LogFileIndex":
+        try:
+            with open(index_path) as f:
+                return cls(**json.load(f))
+        except (OSError, ValueError, TypeError):
+            return cls()
+
+    def save(self, index_path: str) -> None:
+        # the index is only there to make reading faster, so it's fine if it
+        # can't be saved, e.g. if the log files aren't ours to write next to
+        try:
+            with atomic_file_write(index_path) as f:
+                json.dump(
+                    {
+                        "inode": self.inode,
+                        "size": self.size,
+                        "minutes": self.minutes,
+                        "offsets": self.offsets,
+                    },
+                    f,
+                )
+        except OSError as e:
+            log.debug(f"Couldn't save log file index {index_path}: {e}")
+
+    def update(self, log_file: mmap.mmap, inode: int, delimiter: bytes) -> bool:
+        """Indexes the lines added to the file since the last update, or all of
+        them if it's been replaced or truncated since.
+
+        :returns: whether the index changed
+        """
+        changed = False
+        if inode != self.inode or len(log_file) < self.size:
+            self.inode, self.size, self.minutes, self.offsets = inode, 0, [], []
+            changed = True
+        pos = self.size
+        while True:
+            end = log_file.find(delimiter, pos)
+            if end == -1:
+                break
+            timestamp = log_file.find(_LOG_LINE_TIMESTAMP, pos, end)
+            if timestamp != -1:
+                timestamp += len(_LOG_LINE_TIMESTAMP)
+                minute = log_file[timestamp : timestamp + 16]
+                if minute[4:5] == b"-" and minute[10:11] == b"T":
+                    minute_str = minute.decode("ascii", errors="replace")
+                    if not self.minutes or minute_str > self.minutes[-1]:
+                        self.minutes.append(minute_str)
+                        self.offsets.append(pos)
+            pos = end + len(delimiter)
+        if pos != self.size:
+            self.size = pos
+            changed = True
+        return changed
+
+    def offset_range(
+        self,
+        start_time: Optional[datetime.datetime],
+        end_time: Optional[datetime.datetime],
+    ) -> Tuple[int, int]:
+        """The offsets of the file between which its lines from start_time to
+        end_time are."""
+        begin, stop = 0, self.size
+        if start_time is not None:
+            i = bisect.bisect_left(self.minutes, _index_minute(start_time))
+            begin = self.offsets[i] if i < len(self.offsets) else self.size
+        if end_time is not None:
+            i = bisect.bisect_right(
+                self.minutes, _index_minute(end_time + LOG_FILE_INDEX_SLACK)
+            )
+            stop = self.offsets[i] if i < len(self.offsets) else self.size
+        return begin, max(begin, stop)
+
+    def segments(self) -> List[Tuple[int, int]]:
+        """The offsets of the file between which each indexed minute is."""
+        starts = [0] + [offset for offset in self.offsets if offset > 0]
+        return list(zip(starts, starts[1:] + [self.size]))
+
+
+def _as_list(values: Optional[Iterable[str]]) -> Optional[List[str]]:
+    # paasta_logs passes a single cluster, and sometimes instance, as a str
+    if values is None:
+        return None
+    if isinstance(values, str):
+        return [values]
+    return list(values)
+
+
+@register_log_reader("file")
+class FileLogReader(LogReader):
+    """Reads the log files written by FileLogWriter with the same path_format.
+
+    Files are read with mmap, and a LogFileIndex of each file is kept in a
+    hidden file next to it (or in index_dir), so that reading a time range or
+    the last lines of a file doesn't mean reading all of it.
+    """
+
+    SUPPORTS_TAILING = True
+    SUPPORTS_LINE_COUNT = True
+    SUPPORTS_TIME = True
+
+    def __init__(
+        self,
+        path_format: str,
+        line_delimiter: str = "\n",
+        index_dir: Optional[str] = None,
+        tail_interval_seconds: float = 1,
+    ) -> None:
+        super().__init__()
+        self.path_format = path_format
+        self.line_delimiter = line_delimiter.encode("UTF-8")
+        self.index_dir = index_dir
+        self.tail_interval_seconds = tail_interval_seconds
+
+    def log_paths(
+        self,
+        service: str,
+        levels: Sequence[str],
+        components: Iterable[str],
+        clusters: Sequence[str],
+        instances: Optional[List[str]],
+    ) -> List[str]:
+        """The existing files that path_format gives for any of the levels,
+        components, clusters and instances. Fields of path_format that aren't
+        known, like the instance when any instance will do, match any file."""
+        values: Dict[str, Optional[List[str]]] = {
+            "service": [service],
+            "level": list(levels),
+            "component": list(components),
+            "cluster": list(clusters) + [ANY_CLUSTER],
+            "instance": instances,
+        }
+        fields = sorted(
+            {field for _, field, _, _ in string.Formatter().parse(self.path_format)}
+            - {None, ""}
+        )
+        choices = []
+        for field in fields:
+            field_values = values.get(field)
+            if field_values is None:
+                choices.append(["*"])
+            else:
+                choices.append([glob.escape(value) for value in field_values])
+        paths: Set[str] = set()
+        for combination in itertools.product(*choices):
+            paths.update(
+                glob.glob(self.path_format.format(**dict(zip(fields, combination))))
+            )
+        return sorted(paths)
+
+    def index_path(self, path: str) -> str:
+        if self.index_dir is None:
+            directory, name = os.path.split(path)
+        else:
+            directory, name = self.index_dir, quote(os.path.abspath(path), safe="")
+        # hidden, so that path_format never matches it
+        return os.path.join(directory, f".{name}.index")
+
+    @contextmanager
+    def open_indexed(
+        self, path: str
+    ) -> Iterator[Tuple[Optional[mmap.mmap], LogFileIndex]]:
+        """Maps a log file into memory, and brings its index up to date. The
+        map is None if the file is empty, since an empty file can't be mapped."""
+        index_path = self.index_path(path)
+        index = LogFileIndex.load(index_path)
+        with open(path, "rb") as f:
+            stat = os.fstat(f.fileno())
+            if stat.st_size == 0:
+                yield None, index
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as log_file:
+                if index.update(log_file, stat.st_ino, self.line_delimiter):
+                    index.save(index_path)
+                yield log_file, index
+
+    def read_lines(self, log_file: mmap.mmap, begin: int, stop: int) -> Iterator[str]:
+        pos = begin
+        while pos < stop:
+            end = log_file.find(self.line_delimiter, pos, stop)
+            if end == -1:
+                end = stop
+            yield log_file[pos:end].decode("UTF-8", errors="replace")
+            pos = end + len(self.line_delimiter)
+
+    def filter_lines(
+        self,
+        lines: Iterable[str],
+        levels: Sequence[str],
+        service: str,
+        components: Iterable[str],
+        clusters: Sequence[str],
+        instances: Optional[List[str]],
+        start_time: datetime.datetime = None,
+        end_time: datetime.datetime = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Same as ScribeLogReader.filter_scribe_logs, for lines of a file."""
+        for line in lines:
+            if not log_line_may_pass_filter(line, clusters, instances):
+                continue
+            record = decode_log_line(line)
+            if record is None or not paasta_log_record_passes_filter(
+                record,
+                levels,
+                service,
+                components,
+                clusters,
+                instances,
+                start_time=start_time,
+                end_time=end_time,
+            ):
+                continue
+            # the same as lines from scribereader, which end with a newline
+            yield {"raw_line": line + "\n", "sort_key": log_record_sort_key(record)}
+
+    def read_file_by_time(
+        self,
+        path: str,
+        start_time: datetime.datetime,
+        end_time: datetime.datetime,
+        levels: Sequence[str],
+        service: str,
+        components: Iterable[str],
+        clusters: Sequence[str],
+        instances: Optional[List[str]],
+    ) -> Iterator[Dict[str, Any]]:
+        try:
+            with self.open_indexed(path) as (log_file, index):
+                if log_file is None:
+                    return
+                begin, stop = index.offset_range(start_time, end_time)
+                # merge_log_streams needs each file's lines in order
+                yield from sort_within_window(
+                    self.filter_lines(
+                        self.read_lines(log_file, begin, stop),
+                        levels,
+                        service,
+                        components,
+                        clusters,
+                        instances,
+                        start_time=start_time,
+                        end_time=end_time,
+                    ),
+                    LOG_FILE_INDEX_SLACK,
+                )
+        except FileNotFoundError:
+            # removed since we looked for it
+            return
+
+    def read_file_last_n(
+        self,
+        path: str,
+        line_count: int,
+        levels: Sequence[str],
+        service: str,
+        components: Iterable[str],
+        clusters: Sequence[str],
+        instances: Optional[List[str]],
+    ) -> List[Dict[str, Any]]:
+        """The last line_count lines of a file that pass the filter, reading
+        it back a minute at a time until there are enough of them."""
+        lines: List[Dict[str, Any]] = []
+        try:
+            with self.open_indexed(path) as (log_file, index):
+                if log_file is None:
+                    return []
+                for begin, stop in reversed(index.segments()):
+                    if len(lines) >= line_count:
+                        break
+                    lines[:0] = self.filter_lines(
+                        self.read_lines(log_file, begin, stop),
+                        levels,
+                        service,
+                        components,
+                        clusters,
+                        instances,
+                    )
+        except FileNotFoundError:
+            return []
+        lines.sort(key=lambda line: line["sort_key"])
+        return lines[max(len(lines) - line_count, 0) :]
+
+    def read_new_lines(
+        self, path: str, position: Optional[Tuple[int, int]]
+    ) -> Tuple[List[str], Tuple[int, int]]:
+        """The whole lines added to a file since position, and the position
+        after them, as (inode, offset). Without a position, there aren't any,
+        and the position is the end of the file."""
+        with open(path, "rb") as f:
+            stat = os.fstat(f.fileno())
+            if position is None:
+                offset = None
+            else:
+                inode, offset = position
+                if inode != stat.st_ino or stat.st_size < offset:
+                    # replaced or truncated, e.g. by logrotate
+                    offset = 0
+            if stat.st_size == 0 or stat.st_size == offset:
+                return [], (stat.st_ino, stat.st_size)
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as log_file:
+                last_line_end = log_file.rfind(self.line_delimiter)
+                stop = (
+                    0
+                    if last_line_end == -1
+                    else last_line_end + len(self.line_delimiter)
+                )
+                if offset is None or offset >= stop:
+                    return [], (stat.st_ino, max(stop, offset or 0))
+                return (
+                    list(self.read_lines(log_file, offset, stop)),
+                    (stat.st_ino, stop),
+                )
+
+    def tail_logs(
+        self,
+        service: str,
+        levels: Sequence[str],
+        components: Iterable[str],
+        clusters: Sequence[str],
+        instances: List[str],
+        pods: Iterable[str] = None,
+        raw_mode: bool = False,
+        strip_headers: bool = False,
+    ) -> None:
+        """Prints the lines added to the files from now on, looking for new
+        lines and files every tail_interval_seconds, until interrupted."""
+        clusters, instances = _as_list(clusters), _as_list(instances)
+        positions: Dict[str, Tuple[int, int]] = {}
+        started = False
+        try:
+            while True:
+                new_lines: List[Dict[str, Any]] = []
+                for path in self.log_paths(
+                    service, levels, components, clusters, instances
+                ):
+                    if path not in positions and started:
+                        # created since we started, so all of it is new. No
+                        # file has inode 0, so it's read from the start
+                        positions[path] = (0, 0)
+                    try:
+                        lines, positions[path] = self.read_new_lines(
+                            path, positions.get(path)
+                        )
+                    except FileNotFoundError:
+                        positions.pop(path, None)
+                        continue
+                    new_lines.extend(
+                        self.filter_lines(
+                            lines, levels, service, components, clusters, instances
+                        )
+                    )
+                started = True
+                for line in sorted(new_lines, key=lambda line: line["sort_key"]):
+                    print_log(line["raw_line"], levels, raw_mode, strip_headers)
+                sleep(self.tail_interval_seconds)
+        except KeyboardInterrupt:
+            pass
+
+    def print_logs_by_time(
+        self,
+        service: str,
+        start_time: datetime.datetime,
+        end_time: datetime.datetime,
+        levels: Sequence[str],
+        components: Iterable[str],
+        clusters: Sequence[str],
+        instances: List[str],
+        pods: Iterable[str],
+        raw_mode: bool,
+        strip_headers: bool,
+    ) -> None:
+        clusters, instances = _as_list(clusters), _as_list(instances)
+        read_streams = [
+            partial(
+                self.read_file_by_time,
+                path,
+                start_time,
+                end_time,
+                levels,
+                service,
+                components,
+                clusters,
+                instances,
+            )
+            for path in self.log_paths(service, levels, components, clusters, instances)
+        ]
+        for line in merge_log_streams(read_streams):
+            print_log(line["raw_line"], levels, raw_mode, strip_headers)
+
+    def print_last_n_logs(
+        self,
+        service: str,
+        line_count: int,
+        levels: Sequence[str],
+        components: Iterable[str],
+        clusters: Sequence[str],
+        instances: List[str],
+        pods: Iterable[str],
+        raw_mode: bool,
+        strip_headers: bool,
+    ) -> None:
+        if line_count <= 0:
+            return
+        clusters, instances = _as_list(clusters), _as_list(instances)
+        read_streams = [
+            partial(
+                self.read_file_last_n,
+                path,
+                line_count,
+                levels,
+                service,
+                components,
+                clusters,
+                instances,
+            )
+            for path in self.log_paths(service, levels, components, clusters, instances)
+        ]
+        for line in deque(merge_log_streams(read_streams), maxlen=line_count):
+            print_log(line["raw_line"], levels, raw_mode, strip_headers)
+
+
 def scribe_env_to_locations(scribe_env):
     """Converts a scribe environment to a dictionary of locations. The
     return value is meant to be used as kwargs for `scribereader.get_tail_host_and_port`.
@@ -73,8 +73,12 @@ from paasta_tools.long_running_service_tools import LongRunningServiceConfig
 from paasta_tools.marathon_tools import MarathonServiceConfig
 from paasta_tools.metrics import metrics_lib
 from paasta_tools.paasta_service_config_loader import PaastaServiceConfigLoader
+from paasta_tools.paastaapi.models import BounceStatusResult
+from paasta_tools.paastaapi.models import BulkBounceStatusRequest
+from paasta_tools.paastaapi.models import InstanceBounceStatus
 from paasta_tools.paastaapi.models import InstanceStatusKubernetesV2
 from paasta_tools.paastaapi.models import KubernetesPodV2
+from paasta_tools.paastaapi.models import ServiceInstanceName
 from paasta_tools.slack import get_slack_client
 from paasta_tools.utils import _log
 from paasta_tools.utils import _log_audit
@@ -1413,6 +1417,7 @@ async def wait_until_instance_is_done(
     time_before_first_diagnosis: float,
     should_ping_for_unhealthy_pods: bool,
     notify_fn: Optional[Callable[[str], None]] = None,
+    bounce_status_poller: Optional["BounceStatusPoller"] = None,
 ) -> Tuple[str, str]:
     loop = asyncio.get_running_loop()
     diagnosis_task = asyncio.create_task(
@@ -1430,18 +1435,24 @@ async def wait_until_instance_is_done(
         )
     )
     try:
-        while not await loop.run_in_executor(
-            executor,
-            functools.partial(
-                check_if_instance_is_done,
-                service,
-                instance,
-                cluster,
-                version,
-                instance_config,
-            ),
-        ):
-            await asyncio.sleep(polling_interval)
+        if bounce_status_poller is not None:
+            while not await bounce_status_poller.is_instance_done(
+                instance, version, instance_config
+            ):
+                pass
+        else:
+            while not await loop.run_in_executor(
+                executor,
+                functools.partial(
+                    check_if_instance_is_done,
+                    service,
+                    instance,
+                    cluster,
+                    version,
+                    instance_config,
+                ),
+            ):
+                await asyncio.sleep(polling_interval)
         return (
             cluster,
             instance,
@@ -1630,36 +1641,57 @@ def check_if_instance_is_done(
             )
             return False
 
-    inst_str = f"{service}.{instance} in {cluster}"
-    log.debug(f"Inspecting the deployment status of {inst_str}")
+    log.debug(f"Inspecting the deployment status of {service}.{instance} in {cluster}")
 
-    status = None
     try:
         status = api.service.bounce_status_instance(service=service, instance=instance)
     except api.api_error as e:
-        if e.status == 404:  # non-existent instance
-            # TODO(PAASTA-17290): just print the error message so that we
-            # can distinguish between sources of 404s
-            log.warning(
-                "Can't get status for instance {}, service {} in "
-                "cluster {}. This is normally because it is a new "
-                "service that hasn't been deployed by PaaSTA yet.".format(
-                    instance, service, cluster
-                )
-            )
-        elif e.status == 599:  # Temporary issue
-            log.warning(
-                f"Temporary issue fetching service status from PaaSTA API for {cluster}. Will retry on next poll interval."
-            )
-        else:  # 500 - error talking to api
-            log.warning(
-                "Error getting service status from PaaSTA API for "
-                f"{cluster}: {e.status} {e.reason}"
+        log_bounce_status_error(service, instance, cluster, e.status, e.reason)
+        return False
+
+    return is_instance_done(
+        service, instance, cluster, version, instance_config, status
+    )
+
+
+def log_bounce_status_error(
+    service: str, instance: str, cluster: str, status_code: int, reason: str
+) -> None:
+    if status_code == 404:  # non-existent instance
+        # TODO(PAASTA-17290): just print the error message so that we
+        # can distinguish between sources of 404s
+        log.warning(
+            "Can't get status for instance {}, service {} in "
+            "cluster {}. This is normally because it is a new "
+            "service that hasn't been deployed by PaaSTA yet.".format(
+                instance, service, cluster
             )
+        )
+    elif status_code == 599:  # Temporary issue
+        log.warning(
+            f"Temporary issue fetching service status from PaaSTA API for {cluster}. Will retry on next poll interval."
+        )
+    else:  # 500 - error talking to api
+        log.warning(
+            "Error getting service status from PaaSTA API for "
+            f"{cluster}: {status_code} {reason}"
+        )
+
+    log.debug(f"No status for {service}.{instance} in {cluster}. Not deployed yet.")
 
-        log.debug(f"No status for {inst_str}. Not deployed yet.")
-        return False
 
+def is_instance_done(
+    service: str,
+    instance: str,
+    cluster: str,
+    version: DeploymentVersion,
+    instance_config: LongRunningServiceConfig,
+    status: Optional[InstanceBounceStatus],
+) -> bool:
+    """Whether an instance has finished bouncing to version, given its bounce
+    status (None if the API has no bounce status for it, i.e. it isn't a
+    bounceable instance)."""
+    inst_str = f"{service}.{instance} in {cluster}"
     if not status:  # 204 - instance is not bounceable
         log.debug(
             f"{inst_str} is not a supported bounceable instance. "
@@ -1729,6 +1761,204 @@ def check_if_instance_is_done(
     return True
 
 
+class BulkBounceStatusUnsupported(Exception):
+    pass
+
+
+def get_bulk_bounce_status(
+    service: str,
+    cluster: str,
+    instances: Collection[str],
+    api: Optional[client.PaastaOApiClient] = None,
+) -> Optional[Dict[str, BounceStatusResult]]:
+    """The bounce status of many instances of a service in a cluster, fetched
+    with a single request. Returns None if the API couldn't be reached, and
+    raises BulkBounceStatusUnsupported if its PaaSTA API is too old to have a
+    bulk bounce status endpoint."""
+    if api is None:
+        api = client.get_paasta_oapi_client(cluster=cluster)
+        if not api:
+            log.warning(
+                "Couldn't reach the PaaSTA api for {}! Assuming it is not "
+                "deployed there yet.".format(cluster)
+            )
+            return None
+
+    log.debug(
+        f"Inspecting the deployment status of {len(instances)} instances of "
+        f"{service} in {cluster}"
+    )
+    try:
+        bulk_status = api.service.bulk_bounce_status(
+            BulkBounceStatusRequest(
+                instances=[
+                    ServiceInstanceName(service=service, instance=instance)
+                    for instance in instances
+                ]
+            )
+        )
+    except api.api_error as e:
+        if e.status in (404, 405):
+            raise BulkBounceStatusUnsupported()
+        log.warning(
+            "Error getting service status from PaaSTA API for "
+            f"{cluster}: {e.status} {e.reason}"
+        )
+        return None
+    return {result.instance: result for result in bulk_status.statuses}
+
+
+# An instance whose bounce status can't be fetched (e.g. because it hasn't been
+# deployed to the cluster yet) is skipped for 1, 3, 7... polling rounds after
+# each consecutive failure, up to this many.
+BOUNCE_STATUS_MAX_SKIPPED_ROUNDS = 7
+
+
+class BounceStatusPoller:
+    """Polls the bounce status of all the instances of a service being waited
+    on in a cluster with a single bulk_bounce_status request per polling
+    interval, instead of one bounce_status_instance request per instance.
+
+    Instances that are done stop being asked about, and instances whose
+    status can't be fetched back off exponentially. If the cluster's PaaSTA
+    API doesn't have the bulk endpoint, instances fall back to polling
+    check_if_instance_is_done on their own."""
+
+    def __init__(
+        self,
+        executor: concurrent.futures.Executor,
+        service: str,
+        cluster: str,
+        polling_interval: float,
+    ) -> None:
+        self.executor = executor
+        self.service = service
+        self.cluster = cluster
+        self.polling_interval = polling_interval
+        self.bulk_supported = True
+        self._waiters: Dict[str, "asyncio.Future[Optional[BounceStatusResult]]"] = {}
+        self._has_waiters = asyncio.Event()
+        self._skipped_rounds: Dict[str, int] = {}
+        self._failures: Dict[str, int] = {}
+        self._poll_task: Optional["asyncio.Task[None]"] = None
+
+    def stop(self) -> None:
+        if self._poll_task is not None:
+            self._poll_task.cancel()
+
+    async def _next_status(self, instance: str) -> Optional[BounceStatusResult]:
+        """The bounce status of an instance from the next polling round, or
+        None if it couldn't be fetched."""
+        loop = asyncio.get_running_loop()
+        if self._poll_task is None:
+            self._poll_task = loop.create_task(self._poll_forever())
+        future = self._waiters[instance] = loop.create_future()
+        self._has_waiters.set()
+        return await future
+
+    async def _poll_forever(self) -> None:
+        loop = asyncio.get_running_loop()
+        while self.bulk_supported:
+            await self._has_waiters.wait()
+            due = {}
+            for instance in list(self._waiters):
+                if self._skipped_rounds.get(instance, 0) > 0:
+                    self._skipped_rounds[instance] -= 1
+                else:
+                    due[instance] = self._waiters.pop(instance)
+            if not self._waiters:
+                self._has_waiters.clear()
+
+            if due:
+                try:
+                    statuses = await loop.run_in_executor(
+                        self.executor,
+                        functools.partial(
+                            get_bulk_bounce_status,
+                            self.service,
+                            self.cluster,
+                            sorted(due),
+                        ),
+                    )
+                except BulkBounceStatusUnsupported:
+                    self.bulk_supported = False
+                    statuses = None
+                except Exception:
+                    print(
+                        f"Couldn't get bounce status of {self.service} in {self.cluster}:"
+                    )
+                    traceback.print_exc()
+                    statuses = None
+
+                for instance, future in due.items():
+                    status = statuses.get(instance) if statuses else None
+                    if status is None or status.status_code not in (200, 204):
+                        failures = self._failures.get(instance, 0) + 1
+                        self._skipped_rounds[instance] = min(
+                            2**failures - 1, BOUNCE_STATUS_MAX_SKIPPED_ROUNDS
+                        )
+                    else:
+                        failures = 0
+                    self._failures[instance] = failures
+                    if not future.done():
+                        future.set_result(status)
+
+            await asyncio.sleep(self.polling_interval)
+
+        # the cluster's API is too old to have the bulk endpoint
+        for future in self._waiters.values():
+            if not future.done():
+                future.set_result(None)
+        self._waiters.clear()
+
+    async def is_instance_done(
+        self,
+        instance: str,
+        version: DeploymentVersion,
+        instance_config: LongRunningServiceConfig,
+    ) -> bool:
+        """Waits for the next polling round, and returns whether it found
+        instance to be done bouncing to version."""
+        if self.bulk_supported:
+            status = await self._next_status(instance)
+            if self.bulk_supported:
+                if status is None:
+                    return False
+                if status.status_code not in (200, 204):
+                    log_bounce_status_error(
+                        self.service,
+                        instance,
+                        self.cluster,
+                        status.status_code,
+                        status.get("error_message", ""),
+                    )
+                    return False
+                return is_instance_done(
+                    self.service,
+                    instance,
+                    self.cluster,
+                    version,
+                    instance_config,
+                    status.get("status"),
+                )
+
+        loop = asyncio.get_running_loop()
+        if await loop.run_in_executor(
+            self.executor,
+            functools.partial(
+                check_if_instance_is_done,
+                self.service,
+                instance,
+                self.cluster,
+                version,
+                instance_config,
+            ),
+        ):
+            return True
+        await asyncio.sleep(self.polling_interval)
+        return False
+
+
 WAIT_FOR_INSTANCE_CLASSES = [
     MarathonServiceConfig,
     KubernetesDeploymentConfig,
@@ -1837,6 +2067,12 @@ async def wait_for_deployment(
     with progressbar.ProgressBar(maxval=total_instances) as bar:
         instance_done_futures = []
         with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            bounce_status_pollers = {
+                cluster: BounceStatusPoller(
+                    executor, service, cluster, polling_interval=polling_interval
+                )
+                for cluster in instance_configs_per_cluster
+            }
             for cluster, instance_configs in instance_configs_per_cluster.items():
                 for instance_config in instance_configs:
                     instance_done_futures.append(
@@ -1855,6 +2091,7 @@ async def wait_for_deployment(
                                     system_paasta_config.get_mark_for_deployment_should_ping_for_unhealthy_pods()
                                 ),
                                 notify_fn=notify_fn,
+                                bounce_status_poller=bounce_status_pollers[cluster],
                             ),
                         )
                     )
@@ -1917,6 +2154,8 @@ async def wait_for_deployment(
                 return 0
             finally:
                 periodically_update_progressbar_task.cancel()
+                for bounce_status_poller in bounce_status_pollers.values():
+                    bounce_status_poller.stop()
 
 
 def compose_timeout_message(
@@ -15,6 +15,8 @@
 import asyncio
 import concurrent.futures
 import difflib
+import json
+import logging
 import shutil
 import sys
 from collections import Counter
@@ -35,12 +37,14 @@ from typing import List
 from typing import Mapping
 from typing import Optional
 from typing import Sequence
+from typing import Set
 from typing import Tuple
 from typing import Type
 from typing import Union
 
 import a_sync
 import humanize
+import urllib3
 from mypy_extensions import Arg
 from service_configuration_lib import read_deploy
 
@@ -75,6 +79,8 @@ from paasta_tools.monitoring_tools import list_teams
 from paasta_tools.paasta_service_config_loader import PaastaServiceConfigLoader
 from paasta_tools.paastaapi.model.flink_job_details import FlinkJobDetails
 from paasta_tools.paastaapi.model.flink_jobs import FlinkJobs
+from paasta_tools.paastaapi.model.instance_status import InstanceStatus
+from paasta_tools.paastaapi.model_utils import validate_and_convert_types
 from paasta_tools.paastaapi.models import InstanceStatusKubernetesV2
 from paasta_tools.paastaapi.models import KubernetesContainerV2
 from paasta_tools.paastaapi.models import KubernetesPodV2
@@ -95,6 +101,8 @@ from paasta_tools.utils import PaastaColors
 from paasta_tools.utils import remove_ansi_escape_sequences
 from paasta_tools.utils import SystemPaastaConfig
 
+log = logging.getLogger(__name__)
+
 FLINK_STATUS_MAX_THREAD_POOL_WORKERS = 50
 ALLOWED_INSTANCE_CONFIG: Sequence[Type[InstanceConfig]] = [
     FlinkDeploymentConfig,
@@ -305,6 +313,128 @@ def paasta_status_on_api_endpoint(
         output.append(str(e))
         return 1
 
+    return print_paasta_status_from_api(
+        cluster=cluster,
+        service=service,
+        instance=instance,
+        status=status,
+        output=output,
+        lock=lock,
+        verbose=verbose,
+    )
+
+
+def paasta_status_for_service_on_api_endpoint(
+    cluster: str,
+    service: str,
+    instances: Sequence[str],
+    system_paasta_config: SystemPaastaConfig,
+    lock: Lock,
+    verbose: int,
+    new: bool = False,
+) -> Optional[List[int]]:
+    """Like paasta_status_on_api_endpoint, but for several instances of a
+    service at once, using a single call to the API's service status endpoint
+    and printing each instance's status as soon as the API streams it back.
+
+    Returns None (having printed nothing) if the API doesn't have that
+    endpoint, so that the caller can ask for each instance separately instead.
+    """
+    client = get_paasta_oapi_client(cluster, system_paasta_config)
+    if not client:
+        print("Cannot get a paasta-api client")
+        exit(1)
+    try:
+        response = client.service.status_service(
+            service=service,
+            verbose=verbose,
+            new=new,
+            include_smartstack=False,
+            _preload_content=False,
+        )
+    except (
+        client.api_error,
+        client.connection_error,
+        client.timeout_error,
+        urllib3.exceptions.HTTPError,
+    ):
+        # e.g. an API that doesn't have this endpoint yet
+        return None
+    except Exception:
+        log.exception(f"Failed to get the status of {service} in {cluster}")
+        return None
+
+    wanted_instances = set(instances)
+    seen_instances: Set[str] = set()
+    return_codes = []
+    try:
+        for line in response:
+            if not line.strip():
+                continue
+            instance_status = json.loads(line)
+            instance = instance_status.get("instance")
+            if instance not in wanted_instances or instance in seen_instances:
+                continue
+            seen_instances.add(instance)
+            output = ["", f"\n{service}.{PaastaColors.cyan(instance)} in {cluster}"]
+            if "error_message" in instance_status:
+                output.append(PaastaColors.red(instance_status["error_message"]))
+                with lock:
+                    print("\n".join(output), flush=True)
+                return_codes.append(instance_status.get("error_code", 1))
+                continue
+            status = validate_and_convert_types(
+                instance_status,
+                (InstanceStatus,),
+                ["received_data"],
+                True,
+                True,
+                configuration=client.service.api_client.configuration,
+            )
+            return_codes.append(
+                print_paasta_status_from_api(
+                    cluster=cluster,
+                    service=service,
+                    instance=instance,
+                    status=status,
+                    output=output,
+                    lock=lock,
+                    verbose=verbose,
+                )
+            )
+    except (client.api_error, urllib3.exceptions.HTTPError):
+        # e.g. the connection dropped; get whatever is missing one by one below
+        pass
+    except Exception:
+        log.exception(f"Failed to read the status of {service} in {cluster}")
+    finally:
+        response.release_conn()
+
+    for instance in instances:
+        if instance not in seen_instances:
+            return_codes.append(
+                paasta_status_on_api_endpoint(
+                    cluster=cluster,
+                    service=service,
+                    instance=instance,
+                    system_paasta_config=system_paasta_config,
+                    lock=lock,
+                    verbose=verbose,
+                    new=new,
+                )
+            )
+    return return_codes
+
+
+def print_paasta_status_from_api(
+    cluster: str,
+    service: str,
+    instance: str,
+    status: InstanceStatus,
+    output: List[str],
+    lock: Lock,
+    verbose: int,
+) -> int:
     if status.version and status.version != "":
         output.append(f"    Version:    {status.version} (desired)")
     # TODO: Remove this when all clusters are returning status.version
@@ -2174,19 +2304,31 @@ def report_status_for_cluster(
             output.append("    Git sha:    None (not deployed yet)")
 
     return_code = 0
-    return_codes = []
-    for deployed_instance in instances:
-        return_codes.append(
-            paasta_status_on_api_endpoint(
-                cluster=cluster,
-                service=service,
-                instance=deployed_instance,
-                system_paasta_config=system_paasta_config,
-                lock=lock,
-                verbose=verbose,
-                new=new,
-            )
+    return_codes = None
+    if len(instances) > 1:
+        return_codes = paasta_status_for_service_on_api_endpoint(
+            cluster=cluster,
+            service=service,
+            instances=instances,
+            system_paasta_config=system_paasta_config,
+            lock=lock,
+            verbose=verbose,
+            new=new,
         )
+    if return_codes is None:
+        return_codes = []
+        for deployed_instance in instances:
+            return_codes.append(
+                paasta_status_on_api_endpoint(
+                    cluster=cluster,
+                    service=service,
+                    instance=deployed_instance,
+                    system_paasta_config=system_paasta_config,
+                    lock=lock,
+                    verbose=verbose,
+                    new=new,
+                )
+            )
 
     if any(return_codes):
         return_code = 1
@@ -12,11 +12,18 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import argparse
+import contextlib
+import io
 import json
 import os
 import pkgutil
 import re
+import sys
+import time
 from collections import Counter
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from functools import lru_cache
 from functools import partial
@@ -114,6 +121,10 @@ OVERRIDE_CPU_BURST_ACK_PATTERN = r"#\s*override-cpu-burst\s+\(.+[A-Z]+-[0-9]+.+\
 # this to the autotune cap (i.e., 1)
 CPU_BURST_THRESHOLD = 2
 
+# libyaml's loader is several times faster than the pure python one, which
+# adds up when validating every service
+YAML_SAFE_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 class ConditionConfig(TypedDict, total=False):
     """
@@ -130,6 +141,20 @@ class ConditionConfig(TypedDict, total=False):
     dry_run: bool
 
 
+class CheckResult(TypedDict):
+    valid: bool
+    duration_seconds: float
+
+
+class ServiceValidationResult(TypedDict):
+    service: str
+    valid: bool
+    duration_seconds: float
+    checks: Dict[str, CheckResult]
+    output: str
+    error: Optional[str]
+
+
 def invalid_tron_namespace(cluster, output, filename):
     return failure(
         "%s is invalid:\n  %s\n  " "More info:" % (filename, output),
@@ -169,6 +194,20 @@ def get_schema(file_type):
     return json.loads(schema)
 
 
+@lru_cache()
+def get_schema_validator(file_type: str) -> Optional[Draft4Validator]:
+    """Get a validator for a schema type, or None if there's no such schema.
+
+    Validators don't keep any state between calls to validate(), so each schema
+    is only loaded and compiled once per process rather than once per file.
+    """
+    schema = get_schema(file_type)
+    if schema is None:
+        return None
+    Draft4Validator.check_schema(schema)
+    return Draft4Validator(schema, format_checker=FormatChecker())
+
+
 def validate_rollback_bounds(
     config: Dict[str, List[ConditionConfig]], file_loc: str
 ) -> bool:
@@ -251,7 +290,7 @@ def get_config_file_dict(file_path: str, use_ruamel: bool = False) -> Dict[Any,
                 )
                 return ruamel_loader.load(config_file)
             else:
-                return yaml.safe_load(config_file)
+                return yaml.load(config_file, Loader=YAML_SAFE_LOADER)
         elif extension == ".json":
             return json.loads(config_file)
         else:
@@ -268,16 +307,15 @@ def validate_schema(file_path: str, file_type: str) -> bool:
     :param file_type: what schema type should we validate against
     """
     try:
-        schema = get_schema(file_type)
+        validator = get_schema_validator(file_type)
     except Exception as e:
         print(f"{SCHEMA_ERROR}: {file_type}, error: {e!r}")
         return False
 
-    if schema is None:
+    if validator is None:
         print(f"{SCHEMA_NOT_FOUND}: {file_path}")
         return False
 
-    validator = Draft4Validator(schema, format_checker=FormatChecker())
     basename = os.path.basename(file_path)
     config_file_object = get_config_file_dict(file_path)
     try:
@@ -328,6 +366,16 @@ def validate_all_schemas(service_path: str) -> bool:
     return returncode
 
 
+def positive_int(value: str) -> int:
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"{value!r} is not a number")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"{value} must be at least 1")
+    return number
+
+
 def add_subparser(subparsers):
     validate_parser = subparsers.add_parser(
         "validate",
@@ -355,6 +403,30 @@ def add_subparser(subparsers):
         required=False,
         help="Path to root of yelpsoa-configs checkout",
     )
+    validate_parser.add_argument(
+        "-a",
+        "--all",
+        action="store_true",
+        dest="validate_all",
+        required=False,
+        help="Validate every service in the yelpsoa-configs checkout instead of just one.",
+    )
+    validate_parser.add_argument(
+        "-j",
+        "--jobs",
+        type=positive_int,
+        default=os.cpu_count(),
+        required=False,
+        help="With --all, how many services to validate in parallel. "
+        "Defaults to the number of CPUs.",
+    )
+    validate_parser.add_argument(
+        "--results-file",
+        dest="results_file",
+        required=False,
+        help="With --all, also write the result of every check of every service, "
+        "and how long it took, to this file as JSON.",
+    )
     validate_parser.set_defaults(command=paasta_validate)
 
 
@@ -805,11 +877,16 @@ def validate_cpu_burst(service_path: str) -> bool:
 
 
 def paasta_validate_soa_configs(
-    service: str, service_path: str, verbose: bool = False
+    service: str,
+    service_path: str,
+    verbose: bool = False,
+    check_results: Optional[Dict[str, CheckResult]] = None,
 ) -> bool:
     """Analyze the service in service_path to determine if the conf files are valid
 
     :param service_path: Path to directory containing soa conf yaml files for service
+    :param check_results: if given, filled in with the result of each check and
+        how long it took, keyed by the name of the check
     """
     if not check_service_path(service_path):
         return False
@@ -828,10 +905,139 @@ def paasta_validate_soa_configs(
         validate_cpu_burst,
     ]
 
-    # NOTE: we're explicitly passing a list comprehension to all()
-    # instead of a generator expression so that we run all checks
-    # no matter what
-    return all([check(service_path) for check in checks])
+    # NOTE: we run all checks no matter what, rather than stopping at the
+    # first one that fails
+    returncode = True
+    for check in checks:
+        start = time.monotonic()
+        valid = check(service_path)
+        if check_results is not None:
+            check_results[getattr(check, "func", check).__name__] = {
+                "valid": bool(valid),
+                "duration_seconds": time.monotonic() - start,
+            }
+        returncode = returncode and valid
+    return returncode
+
+
+def list_services_to_validate(soa_dir: str) -> List[str]:
+    return [
+        service
+        for service in list_services(soa_dir=soa_dir)
+        if not service.startswith(".") and os.path.isdir(os.path.join(soa_dir, service))
+    ]
+
+
+def validate_service(
+    soa_dir: str, service: str, verbose: bool = False
+) -> ServiceValidationResult:
+    """Runs every check against one service, capturing what they print so that
+    the output of services validated in parallel doesn't get interleaved."""
+    check_results: Dict[str, CheckResult] = {}
+    output = io.StringIO()
+    error = None
+    start = time.monotonic()
+    with contextlib.redirect_stdout(output):
+        try:
+            valid = paasta_validate_soa_configs(
+                service,
+                os.path.join(soa_dir, service),
+                verbose=verbose,
+                check_results=check_results,
+            )
+        except Exception as e:
+            print(failure(f"Failed to validate {service}: {e!r}", ""))
+            valid = False
+            error = repr(e)
+    # the parsed files of this service won't be needed again
+    get_config_file_dict.cache_clear()
+    return {
+        "service": service,
+        "valid": bool(valid),
+        "duration_seconds": time.monotonic() - start,
+        "checks": check_results,
+        "output": output.getvalue(),
+        "error": error,
+    }
+
+
+def print_check_timings(results: List[ServiceValidationResult]) -> None:
+    check_durations: Dict[str, float] = defaultdict(float)
+    for result in results:
+        for check, check_result in result["checks"].items():
+            check_durations[check] += check_result["duration_seconds"]
+    print("Time spent in each check, across all services:")
+    for check, duration in sorted(
+        check_durations.items(), key=lambda item: item[1], reverse=True
+    ):
+        print(f"  {check}: {duration:.2f}s")
+    print("Slowest services:")
+    for result in sorted(results, key=lambda r: r["duration_seconds"], reverse=True)[
+        :10
+    ]:
+        print(f"  {result['service']}: {result['duration_seconds']:.2f}s")
+
+
+def paasta_validate_all(
+    soa_dir: str,
+    verbose: bool = False,
+    jobs: Optional[int] = None,
+    results_file: Optional[str] = None,
+) -> bool:
+    """Validates every service in soa_dir, spread across jobs processes.
+
+    :param results_file: if given, where to write the results of every check
+        of every service as JSON
+    """
+    soa_dir = os.path.abspath(soa_dir)
+    services = list_services_to_validate(soa_dir)
+    start = time.monotonic()
+    validate = partial(validate_service, soa_dir, verbose=verbose)
+    if jobs == 1:
+        results = [validate(service) for service in services]
+        for result in results:
+            sys.stdout.write(result["output"])
+    else:
+        # compile the schemas before forking, so that workers start with them
+        for file_type in SCHEMA_TYPES:
+            try:
+                get_schema_validator(file_type)
+            except Exception:
+                # validate_schema reports this for every file of this type
+                pass
+        results = []
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            for result in executor.map(validate, services):
+                sys.stdout.write(result["output"])
+                results.append(result)
+    duration = time.monotonic() - start
+
+    invalid = [result["service"] for result in results if not result["valid"]]
+    print_check_timings(results)
+    if invalid:
+        print(
+            failure(
+                f"{len(invalid)} of {len(results)} services failed validation "
+                f"in {duration:.1f}s: {', '.join(invalid)}",
+                "http://paasta.readthedocs.io/en/latest/yelpsoa_configs.html",
+            )
+        )
+    else:
+        print(success(f"All {len(results)} services are valid ({duration:.1f}s)"))
+
+    if results_file:
+        with open(results_file, "w") as f:
+            json.dump(
+                {
+                    "soa_dir": soa_dir,
+                    "valid": not invalid,
+                    "duration_seconds": duration,
+                    "services": results,
+                },
+                f,
+                indent=2,
+            )
+    return not invalid
 
 
 def paasta_validate(args):
@@ -839,6 +1045,16 @@ def paasta_validate(args):
 
     :param args: argparse.Namespace obj created from sys.args by cli
     """
+    if args.validate_all:
+        if not paasta_validate_all(
+            args.yelpsoa_config_root,
+            verbose=args.verbose,
+            jobs=args.jobs,
+            results_file=args.results_file,
+        ):
+            return 1
+        return 0
+
     service_path = get_service_path(args.service, args.yelpsoa_config_root)
     service = args.service or guess_service_name()
     if not paasta_validate_soa_configs(service, service_path, args.verbose):
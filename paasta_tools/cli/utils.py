@@ -16,6 +16,7 @@ import difflib
 import fnmatch
 import getpass
 import hashlib
+import importlib
 import logging
 import os
 import random
@@ -24,6 +25,7 @@ import socket
 import subprocess
 from collections import defaultdict
 from shlex import quote
+from typing import Any
 from typing import Callable
 from typing import Collection
 from typing import Iterable
@@ -38,19 +40,9 @@ from typing import Tuple
 import ephemeral_port_reserve
 from mypy_extensions import NamedArg
 
-from paasta_tools import remote_git
 from paasta_tools.adhoc_tools import load_adhoc_job_config
-from paasta_tools.cassandracluster_tools import load_cassandracluster_instance_config
-from paasta_tools.flink_tools import load_flink_instance_config
-from paasta_tools.kafkacluster_tools import load_kafkacluster_instance_config
-from paasta_tools.kubernetes_tools import KubernetesDeploymentConfig
-from paasta_tools.kubernetes_tools import load_kubernetes_service_config
 from paasta_tools.long_running_service_tools import LongRunningServiceConfig
-from paasta_tools.marathon_tools import load_marathon_service_config
-from paasta_tools.monkrelaycluster_tools import load_monkrelaycluster_instance_config
-from paasta_tools.nrtsearchservice_tools import load_nrtsearchservice_instance_config
 from paasta_tools.paasta_service_config_loader import PaastaServiceConfigLoader
-from paasta_tools.tron_tools import load_tron_instance_config
 from paasta_tools.utils import _log
 from paasta_tools.utils import _log_audit
 from paasta_tools.utils import _run
@@ -753,6 +745,47 @@ LongRunningServiceLoaderSig = Callable[
 ]
 
 
+def _lazy_loader(module_name: str, loader_name: str) -> Callable[..., Any]:
+    """A loader function that only imports the module it lives in when it is
+    first called, so that importing this module (which every paasta
+    subcommand does) doesn't import the Kubernetes, Marathon, etc. client
+    libraries that most subcommands never need."""
+
+    def loader(*args: Any, **kwargs: Any) -> Any:
+        return getattr(importlib.import_module(module_name), loader_name)(
+            *args, **kwargs
+        )
+
+    loader.__name__ = loader.__qualname__ = loader_name
+    return loader
+
+
+load_marathon_service_config = _lazy_loader(
+    "paasta_tools.marathon_tools", "load_marathon_service_config"
+)
+load_kubernetes_service_config = _lazy_loader(
+    "paasta_tools.kubernetes_tools", "load_kubernetes_service_config"
+)
+load_tron_instance_config = _lazy_loader(
+    "paasta_tools.tron_tools", "load_tron_instance_config"
+)
+load_flink_instance_config = _lazy_loader(
+    "paasta_tools.flink_tools", "load_flink_instance_config"
+)
+load_cassandracluster_instance_config = _lazy_loader(
+    "paasta_tools.cassandracluster_tools", "load_cassandracluster_instance_config"
+)
+load_kafkacluster_instance_config = _lazy_loader(
+    "paasta_tools.kafkacluster_tools", "load_kafkacluster_instance_config"
+)
+load_nrtsearchservice_instance_config = _lazy_loader(
+    "paasta_tools.nrtsearchservice_tools", "load_nrtsearchservice_instance_config"
+)
+load_monkrelaycluster_instance_config = _lazy_loader(
+    "paasta_tools.monkrelaycluster_tools", "load_monkrelaycluster_instance_config"
+)
+
+
 class InstanceTypeHandler(NamedTuple):
     lister: InstanceListerSig
     loader: InstanceLoaderSig
@@ -850,6 +883,8 @@ def get_instance_config(
 def get_namespaces_for_secret(
     service: str, cluster: str, secret_name: str, soa_dir: str = DEFAULT_SOA_DIR
 ) -> Set[str]:
+    from paasta_tools.kubernetes_tools import KubernetesDeploymentConfig
+
     secret_to_k8s_namespace = set()
 
     for instance_type in INSTANCE_TYPES:
@@ -971,6 +1006,8 @@ def validate_git_sha(sha, git_url):
         validate_full_git_sha(sha)
         return sha
     except argparse.ArgumentTypeError:
+        from paasta_tools import remote_git
+
         refs = remote_git.list_remote_refs(git_url)
         commits = short_to_full_git_sha(short=sha, refs=refs)
         if len(commits) != 1:
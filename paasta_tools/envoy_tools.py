@@ -108,18 +108,26 @@ def are_namespaces_up_in_eds(
 
 
 def retrieve_envoy_clusters(
-    envoy_host: str, envoy_admin_port: int, envoy_admin_endpoint_format: str
+    envoy_host: str,
+    envoy_admin_port: int,
+    envoy_admin_endpoint_format: str,
+    session: Optional[requests.Session] = None,
 ) -> Dict[str, Any]:
+    """
+    :param session: a session to reuse connections from, it should retry
+        failed requests the same way as the one created by default
+    """
     envoy_uri = envoy_admin_endpoint_format.format(
         host=envoy_host, port=envoy_admin_port, endpoint="clusters?format=json"
     )
 
     # timeout after 3 seconds and retry 3 times
-    envoy_admin_request = requests.Session()
-    envoy_admin_request.headers.update({"User-Agent": get_user_agent()})
-    envoy_admin_request.mount("http://", requests.adapters.HTTPAdapter(max_retries=3))
-    envoy_admin_request.mount("https://", requests.adapters.HTTPAdapter(max_retries=3))
-    envoy_admin_response = envoy_admin_request.get(envoy_uri, timeout=3)
+    if session is None:
+        session = requests.Session()
+        session.headers.update({"User-Agent": get_user_agent()})
+        session.mount("http://", requests.adapters.HTTPAdapter(max_retries=3))
+        session.mount("https://", requests.adapters.HTTPAdapter(max_retries=3))
+    envoy_admin_response = session.get(envoy_uri, timeout=3)
     return envoy_admin_response.json()
 
 
@@ -201,6 +209,87 @@ def get_backends(
     )
 
 
+class EnvoyClustersSnapshot:
+    """The output of Envoy admin's /clusters endpoint, indexed by service
+    namespace. The backends of a namespace are only built (which involves a
+    reverse DNS lookup per backend) the first time they are asked for."""
+
+    def __init__(self, clusters_info: Mapping[str, Any]) -> None:
+        self.casper_endpoints = get_casper_endpoints(clusters_info)
+        self._cluster_statuses: DefaultDict[
+            str, List[Mapping[str, Any]]
+        ] = collections.defaultdict(list)
+        for cluster_status in clusters_info["cluster_statuses"]:
+            if "host_statuses" in cluster_status:
+                if cluster_status["name"].endswith(".egress_cluster"):
+                    service_name = cluster_status["name"][: -len(".egress_cluster")]
+                    self._cluster_statuses[service_name].append(cluster_status)
+        self._backends: Dict[str, List[Tuple[EnvoyBackend, bool]]] = {}
+
+    def service_names(self) -> Collection[str]:
+        return self._cluster_statuses.keys()
+
+    def get_backends(
+        self, services: Optional[Collection[str]] = None
+    ) -> Dict[str, List[Tuple[EnvoyBackend, bool]]]:
+        """Same as get_multiple_backends, without fetching anything."""
+        if services is None:
+            services = self.service_names()
+        backends = {}
+        for service_name in services:
+            if service_name not in self._cluster_statuses:
+                continue
+            if service_name not in self._backends:
+                self._backends[service_name] = [
+                    backend
+                    for cluster_status in self._cluster_statuses[service_name]
+                    for backend in _get_cluster_backends(
+                        service_name, cluster_status, self.casper_endpoints
+                    )
+                ]
+            backends[service_name] = self._backends[service_name]
+        return backends
+
+
+def _get_cluster_backends(
+    service_name: str,
+    cluster_status: Mapping[str, Any],
+    casper_endpoints: AbstractSet[Tuple[str, int]],
+) -> List[Tuple[EnvoyBackend, bool]]:
+    cluster_backends = []
+    casper_endpoint_found = False
+    for host_status in cluster_status["host_statuses"]:
+        address = host_status["address"]["socket_address"]["address"]
+        port_value = host_status["address"]["socket_address"]["port_value"]
+
+        # Check if this endpoint is actually a casper backend
+        # If so, omit from the service's list of backends
+        if not service_name.startswith("spectre."):
+            if (address, port_value) in casper_endpoints:
+                casper_endpoint_found = True
+                continue
+
+        try:
+            hostname = socket.gethostbyaddr(address)[0].split(".")[0]
+        except socket.herror:
+            # Default to the raw IP address if we can't lookup the hostname
+            hostname = address
+
+        cluster_backends.append(
+            (
+                EnvoyBackend(
+                    address=address,
+                    port_value=port_value,
+                    hostname=hostname,
+                    eds_health_status=host_status["health_status"]["eds_health_status"],
+                    weight=host_status["weight"],
+                ),
+                casper_endpoint_found,
+            )
+        )
+    return cluster_backends
+
+
 def get_multiple_backends(
     services: Optional[Sequence[str]],
     envoy_host: str,
@@ -222,55 +311,7 @@ def get_multiple_backends(
         envoy_admin_port=envoy_admin_port,
         envoy_admin_endpoint_format=envoy_admin_endpoint_format,
     )
-
-    casper_endpoints = get_casper_endpoints(clusters_info)
-
-    backends: DefaultDict[
-        str, List[Tuple[EnvoyBackend, bool]]
-    ] = collections.defaultdict(list)
-    for cluster_status in clusters_info["cluster_statuses"]:
-        if "host_statuses" in cluster_status:
-            if cluster_status["name"].endswith(".egress_cluster"):
-                service_name = cluster_status["name"][: -len(".egress_cluster")]
-
-                if services is None or service_name in services:
-                    cluster_backends = []
-                    casper_endpoint_found = False
-                    for host_status in cluster_status["host_statuses"]:
-                        address = host_status["address"]["socket_address"]["address"]
-                        port_value = host_status["address"]["socket_address"][
-                            "port_value"
-                        ]
-
-                        # Check if this endpoint is actually a casper backend
-                        # If so, omit from the service's list of backends
-                        if not service_name.startswith("spectre."):
-                            if (address, port_value) in casper_endpoints:
-                                casper_endpoint_found = True
-                                continue
-
-                        try:
-                            hostname = socket.gethostbyaddr(address)[0].split(".")[0]
-                        except socket.herror:
-                            # Default to the raw IP address if we can't lookup the hostname
-                            hostname = address
-
-                        cluster_backends.append(
-                            (
-                                EnvoyBackend(
-                                    address=address,
-                                    port_value=port_value,
-                                    hostname=hostname,
-                                    eds_health_status=host_status["health_status"][
-                                        "eds_health_status"
-                                    ],
-                                    weight=host_status["weight"],
-                                ),
-                                casper_endpoint_found,
-                            )
-                        )
-                    backends[service_name] += cluster_backends
-    return backends
+    return EnvoyClustersSnapshot(clusters_info).get_backends(services)
 
 
 def match_backends_and_pods(
@@ -394,6 +435,12 @@ def get_replication_for_all_services(
         envoy_admin_port=envoy_admin_port,
         envoy_admin_endpoint_format=envoy_admin_endpoint_format,
     )
+    return count_up_backends(backends)
+
+
+def count_up_backends(
+    backends: Mapping[str, Iterable[Tuple[EnvoyBackend, bool]]]
+) -> Dict[str, int]:
     return collections.Counter(
         [
             service_name
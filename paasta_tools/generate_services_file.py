@@ -27,9 +27,11 @@ import yaml
 
 from paasta_tools.marathon_tools import get_all_namespaces
 from paasta_tools.marathon_tools import get_all_namespaces_for_service
+from paasta_tools.soa_config_index import use_soa_config_index
 from paasta_tools.utils import atomic_file_write
 from paasta_tools.utils import compose_job_id
 from paasta_tools.utils import DEFAULT_SOA_DIR
+from paasta_tools.utils import optionally_load_system_paasta_config
 
 
 YOCALHOST = "169.254.255.254"
@@ -138,14 +140,18 @@ def write_rfc1700_file(filename):
 
 def main():
     args = parse_args()
-    if args.output_format == "rfc1700":
-        write_rfc1700_file(filename=args.output_filename)
-    elif args.output_format == "yaml":
-        write_yaml_file(filename=args.output_filename)
-    elif args.output_format == "json":
-        write_json_file(filename=args.output_filename)
-    else:
-        raise (NotImplementedError)
+    with use_soa_config_index(
+        index_path=optionally_load_system_paasta_config().get_soa_config_index_path(),
+        soa_dir=DEFAULT_SOA_DIR,
+    ):
+        if args.output_format == "rfc1700":
+            write_rfc1700_file(filename=args.output_filename)
+        elif args.output_format == "yaml":
+            write_yaml_file(filename=args.output_filename)
+        elif args.output_format == "json":
+            write_json_file(filename=args.output_filename)
+        else:
+            raise (NotImplementedError)
 
 
 if __name__ == "__main__":
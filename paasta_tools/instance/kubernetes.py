@@ -1,7 +1,10 @@
 import asyncio
+import threading
 from collections import defaultdict
+from concurrent.futures import Future
 from enum import Enum
 from typing import Any
+from typing import Callable
 from typing import DefaultDict
 from typing import Dict
 from typing import Iterable
@@ -37,6 +40,7 @@ from paasta_tools.instance.hpa_metrics_parser import HPAMetricsDict
 from paasta_tools.instance.hpa_metrics_parser import HPAMetricsParser
 from paasta_tools.kubernetes_tools import get_pod_event_messages
 from paasta_tools.kubernetes_tools import get_tail_lines_for_kubernetes_container
+from paasta_tools.kubernetes_tools import KubeDeployment
 from paasta_tools.kubernetes_tools import KubernetesDeploymentConfig
 from paasta_tools.kubernetes_tools import paasta_prefixed
 from paasta_tools.long_running_service_tools import LongRunningServiceConfig
@@ -535,7 +539,13 @@ async def get_pods_for_service_instance_multiple_namespaces(
     instance: str,
     kube_client: kubernetes_tools.KubeClient,
     namespaces: Iterable[str],
+    service_objects: Optional["ServiceKubeObjects"] = None,
 ) -> Sequence[V1Pod]:
+    if service_objects is not None:
+        return await asyncio.wait_for(
+            a_sync.to_async(service_objects.pods)(instance, namespaces), timeout=15
+        )
+
     ret: List[V1Pod] = []
 
     for coro in asyncio.as_completed(
@@ -569,6 +579,117 @@ def find_all_relevant_namespaces(
     }
 
 
+class ServiceKubeObjects:
+    """The Deployments, Pods, ReplicaSets and ControllerRevisions of all the
+    instances of a service, each listed at most once per namespace (with a
+    service-only label selector) and then filtered by instance label.
+
+    Computing the status of every instance of a service with one of these
+    costs one list call per kind and namespace, rather than one per instance
+    (or none at all, when paasta-api's KubeObjectCache is fresh).
+    It is safe to share between threads (and so between the event loops that
+    kubernetes_status_v2 runs in): concurrent requests for the same list wait
+    for the first one instead of making their own call.
+    """
+
+    def __init__(self, service: str, kube_client: kubernetes_tools.KubeClient) -> None:
+        self.service = service
+        self.kube_client = kube_client
+        self._lock = threading.Lock()
+        self._lists: Dict[Tuple[str, str], "Future[Sequence[Any]]"] = {}
+
+    @property
+    def label_selector(self) -> str:
+        return f"{paasta_prefixed('service')}={self.service}"
+
+    def _get(self, key: Tuple[str, str], fetch: Callable[[], Sequence[Any]]) -> Any:
+        with self._lock:
+            future = self._lists.get(key)
+            if future is None:
+                future = self._lists[key] = Future()
+                fetching = True
+            else:
+                fetching = False
+        if fetching:
+            try:
+                future.set_result(fetch())
+            except Exception as e:
+                future.set_exception(e)
+        return future.result()
+
+    def deployments(self) -> Sequence[KubeDeployment]:
+        return self._get(
+            ("deployments", ""),
+            lambda: kubernetes_tools.list_deployments_in_managed_namespaces(
+                kube_client=self.kube_client, label_selector=self.label_selector
+            ),
+        )
+
+    def relevant_namespaces(
+        self, instance: str, job_config: LongRunningServiceConfig
+    ) -> Set[str]:
+        return {job_config.get_kubernetes_namespace()} | {
+            deployment.namespace
+            for deployment in self.deployments()
+            if deployment.instance == instance
+        }
+
+    def _list_for_instance(
+        self,
+        kind: str,
+        list_func: Callable[..., Any],
+        instance: str,
+        namespaces: Iterable[str],
+    ) -> List[Any]:
+        ret = []
+        kube_object_cache = kubernetes_tools.get_kube_object_cache()
+        for namespace in namespaces:
+            if kube_object_cache is not None:
+                cached = kube_object_cache.list_for_service_instance(
+                    kind, self.service, instance, namespace
+                )
+                if cached is not None:
+                    ret.extend(cached)
+                    continue
+            items = self._get(
+                (kind, namespace),
+                lambda: list_func(
+                    label_selector=self.label_selector, namespace=namespace
+                ).items,
+            )
+            ret.extend(
+                item
+                for item in items
+                if item.metadata.labels.get(paasta_prefixed("instance")) == instance
+            )
+        return ret
+
+    def pods(self, instance: str, namespaces: Iterable[str]) -> List[V1Pod]:
+        return self._list_for_instance(
+            "pods", self.kube_client.core.list_namespaced_pod, instance, namespaces
+        )
+
+    def replicasets(
+        self, instance: str, namespaces: Iterable[str]
+    ) -> List[V1ReplicaSet]:
+        return self._list_for_instance(
+            "replicasets",
+            self.kube_client.deployments.list_namespaced_replica_set,
+            instance,
+            namespaces,
+        )
+
+    def controller_revisions(
+        self, instance: str, namespaces: Iterable[str]
+    ) -> List[V1ControllerRevision]:
+        return self._list_for_instance(
+            "controller_revisions",
+            self.kube_client.deployments.list_namespaced_controller_revision,
+            instance,
+            namespaces,
+        )
+
+
 @a_sync.to_blocking
 async def kubernetes_status_v2(
     service: str,
@@ -578,7 +699,13 @@ async def kubernetes_status_v2(
     include_envoy: bool,
     instance_type: str,
     settings: Any,
+    service_objects: Optional[ServiceKubeObjects] = None,
 ) -> Dict[str, Any]:
+    """
+    :param service_objects: if given, list the service's Kubernetes objects
+        through it instead of with this instance's own list calls, so that
+        they can be shared with the status of the service's other instances.
+    """
     status: Dict[str, Any] = {}
     config_loader = LONG_RUNNING_INSTANCE_TYPE_HANDLERS[instance_type].loader
     job_config = config_loader(
@@ -592,9 +719,14 @@ async def kubernetes_status_v2(
     if kube_client is None:
         return status
 
-    relevant_namespaces = await a_sync.to_async(find_all_relevant_namespaces)(
-        service, instance, kube_client, job_config
-    )
+    if service_objects is None:
+        relevant_namespaces = await a_sync.to_async(find_all_relevant_namespaces)(
+            service, instance, kube_client, job_config
+        )
+    else:
+        relevant_namespaces = await a_sync.to_async(
+            service_objects.relevant_namespaces
+        )(instance, job_config)
 
     tasks: List["asyncio.Future[Dict[str, Any]]"] = []
 
@@ -618,6 +750,7 @@ async def kubernetes_status_v2(
             instance=instance,
             kube_client=kube_client,
             namespaces=relevant_namespaces,
+            service_objects=service_objects,
         )
     )
     tasks.append(pods_task)
@@ -664,6 +797,7 @@ async def kubernetes_status_v2(
                 instance=instance,
                 namespaces=relevant_namespaces,
                 pod_status_by_sha_and_readiness_task=pod_status_by_sha_and_readiness_task,
+                service_objects=service_objects,
             )
         )
         tasks.extend([pod_status_by_sha_and_readiness_task, versions_task])
@@ -683,6 +817,7 @@ async def kubernetes_status_v2(
                 instance=instance,
                 namespaces=relevant_namespaces,
                 pod_status_by_replicaset_task=pod_status_by_replicaset_task,
+                service_objects=service_objects,
             )
         )
         tasks.extend([pod_status_by_replicaset_task, versions_task])
@@ -754,21 +889,28 @@ async def get_versions_for_replicasets(
     instance: str,
     namespaces: Iterable[str],
     pod_status_by_replicaset_task: "asyncio.Future[Mapping[str, Sequence[asyncio.Future[Dict[str, Any]]]]]",
+    service_objects: Optional[ServiceKubeObjects] = None,
 ) -> List[KubernetesVersionDict]:
 
     replicaset_list: List[V1ReplicaSet] = []
-    for coro in asyncio.as_completed(
-        [
-            kubernetes_tools.replicasets_for_service_instance(
-                service=service,
-                instance=instance,
-                kube_client=kube_client,
-                namespace=namespace,
-            )
-            for namespace in namespaces
-        ]
-    ):
-        replicaset_list.extend(await coro)
+    if service_objects is not None:
+        replicaset_list = await asyncio.wait_for(
+            a_sync.to_async(service_objects.replicasets)(instance, namespaces),
+            timeout=10,
+        )
+    else:
+        for coro in asyncio.as_completed(
+            [
+                kubernetes_tools.replicasets_for_service_instance(
+                    service=service,
+                    instance=instance,
+                    kube_client=kube_client,
+                    namespace=namespace,
+                )
+                for namespace in namespaces
+            ]
+        ):
+            replicaset_list.extend(await coro)
 
     # For the purpose of active_versions/app_count, don't count replicasets that
     # are at 0/0.
@@ -1029,21 +1171,28 @@ async def get_versions_for_controller_revisions(
     instance: str,
     namespaces: Iterable[str],
     pod_status_by_sha_and_readiness_task: "asyncio.Future[Mapping[Tuple[str, str], Mapping[bool, Sequence[asyncio.Future[Mapping[str, Any]]]]]]",
+    service_objects: Optional[ServiceKubeObjects] = None,
 ) -> List[KubernetesVersionDict]:
     controller_revision_list: List[V1ControllerRevision] = []
 
-    for coro in asyncio.as_completed(
-        [
-            kubernetes_tools.controller_revisions_for_service_instance(
-                service=service,
-                instance=instance,
-                kube_client=kube_client,
-                namespace=namespace,
-            )
-            for namespace in namespaces
-        ]
-    ):
-        controller_revision_list.extend(await coro)
+    if service_objects is not None:
+        controller_revision_list = await asyncio.wait_for(
+            a_sync.to_async(service_objects.controller_revisions)(instance, namespaces),
+            timeout=10,
+        )
+    else:
+        for coro in asyncio.as_completed(
+            [
+                kubernetes_tools.controller_revisions_for_service_instance(
+                    service=service,
+                    instance=instance,
+                    kube_client=kube_client,
+                    namespace=namespace,
+                )
+                for namespace in namespaces
+            ]
+        ):
+            controller_revision_list.extend(await coro)
 
     cr_by_shas: Dict[Tuple[str, str], V1ControllerRevision] = {}
     for cr in controller_revision_list:
@@ -1225,6 +1374,7 @@ def instance_status(
     use_new: bool,
     instance_type: str,
     settings: Any,
+    service_objects: Optional[ServiceKubeObjects] = None,
 ) -> Mapping[str, Any]:
     status = {}
 
@@ -1253,6 +1403,7 @@ def instance_status(
                 include_smartstack=include_smartstack,
                 include_envoy=include_envoy,
                 settings=settings,
+                service_objects=service_objects,
             )
         else:
             status["kubernetes"] = kubernetes_status(
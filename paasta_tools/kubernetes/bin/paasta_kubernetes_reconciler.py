@@ -0,0 +1,388 @@
+#!/usr/bin/env python
+# Copyright 2015-2021 Yelp Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Usage: ./paasta_kubernetes_reconciler.py [options]
+
+Long-running alternative to running setup_kubernetes_job for every service
+instance from cron. Deployments and StatefulSets are listed once and then kept
+up to date with watches, and only the services whose soa-configs (including
+deployments.json, smartstack.yaml and secrets), secret signatures or live
+controllers changed get re-formatted and re-applied. Changes to the system
+paasta config, shared secrets or any smartstack.yaml (which other services can
+register into) re-apply every service.
+"""
+import argparse
+import logging
+import os
+import threading
+import time
+from typing import Any
+from typing import cast
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import MutableMapping
+from typing import Optional
+from typing import Set
+from typing import Tuple
+
+import service_configuration_lib
+
+from paasta_tools.kubernetes.informer import KubeInformer
+from paasta_tools.kubernetes_tools import enable_formatted_app_cache
+from paasta_tools.kubernetes_tools import ensure_namespace
+from paasta_tools.kubernetes_tools import kube_deployment_from_controller
+from paasta_tools.kubernetes_tools import KubeClient
+from paasta_tools.kubernetes_tools import KubeDeployment
+from paasta_tools.kubernetes_tools import sanitise_label_value
+from paasta_tools.metrics import metrics_lib
+from paasta_tools.secret_tools import SHARED_SECRET_SERVICE
+from paasta_tools.setup_kubernetes_job import get_kubernetes_deployment_config
+from paasta_tools.setup_kubernetes_job import setup_kube_deployments
+from paasta_tools.utils import DEFAULT_SOA_DIR
+from paasta_tools.utils import get_service_instance_list_no_cache
+from paasta_tools.utils import load_system_paasta_config
+from paasta_tools.utils import PATH_TO_SYSTEM_PAASTA_CONFIG_DIR
+
+log = logging.getLogger(__name__)
+
+PAASTA_SERVICE_LABEL_SELECTOR = "paasta.yelp.com/service"
+
+FileSignature = Optional[Tuple[int, int]]
+# the signature of every file in a directory, by path
+DirectorySignature = Dict[str, FileSignature]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Continuously reconciles Kubernetes deployments with soa-configs."
+    )
+    parser.add_argument(
+        "-d",
+        "--soa-dir",
+        dest="soa_dir",
+        metavar="SOA_DIR",
+        default=DEFAULT_SOA_DIR,
+        help="define a different soa config directory",
+    )
+    parser.add_argument(
+        "-c",
+        "--cluster",
+        dest="cluster",
+        help="paasta cluster",
+    )
+    parser.add_argument(
+        "--poll-interval",
+        dest="poll_interval",
+        default=10,
+        type=float,
+        help="How often to check soa-configs for changes, in seconds. Default is %(default)s.",
+    )
+    parser.add_argument(
+        "--full-resync-interval",
+        dest="full_resync_interval",
+        default=3600,
+        type=float,
+        help=(
+            "Reconcile every service instance at least this often, in seconds, "
+            "regardless of whether anything changed. Default is %(default)s."
+        ),
+    )
+    parser.add_argument(
+        "-v",
+        "--verbose",
+        action="store_true",
+        dest="verbose",
+        default=False,
+    )
+    return parser.parse_args()
+
+
+def _file_signature(path: str) -> FileSignature:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _directory_signature(path: str) -> DirectorySignature:
+    signature: DirectorySignature = {}
+    for dirpath, _, filenames in os.walk(path):
+        for filename in filenames:
+            file_path = os.path.join(dirpath, filename)
+            signature[file_path] = _file_signature(file_path)
+    return signature
+
+
+class ServiceInputWatcher:
+    """Keeps track of the files that setup_kubernetes_job reads for each
+    service, and reports the services whose files changed.
+
+    Every file in a service's soa-configs directory counts as one of its
+    inputs, so that nothing that goes into format_kubernetes_app (its
+    kubernetes and autotuned yaml, deployments.json, smartstack.yaml,
+    secrets...) is missed. Some inputs are shared by every service: the
+    system paasta config, the shared secrets, and every smartstack.yaml, since
+    a service can register into another service's namespaces.
+    """
+
+    def __init__(
+        self,
+        soa_dir: str,
+        cluster: str,
+        system_paasta_config_dir: str = PATH_TO_SYSTEM_PAASTA_CONFIG_DIR,
+    ) -> None:
+        self.soa_dir = os.path.abspath(soa_dir)
+        self.cluster = cluster
+        self.system_paasta_config_dir = system_paasta_config_dir
+        self._signatures: Dict[str, DirectorySignature] = {}
+        self._shared_signature: Optional[DirectorySignature] = None
+
+    def input_files(self, service: str) -> List[str]:
+        return sorted(self._signatures.get(service, {}))
+
+    def changed_services(self) -> Set[str]:
+        changed = set()
+        smartstack_changed = False
+        signatures = {}
+        for service in os.listdir(self.soa_dir):
+            signature = _directory_signature(os.path.join(self.soa_dir, service))
+            signatures[service] = signature
+            old_signature = self._signatures.get(service)
+            if old_signature != signature:
+                changed.add(service)
+                smartstack_yaml = os.path.join(self.soa_dir, service, "smartstack.yaml")
+                if old_signature is not None and old_signature.get(
+                    smartstack_yaml
+                ) != signature.get(smartstack_yaml):
+                    smartstack_changed = True
+        self._signatures = signatures
+
+        shared_signature = _directory_signature(self.system_paasta_config_dir)
+        shared_changed = (
+            self._shared_signature is not None
+            and self._shared_signature != shared_signature
+        )
+        self._shared_signature = shared_signature
+
+        # shared secrets live in their own "service"
+        if smartstack_changed or shared_changed or SHARED_SECRET_SERVICE in changed:
+            return set(signatures)
+        return changed
+
+    def forget_yaml_cache(self, services: Iterable[str]) -> None:
+        """Make sure the next read of these services' files hits the disk."""
+        yaml_cache = cast(
+            MutableMapping[str, Any], service_configuration_lib._yaml_cache
+        )
+        for service in services:
+            for path in self.input_files(service):
+                yaml_cache.pop(path, None)
+
+
+class KubernetesReconciler:
+    def __init__(
+        self,
+        kube_client: KubeClient,
+        cluster: str,
+        soa_dir: str = DEFAULT_SOA_DIR,
+        metrics_interface: metrics_lib.BaseMetrics = metrics_lib.NoMetrics("paasta"),
+    ) -> None:
+        self.kube_client = kube_client
+        self.cluster = cluster
+        self.soa_dir = soa_dir
+        self.metrics_interface = metrics_interface
+        self.input_watcher = ServiceInputWatcher(soa_dir=soa_dir, cluster=cluster)
+        self.informers = [
+            KubeInformer(
+                list_func=list_func,
+                label_selector=PAASTA_SERVICE_LABEL_SELECTOR,
+                on_event=self.handle_controller_event,
+            )
+            for list_func in (
+                kube_client.deployments.list_deployment_for_all_namespaces,
+                kube_client.deployments.list_stateful_set_for_all_namespaces,
+            )
+        ]
+        # secret signatures change when paasta_secrets_sync has synced a
+        # service's secrets, which may be a while after its secret files did
+        self.secret_signature_informer = KubeInformer(
+            list_func=kube_client.core.list_config_map_for_all_namespaces,
+            label_selector=PAASTA_SERVICE_LABEL_SELECTOR,
+            on_event=self.handle_secret_signature_event,
+        )
+        self._dirty_services: Set[str] = set()
+        # the sanitised names of services whose secret signatures changed
+        self._dirty_secret_labels: Set[str] = set()
+        self._dirty_lock = threading.Lock()
+        self._known_namespaces: Set[str] = set()
+
+    def handle_controller_event(
+        self, event_type: str, old: Optional[Any], new: Any
+    ) -> None:
+        """Queue a service for reconciliation when one of its controllers is
+        deleted or changed by something other than a status update (e.g. a
+        manual edit), so that we put it back the way soa-configs wants it."""
+        if event_type == "ADDED":
+            return
+        new_deployment = kube_deployment_from_controller(new)
+        if (
+            event_type == "DELETED"
+            or old is None
+            or kube_deployment_from_controller(old) != new_deployment
+        ):
+            with self._dirty_lock:
+                self._dirty_services.add(new_deployment.service)
+
+    def handle_secret_signature_event(
+        self, event_type: str, old: Optional[Any], new: Any
+    ) -> None:
+        if event_type == "MODIFIED" and old is not None and old.data == new.data:
+            return
+        label = (new.metadata.labels or {}).get(PAASTA_SERVICE_LABEL_SELECTOR)
+        if label:
+            with self._dirty_lock:
+                self._dirty_secret_labels.add(label)
+
+    def mark_dirty(self, services: Iterable[str]) -> None:
+        """Reconcile these services again on the next pass."""
+        with self._dirty_lock:
+            self._dirty_services.update(services)
+
+    def pop_dirty_services(self) -> Set[str]:
+        with self._dirty_lock:
+            services, self._dirty_services = self._dirty_services, set()
+            secret_labels, self._dirty_secret_labels = self._dirty_secret_labels, set()
+        if secret_labels:
+            all_services = os.listdir(self.soa_dir)
+            if sanitise_label_value(SHARED_SECRET_SERVICE) in secret_labels:
+                services.update(all_services)
+            else:
+                services.update(
+                    service
+                    for service in all_services
+                    if sanitise_label_value(service) in secret_labels
+                )
+        return services
+
+    def existing_kube_deployments(self) -> Set[KubeDeployment]:
+        return {
+            kube_deployment_from_controller(item)
+            for informer in self.informers
+            for item in informer.list()
+        }
+
+    def reconcile(self, services: Iterable[str]) -> bool:
+        services = sorted(services)
+        self.input_watcher.forget_yaml_cache(services)
+        service_instances = [
+            (service, instance, None, None)
+            for service in services
+            for _, instance in get_service_instance_list_no_cache(
+                service=service,
+                cluster=self.cluster,
+                instance_type="kubernetes",
+                soa_dir=self.soa_dir,
+            )
+        ]
+        if not service_instances:
+            return True
+
+        log.info(
+            f"Reconciling {len(service_instances)} instances of {len(services)} services"
+        )
+        service_instance_configs_list = get_kubernetes_deployment_config(
+            service_instances_with_valid_names=service_instances,
+            cluster=self.cluster,
+            soa_dir=self.soa_dir,
+        )
+        for _, service_instance_config in service_instance_configs_list:
+            if service_instance_config:
+                namespace = service_instance_config.get_namespace()
+                if namespace not in self._known_namespaces:
+                    ensure_namespace(self.kube_client, namespace=namespace)
+                    self._known_namespaces.add(namespace)
+
+        return setup_kube_deployments(
+            kube_client=self.kube_client,
+            cluster=self.cluster,
+            service_instance_configs_list=service_instance_configs_list,
+            soa_dir=self.soa_dir,
+            metrics_interface=self.metrics_interface,
+            existing_kube_deployments=self.existing_kube_deployments(),
+        )
+
+    def run_once(self, full_resync: bool = False) -> bool:
+        changed = self.input_watcher.changed_services()
+        if full_resync:
+            services = set(os.listdir(self.soa_dir))
+        else:
+            services = changed | self.pop_dirty_services()
+        try:
+            reconciled = self.reconcile(services)
+        except Exception:
+            self.mark_dirty(services)
+            raise
+        if not reconciled:
+            # their inputs won't look changed next time, so retry them
+            # explicitly rather than waiting for the next full resync
+            self.mark_dirty(services)
+        return reconciled
+
+    def run_forever(self, poll_interval: float, full_resync_interval: float) -> None:
+        for informer in self.informers:
+            informer.start()
+        self.secret_signature_informer.start()
+
+        # the first pass sees every service as changed, which is a full resync
+        last_full_resync = time.time()
+        while True:
+            full_resync = time.time() - last_full_resync > full_resync_interval
+            if full_resync:
+                last_full_resync = time.time()
+            try:
+                self.run_once(full_resync=full_resync)
+            except Exception:
+                log.exception("Error while reconciling service instances")
+            time.sleep(poll_interval)
+
+
+def main() -> None:
+    args = parse_args()
+    if args.verbose:
+        logging.basicConfig(level=logging.DEBUG)
+    else:
+        # filter out unwanted zookeeper messages in the log
+        logging.getLogger("kazoo").setLevel(logging.WARN)
+        logging.basicConfig(level=logging.INFO)
+
+    # most instances are unchanged between two reconciles, so don't spend time
+    # formatting and hashing them again
+    enable_formatted_app_cache()
+    reconciler = KubernetesReconciler(
+        kube_client=KubeClient(),
+        cluster=args.cluster or load_system_paasta_config().get_cluster(),
+        soa_dir=args.soa_dir,
+        metrics_interface=metrics_lib.get_metrics_interface("paasta"),
+    )
+    reconciler.run_forever(
+        poll_interval=args.poll_interval,
+        full_resync_interval=args.full_resync_interval,
+    )
+
+
+if __name__ == "__main__":
+    main()
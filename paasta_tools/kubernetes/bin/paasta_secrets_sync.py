@@ -19,8 +19,11 @@ import json
 import logging
 import os
 import sys
+import threading
 import time
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from functools import partial
 from typing import Callable
 from typing import Dict
@@ -37,6 +40,7 @@ from paasta_tools.kubernetes_tools import create_secret_signature
 from paasta_tools.kubernetes_tools import get_paasta_secret_name
 from paasta_tools.kubernetes_tools import get_paasta_secret_signature_name
 from paasta_tools.kubernetes_tools import get_secret_signature
+from paasta_tools.kubernetes_tools import get_secret_signatures
 from paasta_tools.kubernetes_tools import get_vault_key_secret_name
 from paasta_tools.kubernetes_tools import KubeClient
 from paasta_tools.kubernetes_tools import KubernetesDeploymentConfig
@@ -44,8 +48,10 @@ from paasta_tools.kubernetes_tools import sanitise_kubernetes_name
 from paasta_tools.kubernetes_tools import update_secret
 from paasta_tools.kubernetes_tools import update_secret_signature
 from paasta_tools.paasta_service_config_loader import PaastaServiceConfigLoader
+from paasta_tools.secret_providers import SecretProvider
 from paasta_tools.secret_tools import get_secret_name_from_ref
 from paasta_tools.secret_tools import get_secret_provider
+from paasta_tools.soa_config_index import use_soa_config_index
 from paasta_tools.utils import DEFAULT_SOA_DIR
 from paasta_tools.utils import DEFAULT_VAULT_TOKEN_FILE
 from paasta_tools.utils import get_service_instance_list
@@ -55,6 +61,8 @@ from paasta_tools.utils import load_system_paasta_config
 
 log = logging.getLogger(__name__)
 
+SecretProviderGetter = Callable[[], SecretProvider]
+
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Sync paasta secrets into k8s")
@@ -103,6 +111,15 @@ def parse_args() -> argparse.Namespace:
         type=str,
         help="Define which type of secret to add/update. Default is 'all'",
     )
+    parser.add_argument(
+        "-j",
+        "--concurrency",
+        dest="concurrency",
+        metavar="N",
+        default=1,
+        type=int,
+        help="Sync the secrets of up to N services at the same time. Default is %(default)s.",
+    )
     args = parser.parse_args()
     return args
 
@@ -122,26 +139,31 @@ def main() -> None:
     secret_provider_name = system_paasta_config.get_secret_provider_name()
     vault_cluster_config = system_paasta_config.get_vault_cluster_config()
     kube_client = KubeClient()
-    services_to_k8s_namespaces_to_allowlist = (
-        get_services_to_k8s_namespaces_to_allowlist(
-            service_list=args.service_list,
-            cluster=cluster,
-            soa_dir=args.soa_dir,
-            kube_client=kube_client,
+    with use_soa_config_index(
+        index_path=system_paasta_config.get_soa_config_index_path(),
+        soa_dir=args.soa_dir,
+    ):
+        services_to_k8s_namespaces_to_allowlist = (
+            get_services_to_k8s_namespaces_to_allowlist(
+                service_list=args.service_list,
+                cluster=cluster,
+                soa_dir=args.soa_dir,
+                kube_client=kube_client,
+            )
         )
-    )
 
-    sys.exit(0) if sync_all_secrets(
-        kube_client=kube_client,
-        cluster=cluster,
-        services_to_k8s_namespaces_to_allowlist=services_to_k8s_namespaces_to_allowlist,
-        secret_provider_name=secret_provider_name,
-        vault_cluster_config=vault_cluster_config,
-        soa_dir=args.soa_dir,
-        vault_token_file=args.vault_token_file,
-        overwrite_namespace=args.namespace,
-        secret_type=args.secret_type,
-    ) else sys.exit(1)
+        sys.exit(0) if sync_all_secrets(
+            kube_client=kube_client,
+            cluster=cluster,
+            services_to_k8s_namespaces_to_allowlist=services_to_k8s_namespaces_to_allowlist,
+            secret_provider_name=secret_provider_name,
+            vault_cluster_config=vault_cluster_config,
+            soa_dir=args.soa_dir,
+            vault_token_file=args.vault_token_file,
+            overwrite_namespace=args.namespace,
+            secret_type=args.secret_type,
+            concurrency=args.concurrency,
+        ) else sys.exit(1)
 
 
 def get_services_to_k8s_namespaces_to_allowlist(
@@ -251,6 +273,48 @@ def get_secrets_used_by_instance(
     return secrets_used, shared_secrets_used
 
 
+class SecretSignatureIndex:
+    """The signatures of the secrets already in Kubernetes, listed once per
+    namespace the first time that namespace is looked at, so that deciding
+    whether a secret needs syncing doesn't cost an API call per secret."""
+
+    def __init__(self, kube_client: KubeClient) -> None:
+        self.kube_client = kube_client
+        self._signatures: Dict[str, Dict[str, str]] = {}
+        self._lock = threading.Lock()
+
+    def _namespace_signatures(self, namespace: str) -> Dict[str, str]:
+        with self._lock:
+            signatures = self._signatures.get(namespace)
+        if signatures is not None:
+            return signatures
+        # list outside of the lock, so that threads looking at different
+        # namespaces don't wait on each other's API calls. If two threads list
+        # the same namespace, the first to finish wins.
+        signatures = get_secret_signatures(
+            kube_client=self.kube_client, namespace=namespace
+        )
+        with self._lock:
+            return self._signatures.setdefault(namespace, signatures)
+
+    def get(self, namespace: str, signature_name: str) -> Optional[str]:
+        signature = self._namespace_signatures(namespace).get(signature_name)
+        if signature is None:
+            # signatures written by older versions of paasta may be missing
+            # the label we list by, so double check before creating anything
+            signature = get_secret_signature(
+                kube_client=self.kube_client,
+                signature_name=signature_name,
+                namespace=namespace,
+            )
+        return signature
+
+    def set(self, namespace: str, signature_name: str, signature: str) -> None:
+        signatures = self._namespace_signatures(namespace)
+        with self._lock:
+            signatures[signature_name] = signature
+
+
 def sync_all_secrets(
     kube_client: KubeClient,
     cluster: str,
@@ -261,14 +325,37 @@ def sync_all_secrets(
     vault_token_file: str,
     secret_type: Literal["all", "paasta-secret", "crypto-key", "boto-key"] = "all",
     overwrite_namespace: Optional[str] = None,
+    concurrency: int = 1,
 ) -> bool:
-    results = []
+    """
+    :param concurrency: the number of services to sync at the same time. The
+        secrets of a single service are always synced one at a time, with a
+        single secret provider.
+    """
+    signature_index = SecretSignatureIndex(kube_client=kube_client)
+    service_syncs = []
 
     for (
         service,
         namespaces_to_allowlist,
     ) in services_to_k8s_namespaces_to_allowlist.items():
         sync_service_secrets: Dict[str, List[Callable]] = defaultdict(list)
+        # only talk to the secret provider if this service has secrets, and
+        # then only set it up once
+        get_service_secret_provider = lru_cache(maxsize=None)(
+            partial(
+                get_secret_provider,
+                secret_provider_name=secret_provider_name,
+                soa_dir=soa_dir,
+                service_name=service,
+                cluster_names=[cluster],
+                secret_provider_kwargs={
+                    "vault_cluster_config": vault_cluster_config,
+                    "vault_auth_method": "token",
+                    "vault_token_file": vault_token_file,
+                },
+            )
+        )
 
         if overwrite_namespace:
             namespaces_to_allowlist = {
@@ -289,6 +376,8 @@ def sync_all_secrets(
                     namespace=namespace,
                     vault_token_file=vault_token_file,
                     secret_allowlist=secret_allowlist,
+                    get_service_secret_provider=get_service_secret_provider,
+                    signature_index=signature_index,
                 )
             )
         sync_service_secrets["boto-key"].append(
@@ -298,6 +387,7 @@ def sync_all_secrets(
                 cluster=cluster,
                 service=service,
                 soa_dir=soa_dir,
+                signature_index=signature_index,
             )
         )
         sync_service_secrets["crypto-key"].append(
@@ -310,21 +400,42 @@ def sync_all_secrets(
                 vault_cluster_config=vault_cluster_config,
                 soa_dir=soa_dir,
                 vault_token_file=vault_token_file,
+                get_service_secret_provider=get_service_secret_provider,
+                signature_index=signature_index,
             )
         )
 
         if secret_type == "all":
-            results.append(
-                all(sync() for sync in sync_service_secrets["paasta-secret"])
-            )
-            results.append(all(sync() for sync in sync_service_secrets["boto-key"]))
-            results.append(all(sync() for sync in sync_service_secrets["crypto-key"]))
+            secret_types = ["paasta-secret", "boto-key", "crypto-key"]
         else:
-            results.append(all(sync() for sync in sync_service_secrets[secret_type]))
+            secret_types = [secret_type]
+        service_syncs.append(
+            partial(
+                _sync_service_secrets,
+                sync_service_secrets=sync_service_secrets,
+                secret_types=secret_types,
+            )
+        )
+
+    if concurrency > 1:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            results = list(executor.map(lambda sync: sync(), service_syncs))
+    else:
+        results = [sync() for sync in service_syncs]
 
     return all(results)
 
 
+def _sync_service_secrets(
+    sync_service_secrets: Dict[str, List[Callable]], secret_types: List[str]
+) -> bool:
+    results = [
+        all(sync() for sync in sync_service_secrets[secret_type])
+        for secret_type in secret_types
+    ]
+    return all(results)
+
+
 def sync_secrets(
     kube_client: KubeClient,
     cluster: str,
@@ -335,25 +446,36 @@ def sync_secrets(
     namespace: str,
     vault_token_file: str,
     secret_allowlist: Optional[Set[str]],
+    get_service_secret_provider: Optional[SecretProviderGetter] = None,
+    signature_index: Optional[SecretSignatureIndex] = None,
 ) -> bool:
+    """
+    :param get_service_secret_provider: returns the secret provider to use for
+        this service, by default a new one is set up for every call
+    :param signature_index: where to look up the current signatures, by
+        default they are fetched one at a time from the Kubernetes API
+    """
     secret_dir = os.path.join(soa_dir, service, "secrets")
-    secret_provider_kwargs = {
-        "vault_cluster_config": vault_cluster_config,
-        # TODO: make vault-tools support k8s auth method so we don't have to
-        # mount a token in.
-        "vault_auth_method": "token",
-        "vault_token_file": vault_token_file,
-    }
-    secret_provider = get_secret_provider(
-        secret_provider_name=secret_provider_name,
-        soa_dir=soa_dir,
-        service_name=service,
-        cluster_names=[cluster],
-        secret_provider_kwargs=secret_provider_kwargs,
-    )
+    if get_service_secret_provider is None:
+        secret_provider_kwargs = {
+            "vault_cluster_config": vault_cluster_config,
+            # TODO: make vault-tools support k8s auth method so we don't have to
+            # mount a token in.
+            "vault_auth_method": "token",
+            "vault_token_file": vault_token_file,
+        }
+        get_service_secret_provider = partial(
+            get_secret_provider,
+            secret_provider_name=secret_provider_name,
+            soa_dir=soa_dir,
+            service_name=service,
+            cluster_names=[cluster],
+            secret_provider_kwargs=secret_provider_kwargs,
+        )
     if not os.path.isdir(secret_dir):
         log.debug(f"No secrets dir for {service}")
         return True
+    secret_provider = get_service_secret_provider()
 
     with os.scandir(secret_dir) as secret_file_paths:
         for secret_file_path in secret_file_paths:
@@ -391,6 +513,7 @@ def sync_secrets(
                         secret_signature=secret_signature,
                         kube_client=kube_client,
                         namespace=namespace,
+                        signature_index=signature_index,
                     )
 
     return True
@@ -404,6 +527,8 @@ def sync_crypto_secrets(
     vault_cluster_config: Dict[str, str],
     soa_dir: str,
     vault_token_file: str,
+    get_service_secret_provider: Optional[SecretProviderGetter] = None,
+    signature_index: Optional[SecretSignatureIndex] = None,
 ) -> bool:
     """
     For each key-name in `crypto_key`,
@@ -421,17 +546,20 @@ def sync_crypto_secrets(
         if not crypto_keys:
             continue
         secret_data = {}
-        provider = get_secret_provider(
-            secret_provider_name=secret_provider_name,
-            soa_dir=soa_dir,
-            service_name=service,
-            cluster_names=[cluster],
-            secret_provider_kwargs={
-                "vault_cluster_config": vault_cluster_config,
-                "vault_auth_method": "token",
-                "vault_token_file": vault_token_file,
-            },
-        )
+        if get_service_secret_provider is not None:
+            provider = get_service_secret_provider()
+        else:
+            provider = get_secret_provider(
+                secret_provider_name=secret_provider_name,
+                soa_dir=soa_dir,
+                service_name=service,
+                cluster_names=[cluster],
+                secret_provider_kwargs={
+                    "vault_cluster_config": vault_cluster_config,
+                    "vault_auth_method": "token",
+                    "vault_token_file": vault_token_file,
+                },
+            )
         for key in crypto_keys:
             key_versions = provider.get_key_versions(key)
             if not key_versions:
@@ -459,6 +587,7 @@ def sync_crypto_secrets(
             secret_signature=_get_dict_signature(secret_data),
             kube_client=kube_client,
             namespace=instance_config.get_namespace(),
+            signature_index=signature_index,
         )
 
     return True
@@ -469,6 +598,7 @@ def sync_boto_secrets(
     cluster: str,
     service: str,
     soa_dir: str,
+    signature_index: Optional[SecretSignatureIndex] = None,
 ) -> bool:
     config_loader = PaastaServiceConfigLoader(service=service, soa_dir=soa_dir)
     for instance_config in config_loader.instance_configs(
@@ -506,6 +636,7 @@ def sync_boto_secrets(
             secret_signature=_get_dict_signature(secret_data),
             kube_client=kube_client,
             namespace=instance_config.get_namespace(),
+            signature_index=signature_index,
         )
     return True
 
@@ -524,15 +655,20 @@ def create_or_update_k8s_secret(
     secret_signature: str,
     kube_client: KubeClient,
     namespace: str,
+    signature_index: Optional[SecretSignatureIndex] = None,
 ) -> None:
     """
     :param get_secret_data: is a function to postpone fetching data in order to reduce service load, e.g. Vault API
+    :param signature_index: if given, look up the current signature there instead of fetching it
     """
-    kubernetes_signature = get_secret_signature(
-        kube_client=kube_client,
-        signature_name=signature_name,
-        namespace=namespace,
-    )
+    if signature_index is not None:
+        kubernetes_signature = signature_index.get(namespace, signature_name)
+    else:
+        kubernetes_signature = get_secret_signature(
+            kube_client=kube_client,
+            signature_name=signature_name,
+            namespace=namespace,
+        )
 
     if not kubernetes_signature:
         log.info(f"{secret_name} for {service} in {namespace} not found, creating")
@@ -565,6 +701,8 @@ def create_or_update_k8s_secret(
             secret_signature=secret_signature,
             namespace=namespace,
         )
+        if signature_index is not None:
+            signature_index.set(namespace, signature_name, secret_signature)
     elif secret_signature != kubernetes_signature:
         log.info(
             f"{secret_name} for {service} in {namespace} needs updating as signature changed"
@@ -583,6 +721,8 @@ def create_or_update_k8s_secret(
             secret_signature=secret_signature,
             namespace=namespace,
         )
+        if signature_index is not None:
+            signature_index.set(namespace, signature_name, secret_signature)
     else:
         log.info(f"{secret_name} for {service} in {namespace} up to date")
 
@@ -0,0 +1,259 @@
+# Copyright 2015-2021 Yelp Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+A minimal informer: an in-memory cache of Kubernetes objects that is filled by
+a single list call and then kept up to date by watching from the list's
+resourceVersion, the same way client-go's informers work.
+"""
+import logging
+import math
+import threading
+import time
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Hashable
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from kubernetes import watch
+from kubernetes.client.rest import ApiException
+
+log = logging.getLogger(__name__)
+
+HTTP_STATUS_GONE = 410
+# how much longer than the API server takes to end a watch we wait for it
+# before deciding that the connection has hung
+WATCH_REQUEST_TIMEOUT_SLACK_SECONDS = 30
+
+# (namespace, name)
+ObjectKey = Tuple[str, str]
+# called with the event type ("ADDED", "MODIFIED" or "DELETED"), the previously
+# cached object (if any) and the new object
+EventHandler = Callable[[str, Optional[Any], Any], None]
+# maps an object to the key it can be looked up by with KubeInformer.by_index
+IndexFunc = Callable[[Any], Hashable]
+
+
+def object_key(obj: Any) -> ObjectKey:
+    return obj.metadata.namespace, obj.metadata.name
+
+
+class KubeInformer:
+    def __init__(
+        self,
+        list_func: Callable[..., Any],
+        label_selector: str = "",
+        on_event: Optional[EventHandler] = None,
+        watch_timeout_seconds: int = 300,
+        error_backoff_seconds: float = 5,
+        index_func: Optional[IndexFunc] = None,
+        list_timeout_seconds: float = 60,
+        namespace: Optional[str] = None,
+    ) -> None:
+        """
+        :param list_func: a kubernetes client list function that supports
+            watching, e.g. ``kube_client.deployments.list_deployment_for_all_namespaces``
+        :param namespace: only cache objects in this namespace. list_func must
+            then be a namespaced list function, e.g. ``kube_client.core.list_namespaced_pod``
+        :param label_selector: only cache objects matching this label selector
+        :param on_event: called from the watch thread for every change to the cache
+        :param watch_timeout_seconds: how long a single watch request lasts
+            before being transparently restarted from the last resourceVersion.
+            A watch that hasn't ended a little while after that is given up on,
+            so that a hung connection can't silently stop the cache updating
+        :param list_timeout_seconds: how long to wait for the list request
+        :param index_func: if given, also index the cached objects by the key
+            it returns for them, so that they can be looked up with by_index
+        """
+        self.list_func = list_func
+        self.namespace = namespace
+        self.label_selector = label_selector
+        self.on_event = on_event
+        self.index_func = index_func
+        self.watch_timeout_seconds = watch_timeout_seconds
+        self.list_timeout_seconds = list_timeout_seconds
+        self.error_backoff_seconds = error_backoff_seconds
+
+        self.resource_version: Optional[str] = None
+        self.last_sync_time: Optional[float] = None
+        self._objects: Dict[ObjectKey, Any] = {}
+        self._index: Dict[Hashable, Dict[ObjectKey, Any]] = {}
+        # when we stopped being sure that the cache is up to date
+        self._stale_since: Optional[float] = None
+        self._lock = threading.Lock()
+        self._watch: Optional[watch.Watch] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    def list(self) -> List[Any]:
+        with self._lock:
+            return list(self._objects.values())
+
+    def get(self, namespace: str, name: str) -> Optional[Any]:
+        with self._lock:
+            return self._objects.get((namespace, name))
+
+    def by_index(self, index_key: Hashable) -> List[Any]:
+        with self._lock:
+            return list(self._index.get(index_key, {}).values())
+
+    def has_synced(self) -> bool:
+        return self.last_sync_time is not None
+
+    def staleness(self) -> float:
+        """How many seconds the cache may have been missing changes for: 0
+        while its watch is working, infinity before the first list."""
+        last_sync_time = self.last_sync_time
+        if last_sync_time is None:
+            return math.inf
+        stale_since = self._stale_since
+        if stale_since is None:
+            # a working watch gets an event, or ends and is restarted, at
+            # least every watch_timeout_seconds, so one that has been quiet
+            # for longer than that may have hung
+            stale_since = last_sync_time + self.watch_timeout_seconds
+        return max(0.0, time.time() - stale_since)
+
+    def _list_args(self) -> Tuple[str, ...]:
+        if self.namespace is None:
+            return ()
+        return (self.namespace,)
+
+    def _describe(self) -> str:
+        if self.namespace is not None:
+            return f"{self.list_func.__name__}({self.namespace})"
+        return self.list_func.__name__
+
+    def _add_to_index(self, key: ObjectKey, obj: Any) -> None:
+        if self.index_func is not None:
+            self._index.setdefault(self.index_func(obj), {})[key] = obj
+
+    def _remove_from_index(self, key: ObjectKey, obj: Any) -> None:
+        if self.index_func is not None:
+            index_key = self.index_func(obj)
+            objects = self._index.get(index_key)
+            if objects is not None:
+                objects.pop(key, None)
+                if not objects:
+                    del self._index[index_key]
+
+    def relist(self) -> None:
+        """Replace the cache with a fresh list from the API server."""
+        response = self.list_func(
+            *self._list_args(),
+            label_selector=self.label_selector,
+            _request_timeout=self.list_timeout_seconds,
+        )
+        objects = {object_key(item): item for item in response.items}
+        with self._lock:
+            previous = self._objects
+            self._objects = objects
+            self._index = {}
+            for key, obj in objects.items():
+                self._add_to_index(key, obj)
+            self.resource_version = response.metadata.resource_version
+            self.last_sync_time = time.time()
+            self._stale_since = None
+
+        if self.on_event is not None:
+            for key, obj in objects.items():
+                old = previous.get(key)
+                if old is None:
+                    self.on_event("ADDED", None, obj)
+                elif old.metadata.resource_version != obj.metadata.resource_version:
+                    self.on_event("MODIFIED", old, obj)
+            for key, old in previous.items():
+                if key not in objects:
+                    self.on_event("DELETED", old, old)
+
+    def handle_event(self, event_type: str, obj: Any) -> None:
+        key = object_key(obj)
+        with self._lock:
+            old = self._objects.get(key)
+            if old is not None:
+                self._remove_from_index(key, old)
+            if event_type == "DELETED":
+                self._objects.pop(key, None)
+            else:
+                self._objects[key] = obj
+                self._add_to_index(key, obj)
+            self.resource_version = obj.metadata.resource_version
+            self.last_sync_time = time.time()
+            self._stale_since = None
+        if self.on_event is not None:
+            self.on_event(event_type, old, obj)
+
+    def watch_once(self) -> None:
+        """Stream events from the last seen resourceVersion until the watch
+        request times out, relisting if that resourceVersion is too old."""
+        self._watch = watch.Watch()
+        try:
+            for event in self._watch.stream(
+                self.list_func,
+                *self._list_args(),
+                label_selector=self.label_selector,
+                resource_version=self.resource_version,
+                timeout_seconds=self.watch_timeout_seconds,
+                _request_timeout=self.watch_timeout_seconds
+                + WATCH_REQUEST_TIMEOUT_SLACK_SECONDS,
+            ):
+                if event["type"] in ("ADDED", "MODIFIED", "DELETED"):
+                    self.handle_event(event["type"], event["object"])
+                if self._stopped.is_set():
+                    break
+        except ApiException as e:
+            if e.status != HTTP_STATUS_GONE:
+                raise
+            log.info(
+                f"resourceVersion {self.resource_version} is too old to watch from, relisting"
+            )
+            self.relist()
+        else:
+            # an idle watch that ended normally still means we were in sync
+            self.last_sync_time = time.time()
+            self._stale_since = None
+
+    def run(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                if self.resource_version is None:
+                    self.relist()
+                self.watch_once()
+            except Exception:
+                if self._stale_since is None:
+                    self._stale_since = time.time()
+                log.exception(
+                    f"Error while watching {self._describe()}, retrying in "
+                    f"{self.error_backoff_seconds}s"
+                )
+                self._stopped.wait(self.error_backoff_seconds)
+
+    def start(self, wait_for_sync: bool = True) -> None:
+        """Do the initial list (synchronously, unless wait_for_sync is False),
+        then keep the cache up to date from a background thread."""
+        if wait_for_sync:
+            self.relist()
+        self._thread = threading.Thread(
+            target=self.run,
+            name=f"informer-{self._describe()}",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._watch is not None:
+            self._watch.stop()
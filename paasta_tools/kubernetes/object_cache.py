@@ -0,0 +1,202 @@
+# Copyright 2015-2021 Yelp Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Watch-driven in-memory copies of the Pods, ReplicaSets, ControllerRevisions and
+HPAs that paasta-api's instance status endpoints read, so that polling the
+status of many instances doesn't turn into a burst of list calls against the
+Kubernetes API server for every request.
+
+Readers must be ready for the cache not to have an answer (before the first
+list has completed, when a watch has been failing for longer than
+max_staleness_seconds, or for a namespace that isn't cached), and list from the
+API server directly in that case.
+"""
+import logging
+import math
+import threading
+from typing import Any
+from typing import Callable
+from typing import Collection
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from paasta_tools.kubernetes.informer import KubeInformer
+from paasta_tools.metrics import metrics_lib
+
+log = logging.getLogger(__name__)
+
+SERVICE_LABEL = "paasta.yelp.com/service"
+INSTANCE_LABEL = "paasta.yelp.com/instance"
+
+
+def service_instance_key(obj: Any) -> Tuple[Optional[str], Optional[str]]:
+    labels = obj.metadata.labels or {}
+    return labels.get(SERVICE_LABEL), labels.get(INSTANCE_LABEL)
+
+
+class KubeObjectCache:
+    def __init__(
+        self,
+        kube_client: Any,
+        max_staleness_seconds: float = 60,
+        metrics_interface: metrics_lib.BaseMetrics = metrics_lib.NoMetrics("paasta"),
+        report_interval_seconds: float = 60,
+        namespaces: Optional[Collection[str]] = None,
+        watch_timeout_seconds: int = 60,
+    ) -> None:
+        """
+        :param kube_client: a paasta_tools.kubernetes_tools.KubeClient
+        :param max_staleness_seconds: stop answering from a cache whose watch
+            has been failing for longer than this
+        :param report_interval_seconds: how often to emit the staleness gauges
+        :param namespaces: only cache objects in these namespaces, rather than
+            in every namespace of the cluster. Reads for other namespaces fall
+            back to the API server.
+        :param watch_timeout_seconds: how long each watch request lasts. A
+            watch that has hung is noticed this long after its last event.
+        """
+        self.max_staleness_seconds = max_staleness_seconds
+        self.report_interval_seconds = report_interval_seconds
+        self.namespaces = namespaces
+        list_funcs: Dict[str, Tuple[Callable[..., Any], Callable[..., Any]]] = {
+            "pods": (
+                kube_client.core.list_pod_for_all_namespaces,
+                kube_client.core.list_namespaced_pod,
+            ),
+            "replicasets": (
+                kube_client.deployments.list_replica_set_for_all_namespaces,
+                kube_client.deployments.list_namespaced_replica_set,
+            ),
+            "controller_revisions": (
+                kube_client.deployments.list_controller_revision_for_all_namespaces,
+                kube_client.deployments.list_namespaced_controller_revision,
+            ),
+            "hpas": (
+                kube_client.autoscaling.list_horizontal_pod_autoscaler_for_all_namespaces,
+                kube_client.autoscaling.list_namespaced_horizontal_pod_autoscaler,
+            ),
+        }
+        # kind -> namespace (or None for all of them) -> informer
+        self.informers: Dict[str, Dict[Optional[str], KubeInformer]] = {}
+        for kind, (list_all_func, list_namespaced_func) in list_funcs.items():
+            # the HPAs we create aren't labelled, so they're looked up by name
+            labelled = kind != "hpas"
+            informer_kwargs: Dict[str, Any] = dict(
+                label_selector=SERVICE_LABEL if labelled else "",
+                index_func=service_instance_key if labelled else None,
+                watch_timeout_seconds=watch_timeout_seconds,
+            )
+            if namespaces is None:
+                self.informers[kind] = {
+                    None: KubeInformer(list_func=list_all_func, **informer_kwargs)
+                }
+            else:
+                self.informers[kind] = {
+                    namespace: KubeInformer(
+                        list_func=list_namespaced_func,
+                        namespace=namespace,
+                        **informer_kwargs,
+                    )
+                    for namespace in namespaces
+                }
+        self.staleness_gauges = {
+            kind: metrics_interface.create_gauge(
+                "paasta_api.kube_object_cache.staleness_seconds", kind=kind
+            )
+            for kind in self.informers
+        }
+        self._stopped = threading.Event()
+
+    def start(self) -> None:
+        """Start filling and watching every cache in the background. Until a
+        cache's first list is done, reads of it fall back to the API server."""
+        for informer in self._all_informers():
+            informer.start(wait_for_sync=False)
+        threading.Thread(
+            target=self.report_staleness_forever,
+            name="kube-object-cache-staleness",
+            daemon=True,
+        ).start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        for informer in self._all_informers():
+            informer.stop()
+
+    def _all_informers(self) -> List[KubeInformer]:
+        return [
+            informer
+            for informers in self.informers.values()
+            for informer in informers.values()
+        ]
+
+    def _informer(self, kind: str, namespace: str) -> Optional[KubeInformer]:
+        """The informer caching objects of a kind in a namespace, if any."""
+        informers = self.informers[kind]
+        if None in informers:
+            return informers[None]
+        return informers.get(namespace)
+
+    def staleness(self, kind: str) -> float:
+        """The staleness of the stalest namespace of a kind."""
+        return max(
+            (informer.staleness() for informer in self.informers[kind].values()),
+            default=math.inf,
+        )
+
+    def _fresh_informer(self, kind: str, namespace: str) -> Optional[KubeInformer]:
+        informer = self._informer(kind, namespace)
+        if informer is None or informer.staleness() > self.max_staleness_seconds:
+            return None
+        return informer
+
+    def report_staleness(self) -> None:
+        for kind, gauge in self.staleness_gauges.items():
+            staleness = self.staleness(kind)
+            # a cache that hasn't been filled yet is reported as -1
+            gauge.set(staleness if staleness != math.inf else -1)
+
+    def report_staleness_forever(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                self.report_staleness()
+            except Exception:
+                log.exception("Error while reporting kube object cache staleness")
+            self._stopped.wait(self.report_interval_seconds)
+
+    def list_for_service_instance(
+        self, kind: str, service: str, instance: str, namespace: str
+    ) -> Optional[List[Any]]:
+        """The cached objects of a kind with the given service and instance
+        labels in a namespace, or None if that namespace isn't cached or its
+        cache is too stale to use."""
+        informer = self._fresh_informer(kind, namespace)
+        if informer is None:
+            return None
+        return [
+            obj
+            for obj in informer.by_index((service, instance))
+            if obj.metadata.namespace == namespace
+        ]
+
+    def get(self, kind: str, namespace: str, name: str) -> Tuple[bool, Optional[Any]]:
+        """Returns (True, the object or None if it doesn't exist), or
+        (False, None) if that namespace isn't cached or its cache is too stale
+        to use."""
+        informer = self._fresh_informer(kind, namespace)
+        if informer is None:
+            return False, None
+        return True, informer.get(namespace, name)
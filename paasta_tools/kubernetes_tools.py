@@ -18,11 +18,18 @@ import logging
 import math
 import os
 import re
+import threading
+from collections import defaultdict
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from datetime import timezone
 from enum import Enum
+from functools import partial
 from inspect import currentframe
 from pathlib import Path
 from typing import Any
+from typing import cast
 from typing import Collection
 from typing import Container
 from typing import Dict
@@ -32,9 +39,11 @@ from typing import Mapping
 from typing import MutableMapping
 from typing import NamedTuple
 from typing import Optional
+from typing import overload
 from typing import Sequence
 from typing import Set
 from typing import Tuple
+from typing import TypeVar
 from typing import Union
 
 import a_sync
@@ -119,9 +128,11 @@ from kubernetes.client.models import V2beta2HorizontalPodAutoscalerStatus
 from kubernetes.client.rest import ApiException
 from mypy_extensions import TypedDict
 from service_configuration_lib import read_soa_metadata
+from urllib3.response import HTTPResponse
 
 from paasta_tools import __version__
 from paasta_tools.async_utils import async_timeout
+from paasta_tools.kubernetes.object_cache import KubeObjectCache
 from paasta_tools.long_running_service_tools import AutoscalingParamsDict
 from paasta_tools.long_running_service_tools import host_passes_blacklist
 from paasta_tools.long_running_service_tools import host_passes_whitelist
@@ -187,6 +198,8 @@ DISCOVERY_ATTRIBUTES = {
 
 GPU_RESOURCE_NAME = "nvidia.com/gpu"
 DEFAULT_STORAGE_CLASS_NAME = "ebs"
+DEFAULT_POD_LIST_PAGE_SIZE = 500
+DEFAULT_POD_LIST_CONCURRENCY = 8
 DEFAULT_PRESTOP_SLEEP_SECONDS = 30
 DEFAULT_HADOWN_PRESTOP_SLEEP_SECONDS = DEFAULT_PRESTOP_SLEEP_SECONDS + 1
 
@@ -604,6 +617,115 @@ def registration_label(namespace: str) -> str:
     return f"registrations.{PAASTA_ATTRIBUTE_PREFIX}{limited_namespace}"
 
 
+def copy_kube_object(obj: Any) -> Any:
+    """Deep copy a kubernetes client model object.
+
+    copy.deepcopy also copies the client Configuration that every model holds
+    a reference to, which makes it slower than building the object again.
+    """
+    if isinstance(obj, list):
+        return [copy_kube_object(item) for item in obj]
+    if isinstance(obj, dict):
+        return {key: copy_kube_object(value) for key, value in obj.items()}
+    if hasattr(obj, "openapi_types"):
+        new = obj.__class__.__new__(obj.__class__)
+        for attr, value in obj.__dict__.items():
+            if attr != "local_vars_configuration":
+                value = copy_kube_object(value)
+            new.__dict__[attr] = value
+        return new
+    # everything else in a model (str, int, bool, datetime, ...) is immutable
+    return obj
+
+
+class FormattedAppCache:
+    """A bounded LRU cache of formatted Deployments/StatefulSets, keyed by a
+    digest of everything that went into formatting them (see
+    KubernetesDeploymentConfig.get_formatted_app_cache_key).
+
+    Entries are copied on the way in and out, as callers are free to mutate
+    the objects they get back from format_kubernetes_app.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Union[V1Deployment, V1StatefulSet]]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[Union[V1Deployment, V1StatefulSet]]:
+        with self._lock:
+            app = self._entries.get(key)
+            if app is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return copy_kube_object(app)
+
+    def put(self, key: str, app: Union[V1Deployment, V1StatefulSet]) -> None:
+        app = copy_kube_object(app)
+        with self._lock:
+            self._entries[key] = app
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+
+_formatted_app_cache: Optional[FormattedAppCache] = None
+
+
+def enable_formatted_app_cache(max_size: int = 10000) -> FormattedAppCache:
+    """Make format_kubernetes_app reuse its previous result for instances whose
+    inputs have not changed. This only pays off in long-running processes that
+    format the same instances over and over, so it is off by default."""
+    global _formatted_app_cache
+    _formatted_app_cache = FormattedAppCache(max_size=max_size)
+    return _formatted_app_cache
+
+
+def disable_formatted_app_cache() -> None:
+    global _formatted_app_cache
+    _formatted_app_cache = None
+
+
+_kube_object_cache: Optional[KubeObjectCache] = None
+
+
+def enable_kube_object_cache(cache: KubeObjectCache) -> None:
+    """Make pods_for_service_instance, replicasets_for_service_instance,
+    controller_revisions_for_service_instance and get_hpa read from a
+    watch-driven KubeObjectCache whenever it is fresh enough, instead of
+    making a request to the Kubernetes API server."""
+    global _kube_object_cache
+    _kube_object_cache = cache
+
+
+def disable_kube_object_cache() -> None:
+    global _kube_object_cache
+    _kube_object_cache = None
+
+
+def get_kube_object_cache() -> Optional[KubeObjectCache]:
+    return _kube_object_cache
+
+
+def _cached_for_service_instance(
+    kind: str, service: str, instance: str, namespace: str
+) -> Optional[List[Any]]:
+    if _kube_object_cache is None:
+        return None
+    return _kube_object_cache.list_for_service_instance(
+        kind, service, instance, namespace
+    )
+
+
 class KubernetesDeploymentConfig(LongRunningServiceConfig):
     config_dict: KubernetesDeploymentConfigDict
 
@@ -1805,11 +1927,73 @@ class KubernetesDeploymentConfig(LongRunningServiceConfig):
         """Get sts pod_management_policy from config, default to 'OrderedReady'"""
         return self.config_dict.get("pod_management_policy", "OrderedReady")
 
+    def get_formatted_app_cache_key(
+        self,
+        system_paasta_config: SystemPaastaConfig,
+        secret_hashes: Mapping[str, str],
+    ) -> str:
+        """Returns a digest of every input to format_kubernetes_app: the merged
+        instance config and deployments.json entry, the system config, the
+        other soa-configs files it reads and the current secret signatures."""
+        inputs = {
+            "service": self.service,
+            "instance": self.instance,
+            "cluster": self.cluster,
+            "soa_dir": self.soa_dir,
+            "config_dict": self.config_dict,
+            "branch_dict": self.branch_dict,
+            "system_paasta_config": system_paasta_config.config_dict,
+            "service_configuration": service_configuration_lib.read_service_configuration(
+                self.service, soa_dir=self.soa_dir
+            ),
+            "service_namespace_config": load_service_namespace_config(
+                service=self.service, namespace=self.get_nerve_namespace()
+            ),
+            "soa_metadata": read_soa_metadata(soa_dir=self.soa_dir),
+            "secret_hashes": secret_hashes,
+        }
+        return hashlib.sha256(
+            json.dumps(inputs, sort_keys=True, default=str).encode("UTF-8")
+        ).hexdigest()
+
     def format_kubernetes_app(self) -> Union[V1Deployment, V1StatefulSet]:
-        """Create the configuration that will be passed to the Kubernetes REST API."""
+        """Create the configuration that will be passed to the Kubernetes REST API.
+
+        If the formatted app cache is enabled (see enable_formatted_app_cache)
+        and nothing this instance depends on changed since it was last
+        formatted, a copy of the previous result is returned instead.
+        """
+        cache = _formatted_app_cache
+        if cache is None:
+            return self._format_kubernetes_app()
 
         try:
             system_paasta_config = load_system_paasta_config()
+            secret_hashes = self.get_secret_hashes()
+            cache_key = self.get_formatted_app_cache_key(
+                system_paasta_config=system_paasta_config,
+                secret_hashes=secret_hashes,
+            )
+        except Exception as e:
+            raise InvalidKubernetesConfig(e, self.get_service(), self.get_instance())
+
+        complete_config = cache.get(cache_key)
+        if complete_config is None:
+            complete_config = self._format_kubernetes_app(
+                system_paasta_config=system_paasta_config,
+                secret_hashes=secret_hashes,
+            )
+            cache.put(cache_key, complete_config)
+        return complete_config
+
+    def _format_kubernetes_app(
+        self,
+        system_paasta_config: Optional[SystemPaastaConfig] = None,
+        secret_hashes: Optional[Mapping[str, str]] = None,
+    ) -> Union[V1Deployment, V1StatefulSet]:
+        try:
+            if system_paasta_config is None:
+                system_paasta_config = load_system_paasta_config()
             docker_url = self.get_docker_url()
             git_sha = get_git_sha_from_dockerurl(docker_url, long=True)
             complete_config: Union[V1StatefulSet, V1Deployment]
@@ -1871,7 +2055,9 @@ class KubernetesDeploymentConfig(LongRunningServiceConfig):
 
             # DO NOT ADD LABELS AFTER THIS LINE
             config_hash = get_config_hash(
-                self.sanitize_for_config_hash(complete_config),
+                self.sanitize_for_config_hash(
+                    complete_config, secret_hashes=secret_hashes
+                ),
                 force_bounce=self.get_force_bounce(),
             )
             complete_config.metadata.labels["yelp.com/paasta_config_sha"] = config_hash
@@ -2219,21 +2405,30 @@ class KubernetesDeploymentConfig(LongRunningServiceConfig):
             labels[PAASTA_ATTRIBUTE_PREFIX + "instance"] = condition.get("instance")
         return V1LabelSelector(match_labels=labels) if labels else None
 
+    def get_secret_hashes(self) -> Mapping[str, str]:
+        return get_kubernetes_secret_hashes(
+            service=self.get_service(),
+            environment_variables=self.get_env(),
+            namespace=self.get_namespace(),
+        )
+
     def sanitize_for_config_hash(
-        self, config: Union[V1Deployment, V1StatefulSet]
+        self,
+        config: Union[V1Deployment, V1StatefulSet],
+        secret_hashes: Optional[Mapping[str, str]] = None,
     ) -> Mapping[str, Any]:
         """Removes some data from config to make it suitable for
         calculation of config hash.
 
         :param config: complete_config hash to sanitise
+        :param secret_hashes: the signatures of the secrets used by this
+            instance, if the caller already looked them up
         :returns: sanitised copy of complete_config hash
         """
         ahash = config.to_dict()  # deep convert to dict
-        ahash["paasta_secrets"] = get_kubernetes_secret_hashes(
-            service=self.get_service(),
-            environment_variables=self.get_env(),
-            namespace=self.get_namespace(),
-        )
+        if secret_hashes is None:
+            secret_hashes = self.get_secret_hashes()
+        ahash["paasta_secrets"] = secret_hashes
 
         # remove data we dont want used to hash configs
         # replica count
@@ -2513,6 +2708,22 @@ def ensure_paasta_api_rolebinding(kube_client: KubeClient, namespace: str) -> No
         )
 
 
+def kube_deployment_from_controller(
+    item: Union[V1Deployment, V1StatefulSet]
+) -> KubeDeployment:
+    return KubeDeployment(
+        service=item.metadata.labels["paasta.yelp.com/service"],
+        instance=item.metadata.labels["paasta.yelp.com/instance"],
+        git_sha=item.metadata.labels.get("paasta.yelp.com/git_sha", ""),
+        image_version=item.metadata.labels.get("paasta.yelp.com/image_version", None),
+        namespace=item.metadata.namespace,
+        config_sha=item.metadata.labels.get("paasta.yelp.com/config_sha", ""),
+        replicas=item.spec.replicas
+        if item.metadata.labels.get(paasta_prefixed("autoscaled"), "false") == "false"
+        else None,
+    )
+
+
 def list_deployments_in_all_namespaces(
     kube_client: KubeClient, label_selector: str
 ) -> List[KubeDeployment]:
@@ -2523,20 +2734,7 @@ def list_deployments_in_all_namespaces(
         label_selector=label_selector
     )
     return [
-        KubeDeployment(
-            service=item.metadata.labels["paasta.yelp.com/service"],
-            instance=item.metadata.labels["paasta.yelp.com/instance"],
-            git_sha=item.metadata.labels.get("paasta.yelp.com/git_sha", ""),
-            image_version=item.metadata.labels.get(
-                "paasta.yelp.com/image_version", None
-            ),
-            namespace=item.metadata.namespace,
-            config_sha=item.metadata.labels.get("paasta.yelp.com/config_sha", ""),
-            replicas=item.spec.replicas
-            if item.metadata.labels.get(paasta_prefixed("autoscaled"), "false")
-            == "false"
-            else None,
-        )
+        kube_deployment_from_controller(item)
         for item in deployments.items + stateful_sets.items
     ]
 
@@ -2969,6 +3167,9 @@ def list_matching_deployments_in_all_namespaces(
 async def replicasets_for_service_instance(
     service: str, instance: str, kube_client: KubeClient, namespace: str = "paasta"
 ) -> Sequence[V1ReplicaSet]:
+    cached = _cached_for_service_instance("replicasets", service, instance, namespace)
+    if cached is not None:
+        return cached
     async_list_replica_set = a_sync.to_async(
         kube_client.deployments.list_namespaced_replica_set
     )
@@ -2983,6 +3184,11 @@ async def replicasets_for_service_instance(
 async def controller_revisions_for_service_instance(
     service: str, instance: str, kube_client: KubeClient, namespace: str = "paasta"
 ) -> Sequence[V1ControllerRevision]:
+    cached = _cached_for_service_instance(
+        "controller_revisions", service, instance, namespace
+    )
+    if cached is not None:
+        return cached
     async_list_controller_revisions = a_sync.to_async(
         kube_client.deployments.list_namespaced_controller_revision
     )
@@ -2997,6 +3203,9 @@ async def controller_revisions_for_service_instance(
 async def pods_for_service_instance(
     service: str, instance: str, kube_client: KubeClient, namespace: str = "paasta"
 ) -> Sequence[V1Pod]:
+    cached = _cached_for_service_instance("pods", service, instance, namespace)
+    if cached is not None:
+        return cached
     async_list_pods = a_sync.to_async(kube_client.core.list_namespaced_pod)
     response = await async_list_pods(
         label_selector=f"paasta.yelp.com/service={service},paasta.yelp.com/instance={instance}",
@@ -3015,7 +3224,131 @@ def get_all_pods(kube_client: KubeClient, namespace: str = "paasta") -> List[V1P
     return kube_client.core.list_namespaced_pod(namespace=namespace).items
 
 
-@time_cache(ttl=300)
+class SlimOwnerReference(NamedTuple):
+    kind: str
+    name: str
+
+
+class SlimPodCondition(NamedTuple):
+    type: str
+    status: str
+    reason: Optional[str]
+
+
+class SlimPodMetadata(NamedTuple):
+    name: str
+    namespace: str
+    labels: Dict[str, str]
+    owner_references: List[SlimOwnerReference]
+
+
+class SlimPodSpec(NamedTuple):
+    node_name: Optional[str]
+
+
+class SlimPodStatus(NamedTuple):
+    phase: Optional[str]
+    pod_ip: Optional[str]
+    start_time: Optional[datetime]
+    conditions: List[SlimPodCondition]
+
+
+class SlimPod(NamedTuple):
+    """The parts of a V1Pod that the replication checks look at, with the same
+    attribute names, so that is_pod_ready, filter_pods_by_service_instance and
+    PodIndex work on either."""
+
+    metadata: SlimPodMetadata
+    spec: SlimPodSpec
+    status: SlimPodStatus
+
+
+AnyPod = Union[V1Pod, SlimPod]
+_AnyPodT = TypeVar("_AnyPodT", bound=AnyPod)
+
+
+def _parse_kube_timestamp(timestamp: Optional[str]) -> Optional[datetime]:
+    if timestamp is None:
+        return None
+    return datetime.strptime(timestamp, "%Y-%m-%dT%H:%M:%SZ").replace(
+        tzinfo=timezone.utc
+    )
+
+
+def slim_pod_from_dict(pod: Dict[str, Any]) -> SlimPod:
+    """Builds a SlimPod from a pod as returned by the API, as a plain dict."""
+    metadata = pod["metadata"]
+    spec = pod.get("spec") or {}
+    status = pod.get("status") or {}
+    return SlimPod(
+        metadata=SlimPodMetadata(
+            name=metadata["name"],
+            namespace=metadata.get("namespace"),
+            labels=metadata.get("labels") or {},
+            owner_references=[
+                SlimOwnerReference(kind=ref["kind"], name=ref["name"])
+                for ref in metadata.get("ownerReferences") or []
+            ],
+        ),
+        spec=SlimPodSpec(node_name=spec.get("nodeName")),
+        status=SlimPodStatus(
+            phase=status.get("phase"),
+            pod_ip=status.get("podIP"),
+            start_time=_parse_kube_timestamp(status.get("startTime")),
+            conditions=[
+                SlimPodCondition(
+                    type=cond["type"],
+                    status=cond["status"],
+                    reason=cond.get("reason"),
+                )
+                for cond in status.get("conditions") or []
+            ],
+        ),
+    )
+
+
+def get_all_pods_slim(
+    kube_client: KubeClient,
+    namespace: str = "paasta",
+    page_size: int = DEFAULT_POD_LIST_PAGE_SIZE,
+) -> List[SlimPod]:
+    """Like get_all_pods, but a page of page_size pods at a time, and without
+    deserializing them into V1Pods, which is most of the time and memory it
+    takes to list the pods of a large namespace."""
+    pods: List[SlimPod] = []
+    continue_token = None
+    while True:
+        # without _preload_content, the client returns the raw HTTP response
+        response = cast(
+            HTTPResponse,
+            kube_client.core.list_namespaced_pod(
+                namespace=namespace,
+                limit=page_size,
+                _continue=continue_token,
+                _preload_content=False,
+            ),
+        )
+        page = json.loads(response.data)
+        pods.extend(slim_pod_from_dict(pod) for pod in page["items"])
+        continue_token = page["metadata"].get("continue")
+        if not continue_token:
+            return pods
+
+
+def get_all_pods_slim_in_namespaces(
+    kube_client: KubeClient,
+    namespaces: Iterable[str],
+    concurrency: int = DEFAULT_POD_LIST_CONCURRENCY,
+    page_size: int = DEFAULT_POD_LIST_PAGE_SIZE,
+) -> List[SlimPod]:
+    """get_all_pods_slim for several namespaces, listing up to concurrency of
+    them at once. Pods are returned in the order of namespaces."""
+    list_pods = partial(get_all_pods_slim, kube_client, page_size=page_size)
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        return list(itertools.chain.from_iterable(pool.map(list_pods, namespaces)))
+
+
+@time_cache(ttl=300, maxsize=8, stale_ttl=300, name="get_all_pods_cached")
 def get_all_pods_cached(
     kube_client: KubeClient, namespace: str = "paasta"
 ) -> Sequence[V1Pod]:
@@ -3023,9 +3356,51 @@ def get_all_pods_cached(
     return pods
 
 
+class PodIndex(Sequence[_AnyPodT]):
+    """A list of pods (V1Pods or SlimPods) that is also indexed by service and
+    instance labels, so that looking up the pods of every instance in a
+    cluster is linear in the number of pods rather than quadratic.
+
+    Can be passed anywhere a Sequence of those pods is expected, and
+    filter_pods_by_service_instance will use the index.
+    """
+
+    def __init__(self, pods: Iterable[_AnyPodT]) -> None:
+        self._pods = list(pods)
+        self._by_service_instance: Dict[Tuple[str, str], List[_AnyPodT]] = defaultdict(
+            list
+        )
+        for pod in self._pods:
+            labels = pod.metadata.labels
+            if labels is None:
+                continue
+            self._by_service_instance[
+                (
+                    labels.get("paasta.yelp.com/service", ""),
+                    labels.get("paasta.yelp.com/instance", ""),
+                )
+            ].append(pod)
+
+    def __getitem__(self, index: Any) -> Any:
+        return self._pods[index]
+
+    def __len__(self) -> int:
+        return len(self._pods)
+
+    def get_pods(
+        self, service: str, instance: str, namespace: Optional[str] = None
+    ) -> List[_AnyPodT]:
+        pods = self._by_service_instance.get((service, instance), [])
+        if namespace is not None:
+            pods = [pod for pod in pods if pod.metadata.namespace == namespace]
+        return pods
+
+
 def filter_pods_by_service_instance(
-    pod_list: Sequence[V1Pod], service: str, instance: str
-) -> Sequence[V1Pod]:
+    pod_list: Sequence[_AnyPodT], service: str, instance: str
+) -> Sequence[_AnyPodT]:
+    if isinstance(pod_list, PodIndex):
+        return pod_list.get_pods(service=service, instance=instance)
     return [
         pod
         for pod in pod_list
@@ -3036,7 +3411,7 @@ def filter_pods_by_service_instance(
 
 
 def _is_it_ready(
-    it: Union[V1Pod, V1Node],
+    it: Union[V1Pod, SlimPod, V1Node],
 ) -> bool:
     ready_conditions = [
         cond.status == "True"
@@ -3060,7 +3435,17 @@ def is_pod_scheduled(pod: V1Pod) -> bool:
     return scheduled_condition.status == "True" if scheduled_condition else False
 
 
+@overload
+def get_pod_condition(pod: SlimPod, condition: str) -> SlimPodCondition:
+    ...
+
+
+@overload
 def get_pod_condition(pod: V1Pod, condition: str) -> V1PodCondition:
+    ...
+
+
+def get_pod_condition(pod: AnyPod, condition: str) -> Any:
     conditions = [
         cond for cond in pod.status.conditions or [] if cond.type == condition
     ]
@@ -3145,7 +3530,7 @@ def get_all_nodes(
     return kube_client.core.list_node().items
 
 
-@time_cache(ttl=300)
+@time_cache(ttl=300, maxsize=8, stale_ttl=300, name="get_all_nodes_cached")
 def get_all_nodes_cached(kube_client: KubeClient) -> Sequence[V1Node]:
     nodes: Sequence[V1Node] = get_all_nodes(kube_client)
     return nodes
@@ -3341,6 +3726,10 @@ async def get_hpa(
     name: str,
     namespace: str,
 ) -> V2beta2HorizontalPodAutoscaler:
+    if _kube_object_cache is not None:
+        fresh, hpa = _kube_object_cache.get("hpas", namespace, name)
+        if fresh:
+            return hpa
     async_get_hpa = a_sync.to_async(
         kube_client.autoscaling.read_namespaced_horizontal_pod_autoscaler
     )
@@ -3489,6 +3878,28 @@ def get_secret_signature(
         return signature.data["signature"]
 
 
+def get_secret_signatures(
+    kube_client: KubeClient,
+    namespace: str,
+) -> Dict[str, str]:
+    """
+    List every secret signature in a namespace with a single API call.
+
+    :return: a mapping of signature name to signature, for every configmap
+        created by create_secret_signature
+    :raises ApiException:
+    """
+    config_maps = kube_client.core.list_namespaced_config_map(
+        namespace=namespace,
+        label_selector="paasta.yelp.com/service",
+    )
+    return {
+        config_map.metadata.name: config_map.data["signature"]
+        for config_map in config_maps.items
+        if config_map.data and "signature" in config_map.data
+    }
+
+
 def update_secret_signature(
     kube_client: KubeClient,
     service_name: str,
@@ -0,0 +1,219 @@
+# Copyright 2015-2021 Yelp Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Periodically refreshed snapshots of the capacity of a cluster, for paasta-api's
+/resources/utilization endpoint.
+
+A snapshot has one row per node, with the node's attributes and the total and
+free resources of the node, i.e. with its pods or tasks already added up. Any
+grouping and filtering of the nodes can then be answered by adding up rows,
+instead of listing and going through every node and pod of the cluster again
+for every request.
+"""
+import logging
+import threading
+import time
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Mapping
+from typing import NamedTuple
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+import a_sync
+
+from paasta_tools.kubernetes_tools import get_all_nodes
+from paasta_tools.kubernetes_tools import KubeClient
+from paasta_tools.kubernetes_tools import paasta_prefixed
+from paasta_tools.mesos.master import MesosState
+from paasta_tools.mesos_tools import get_all_tasks_from_state
+from paasta_tools.mesos_tools import get_mesos_master
+from paasta_tools.mesos_tools import is_task_terminal
+from paasta_tools.metrics.metastatus_lib import (
+    calculate_resource_utilization_for_kube_nodes,
+)
+from paasta_tools.metrics.metastatus_lib import (
+    calculate_resource_utilization_for_slaves,
+)
+from paasta_tools.metrics.metastatus_lib import group_pods_by_node
+from paasta_tools.metrics.metastatus_lib import group_tasks_by_slave
+from paasta_tools.metrics.metastatus_lib import ResourceInfo
+from paasta_tools.metrics.metastatus_lib import ResourceUtilizationDict
+
+log = logging.getLogger(__name__)
+
+GroupingKey = Tuple[Tuple[str, str], ...]
+
+
+class NodeCapacity(NamedTuple):
+    attributes: Mapping[str, str]
+    total: ResourceInfo
+    free: ResourceInfo
+
+
+def add_resource_info(a: ResourceInfo, b: ResourceInfo) -> ResourceInfo:
+    return ResourceInfo(*(x + y for x, y in zip(a, b)))
+
+
+class CapacitySnapshot:
+    def __init__(
+        self,
+        nodes: Sequence[NodeCapacity],
+        attribute_key: Callable[[str], str] = lambda attribute: attribute,
+        created_at: Optional[float] = None,
+    ) -> None:
+        """
+        :param nodes: one row per node
+        :param attribute_key: the key in a node's attributes of an attribute
+            that can be grouped or filtered by, e.g. the label of a Kubernetes
+            node
+        """
+        self.nodes = nodes
+        self.attribute_key = attribute_key
+        self.created_at = time.time() if created_at is None else created_at
+
+    def age(self) -> float:
+        return time.time() - self.created_at
+
+    def utilization(
+        self,
+        groupings: Sequence[str],
+        filters: Optional[Mapping[str, Sequence[str]]] = None,
+    ) -> Dict[GroupingKey, ResourceUtilizationDict]:
+        """Same as metastatus_lib.get_resource_utilization_by_grouping with
+        key_func_for_attribute_multi(groupings) and make_filter_slave_func for
+        each filter: the utilization of the nodes with each combination of
+        values of the grouping attributes, out of the nodes whose attributes
+        have one of the values of every filter."""
+        filter_keys = [
+            (self.attribute_key(attribute), set(values))
+            for attribute, values in (filters or {}).items()
+        ]
+        grouping_keys = [
+            (attribute, self.attribute_key(attribute)) for attribute in groupings
+        ]
+        sums: Dict[GroupingKey, List] = {}
+        for node in self.nodes:
+            if not all(
+                node.attributes.get(key) in values for key, values in filter_keys
+            ):
+                continue
+            group = tuple(
+                (attribute, node.attributes.get(key, "unknown"))
+                for attribute, key in grouping_keys
+            )
+            group_sums = sums.get(group)
+            if group_sums is None:
+                sums[group] = [node.total, node.free, 1]
+            else:
+                group_sums[0] = add_resource_info(group_sums[0], node.total)
+                group_sums[1] = add_resource_info(group_sums[1], node.free)
+                group_sums[2] += 1
+        return {
+            group: {"total": total, "free": free, "slave_count": count}
+            for group, (total, free, count) in sorted(sums.items())
+        }
+
+
+def capacity_snapshot_from_mesos_state(mesos_state: MesosState) -> CapacitySnapshot:
+    tasks = get_all_tasks_from_state(mesos_state, include_orphans=True)
+    tasks_by_slave = group_tasks_by_slave(
+        [task for task in tasks if not is_task_terminal(task)]
+    )
+    nodes = []
+    for slave in mesos_state.get("slaves", []):
+        utilization = calculate_resource_utilization_for_slaves(
+            slaves=[slave], tasks=tasks_by_slave.get(slave["id"], [])
+        )
+        nodes.append(
+            NodeCapacity(
+                # key_func_for_attribute_multi groups by hostname too
+                attributes={
+                    **slave["attributes"],
+                    "hostname": slave.get("hostname", "unknown"),
+                },
+                total=utilization["total"],
+                free=utilization["free"],
+            )
+        )
+    return CapacitySnapshot(nodes)
+
+
+def capacity_snapshot_from_mesos() -> CapacitySnapshot:
+    return capacity_snapshot_from_mesos_state(a_sync.block(get_mesos_master().state))
+
+
+def capacity_snapshot_from_kube(kube_client: KubeClient) -> CapacitySnapshot:
+    # pods that have finished don't use any capacity
+    pods = kube_client.core.list_pod_for_all_namespaces(
+        field_selector="status.phase!=Succeeded,status.phase!=Failed"
+    ).items
+    pods_by_node = group_pods_by_node(pods)
+    nodes = []
+    for node in get_all_nodes(kube_client):
+        utilization = calculate_resource_utilization_for_kube_nodes(
+            [node], pods_by_node
+        )
+        nodes.append(
+            NodeCapacity(
+                attributes=node.metadata.labels or {},
+                total=utilization["total"],
+                free=utilization["free"],
+            )
+        )
+    # same as key_func_for_attribute_multi_kube
+    return CapacitySnapshot(nodes, attribute_key=paasta_prefixed)
+
+
+class CapacitySnapshotCache:
+    def __init__(
+        self,
+        build_snapshot: Callable[[], CapacitySnapshot],
+        refresh_interval_seconds: float = 30,
+    ) -> None:
+        """
+        :param build_snapshot: takes a new snapshot, e.g.
+            partial(capacity_snapshot_from_kube, kube_client)
+        """
+        self.build_snapshot = build_snapshot
+        self.refresh_interval_seconds = refresh_interval_seconds
+        self.snapshot: Optional[CapacitySnapshot] = None
+        self._stopped = threading.Event()
+
+    def start(self) -> None:
+        """Take snapshots in the background. Until the first one is taken,
+        get() returns None."""
+        threading.Thread(
+            target=self.refresh_forever, name="capacity-snapshot", daemon=True
+        ).start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+    def refresh(self) -> None:
+        self.snapshot = self.build_snapshot()
+
+    def refresh_forever(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                self.refresh()
+            except Exception:
+                # keep answering from the last snapshot, which gets older
+                log.exception("Error while taking a capacity snapshot")
+            self._stopped.wait(self.refresh_interval_seconds)
+
+    def get(self) -> Optional[CapacitySnapshot]:
+        return self.snapshot
@@ -17,10 +17,14 @@ import itertools
 import math
 import re
 from collections import Counter
+from collections import defaultdict
 from collections import namedtuple
 from collections import OrderedDict
+from functools import lru_cache
 from typing import Any
 from typing import Callable
+from typing import Dict
+from typing import List
 from typing import Mapping
 from typing import NamedTuple
 from typing import Sequence
@@ -283,15 +287,11 @@ class ResourceParser:
 def allocated_node_resources(pods: Sequence[V1Pod]) -> Mapping[str, float]:
     cpus = mem = disk = 0
     for pod in pods:
-        cpus += sum(
-            ResourceParser.cpus(c.resources.requests) for c in pod.spec.containers
-        )
-        mem += sum(
-            ResourceParser.mem(c.resources.requests) for c in pod.spec.containers
-        )
-        disk += sum(
-            ResourceParser.disk(c.resources.requests) for c in pod.spec.containers
-        )
+        for container in pod.spec.containers:
+            requests = container.resources.requests
+            cpus += ResourceParser.cpus(requests)
+            mem += ResourceParser.mem(requests)
+            disk += ResourceParser.disk(requests)
     return {"cpu": cpus, "memory": mem, "ephemeral-storage": disk}
 
 
@@ -741,9 +741,14 @@ _IEC_NUMBER_SUFFIXES = {
 }
 
 
+_SUFFIXED_NUMBER_REGEX = re.compile(r"(?P<number>\d+)(?P<suff>\w*)")
+
+
+# the same few quantities ("100m", "512Mi", ...) come up for nearly every pod
+# and node in a cluster, so each is only parsed once
+@lru_cache(maxsize=4096)
 def suffixed_number_value(s: str) -> float:
-    pattern = r"(?P<number>\d+)(?P<suff>\w*)"
-    match = re.match(pattern, s)
+    match = _SUFFIXED_NUMBER_REGEX.match(s)
     number, suff = match.groups()
 
     if suff in _IEC_NUMBER_SUFFIXES:
@@ -768,24 +773,19 @@ def calculate_resource_utilization_for_kube_nodes(
     is a ResourceInfo tuple, exposing a number for cpu, disk and mem.
     """
     resource_total_dict: _Counter[str] = Counter()
-    resource_free_dict: _Counter[str] = Counter()
+    resource_free_dict: Dict[str, float] = defaultdict(float)
     for node in nodes:
         allocatable_resources = suffixed_number_dict_values(
             filter_kube_resources(node.status.allocatable)
         )
-        resource_total_dict.update(Counter(allocatable_resources))
-        allocated_resources = allocated_node_resources(pods_by_node[node.metadata.name])
-        resource_free_dict.update(
-            Counter(
-                {
-                    "cpu": allocatable_resources["cpu"] - allocated_resources["cpu"],
-                    "ephemeral-storage": allocatable_resources["ephemeral-storage"]
-                    - allocated_resources["ephemeral-storage"],
-                    "memory": allocatable_resources["memory"]
-                    - allocated_resources["memory"],
-                }
-            )
+        resource_total_dict.update(allocatable_resources)
+        allocated_resources = allocated_node_resources(
+            pods_by_node.get(node.metadata.name, [])
         )
+        for resource in ("cpu", "ephemeral-storage", "memory"):
+            resource_free_dict[resource] += (
+                allocatable_resources[resource] - allocated_resources[resource]
+            )
     return {
         "free": ResourceInfo(
             cpus=resource_free_dict["cpu"],
@@ -816,10 +816,30 @@ def filter_tasks_for_slaves(
     identical to that provided by the tasks param, but with only those where
     the task is running on one of the provided slaves included.
     """
-    slave_ids = [slave["id"] for slave in slaves]
+    slave_ids = {slave["id"] for slave in slaves}
     return [task for task in tasks if task["slave_id"] in slave_ids]
 
 
+def group_tasks_by_slave(
+    tasks: Sequence[MesosTask],
+) -> Mapping[str, Sequence[MesosTask]]:
+    """Given a list of tasks, return a dict of slave id: [tasks running on
+    that slave], so that the tasks of any group of slaves can be found without
+    going through every task again."""
+    tasks_by_slave: Dict[str, List[MesosTask]] = defaultdict(list)
+    for task in tasks:
+        tasks_by_slave[task["slave_id"]].append(task)
+    return tasks_by_slave
+
+
+def group_pods_by_node(pods: Sequence[V1Pod]) -> Mapping[str, Sequence[V1Pod]]:
+    """Given a list of pods, return a dict of node name: [pods on that node]."""
+    pods_by_node: Dict[str, List[V1Pod]] = defaultdict(list)
+    for pod in pods:
+        pods_by_node[pod.spec.node_name].append(pod)
+    return pods_by_node
+
+
 def make_filter_slave_func(
     attribute: str, values: Sequence[str]
 ) -> _GenericNodeFilterFunctionT:
@@ -871,11 +891,15 @@ def get_resource_utilization_by_grouping(
 
     tasks = get_all_tasks_from_state(mesos_state, include_orphans=True)
     non_terminal_tasks = [task for task in tasks if not is_task_terminal(task)]
+    tasks_by_slave = group_tasks_by_slave(non_terminal_tasks)
     slave_groupings = group_slaves_by_key_func(grouping_func, slaves, sort_func)
 
     return {
         attribute_value: calculate_resource_utilization_for_slaves(
-            slaves=slaves, tasks=filter_tasks_for_slaves(slaves, non_terminal_tasks)
+            slaves=slaves,
+            tasks=[
+                task for slave in slaves for task in tasks_by_slave.get(slave["id"], [])
+            ],
         )
         for attribute_value, slaves in slave_groupings.items()
     }
@@ -909,13 +933,7 @@ def get_resource_utilization_by_grouping_kube(
 
     node_groupings = group_slaves_by_key_func(grouping_func, nodes, sort_func)
 
-    pods = get_all_pods_cached(kube_client, namespace)
-
-    pods_by_node = {}
-    for node in nodes:
-        pods_by_node[node.metadata.name] = [
-            pod for pod in pods if pod.spec.node_name == node.metadata.name
-        ]
+    pods_by_node = group_pods_by_node(get_all_pods_cached(kube_client, namespace))
     return {
         attribute_value: calculate_resource_utilization_for_kube_nodes(
             nodes, pods_by_node
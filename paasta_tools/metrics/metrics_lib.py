@@ -13,6 +13,7 @@ from typing import Union
 from typing_extensions import Protocol
 
 from paasta_tools.utils import load_system_paasta_config
+from paasta_tools.utils import TIME_CACHES
 
 log = logging.getLogger(__name__)
 
@@ -82,6 +83,13 @@ def get_metrics_interface(base_name: str) -> BaseMetrics:
     return _metrics_interfaces[metrics_provider](base_name)
 
 
+def export_time_cache_metrics(metrics_interface: BaseMetrics) -> None:
+    """Count the hits, misses and evictions of every named utils.time_cache
+    with metrics_interface from now on."""
+    for cache in TIME_CACHES.values():
+        cache.export_metrics(metrics_interface)
+
+
 def register_metrics_interface(
     name: Optional[str],
 ) -> Callable[[Type[BaseMetrics]], Type[BaseMetrics]]:
@@ -33,9 +33,13 @@ log {
   destination(paasta_oom_logger);
 };
 """
+import queue
 import re
 import sys
+import threading
+from collections import Counter
 from collections import namedtuple
+from functools import lru_cache
 
 from docker.errors import APIError
 
@@ -76,6 +80,11 @@ LogLine = namedtuple(
 )
 
 
+ContainerMetadata = namedtuple(
+    "ContainerMetadata", ["service", "instance", "mesos_container_id", "mem_limit"]
+)
+
+
 def capture_oom_events_from_stdin():
     process_name_regex = re.compile(
         r"^\d+\s[a-zA-Z0-9\-]+\s.*\]\s(.+)\sinvoked\soom-killer:"
@@ -110,11 +119,13 @@ def capture_oom_events_from_stdin():
         """,
         re.VERBOSE,
     )
+    # each regex is only tried on lines that contain a string it requires,
+    # which is much cheaper than running the regexes on every line
     event_detail_regexes = [
-        oom_regex_docker,
-        oom_regex_kubernetes,
-        oom_regex_kubernetes_structured,
-        oom_regex_kubernetes_systemd_cgroup,
+        ("Task in /docker/", oom_regex_docker),
+        ("Task in /kubepods/", oom_regex_kubernetes),
+        ("task_memcg=/kubepods/", oom_regex_kubernetes_structured),
+        ("task_memcg=/kubepods.slice/", oom_regex_kubernetes_systemd_cgroup),
     ]
 
     process_name = ""
@@ -125,10 +136,15 @@ def capture_oom_events_from_stdin():
             break
         if not syslog:
             break
-        r = process_name_regex.search(syslog)
-        if r:
-            process_name = r.group(1)
-        for expression in event_detail_regexes:
+        if "oom-kill" not in syslog and "killed as a" not in syslog:
+            continue
+        if "invoked oom-killer:" in syslog:
+            r = process_name_regex.search(syslog)
+            if r:
+                process_name = r.group(1)
+        for prefilter, expression in event_detail_regexes:
+            if prefilter not in syslog:
+                continue
             r = expression.search(syslog)
             if r:
                 yield (int(r.group(1)), r.group(2), r.group(3), process_name)
@@ -147,6 +163,22 @@ def get_container_env_as_dict(docker_inspect):
     return env_vars
 
 
+@lru_cache(maxsize=4096)
+def get_container_metadata(client, container_id):
+    """Looks up the service and instance a container runs. Containers can't
+    change those, and an OOM storm usually hits the same few containers over
+    and over, so this only inspects each container once."""
+    env_vars = get_container_env_as_dict(
+        client.inspect_container(resource_id=container_id)
+    )
+    return ContainerMetadata(
+        service=env_vars.get("PAASTA_SERVICE", "unknown"),
+        instance=env_vars.get("PAASTA_INSTANCE", "unknown"),
+        mesos_container_id=env_vars.get("MESOS_CONTAINER_NAME", "mesos-null"),
+        mem_limit=env_vars.get("PAASTA_RESOURCE_MEM", "unknown"),
+    )
+
+
 def log_to_clog(log_line):
     """Send the event to 'tmp_paasta_oom_events'."""
     line = (
@@ -187,7 +219,8 @@ def log_to_paasta(log_line):
     )
 
 
-def send_sfx_event(service, instance, cluster):
+def send_sfx_event(service, instance, cluster, count=1):
+    """Emits count OOM events for an instance."""
     if yelp_meteorite:
         service_instance_config = get_instance_config(
             service=service, instance=instance, cluster=cluster
@@ -198,15 +231,113 @@ def send_sfx_event(service, instance, cluster):
             "paasta_service": service,
             "paasta_pool": service_instance_config.get_pool(),
         }
-        yelp_meteorite.events.emit_event(
-            "paasta.service.oom_events",
-            dimensions=dimensions,
-        )
         counter = yelp_meteorite.create_counter(
             "paasta.service.oom_count",
             default_dimensions=dimensions,
         )
-        counter.count()
+        for _ in range(count):
+            yelp_meteorite.events.emit_event(
+                "paasta.service.oom_events",
+                dimensions=dimensions,
+            )
+            counter.count()
+
+
+class OOMEventEmitter:
+    """Looks up the service and instance of captured OOM events and logs
+    them, from a background thread, so that reading syslog never waits for
+    docker, clog or SignalFx.
+
+    Events wait in a bounded queue; when it's full (i.e. emitting has fallen
+    that far behind) new events are dropped rather than blocking the reader.
+    The emitter takes everything that's queued at once, so the busier it
+    gets, the bigger its batches.
+    """
+
+    def __init__(self, cluster, docker_client, max_queued=10000, max_batch_size=500):
+        self.cluster = cluster
+        self.docker_client = docker_client
+        self.max_batch_size = max_batch_size
+        self.queue = queue.Queue(maxsize=max_queued)
+        self.dropped = 0
+        self.thread = threading.Thread(
+            target=self.emit_forever, name="oom-event-emitter", daemon=True
+        )
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        """Waits for the events queued so far to be emitted."""
+        self.queue.put(None)
+        self.thread.join()
+
+    def put(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except queue.Full:
+            self.dropped += 1
+            print(
+                f"Dropped an OOM event, {self.dropped} so far: {event}",
+                file=sys.stderr,
+            )
+
+    def emit_forever(self):
+        stopping = False
+        while not stopping:
+            batch = [self.queue.get()]
+            while len(batch) < self.max_batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            if None in batch:
+                stopping = True
+                batch = [event for event in batch if event is not None]
+            try:
+                self.emit_batch(batch)
+            except Exception as e:
+                # emit_batch handles each event's errors itself, so this
+                # shouldn't happen; keep the thread alive regardless
+                print(f"Failed to emit {len(batch)} OOM events: {e!r}", file=sys.stderr)
+
+    def emit_batch(self, events):
+        counts = Counter()
+        for event in events:
+            timestamp, hostname, container_id, process_name = event
+            try:
+                metadata = get_container_metadata(self.docker_client, container_id)
+            except APIError:
+                continue
+            except Exception as e:
+                print(f"Failed to look up OOM event {event}: {e!r}", file=sys.stderr)
+                continue
+            counts[(metadata.service, metadata.instance)] += 1
+            log_line = LogLine(
+                timestamp=timestamp,
+                hostname=hostname,
+                container_id=container_id,
+                cluster=self.cluster,
+                service=metadata.service,
+                instance=metadata.instance,
+                process_name=process_name,
+                mesos_container_id=metadata.mesos_container_id,
+                mem_limit=metadata.mem_limit,
+            )
+            try:
+                log_to_clog(log_line)
+                log_to_paasta(log_line)
+            except Exception as e:
+                print(f"Failed to log OOM event {event}: {e!r}", file=sys.stderr)
+        for (service, instance), count in counts.items():
+            try:
+                send_sfx_event(service, instance, self.cluster, count)
+            except Exception as e:
+                print(
+                    f"Failed to send {count} OOM events of {service}.{instance} "
+                    f"to SignalFx: {e!r}",
+                    file=sys.stderr,
+                )
 
 
 def main():
@@ -221,37 +352,14 @@ def main():
         scribe_disable=False,
     )
 
-    cluster = load_system_paasta_config().get_cluster()
-    client = get_docker_client()
-    for (
-        timestamp,
-        hostname,
-        container_id,
-        process_name,
-    ) in capture_oom_events_from_stdin():
-        try:
-            docker_inspect = client.inspect_container(resource_id=container_id)
-        except (APIError):
-            continue
-        env_vars = get_container_env_as_dict(docker_inspect)
-        service = env_vars.get("PAASTA_SERVICE", "unknown")
-        instance = env_vars.get("PAASTA_INSTANCE", "unknown")
-        mesos_container_id = env_vars.get("MESOS_CONTAINER_NAME", "mesos-null")
-        mem_limit = env_vars.get("PAASTA_RESOURCE_MEM", "unknown")
-        log_line = LogLine(
-            timestamp=timestamp,
-            hostname=hostname,
-            container_id=container_id,
-            cluster=cluster,
-            service=service,
-            instance=instance,
-            process_name=process_name,
-            mesos_container_id=mesos_container_id,
-            mem_limit=mem_limit,
-        )
-        log_to_clog(log_line)
-        log_to_paasta(log_line)
-        send_sfx_event(service, instance, cluster)
+    emitter = OOMEventEmitter(
+        cluster=load_system_paasta_config().get_cluster(),
+        docker_client=get_docker_client(),
+    )
+    emitter.start()
+    for event in capture_oom_events_from_stdin():
+        emitter.put(event)
+    emitter.stop()
 
 
 if __name__ == "__main__":
@@ -23,6 +23,8 @@ from paasta_tools.paastaapi.model_utils import (  # noqa: F401
     none_type,
     validate_and_convert_types
 )
+from paasta_tools.paastaapi.model.bulk_bounce_status import BulkBounceStatus
+from paasta_tools.paastaapi.model.bulk_bounce_status_request import BulkBounceStatusRequest
 from paasta_tools.paastaapi.model.flink_cluster_overview import FlinkClusterOverview
 from paasta_tools.paastaapi.model.flink_config import FlinkConfig
 from paasta_tools.paastaapi.model.flink_job_details import FlinkJobDetails
@@ -173,6 +175,123 @@ class ServiceApi(object):
             callable=__bounce_status_instance
         )
 
+        def __bulk_bounce_status(
+            self,
+            bulk_bounce_status_request,
+            **kwargs
+        ):
+            """Get the bounce status of many service instances at once  # noqa: E501
+
+            This method makes a synchronous HTTP request by default. To make an
+            asynchronous HTTP request, please pass async_req=True
+
+            >>> thread = api.bulk_bounce_status(bulk_bounce_status_request, async_req=True)
+            >>> result = thread.get()
+
+            Args:
+                bulk_bounce_status_request (BulkBounceStatusRequest):
+
+            Keyword Args:
+                _return_http_data_only (bool): response data without head status
+                    code and headers. Default is True.
+                _preload_content (bool): if False, the urllib3.HTTPResponse object
+                    will be returned without reading/decoding response data.
+                    Default is True.
+                _request_timeout (float/tuple): timeout setting for this request. If one
+                    number provided, it will be total request timeout. It can also
+                    be a pair (tuple) of (connection, read) timeouts.
+                    Default is None.
+                _check_input_type (bool): specifies if type checking
+                    should be done one the data sent to the server.
+                    Default is True.
+                _check_return_type (bool): specifies if type checking
+                    should be done one the data received from the server.
+                    Default is True.
+                _host_index (int/None): specifies the index of the server
+                    that we want to use.
+                    Default is read from the configuration.
+                async_req (bool): execute request asynchronously
+
+            Returns:
+                BulkBounceStatus
+                    If the method is called asynchronously, returns the request
+                    thread.
+            """
+            kwargs['async_req'] = kwargs.get(
+                'async_req', False
+            )
+            kwargs['_return_http_data_only'] = kwargs.get(
+                '_return_http_data_only', True
+            )
+            kwargs['_preload_content'] = kwargs.get(
+                '_preload_content', True
+            )
+            kwargs['_request_timeout'] = kwargs.get(
+                '_request_timeout', None
+            )
+            kwargs['_check_input_type'] = kwargs.get(
+                '_check_input_type', True
+            )
+            kwargs['_check_return_type'] = kwargs.get(
+                '_check_return_type', True
+            )
+            kwargs['_host_index'] = kwargs.get('_host_index')
+            kwargs['bulk_bounce_status_request'] = \
+                bulk_bounce_status_request
+            return self.call_with_http_info(**kwargs)
+
+        self.bulk_bounce_status = Endpoint(
+            settings={
+                'response_type': (BulkBounceStatus,),
+                'auth': [],
+                'endpoint_path': '/bounce_status',
+                'operation_id': 'bulk_bounce_status',
+                'http_method': 'POST',
+                'servers': None,
+            },
+            params_map={
+                'all': [
+                    'bulk_bounce_status_request',
+                ],
+                'required': [
+                    'bulk_bounce_status_request',
+                ],
+                'nullable': [
+                ],
+                'enum': [
+                ],
+                'validation': [
+                ]
+            },
+            root_map={
+                'validations': {
+                },
+                'allowed_values': {
+                },
+                'openapi_types': {
+                    'bulk_bounce_status_request':
+                        (BulkBounceStatusRequest,),
+                },
+                'attribute_map': {
+                },
+                'location_map': {
+                    'bulk_bounce_status_request': 'body',
+                },
+                'collection_format_map': {
+                }
+            },
+            headers_map={
+                'accept': [
+                    'application/json'
+                ],
+                'content_type': [
+                    'application/json'
+                ]
+            },
+            api_client=api_client,
+            callable=__bulk_bounce_status
+        )
+
         def __delay_instance(
             self,
             service,
@@ -1461,6 +1580,152 @@ class ServiceApi(object):
             callable=__status_instance
         )
 
+        def __status_service(
+            self,
+            service,
+            **kwargs
+        ):
+            """Get status of all instances of service_name  # noqa: E501
+
+            This method makes a synchronous HTTP request by default. To make an
+            asynchronous HTTP request, please pass async_req=True
+
+            >>> thread = api.status_service(service, async_req=True)
+            >>> result = thread.get()
+
+            Args:
+                service (str): Service name
+
+            Keyword Args:
+                verbose (int): Include verbose status information. [optional]
+                include_smartstack (bool): Include Smartstack information. [optional]
+                include_envoy (bool): Include Envoy information. [optional]
+                include_mesos (bool): Include Mesos information. [optional]
+                new (bool): Use new version of paasta status for services. [optional]
+                _return_http_data_only (bool): response data without head status
+                    code and headers. Default is True.
+                _preload_content (bool): if False, the urllib3.HTTPResponse object
+                    will be returned without reading/decoding response data.
+                    Default is True.
+                _request_timeout (float/tuple): timeout setting for this request. If one
+                    number provided, it will be total request timeout. It can also
+                    be a pair (tuple) of (connection, read) timeouts.
+                    Default is None.
+                _check_input_type (bool): specifies if type checking
+                    should be done one the data sent to the server.
+                    Default is True.
+                _check_return_type (bool): specifies if type checking
+                    should be done one the data received from the server.
+                    Default is True.
+                _host_index (int/None): specifies the index of the server
+                    that we want to use.
+                    Default is read from the configuration.
+                async_req (bool): execute request asynchronously
+
+            Returns:
+                InstanceStatus
+                    If the method is called asynchronously, returns the request
+                    thread.
+            """
+            kwargs['async_req'] = kwargs.get(
+                'async_req', False
+            )
+            kwargs['_return_http_data_only'] = kwargs.get(
+                '_return_http_data_only', True
+            )
+            kwargs['_preload_content'] = kwargs.get(
+                '_preload_content', True
+            )
+            kwargs['_request_timeout'] = kwargs.get(
+                '_request_timeout', None
+            )
+            kwargs['_check_input_type'] = kwargs.get(
+                '_check_input_type', True
+            )
+            kwargs['_check_return_type'] = kwargs.get(
+                '_check_return_type', True
+            )
+            kwargs['_host_index'] = kwargs.get('_host_index')
+            kwargs['service'] = \
+                service
+            return self.call_with_http_info(**kwargs)
+
+        self.status_service = Endpoint(
+            settings={
+                'response_type': (InstanceStatus,),
+                'auth': [],
+                'endpoint_path': '/services/{service}/status',
+                'operation_id': 'status_service',
+                'http_method': 'GET',
+                'servers': None,
+            },
+            params_map={
+                'all': [
+                    'service',
+                    'verbose',
+                    'include_smartstack',
+                    'include_envoy',
+                    'include_mesos',
+                    'new',
+                ],
+                'required': [
+                    'service',
+                ],
+                'nullable': [
+                ],
+                'enum': [
+                ],
+                'validation': [
+                ]
+            },
+            root_map={
+                'validations': {
+                },
+                'allowed_values': {
+                },
+                'openapi_types': {
+                    'service':
+                        (str,),
+                    'verbose':
+                        (int,),
+                    'include_smartstack':
+                        (bool,),
+                    'include_envoy':
+                        (bool,),
+                    'include_mesos':
+                        (bool,),
+                    'new':
+                        (bool,),
+                },
+                'attribute_map': {
+                    'service': 'service',
+                    'verbose': 'verbose',
+                    'include_smartstack': 'include_smartstack',
+                    'include_envoy': 'include_envoy',
+                    'include_mesos': 'include_mesos',
+                    'new': 'new',
+                },
+                'location_map': {
+                    'service': 'path',
+                    'verbose': 'query',
+                    'include_smartstack': 'query',
+                    'include_envoy': 'query',
+                    'include_mesos': 'query',
+                    'new': 'query',
+                },
+                'collection_format_map': {
+                }
+            },
+            headers_map={
+                'accept': [
+                    'application/x-ndjson'
+                ],
+                'content_type': [],
+            },
+            api_client=api_client,
+            callable=__status_service
+        )
+
         def __task_instance(
             self,
             service,
@@ -13,6 +13,9 @@
 
 from paasta_tools.paastaapi.model.adhoc_launch_history import AdhocLaunchHistory
 from paasta_tools.paastaapi.model.autoscaler_count_msg import AutoscalerCountMsg
+from paasta_tools.paastaapi.model.bounce_status_result import BounceStatusResult
+from paasta_tools.paastaapi.model.bulk_bounce_status import BulkBounceStatus
+from paasta_tools.paastaapi.model.bulk_bounce_status_request import BulkBounceStatusRequest
 from paasta_tools.paastaapi.model.deploy_queue import DeployQueue
 from paasta_tools.paastaapi.model.deploy_queue_service_instance import DeployQueueServiceInstance
 from paasta_tools.paastaapi.model.envoy_backend import EnvoyBackend
@@ -63,6 +66,7 @@ from paasta_tools.paastaapi.model.meta_status import MetaStatus
 from paasta_tools.paastaapi.model.resource import Resource
 from paasta_tools.paastaapi.model.resource_item import ResourceItem
 from paasta_tools.paastaapi.model.resource_value import ResourceValue
+from paasta_tools.paastaapi.model.service_instance_name import ServiceInstanceName
 from paasta_tools.paastaapi.model.smartstack_backend import SmartstackBackend
 from paasta_tools.paastaapi.model.smartstack_location import SmartstackLocation
 from paasta_tools.paastaapi.model.smartstack_status import SmartstackStatus
@@ -21,11 +21,18 @@ Command line options:
 - -v, --verbose: Verbose output
 """
 import argparse
+import concurrent.futures
+import functools
+import itertools
 import logging
 import sys
+import threading
+from typing import Callable
+from typing import Dict
 from typing import List
 from typing import Optional
 from typing import Sequence
+from typing import Set
 from typing import Tuple
 
 from paasta_tools.kubernetes.application.controller_wrappers import Application
@@ -35,10 +42,12 @@ from paasta_tools.kubernetes.application.controller_wrappers import (
 from paasta_tools.kubernetes_tools import ensure_namespace
 from paasta_tools.kubernetes_tools import InvalidKubernetesConfig
 from paasta_tools.kubernetes_tools import KubeClient
+from paasta_tools.kubernetes_tools import KubeDeployment
 from paasta_tools.kubernetes_tools import KubernetesDeploymentConfig
 from paasta_tools.kubernetes_tools import list_all_paasta_deployments
 from paasta_tools.kubernetes_tools import load_kubernetes_service_config_no_cache
 from paasta_tools.metrics import metrics_lib
+from paasta_tools.soa_config_index import use_soa_config_index
 from paasta_tools.utils import decompose_job_id
 from paasta_tools.utils import DEFAULT_SOA_DIR
 from paasta_tools.utils import InvalidJobNameError
@@ -88,6 +97,15 @@ def parse_args() -> argparse.Namespace:
         type=int,
         help="Update or create up to this number of service instances. Default is 0 (no limit).",
     )
+    parser.add_argument(
+        "-j",
+        "--concurrency",
+        dest="concurrency",
+        default=1,
+        metavar="N",
+        type=int,
+        help="Create or update up to N service instances in parallel. Default is 1.",
+    )
     args = parser.parse_args()
     return args
 
@@ -104,6 +122,7 @@ def main() -> None:
 
     deploy_metrics = metrics_lib.get_metrics_interface("paasta")
 
+    system_paasta_config = load_system_paasta_config()
     kube_client = KubeClient()
     service_instances_valid = True
 
@@ -113,11 +132,14 @@ def main() -> None:
     )
 
     # returns a list of pairs of (No error?, KubernetesDeploymentConfig) for every service_instance
-    service_instance_configs_list = get_kubernetes_deployment_config(
-        service_instances_with_valid_names=service_instances_with_valid_names,
-        cluster=args.cluster or load_system_paasta_config().get_cluster(),
-        soa_dir=soa_dir,
-    )
+    with use_soa_config_index(
+        index_path=system_paasta_config.get_soa_config_index_path(), soa_dir=soa_dir
+    ):
+        service_instance_configs_list = get_kubernetes_deployment_config(
+            service_instances_with_valid_names=service_instances_with_valid_names,
+            cluster=args.cluster or system_paasta_config.get_cluster(),
+            soa_dir=soa_dir,
+        )
 
     if ((False, None) in service_instance_configs_list) or (
         len(service_instances_with_valid_names) != len(args.service_instance_list)
@@ -133,11 +155,12 @@ def main() -> None:
 
         setup_kube_succeeded = setup_kube_deployments(
             kube_client=kube_client,
-            cluster=args.cluster or load_system_paasta_config().get_cluster(),
+            cluster=args.cluster or system_paasta_config.get_cluster(),
             service_instance_configs_list=service_instance_configs_list,
             rate_limit=args.rate_limit,
             soa_dir=soa_dir,
             metrics_interface=deploy_metrics,
+            concurrency=args.concurrency,
         )
     else:
         setup_kube_succeeded = False
@@ -197,6 +220,118 @@ def get_kubernetes_deployment_config(
     return service_instance_configs_list
 
 
+class ApiUpdateBudget:
+    """Thread-safe counter that enforces --rate-limit across all workers: each
+    successful create or update of a controller consumes one token, and once
+    the tokens are gone no further applications are processed. A token is
+    taken before a create or update, and given back if it fails, so that
+    workers running at the same time can't go over the limit."""
+
+    def __init__(self, rate_limit: int) -> None:
+        self.rate_limit = rate_limit
+        self.used = 0
+        self._lock = threading.Lock()
+
+    def exhausted(self) -> bool:
+        with self._lock:
+            return self.rate_limit > 0 and self.used >= self.rate_limit
+
+    def try_acquire(self) -> bool:
+        with self._lock:
+            if self.rate_limit > 0 and self.used >= self.rate_limit:
+                return False
+            self.used += 1
+            return True
+
+    def release(self) -> None:
+        with self._lock:
+            self.used -= 1
+
+
+def interleave_by_namespace(applications: Sequence[Application]) -> List[Application]:
+    """Order applications round-robin across namespaces, so that a namespace
+    with thousands of instances can't delay (or, with a rate limit, starve)
+    the others."""
+    by_namespace: Dict[str, List[Application]] = {}
+    for app in applications:
+        by_namespace.setdefault(app.kube_deployment.namespace, []).append(app)
+    return [
+        app
+        for apps in itertools.zip_longest(*by_namespace.values())
+        for app in apps
+        if app is not None
+    ]
+
+
+def setup_kube_deployment(
+    kube_client: KubeClient,
+    cluster: str,
+    app: Application,
+    existing_apps: Set[Tuple[str, str, str]],
+    existing_kube_deployments: Set[KubeDeployment],
+    budget: ApiUpdateBudget,
+    metrics_interface: metrics_lib.BaseMetrics = metrics_lib.NoMetrics("paasta"),
+) -> None:
+    app_dimensions = {
+        "paasta_service": app.kube_deployment.service,
+        "paasta_instance": app.kube_deployment.instance,
+        "paasta_cluster": cluster,
+        "paasta_namespace": app.kube_deployment.namespace,
+    }
+    timer = metrics_interface.create_timer(
+        name="setup_kubernetes_job.app_duration",
+        default_dimensions=app_dimensions.copy(),
+    )
+    timer.start()
+    deploy_event = "noop"
+    try:
+        if (
+            app.kube_deployment.service,
+            app.kube_deployment.instance,
+            app.kube_deployment.namespace,
+        ) not in existing_apps:
+            if not budget.try_acquire():
+                deploy_event = "skipped"
+                return
+            log.info(f"Creating {app} because it does not exist yet.")
+            try:
+                app.create(kube_client)
+            except Exception:
+                # one app that can't be created shouldn't use up the budget
+                budget.release()
+                raise
+            deploy_event = app_dimensions["deploy_event"] = "create"
+            metrics_interface.emit_event(
+                name="deploy",
+                dimensions=app_dimensions,
+            )
+        elif app.kube_deployment not in existing_kube_deployments:
+            if not budget.try_acquire():
+                deploy_event = "skipped"
+                return
+            log.info(f"Updating {app} because configs have changed.")
+            try:
+                app.update(kube_client)
+            except Exception:
+                budget.release()
+                raise
+            deploy_event = app_dimensions["deploy_event"] = "update"
+            metrics_interface.emit_event(
+                name="deploy",
+                dimensions=app_dimensions,
+            )
+        else:
+            log.info(f"{app} is up-to-date!")
+
+        log.info(f"Ensuring related API objects for {app} are in sync")
+        app.update_related_api_objects(kube_client)
+    except Exception:
+        deploy_event = "error"
+        log.exception(f"Error while processing: {app}")
+    finally:
+        timer.stop(tmp_dimensions={"deploy_event": deploy_event})
+
+
 def setup_kube_deployments(
     kube_client: KubeClient,
     cluster: str,
@@ -204,10 +339,22 @@ def setup_kube_deployments(
     rate_limit: int = 0,
     soa_dir: str = DEFAULT_SOA_DIR,
     metrics_interface: metrics_lib.BaseMetrics = metrics_lib.NoMetrics("paasta"),
+    existing_kube_deployments: Optional[Set[KubeDeployment]] = None,
+    concurrency: int = 1,
 ) -> bool:
+    """Create or update the given service instances.
 
+    :param existing_kube_deployments: the deployments currently in the cluster,
+        if the caller already knows them (e.g. from an informer). Otherwise
+        they are listed from the API.
+    :param concurrency: how many applications to create/update in parallel.
+        With more than one worker, applications are interleaved by namespace.
+    """
+
+    existing_apps: Set[Tuple[str, str, str]] = set()
     if service_instance_configs_list:
-        existing_kube_deployments = set(list_all_paasta_deployments(kube_client))
+        if existing_kube_deployments is None:
+            existing_kube_deployments = set(list_all_paasta_deployments(kube_client))
         existing_apps = {
             (deployment.service, deployment.instance, deployment.namespace)
             for deployment in existing_kube_deployments
@@ -223,53 +370,45 @@ def setup_kube_deployments(
         else (_, None)
         for _, service_instance in service_instance_configs_list
     ]
-    api_updates = 0
-    for _, app in applications:
-        if app:
-            app_dimensions = {
-                "paasta_service": app.kube_deployment.service,
-                "paasta_instance": app.kube_deployment.instance,
-                "paasta_cluster": cluster,
-                "paasta_namespace": app.kube_deployment.namespace,
-            }
-            try:
-                if (
-                    app.kube_deployment.service,
-                    app.kube_deployment.instance,
-                    app.kube_deployment.namespace,
-                ) not in existing_apps:
-                    log.info(f"Creating {app} because it does not exist yet.")
-                    app.create(kube_client)
-                    app_dimensions["deploy_event"] = "create"
-                    metrics_interface.emit_event(
-                        name="deploy",
-                        dimensions=app_dimensions,
-                    )
-                    api_updates += 1
-                elif app.kube_deployment not in existing_kube_deployments:
-                    log.info(f"Updating {app} because configs have changed.")
-                    app.update(kube_client)
-                    app_dimensions["deploy_event"] = "update"
-                    metrics_interface.emit_event(
-                        name="deploy",
-                        dimensions=app_dimensions,
-                    )
-                    api_updates += 1
-                else:
-                    log.info(f"{app} is up-to-date!")
-
-                log.info(f"Ensuring related API objects for {app} are in sync")
-                app.update_related_api_objects(kube_client)
-            except Exception:
-                log.exception(f"Error while processing: {app}")
-        if rate_limit > 0 and api_updates >= rate_limit:
-            log.info(
-                f"Not doing any further updates as we reached the limit ({api_updates})"
-            )
-            break
+    apps = [app for _, app in applications if app]
+    budget = ApiUpdateBudget(rate_limit)
+    setup_app = functools.partial(
+        setup_kube_deployment,
+        kube_client,
+        cluster,
+        existing_apps=existing_apps,
+        existing_kube_deployments=existing_kube_deployments,
+        budget=budget,
+        metrics_interface=metrics_interface,
+    )
+
+    if concurrency > 1:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=concurrency) as pool:
+            for app in interleave_by_namespace(apps):
+                pool.submit(
+                    _setup_kube_deployment_unless_exhausted, setup_app, app, budget
+                )
+    else:
+        for app in apps:
+            setup_app(app)
+            if budget.exhausted():
+                break
+
+    if budget.exhausted():
+        log.info(
+            f"Not doing any further updates as we reached the limit ({budget.used})"
+        )
     return (False, None) not in applications
 
 
+def _setup_kube_deployment_unless_exhausted(
+    setup_app: Callable[[Application], None], app: Application, budget: ApiUpdateBudget
+) -> None:
+    # mirrors the serial loop, which stops as soon as the limit is reached
+    if not budget.exhausted():
+        setup_app(app)
+
+
 def create_application_object(
     cluster: str,
     soa_dir: str,
@@ -50,6 +50,7 @@ from paasta_tools.long_running_service_tools import (
     DEFAULT_UWSGI_AUTOSCALING_MOVING_AVERAGE_WINDOW,
 )
 from paasta_tools.paasta_service_config_loader import PaastaServiceConfigLoader
+from paasta_tools.soa_config_index import use_soa_config_index
 from paasta_tools.utils import DEFAULT_SOA_DIR
 from paasta_tools.utils import get_services_for_cluster
 from paasta_tools.utils import load_system_paasta_config
@@ -839,10 +840,14 @@ def main() -> int:
         logging.basicConfig(level=logging.INFO)
 
     log.info("Generating adapter config from soaconfigs.")
-    config = create_prometheus_adapter_config(
-        paasta_cluster=args.cluster,
-        soa_dir=args.soa_dir,
-    )
+    with use_soa_config_index(
+        index_path=load_system_paasta_config().get_soa_config_index_path(),
+        soa_dir=str(args.soa_dir),
+    ):
+        config = create_prometheus_adapter_config(
+            paasta_cluster=args.cluster,
+            soa_dir=args.soa_dir,
+        )
     log.info("Generated adapter config from soaconfigs.")
     if args.dry_run:
         log.info(
@@ -17,12 +17,18 @@ import csv
 import logging
 import random
 import socket
+import threading
+import time
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
+from typing import Callable
 from typing import cast
 from typing import Collection
 from typing import DefaultDict
 from typing import Dict
 from typing import Iterable
+from typing import Iterator
 from typing import List
 from typing import MutableMapping
 from typing import NamedTuple
@@ -61,33 +67,131 @@ class HaproxyBackend(TypedDict, total=False):
     status: str
 
 
+# the columns of the haproxy CSV that we keep, see HaproxyBackend
+HAPROXY_BACKEND_COLUMNS = (
+    "pxname",
+    "svname",
+    "status",
+    "lastchg",
+    "check_status",
+    "check_code",
+    "check_duration",
+)
+HAPROXY_CSV_CHUNK_SIZE = 64 * 1024
+# the request timeout only bounds each read from the socket, this bounds the
+# whole download of the CSV
+HAPROXY_CSV_DEADLINE_SECONDS = 10
+
 log = logging.getLogger(__name__)
 
 
-def retrieve_haproxy_csv(
-    synapse_host: str, synapse_port: int, synapse_haproxy_url_format: str, scope: str
-) -> Iterable[Dict[str, str]]:
-    """Retrieves the haproxy csv from the haproxy web interface
+def _new_session() -> requests.Session:
+    session = requests.Session()
+    session.headers.update({"User-Agent": get_user_agent()})
+    session.mount("http://", requests.adapters.HTTPAdapter(max_retries=3))
+    session.mount("https://", requests.adapters.HTTPAdapter(max_retries=3))
+    return session
+
+
+def stream_haproxy_backends(
+    synapse_host: str,
+    synapse_port: int,
+    synapse_haproxy_url_format: str,
+    scope: str,
+    services: Optional[Collection[str]] = None,
+    session: Optional[requests.Session] = None,
+    deadline_seconds: float = HAPROXY_CSV_DEADLINE_SECONDS,
+) -> Iterator[HaproxyBackend]:
+    """Streams the CSV from the haproxy web interface and yields its backends,
+    without ever holding the whole CSV in memory.
 
     :param synapse_host: A host that this check should contact for replication information.
     :param synapse_port: A integer that this check should contact for replication information.
     :param synapse_haproxy_url_format: The format of the synapse haproxy URL.
     :param scope: scope
-    :returns reader: a csv.DictReader object
+    :param services: If None, yield backends for all services, otherwise only for these services.
+    :param session: A requests.Session to reuse connections from, a new one is created if None.
+    :param deadline_seconds: How long reading the whole CSV may take before giving up with a
+                             requests.exceptions.Timeout.
     """
     synapse_uri = synapse_haproxy_url_format.format(
         host=synapse_host, port=synapse_port, scope=scope
     )
 
     # timeout after 1 second and retry 3 times
-    haproxy_request = requests.Session()
-    haproxy_request.headers.update({"User-Agent": get_user_agent()})
-    haproxy_request.mount("http://", requests.adapters.HTTPAdapter(max_retries=3))
-    haproxy_request.mount("https://", requests.adapters.HTTPAdapter(max_retries=3))
-    haproxy_response = haproxy_request.get(synapse_uri, timeout=1)
-    haproxy_data = haproxy_response.text
-    reader = csv.DictReader(haproxy_data.splitlines())
-    return reader
+    if session is None:
+        session = _new_session()
+    deadline = time.monotonic() + deadline_seconds
+    haproxy_response = session.get(synapse_uri, timeout=1, stream=True)
+    try:
+        if haproxy_response.encoding is None:
+            haproxy_response.encoding = "utf-8"
+        yield from parse_haproxy_csv(
+            _lines_until_deadline(
+                haproxy_response.iter_lines(
+                    chunk_size=HAPROXY_CSV_CHUNK_SIZE, decode_unicode=True
+                ),
+                deadline=deadline,
+                description=synapse_uri,
+            ),
+            services=services,
+        )
+    finally:
+        haproxy_response.close()
+
+
+def _lines_until_deadline(
+    lines: Iterable[str], deadline: float, description: str
+) -> Iterator[str]:
+    for line in lines:
+        if time.monotonic() > deadline:
+            raise requests.exceptions.Timeout(
+                f"Gave up reading {description}: it took too long"
+            )
+        yield line
+
+
+def parse_haproxy_csv(
+    lines: Iterable[str], services: Optional[Collection[str]] = None
+) -> Iterator[HaproxyBackend]:
+    """Parses the lines of the haproxy CSV into backends, keeping only the
+    columns in HAPROXY_BACKEND_COLUMNS.
+
+    Lines of other services are skipped by looking at their pxname, which
+    comes first, so most of the CSV is never split into fields. The
+    fictional FRONTEND/BACKEND hosts are skipped too.
+
+    :param lines: The lines of the CSV, starting with its header.
+    :param services: If None, return backends for all services, otherwise only for these services.
+    """
+    lines = iter(lines)
+    header = next(lines, None)
+    if header is None:
+        return
+    # the header has a leading "# " for no good reason
+    columns = header.lstrip("# ").split(",")
+    indexes = [
+        (column, columns.index(column))
+        for column in HAPROXY_BACKEND_COLUMNS
+        if column in columns
+    ]
+    if services is not None:
+        services = frozenset(services)
+
+    for line in lines:
+        if not line:
+            continue
+        if services is not None and line.partition(",")[0] not in services:
+            continue
+        if '"' in line:
+            # haproxy quotes the fields that contain commas, which only
+            # happens in free-form columns like last_chk
+            fields = next(csv.reader([line]))
+        else:
+            fields = line.split(",")
+        if fields[1] in ("FRONTEND", "BACKEND"):
+            continue
+        yield cast(HaproxyBackend, {column: fields[i] for column, i in indexes})
 
 
 def get_backends(
@@ -141,32 +245,15 @@ def get_multiple_backends(
         # For now let's just hope this is rare and fetch all data.
         scope = ""
 
-    reader = retrieve_haproxy_csv(
-        synapse_host,
-        synapse_port,
-        synapse_haproxy_url_format=synapse_haproxy_url_format,
-        scope=scope,
+    return list(
+        stream_haproxy_backends(
+            synapse_host,
+            synapse_port,
+            synapse_haproxy_url_format=synapse_haproxy_url_format,
+            scope=scope,
+            services=services,
+        )
     )
-    backends = []
-
-    for line in reader:
-        # clean up two irregularities of the CSV output, relative to
-        # DictReader's behavior there's a leading "# " for no good reason:
-        line["pxname"] = line.pop("# pxname")
-        # and there's a trailing comma on every line:
-        line.pop("")
-
-        # Look for the service in question and ignore the fictional
-        # FRONTEND/BACKEND hosts, use starts_with so that hosts that are UP
-        # with 1/X healthchecks to go before going down get counted as UP:
-        ha_slave, ha_service = line["svname"], line["pxname"]
-        if (services is None or ha_service in services) and ha_slave not in (
-            "FRONTEND",
-            "BACKEND",
-        ):
-            backends.append(cast(HaproxyBackend, line))
-
-    return backends
 
 
 def load_smartstack_info_for_service(
@@ -271,6 +358,10 @@ def get_replication_for_all_services(
         synapse_port=synapse_port,
         synapse_haproxy_url_format=synapse_haproxy_url_format,
     )
+    return count_up_backends(backends)
+
+
+def count_up_backends(backends: Iterable[HaproxyBackend]) -> Dict[str, int]:
     return collections.Counter([b["pxname"] for b in backends if backend_is_up(b)])
 
 
@@ -487,6 +578,112 @@ class DiscoveredHost(NamedTuple):
     pool: str
 
 
+class DiscoverySnapshotCache:
+    """Fetches the haproxy CSV and/or Envoy clusters JSON of each discovery host
+    at most once, and answers every later backend lookup for that host from
+    memory.
+
+    Fetches run concurrently on a small thread pool and share a single
+    requests.Session, so connections to the same host are reused. A failed
+    fetch is not cached: the next lookup for that host tries again.
+
+    This is meant to live for a single run of something like
+    check_kubernetes_services_replication, the snapshots are never refreshed.
+    """
+
+    HAPROXY = "haproxy"
+    ENVOY = "envoy"
+
+    def __init__(
+        self, system_paasta_config: SystemPaastaConfig, max_workers: int = 8
+    ) -> None:
+        self._system_paasta_config = system_paasta_config
+        self._session = _new_session()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._lock = threading.Lock()
+        self._snapshots: Dict[Tuple[str, str], Future] = {}
+
+    def _fetch_haproxy(self, hostname: str) -> Dict[str, List[HaproxyBackend]]:
+        backends: DefaultDict[str, List[HaproxyBackend]] = collections.defaultdict(list)
+        for backend in stream_haproxy_backends(
+            synapse_host=hostname,
+            synapse_port=self._system_paasta_config.get_synapse_port(),
+            synapse_haproxy_url_format=self._system_paasta_config.get_synapse_haproxy_url_format(),
+            scope="",
+            session=self._session,
+        ):
+            backends[backend["pxname"]].append(backend)
+        return dict(backends)
+
+    def _fetch_envoy(self, hostname: str) -> envoy_tools.EnvoyClustersSnapshot:
+        clusters_info = envoy_tools.retrieve_envoy_clusters(
+            envoy_host=hostname,
+            envoy_admin_port=self._system_paasta_config.get_envoy_admin_port(),
+            envoy_admin_endpoint_format=self._system_paasta_config.get_envoy_admin_endpoint_format(),
+            session=self._session,
+        )
+        return envoy_tools.EnvoyClustersSnapshot(clusters_info)
+
+    def _get_future(self, kind: str, hostname: str) -> Future:
+        fetch: Callable[[str], Any] = (
+            self._fetch_haproxy if kind == self.HAPROXY else self._fetch_envoy
+        )
+        with self._lock:
+            future = self._snapshots.get((kind, hostname))
+            if future is None:
+                future = self._executor.submit(fetch, hostname)
+                self._snapshots[kind, hostname] = future
+        return future
+
+    def _get_snapshot(self, kind: str, hostname: str) -> Any:
+        future = self._get_future(kind, hostname)
+        try:
+            return future.result()
+        except Exception:
+            with self._lock:
+                if self._snapshots.get((kind, hostname)) is future:
+                    del self._snapshots[kind, hostname]
+            raise
+
+    def prefetch_haproxy(self, hostnames: Iterable[str]) -> None:
+        """Start fetching these hosts in the background."""
+        for hostname in hostnames:
+            self._get_future(self.HAPROXY, hostname)
+
+    def prefetch_envoy(self, hostnames: Iterable[str]) -> None:
+        """Start fetching these hosts in the background."""
+        for hostname in hostnames:
+            self._get_future(self.ENVOY, hostname)
+
+    def get_haproxy_backends(
+        self, hostname: str, services: Optional[Collection[str]] = None
+    ) -> List[HaproxyBackend]:
+        """Same as get_multiple_backends, but only fetches each host once."""
+        snapshot = self._get_snapshot(self.HAPROXY, hostname)
+        if services is None:
+            services = snapshot.keys()
+        return [
+            backend for service in services for backend in snapshot.get(service, [])
+        ]
+
+    def get_envoy_backends(
+        self, hostname: str, services: Optional[Collection[str]] = None
+    ) -> Dict[str, List[Tuple[envoy_tools.EnvoyBackend, bool]]]:
+        """Same as envoy_tools.get_multiple_backends, but only fetches each
+        host once."""
+        return self._get_snapshot(self.ENVOY, hostname).get_backends(services)
+
+    def get_haproxy_replication_for_all_services(self, hostname: str) -> Dict[str, int]:
+        return count_up_backends(self.get_haproxy_backends(hostname))
+
+    def get_envoy_replication_for_all_services(self, hostname: str) -> Dict[str, int]:
+        return envoy_tools.count_up_backends(self.get_envoy_backends(hostname))
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False)
+        self._session.close()
+
+
 class ServiceDiscoveryProvider(abc.ABC):
 
     NAME = "..."
@@ -495,52 +692,85 @@ class ServiceDiscoveryProvider(abc.ABC):
     def get_replication_for_all_services(self, hostname: str) -> Dict[str, int]:
         ...
 
+    def prefetch(self, hostnames: Iterable[str]) -> None:
+        """Hint that get_replication_for_all_services is about to be called for
+        these hosts. Does nothing unless the provider has a snapshot cache."""
+
 
 class SmartstackServiceDiscovery(ServiceDiscoveryProvider):
 
     NAME = "Smartstack"
 
-    def __init__(self, system_paasta_config: SystemPaastaConfig) -> None:
+    def __init__(
+        self,
+        system_paasta_config: SystemPaastaConfig,
+        snapshot_cache: Optional[DiscoverySnapshotCache] = None,
+    ) -> None:
         self._synapse_port = system_paasta_config.get_synapse_port()
         self._synapse_haproxy_url_format = (
             system_paasta_config.get_synapse_haproxy_url_format()
         )
+        self._snapshot_cache = snapshot_cache
 
     def get_replication_for_all_services(self, hostname: str) -> Dict[str, int]:
+        if self._snapshot_cache is not None:
+            return self._snapshot_cache.get_haproxy_replication_for_all_services(
+                hostname
+            )
         return get_replication_for_all_services(
             synapse_host=hostname,
             synapse_port=self._synapse_port,
             synapse_haproxy_url_format=self._synapse_haproxy_url_format,
         )
 
+    def prefetch(self, hostnames: Iterable[str]) -> None:
+        if self._snapshot_cache is not None:
+            self._snapshot_cache.prefetch_haproxy(hostnames)
+
 
 class EnvoyServiceDiscovery(ServiceDiscoveryProvider):
 
     NAME = "Envoy"
 
-    def __init__(self, system_paasta_config: SystemPaastaConfig) -> None:
+    def __init__(
+        self,
+        system_paasta_config: SystemPaastaConfig,
+        snapshot_cache: Optional[DiscoverySnapshotCache] = None,
+    ) -> None:
         self._envoy_admin_port = system_paasta_config.get_envoy_admin_port()
         self._envoy_admin_endpoint_format = (
             system_paasta_config.get_envoy_admin_endpoint_format()
         )
+        self._snapshot_cache = snapshot_cache
 
     def get_replication_for_all_services(self, hostname: str) -> Dict[str, int]:
+        if self._snapshot_cache is not None:
+            return self._snapshot_cache.get_envoy_replication_for_all_services(hostname)
         return envoy_tools.get_replication_for_all_services(
             envoy_host=hostname,
             envoy_admin_port=self._envoy_admin_port,
             envoy_admin_endpoint_format=self._envoy_admin_endpoint_format,
         )
 
+    def prefetch(self, hostnames: Iterable[str]) -> None:
+        if self._snapshot_cache is not None:
+            self._snapshot_cache.prefetch_envoy(hostnames)
+
 
 def get_service_discovery_providers(
     system_paasta_config: SystemPaastaConfig,
+    snapshot_cache: Optional[DiscoverySnapshotCache] = None,
 ) -> List[ServiceDiscoveryProvider]:
     providers: List[ServiceDiscoveryProvider] = []
     for name, _ in system_paasta_config.get_service_discovery_providers().items():
         if name == "smartstack":
-            providers.append(SmartstackServiceDiscovery(system_paasta_config))
+            providers.append(
+                SmartstackServiceDiscovery(system_paasta_config, snapshot_cache)
+            )
         elif name == "envoy":
-            providers.append(EnvoyServiceDiscovery(system_paasta_config))
+            providers.append(
+                EnvoyServiceDiscovery(system_paasta_config, snapshot_cache)
+            )
         else:
             log.warn("unknown provider")
     return providers
@@ -589,9 +819,21 @@ class BaseReplicationChecker(ReplicationChecker):
             replication_info = {}
             attribute_host_dict = self.get_allowed_locations_and_hosts(instance_config)
             instance_pool = instance_config.get_pool()
-            for location, hosts in attribute_host_dict.items():
+            hostnames_by_location = {
+                location: self.get_hostnames_in_pool(hosts, instance_pool)
+                for location, hosts in attribute_host_dict.items()
+            }
+            # start fetching every location we haven't seen yet at once,
+            # instead of one after the other in the loop below
+            provider.prefetch(
+                [
+                    hostnames[0]
+                    for location, hostnames in hostnames_by_location.items()
+                    if (location, provider.NAME) not in self._cache
+                ]
+            )
+            for location, hostnames in hostnames_by_location.items():
                 # Try to get information from all available hosts in the pool before giving up
-                hostnames = self.get_hostnames_in_pool(hosts, instance_pool)
                 for hostname in hostnames:
                     try:
                         replication_info[location] = self._get_replication_info(
@@ -719,13 +961,21 @@ class MesosSmartstackEnvoyReplicationChecker(BaseReplicationChecker):
 
 class KubeSmartstackEnvoyReplicationChecker(BaseReplicationChecker):
     def __init__(
-        self, nodes: Sequence[V1Node], system_paasta_config: SystemPaastaConfig
+        self,
+        nodes: Sequence[V1Node],
+        system_paasta_config: SystemPaastaConfig,
+        snapshot_cache: Optional[DiscoverySnapshotCache] = None,
     ) -> None:
         self.nodes = nodes
+        # there are only a handful of discover location types, so group the
+        # nodes once per type rather than once per instance
+        self._hosts_by_location_type: Dict[
+            str, Dict[str, Sequence[DiscoveredHost]]
+        ] = {}
         super().__init__(
             system_paasta_config=system_paasta_config,
             service_discovery_providers=get_service_discovery_providers(
-                system_paasta_config
+                system_paasta_config, snapshot_cache
             ),
         )
 
@@ -738,18 +988,21 @@ class KubeSmartstackEnvoyReplicationChecker(BaseReplicationChecker):
             soa_dir=instance_config.soa_dir,
         ).get_discover()
 
-        attribute_to_nodes = kubernetes_tools.get_nodes_grouped_by_attribute(
-            nodes=self.nodes, attribute=discover_location_type
-        )
-        ret: Dict[str, Sequence[DiscoveredHost]] = {}
-        for attr, nodes in attribute_to_nodes.items():
-            ret[attr] = [
-                DiscoveredHost(
-                    hostname=node.metadata.labels["yelp.com/hostname"],
-                    pool=node.metadata.labels["yelp.com/pool"],
-                )
-                for node in nodes
-            ]
+        ret = self._hosts_by_location_type.get(discover_location_type)
+        if ret is None:
+            attribute_to_nodes = kubernetes_tools.get_nodes_grouped_by_attribute(
+                nodes=self.nodes, attribute=discover_location_type
+            )
+            ret = {}
+            for attr, nodes in attribute_to_nodes.items():
+                ret[attr] = [
+                    DiscoveredHost(
+                        hostname=node.metadata.labels["yelp.com/hostname"],
+                        pool=node.metadata.labels["yelp.com/pool"],
+                    )
+                    for node in nodes
+                ]
+            self._hosts_by_location_type[discover_location_type] = ret
         return ret
 
 
@@ -0,0 +1,194 @@
+# Copyright 2015-2021 Yelp Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+A persistent, on-disk index of parsed soa-configs yaml files.
+
+Every cron entry point walks soa_dir and parses the same yaml files through
+service_configuration_lib. The index keeps the parsed contents of every file
+read during a run, keyed by absolute path (i.e. by service and
+``<instance_type>-<cluster>`` file) together with the file's mtime and size.
+At the start of the next run, entries whose file is unchanged are loaded back
+into service_configuration_lib's in-memory yaml cache, so helpers like
+``get_services_for_cluster``, ``load_service_instance_configs`` and
+``PaastaServiceConfigLoader`` only re-parse the files that changed since the
+index was last written.
+
+The index is purely an optimization: any problem reading or writing it is
+logged and the run carries on by parsing yaml as usual. It's written with
+marshal rather than pickle, so loading it can't run any code; files whose
+contents marshal can't represent (e.g. yaml timestamps) just aren't indexed.
+"""
+import contextlib
+import logging
+import marshal
+import os
+import tempfile
+import time
+from typing import Any
+from typing import cast
+from typing import Dict
+from typing import Iterator
+from typing import MutableMapping
+from typing import Optional
+from typing import Tuple
+
+import service_configuration_lib
+
+log = logging.getLogger(__name__)
+
+INDEX_FORMAT_VERSION = 2
+
+# (st_mtime_ns, st_size, parsed yaml)
+IndexEntry = Tuple[int, int, Any]
+
+
+def _file_signature(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+class SoaConfigIndex:
+    def __init__(self, index_path: str, soa_dir: str) -> None:
+        self.index_path = index_path
+        self.soa_dir = os.path.abspath(soa_dir)
+        self.entries: Dict[str, IndexEntry] = {}
+        # anything modified after this point may have been parsed before the
+        # modification, so we never record it in the index
+        self.started_at_ns = time.time_ns()
+
+    def _read_entries(self) -> Dict[str, IndexEntry]:
+        try:
+            with open(self.index_path, "rb") as f:
+                index = marshal.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            log.warning(f"Ignoring unreadable soa-configs index {self.index_path}: {e}")
+            return {}
+        if (
+            not isinstance(index, dict)
+            or index.get("version") != INDEX_FORMAT_VERSION
+            or index.get("soa_dir") != self.soa_dir
+        ):
+            log.info(f"Ignoring stale soa-configs index {self.index_path}")
+            return {}
+        return index["entries"]
+
+    def load(self) -> None:
+        """Read the index from disk, discarding it if it was built for a
+        different soa_dir or by an incompatible version of this module."""
+        self.entries = self._read_entries()
+
+    def warm_yaml_cache(self) -> int:
+        """Seed service_configuration_lib's yaml cache with every indexed file
+        that is unchanged on disk, and drop the entries that are not.
+
+        :returns: the number of files that will not need to be re-parsed
+        """
+        yaml_cache = cast(
+            MutableMapping[str, Any], service_configuration_lib._yaml_cache
+        )
+        fresh = {}
+        for path, (mtime_ns, size, data) in self.entries.items():
+            if _file_signature(path) == (mtime_ns, size):
+                fresh[path] = (mtime_ns, size, data)
+                yaml_cache.setdefault(path, data)
+        log.debug(
+            f"Reusing {len(fresh)} of {len(self.entries)} indexed soa-configs files"
+        )
+        self.entries = fresh
+        return len(fresh)
+
+    def harvest_yaml_cache(self) -> int:
+        """Record every soa_dir file parsed during this run in the index.
+
+        :returns: the number of files added to the index
+        """
+        added = 0
+        prefix = self.soa_dir + os.sep
+        for path, data in list(service_configuration_lib._yaml_cache.items()):
+            if path in self.entries or not path.startswith(prefix):
+                continue
+            signature = _file_signature(path)
+            if signature is None or signature[0] >= self.started_at_ns:
+                continue
+            try:
+                marshal.dumps(data)
+            except ValueError:
+                log.debug(f"Not indexing {path}, marshal can't represent it")
+                continue
+            self.entries[path] = (signature[0], signature[1], data)
+            added += 1
+        return added
+
+    def save(self) -> None:
+        """Merge the current entries into the on-disk index and atomically
+        replace it.
+
+        Other entry points may have written the index since we loaded it, and
+        they usually read a different subset of soa-configs than we do, so we
+        keep whatever they added, as long as its file is still there and
+        unchanged. Entries for files that were deleted, renamed or modified
+        are dropped, so that the index doesn't grow forever.
+        """
+        entries = {
+            path: entry
+            for path, entry in self._read_entries().items()
+            if _file_signature(path) == (entry[0], entry[1])
+        }
+        entries.update(self.entries)
+        index = {
+            "version": INDEX_FORMAT_VERSION,
+            "soa_dir": self.soa_dir,
+            "entries": entries,
+        }
+        try:
+            dirname = os.path.dirname(os.path.abspath(self.index_path))
+            with tempfile.NamedTemporaryFile(
+                dir=dirname,
+                prefix=".%s-" % os.path.basename(self.index_path),
+                delete=False,
+            ) as f:
+                temp_path = f.name
+                marshal.dump(index, f)
+            os.chmod(temp_path, 0o644)
+            os.rename(temp_path, self.index_path)
+        except Exception as e:
+            log.warning(f"Unable to write soa-configs index {self.index_path}: {e}")
+
+
+@contextlib.contextmanager
+def use_soa_config_index(
+    index_path: Optional[str], soa_dir: str
+) -> Iterator[Optional[SoaConfigIndex]]:
+    """Warm the yaml cache from the index at ``index_path`` for the duration of
+    the block, and write back everything parsed inside it on exit.
+
+    Does nothing when ``index_path`` is None or the yaml cache is disabled.
+    """
+    if not index_path or not service_configuration_lib._use_yaml_cache:
+        yield None
+        return
+
+    index = SoaConfigIndex(index_path=index_path, soa_dir=soa_dir)
+    index.load()
+    index.warm_yaml_cache()
+    try:
+        yield index
+    finally:
+        if index.harvest_yaml_cache():
+            index.save()
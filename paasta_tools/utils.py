@@ -38,6 +38,7 @@ import threading
 import time
 import warnings
 from collections import OrderedDict
+from concurrent.futures import Future
 from enum import Enum
 from fnmatch import fnmatch
 from functools import lru_cache
@@ -64,16 +65,13 @@ from typing import Sequence
 from typing import Set
 from typing import Tuple
 from typing import Type
+from typing import TYPE_CHECKING
 from typing import TypeVar
 from typing import Union
 
 import choice
 import dateutil.tz
-import ldap3
-import requests_cache
 import service_configuration_lib
-from docker import Client
-from docker.utils import kwargs_from_env
 from kazoo.client import KazooClient
 from mypy_extensions import TypedDict
 from service_configuration_lib import read_extra_service_information
@@ -81,6 +79,9 @@ from service_configuration_lib import read_service_configuration
 
 import paasta_tools.cli.fsm
 
+if TYPE_CHECKING:
+    from docker import Client
+
 
 # DO NOT CHANGE SPACER, UNLESS YOU'RE PREPARED TO CHANGE ALL INSTANCES
 # OF IT IN OTHER LIBRARIES (i.e. service_configuration_lib).
@@ -178,11 +179,102 @@ class TimeCacheEntry(TypedDict):
 
 _CacheRetT = TypeVar("_CacheRetT")
 
+# every time_cache that was given a name, so that their hit/miss/eviction
+# counts can be exported with metrics_lib.export_time_cache_metrics
+TIME_CACHES: Dict[str, "time_cache"] = {}
+
 
 class time_cache:
-    def __init__(self, ttl: float = 0) -> None:
-        self.configs: Dict[Tuple, TimeCacheEntry] = {}
+    """Caches what the decorated function returns for each set of arguments
+    for ttl seconds. Callers can force a reload by passing ttl=0.
+
+    It is safe to call the decorated function from several threads: when
+    several of them ask for the same missing or expired key at once, only one
+    calls the function and the others wait for its result.
+
+    :param maxsize: how many results to keep; when there are more, the least
+        recently used one is evicted. None means unbounded.
+    :param stale_ttl: for this many seconds after a result expires, keep
+        returning it straight away, while it is reloaded in the background
+    :param name: name to export the cache's hit/miss/eviction counts under
+    """
+
+    def __init__(
+        self,
+        ttl: float = 0,
+        maxsize: Optional[int] = None,
+        stale_ttl: float = 0,
+        name: Optional[str] = None,
+    ) -> None:
+        self.configs: "OrderedDict[Tuple, TimeCacheEntry]" = OrderedDict()
         self.ttl = ttl
+        self.maxsize = maxsize
+        self.stale_ttl = stale_ttl
+        self.name = name
+        self.lock = threading.Lock()
+        self.loading: Dict[Tuple, Future] = {}
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+        self.counters: Dict[str, Any] = {}
+        if name is not None:
+            TIME_CACHES[name] = self
+
+    def export_metrics(self, metrics_interface: Any) -> None:
+        """From now on, also count hits, misses and evictions with counters
+        from a metrics_lib.BaseMetrics."""
+        self.counters = {
+            stat: metrics_interface.create_counter(
+                f"time_cache.{stat}", cache=self.name
+            )
+            for stat in self.stats
+        }
+
+    def _count(self, stat: str) -> None:
+        self.stats[stat] += 1
+        if stat in self.counters:
+            self.counters[stat].count()
+
+    def clear(self) -> None:
+        with self.lock:
+            self.configs.clear()
+
+    def _store(self, key: Tuple, data: Any) -> None:
+        # must be called with self.lock held
+        self.configs[key] = {"data": data, "fetch_time": time.time()}
+        self.configs.move_to_end(key)
+        while self.maxsize is not None and len(self.configs) > self.maxsize:
+            self.configs.popitem(last=False)
+            self._count("evictions")
+
+    def _load(
+        self,
+        key: Tuple,
+        future: Future,
+        f: Callable[..., _CacheRetT],
+        *args: Any,
+        **kwargs: Any,
+    ) -> None:
+        """Calls f, stores what it returns and sets it as future's result."""
+        try:
+            data = f(*args, **kwargs)
+        except BaseException as e:
+            with self.lock:
+                del self.loading[key]
+            future.set_exception(e)
+            return
+        with self.lock:
+            del self.loading[key]
+            self._store(key, data)
+        future.set_result(data)
+
+    def _reload_in_background(
+        self, key: Tuple, future: Future, f: Callable, *args: Any, **kwargs: Any
+    ) -> None:
+        self._load(key, future, f, *args, **kwargs)
+        if future.exception() is not None:
+            # the callers already got the stale result, so just keep serving it
+            log.warning(
+                f"Error while reloading {f.__name__}{args}: {future.exception()!r}"
+            )
 
     def __call__(self, f: Callable[..., _CacheRetT]) -> Callable[..., _CacheRetT]:
         def cache(*args: Any, **kwargs: Any) -> _CacheRetT:
@@ -194,17 +286,42 @@ class time_cache:
             key = args
             for item in kwargs.items():
                 key += item
-            if (
-                (not ttl)
-                or (key not in self.configs)
-                or (time.time() - self.configs[key]["fetch_time"] > ttl)
-            ):
-                self.configs[key] = {
-                    "data": f(*args, **kwargs),
-                    "fetch_time": time.time(),
-                }
-            return self.configs[key]["data"]
 
+            with self.lock:
+                entry = self.configs.get(key)
+                age = time.time() - entry["fetch_time"] if entry else math.inf
+                in_flight = self.loading.get(key)
+                if ttl and age <= ttl + self.stale_ttl:
+                    self.configs.move_to_end(key)
+                    self._count("hits")
+                    if age > ttl and in_flight is None:
+                        in_flight = self.loading[key] = Future()
+                        threading.Thread(
+                            target=self._reload_in_background,
+                            args=(key, in_flight, f, *args),
+                            kwargs=kwargs,
+                            daemon=True,
+                        ).start()
+                    return entry["data"]
+
+                self._count("misses")
+                if in_flight is None:
+                    future = self.loading[key] = Future()
+
+            if in_flight is None:
+                self._load(key, future, f, *args, **kwargs)
+                return future.result()
+            if ttl:
+                # someone else is already loading this
+                return in_flight.result()
+            # a forced reload shouldn't wait for a load that may have started
+            # before whatever it wants to see changed
+            data = f(*args, **kwargs)
+            with self.lock:
+                self._store(key, data)
+            return data
+
+        cache.time_cache = self  # type: ignore
         return cache
 
 
@@ -1035,7 +1152,7 @@ def stringify_constraints(
     return [stringify_constraint(usc) for usc in uscs]
 
 
-@time_cache(ttl=60)
+@time_cache(ttl=60, maxsize=4096, name="validate_service_instance")
 def validate_service_instance(
     service: str, instance: str, cluster: str, soa_dir: str
 ) -> str:
@@ -2012,6 +2129,7 @@ class SystemPaastaConfigDict(TypedDict, total=False):
     spark_kubeconfig: str
     kube_clusters: Dict
     spark_use_eks_default: bool
+    soa_config_index_path: str
 
 
 def load_system_paasta_config(
@@ -2776,6 +2894,11 @@ class SystemPaastaConfig:
     def get_kube_clusters(self) -> Dict:
         return self.config_dict.get("kube_clusters", {})
 
+    def get_soa_config_index_path(self) -> Optional[str]:
+        """Where cron jobs keep the on-disk index of parsed soa-configs (see
+        paasta_tools.soa_config_index). The index is not used if unset."""
+        return self.config_dict.get("soa_config_index_path", None)
+
 
 def _run(
     command: Union[str, List[str]],
@@ -3249,7 +3372,7 @@ def get_service_instance_list_no_cache(
     return instance_list
 
 
-@time_cache(ttl=5)
+@time_cache(ttl=5, maxsize=4096, name="get_service_instance_list")
 def get_service_instance_list(
     service: str,
     cluster: Optional[str] = None,
@@ -3378,7 +3501,10 @@ def get_docker_host() -> str:
     return os.environ.get("DOCKER_HOST", "unix://var/run/docker.sock")
 
 
-def get_docker_client() -> Client:
+def get_docker_client() -> "Client":
+    from docker import Client
+    from docker.utils import kwargs_from_env
+
     client_opts = kwargs_from_env(assert_hostname=False)
     if "base_url" in client_opts:
         return Client(**client_opts)
@@ -3952,6 +4078,10 @@ def use_requests_cache(
 ) -> Callable[[_UseRequestsCacheFuncT], _UseRequestsCacheFuncT]:
     def wrap(fun: _UseRequestsCacheFuncT) -> _UseRequestsCacheFuncT:
         def fun_with_cache(*args: Any, **kwargs: Any) -> Any:
+            # imported here rather than at the top because it takes a while
+            # and most paasta commands don't need it
+            import requests_cache
+
             requests_cache.install_cache(cache_name, backend=backend, **kwargs)
             result = fun(*args, **kwargs)
             requests_cache.uninstall_cache()
@@ -4149,6 +4279,8 @@ def ldap_user_search(
     password: str,
 ) -> Set[str]:
     """Connects to LDAP and raises a subclass of LDAPOperationResult when it fails"""
+    import ldap3
+
     tls_config = ldap3.Tls(
         validate=ssl.CERT_REQUIRED, ca_certs_file="/etc/ssl/certs/ca-certificates.crt"
     )
@@ -60,6 +60,7 @@ setup(
         "paasta_tools/generate_services_yaml.py",
         "paasta_tools/get_mesos_leader.py",
         "paasta_tools/kubernetes/bin/paasta_secrets_sync.py",
+        "paasta_tools/kubernetes/bin/paasta_kubernetes_reconciler.py",
         "paasta_tools/kubernetes/bin/paasta_cleanup_stale_nodes.py",
         "paasta_tools/kubernetes/bin/kubernetes_remove_evicted_pods.py",
         "paasta_tools/list_marathon_service_instances.py",
@@ -104,6 +105,7 @@ setup(
             "paasta_firewall_update=paasta_tools.firewall_update:main",
             "paasta_firewall_logging=paasta_tools.firewall_logging:main",
             "paasta_oom_logger=paasta_tools.oom_logger:main",
+            "paasta_cgroup_oom_collector=paasta_tools.cgroup_oom_collector:main",
             "paasta_broadcast_log=paasta_tools.broadcast_log_to_services:main",
             "paasta_dump_locally_running_services=paasta_tools.dump_locally_running_services:main",
         ],
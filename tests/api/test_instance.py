@@ -1326,3 +1326,79 @@ class TestBounceStatus:
             excinfo.value.msg
             == "Temporary issue fetching bounce status. Please try again."
         )
+
+    def test_bulk(
+        self,
+        mock_pik_bounce_status,
+        mock_validate_service_instance,
+    ):
+        instance_types = {
+            "kube_instance": "kubernetes",
+            "marathon_instance": "marathon",
+            "timeout_instance": "kubernetes",
+        }
+
+        def validate_service_instance(service, instance, cluster, soa_dir):
+            if instance not in instance_types:
+                raise NoConfigurationForServiceError()
+            return instance_types[instance]
+
+        def bounce_status(service, instance, settings):
+            if instance == "timeout_instance":
+                raise asyncio.TimeoutError()
+            return {"deploy_status": "Running"}
+
+        mock_validate_service_instance.side_effect = validate_service_instance
+        mock_pik_bounce_status.side_effect = bounce_status
+        request = testing.DummyRequest()
+        request.swagger_data = {
+            "json_body": {
+                "instances": [
+                    {"service": "test_service", "instance": instance}
+                    for instance in (
+                        "kube_instance",
+                        "marathon_instance",
+                        "timeout_instance",
+                        "missing_instance",
+                    )
+                ]
+            }
+        }
+
+        statuses = instance.bulk_bounce_status(request)["statuses"]
+        assert [(s["instance"], s["status_code"]) for s in statuses] == [
+            ("kube_instance", 200),
+            ("marathon_instance", 204),
+            ("timeout_instance", 599),
+            ("missing_instance", 404),
+        ]
+        assert statuses[0]["status"] == {"deploy_status": "Running"}
+        assert "status" not in statuses[1]
+        assert statuses[2]["error_message"] == (
+            "Temporary issue fetching bounce status. Please try again."
+        )
+
+    @pytest.mark.parametrize(
+        "service_instance",
+        [{"service": "test_service"}, {"instance": "main"}, "test_service.main"],
+    )
+    def test_bulk_without_service_or_instance(
+        self,
+        mock_pik_bounce_status,
+        mock_validate_service_instance,
+        service_instance,
+    ):
+        request = testing.DummyRequest()
+        request.swagger_data = {
+            "json_body": {
+                "instances": [
+                    {"service": "test_service", "instance": "main"},
+                    service_instance,
+                ]
+            }
+        }
+
+        with pytest.raises(ApiFailure) as excinfo:
+            instance.bulk_bounce_status(request)
+        assert excinfo.value.err == 400
+        assert mock_pik_bounce_status.call_count == 0
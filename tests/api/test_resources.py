@@ -15,11 +15,15 @@ import json
 
 import asynctest
 import mock
+import pytest
 from pyramid import testing
 
+from paasta_tools.api.views.exception import ApiFailure
 from paasta_tools.api.views.resources import parse_filters
 from paasta_tools.api.views.resources import resources_utilization
 from paasta_tools.metrics import metastatus_lib
+from paasta_tools.metrics.capacity_snapshot import capacity_snapshot_from_mesos_state
+from paasta_tools.metrics.capacity_snapshot import CapacitySnapshotCache
 
 
 def test_parse_filters_empty():
@@ -180,3 +184,53 @@ def test_resources_utilization_with_filter(mock_get_mesos_master):
 
     assert resp.status_int == 200
     assert len(body) == 0
+
+
+@mock.patch("paasta_tools.api.views.resources.get_mesos_master", autospec=True)
+def test_resources_utilization_from_capacity_snapshot(mock_get_mesos_master):
+    request = testing.DummyRequest()
+    request.swagger_data = {
+        "groupings": ["region", "pool"],
+        "filter": ["region:top", "pool:default,other"],
+    }
+    cache = CapacitySnapshotCache(
+        lambda: capacity_snapshot_from_mesos_state(mock_mesos_state)
+    )
+    cache.refresh()
+
+    with mock.patch(
+        "paasta_tools.api.views.resources.settings.capacity_snapshot_cache",
+        cache,
+        autospec=None,
+    ):
+        resp = resources_utilization(request)
+    body = json.loads(resp.body.decode("utf-8"))
+
+    assert not mock_get_mesos_master.called
+    assert resp.status_int == 200
+    assert resp.headers["X-Paasta-Capacity-Snapshot-Age"] == "0"
+    assert len(body) == 2
+    assert body[0]["groupings"] == {"region": "top", "pool": "default"}
+    assert body[0]["cpus"] == {"total": 10, "free": 9, "used": 1}
+
+
+@mock.patch("paasta_tools.api.views.resources.get_mesos_master", autospec=True)
+def test_resources_utilization_before_first_kube_snapshot(mock_get_mesos_master):
+    request = testing.DummyRequest()
+    request.swagger_data = {}
+
+    with mock.patch(
+        "paasta_tools.api.views.resources.settings.capacity_snapshot_cache",
+        CapacitySnapshotCache(mock.Mock()),
+        autospec=None,
+    ), mock.patch(
+        "paasta_tools.api.views.resources.settings.capacity_snapshot_source",
+        "kubernetes",
+        autospec=None,
+    ), pytest.raises(
+        ApiFailure
+    ) as excinfo:
+        resources_utilization(request)
+
+    assert excinfo.value.err == 503
+    assert not mock_get_mesos_master.called
@@ -11,11 +11,18 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import json
+
 import mock
+import pytest
 from pyramid import testing
 
+from paasta_tools.api import settings
+from paasta_tools.api.views.exception import ApiFailure
 from paasta_tools.api.views.service import list_instances
 from paasta_tools.api.views.service import list_services_for_cluster
+from paasta_tools.api.views.service import service_status
+from paasta_tools.instance.kubernetes import ServiceKubeObjects
 
 
 @mock.patch(
@@ -53,3 +60,74 @@ def test_list_services_for_cluster(
         ("fake_service", "fake_instance_b"),
         ("fake_service", "fake_instance_c"),
     ]
+
+
+@mock.patch("paasta_tools.api.views.service.get_instance_status", autospec=True)
+@mock.patch("paasta_tools.api.views.service.get_actual_deployments", autospec=True)
+@mock.patch(
+    "paasta_tools.api.views.service.list_all_instances_for_service", autospec=True
+)
+def test_service_status(
+    mock_list_all_instances_for_service,
+    mock_get_actual_deployments,
+    mock_get_instance_status,
+):
+    settings.cluster = "fake_cluster"
+    settings.kubernetes_client = mock.Mock()
+    mock_list_all_instances_for_service.return_value = {"main", "canary"}
+
+    def get_instance_status(service, instance, **kwargs):
+        if instance == "canary":
+            raise ApiFailure("Deployment key fake_cluster.canary not found.", 404)
+        return {"service": service, "instance": instance, "version": "abc123"}
+
+    mock_get_instance_status.side_effect = get_instance_status
+
+    request = testing.DummyRequest(
+        matchdict={"service": "fake_service"}, params={"verbose": "2", "new": "true"}
+    )
+    response = service_status(request)
+
+    assert response.content_type == "application/x-ndjson"
+    statuses = sorted(
+        (json.loads(line) for line in b"".join(response.app_iter).splitlines()),
+        key=lambda status: status["instance"],
+    )
+    assert statuses == [
+        {
+            "service": "fake_service",
+            "instance": "canary",
+            "error_message": "Deployment key fake_cluster.canary not found.",
+            "error_code": 404,
+        },
+        {"service": "fake_service", "instance": "main", "version": "abc123"},
+    ]
+
+    assert mock_get_instance_status.call_count == 2
+    # the instances share the service's deployments and kubernetes objects
+    service_objects = {
+        id(call[1]["service_objects"])
+        for call in mock_get_instance_status.call_args_list
+    }
+    assert len(service_objects) == 1
+    for call in mock_get_instance_status.call_args_list:
+        assert call[1]["actual_deployments"] == (
+            mock_get_actual_deployments.return_value
+        )
+        assert isinstance(call[1]["service_objects"], ServiceKubeObjects)
+        assert call[1]["verbose"] == 2
+        assert call[1]["use_new"] is True
+        assert call[1]["include_smartstack"] is True
+
+
+@mock.patch(
+    "paasta_tools.api.views.service.list_all_instances_for_service", autospec=True
+)
+def test_service_status_no_instances(mock_list_all_instances_for_service):
+    settings.cluster = "fake_cluster"
+    mock_list_all_instances_for_service.return_value = set()
+
+    request = testing.DummyRequest(matchdict={"service": "fake_service"})
+    with pytest.raises(ApiFailure) as excinfo:
+        service_status(request)
+    assert excinfo.value.err == 404
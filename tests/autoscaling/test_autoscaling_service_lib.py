@@ -1721,6 +1721,70 @@ def test_proportional_decision_policy_moving_average(
     )
 
 
+@mock.patch(
+    "paasta_tools.autoscaling.autoscaling_service_lib.save_forecast_state",
+    autospec=True,
+)
+@mock.patch(
+    "paasta_tools.autoscaling.autoscaling_service_lib.fetch_forecast_state",
+    autospec=True,
+)
+@mock.patch(
+    "paasta_tools.autoscaling.autoscaling_service_lib.save_historical_load",
+    autospec=True,
+)
+@mock.patch(
+    "paasta_tools.autoscaling.autoscaling_service_lib.fetch_historical_load",
+    autospec=True,
+)
+@mock.patch(
+    "paasta_tools.autoscaling.autoscaling_service_lib.time.time",
+    autospec=True,
+    return_value=2000,
+)
+def test_proportional_decision_policy_holt_winters(
+    mock_time,
+    mock_fetch_historical_load,
+    mock_save_historical_load,
+    mock_fetch_forecast_state,
+    mock_save_forecast_state,
+):
+    mock_fetch_historical_load.return_value = [(t, 6) for t in range(0, 2000, 60)]
+    mock_fetch_forecast_state.return_value = {}
+
+    assert 0 == autoscaling_service_lib.proportional_decision_policy(
+        zookeeper_path="/test",
+        current_instances=10,
+        min_instances=5,
+        max_instances=15,
+        num_healthy_instances=10,
+        forecast_policy="holt_winters",
+        setpoint=0.6,
+        utilization=0.6,
+        persist_data=True,
+    )
+    mock_fetch_forecast_state.assert_called_once_with(zk_path_prefix="/test")
+    (saved_state,), _ = mock_save_forecast_state.call_args
+    assert saved_state["last_bucket"] == 5
+    assert saved_state["level"] == pytest.approx(6)
+
+
+def test_serialize_and_deserialize_forecast_state():
+    mock_zk = mock.Mock()
+    with mock.patch(
+        "paasta_tools.autoscaling.autoscaling_service_lib.ZookeeperPool",
+        autospec=True,
+    ) as mock_zk_pool:
+        mock_zk_pool.return_value.__enter__.return_value = mock_zk
+        autoscaling_service_lib.save_forecast_state({"level": 1.5}, "/test")
+        mock_zk.set.assert_called_once_with("/test/forecast_state", mock.ANY)
+
+        mock_zk.get.return_value = (mock_zk.set.call_args[0][1], None)
+        assert autoscaling_service_lib.fetch_forecast_state("/test") == {"level": 1.5}
+        mock_zk.get.side_effect = NoNodeError
+        assert autoscaling_service_lib.fetch_forecast_state("/test") == {}
+
+
 def test_filter_autoscaling_tasks_considers_old_versions():
     fake_system_paasta_config = mock.MagicMock()
     marathon_apps = [
@@ -1,3 +1,8 @@
+import math
+
+import mock
+import pytest
+
 from paasta_tools.autoscaling import forecasting
 
 
@@ -70,3 +75,108 @@ def test_linreg_forecast_policy():
     assert 350 == forecasting.linreg_forecast_policy(
         historical_load_2, linreg_window_seconds=7, linreg_extrapolation_seconds=0
     )
+
+
+def _daily_load(timestamp):
+    # a "day" of 24 seconds, peaking at 300 at the 6th second
+    return 200 + 100 * math.sin(2 * math.pi * timestamp / 24)
+
+
+def test_holt_forecast_policy_follows_trend():
+    historical_load = [(t, 100 + 10 * t) for t in range(50)]
+    forecast = forecasting.holt_forecast_policy(
+        historical_load,
+        holt_winters_alpha=0.5,
+        holt_winters_beta=0.5,
+        holt_winters_bucket_seconds=1,
+        holt_winters_extrapolation_seconds=[0, 10],
+    )
+    assert forecast == pytest.approx(100 + 10 * 59, rel=0.01)
+
+
+def test_holt_winters_forecast_policy_anticipates_peaks():
+    historical_load = [(t, _daily_load(t)) for t in range(24 * 10 + 1)]
+    kwargs = dict(
+        holt_winters_bucket_seconds=1,
+        holt_winters_season_seconds=24,
+    )
+    # "now" is the start of a day, the peak is 6 seconds away
+    assert forecasting.holt_winters_forecast_policy(
+        historical_load, holt_winters_extrapolation_seconds=6, **kwargs
+    ) == pytest.approx(300, abs=5)
+    assert forecasting.holt_winters_forecast_policy(
+        historical_load, holt_winters_extrapolation_seconds=18, **kwargs
+    ) == pytest.approx(100, abs=5)
+    assert (
+        forecasting.holt_forecast_policy(
+            historical_load,
+            holt_winters_bucket_seconds=1,
+            holt_winters_extrapolation_seconds=6,
+        )
+        < 250
+    )
+
+
+def test_holt_winters_forecast_policy_resumes_from_state():
+    historical_load = [(t, _daily_load(t) + t) for t in range(24 * 5)]
+    kwargs = dict(
+        holt_winters_bucket_seconds=1,
+        holt_winters_season_seconds=24,
+        holt_winters_extrapolation_seconds=3,
+    )
+
+    forecast_state = {}
+    for now in range(50, len(historical_load), 7):
+        incremental = forecasting.holt_winters_forecast_policy(
+            historical_load[: now + 1], forecast_state=forecast_state, **kwargs
+        )
+    assert forecast_state["last_bucket"] == now - 1
+    from_scratch = forecasting.holt_winters_forecast_policy(
+        historical_load[: now + 1], **kwargs
+    )
+    # the model built from scratch is bootstrapped with more seasons of
+    # data, so the two only converge
+    assert incremental == pytest.approx(from_scratch, rel=0.05)
+
+    # the incremental model only needs the history since its last update
+    with mock.patch.object(
+        forecasting.HoltWinters, "initialize", autospec=True
+    ) as mock_initialize:
+        forecasting.holt_winters_forecast_policy(
+            historical_load[now - 5 :], forecast_state=forecast_state, **kwargs
+        )
+        assert mock_initialize.call_count == 0
+
+
+def test_holt_winters_forecast_policy_ignores_incompatible_state():
+    historical_load = [(t, 100) for t in range(100)]
+    forecast_state = {}
+    forecasting.holt_winters_forecast_policy(
+        historical_load,
+        forecast_state=forecast_state,
+        holt_winters_bucket_seconds=1,
+        holt_winters_season_seconds=10,
+    )
+    assert len(forecast_state["seasonals"]) == 10
+
+    # different parameters
+    forecasting.holt_winters_forecast_policy(
+        historical_load,
+        forecast_state=forecast_state,
+        holt_winters_bucket_seconds=1,
+        holt_winters_season_seconds=20,
+    )
+    assert len(forecast_state["seasonals"]) == 20
+
+    # older than all of the history
+    forecast_state["level"] = 1000
+    assert 100 == forecasting.holt_winters_forecast_policy(
+        [(t, 100) for t in range(200, 300)],
+        forecast_state=forecast_state,
+        holt_winters_bucket_seconds=1,
+        holt_winters_season_seconds=20,
+    )
+
+
+def test_holt_winters_forecast_policy_not_enough_history():
+    assert 7 == forecasting.holt_winters_forecast_policy([(1, 5), (2, 7)])
@@ -0,0 +1,57 @@
+import struct
+
+import pytest
+
+from paasta_tools.autoscaling.historical_load import HistoricalLoad
+
+
+def test_historical_load_bytes_roundtrip():
+    records = [(1.5, 10.0), (2.5, 20.0), (3.5, 30.0)]
+    historical_load = HistoricalLoad.from_records(records)
+
+    data = historical_load.to_bytes()
+    assert data == b"".join(struct.pack("dd", *r) for r in records)
+    assert HistoricalLoad.from_bytes(data) == records
+    # a partially written trailing record is dropped
+    assert HistoricalLoad.from_bytes(data + b"\0" * 3) == records
+    assert HistoricalLoad.from_bytes(b"") == []
+
+
+def test_historical_load_is_bounded():
+    historical_load = HistoricalLoad(max_records=4)
+    for i in range(10):
+        historical_load.append((i, i * 10))
+        assert len(historical_load) == min(i + 1, 4)
+        assert historical_load[0] == (max(0, i - 3), max(0, i - 3) * 10)
+        assert historical_load[-1] == (i, i * 10)
+    assert list(historical_load) == [(6, 60), (7, 70), (8, 80), (9, 90)]
+    assert list(historical_load.timestamps) == [6, 7, 8, 9]
+
+    assert HistoricalLoad(range(10), range(10), max_records=3) == [
+        (7, 7),
+        (8, 8),
+        (9, 9),
+    ]
+
+
+def test_historical_load_window():
+    historical_load = HistoricalLoad.from_records(
+        [(1, 100), (2, 200), (5, 500), (3, 300), (7, 700)]
+    )
+    window = historical_load.window(2, 5)
+    assert isinstance(window, HistoricalLoad)
+    assert window == [(2, 200), (5, 500), (3, 300)]
+    assert historical_load.window(8, 10) == []
+
+
+def test_historical_load_slicing():
+    historical_load = HistoricalLoad.from_records([(1, 100), (2, 200), (3, 300)])
+    assert historical_load[-2:] == [(2, 200), (3, 300)]
+    assert historical_load[-2:] == HistoricalLoad.from_records([(2, 200), (3, 300)])
+    with pytest.raises(IndexError):
+        historical_load[3]
+
+
+def test_historical_load_mismatched_columns():
+    with pytest.raises(ValueError):
+        HistoricalLoad([1, 2], [1])
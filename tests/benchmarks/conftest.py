@@ -0,0 +1,13 @@
+"""Benchmarks are too slow to run with the rest of the tests, so they're skipped
+unless PAASTA_RUN_BENCHMARKS is set. What they measure is logged, e.g.:
+
+    PAASTA_RUN_BENCHMARKS=1 py.test -o log_cli=true --log-cli-level=INFO tests/benchmarks
+"""
+import os
+
+import pytest
+
+
+def pytest_runtest_setup(item):
+    if not os.environ.get("PAASTA_RUN_BENCHMARKS"):
+        pytest.skip("set PAASTA_RUN_BENCHMARKS=1 to run benchmarks")
@@ -0,0 +1,115 @@
+"""Memory held by async_ttl_cache in a long-lived process like paasta-api, after
+serving the status of every instance of a large synthetic fleet once and then
+only ever being asked about a few of them.
+
+Without a bound or a sweep, the entries for every instance stay in the cache
+after they expire, until the same instance is asked about again. To try a
+bigger fleet:
+
+    PAASTA_RUN_BENCHMARKS=1 PAASTA_BENCHMARK_INSTANCES=50000 \\
+    py.test -o log_cli=true --log-cli-level=INFO tests/benchmarks/test_async_ttl_cache_memory_benchmark.py
+"""
+import asyncio
+import logging
+import math
+import os
+import tracemalloc
+from types import SimpleNamespace
+
+import mock
+import pytest
+
+from paasta_tools.async_utils import async_ttl_cache
+
+log = logging.getLogger(__name__)
+
+NUM_INSTANCES = int(os.environ.get("PAASTA_BENCHMARK_INSTANCES", 2000))
+TASKS_PER_INSTANCE = 3
+TTL = 15
+
+
+def make_status_handler(**cache_kwargs):
+    # stands in for the mesos state lookups the instance status handlers make
+    @async_ttl_cache(ttl=TTL, **cache_kwargs)
+    async def get_tasks(service, instance):
+        return [
+            {
+                "id": f"{service}.{instance}.{i}",
+                "state": "TASK_RUNNING",
+                "hostname": f"host{i}.example.com",
+                "resources": {"cpus": 0.5, "mem": 1024, "disk": 1024},
+            }
+            for i in range(TASKS_PER_INSTANCE)
+        ]
+
+    async def instance_status(service, instance):
+        tasks = await get_tasks(service, instance)
+        return {
+            "service": service,
+            "instance": instance,
+            "running_instance_count": sum(
+                task["state"] == "TASK_RUNNING" for task in tasks
+            ),
+        }
+
+    return instance_status, get_tasks.cache_stats
+
+
+def serve_fleet_then_a_few(cache_kwargs):
+    """Returns how many bytes the cache still holds, and how many entries."""
+    instances = [
+        (f"service{i // 10}", f"instance{i % 10}") for i in range(NUM_INSTANCES)
+    ]
+    loop = asyncio.new_event_loop()
+    tracemalloc.start()
+    try:
+        # a mock would remember every call, and use more memory than the cache
+        now = [0]
+        with mock.patch(
+            "paasta_tools.async_utils.time",
+            SimpleNamespace(time=lambda: now[0]),
+            autospec=None,
+        ):
+            instance_status, stats = make_status_handler(**cache_kwargs)
+            baseline = tracemalloc.get_traced_memory()[0]
+
+            for service, instance in instances:
+                loop.run_until_complete(instance_status(service, instance))
+            # everything has expired by the time the next requests come in
+            now[0] = TTL * 2
+            for service, instance in instances[:10]:
+                loop.run_until_complete(instance_status(service, instance))
+
+            retained = tracemalloc.get_traced_memory()[0] - baseline
+    finally:
+        tracemalloc.stop()
+        loop.close()
+    return retained, stats.size()
+
+
+@pytest.fixture(scope="module")
+def unbounded():
+    return serve_fleet_then_a_few({"sweep_interval": math.inf})
+
+
+@pytest.mark.parametrize(
+    "cache_kwargs,max_entries",
+    [
+        # the expired entries are swept on the first call after they expire
+        ({}, 10),
+        ({"maxsize": 1000}, 10),
+        # without the sweep, only maxsize bounds it
+        ({"maxsize": 1000, "sweep_interval": math.inf}, 1000),
+    ],
+)
+def test_async_ttl_cache_memory_benchmark(unbounded, cache_kwargs, max_entries):
+    unbounded, unbounded_entries = unbounded
+    retained, entries = serve_fleet_then_a_few(cache_kwargs)
+    log.info(
+        f"{cache_kwargs}: {entries} entries, {retained / 2**20:.1f}MiB "
+        f"(unbounded: {unbounded_entries} entries, {unbounded / 2**20:.1f}MiB)"
+    )
+
+    assert unbounded_entries == NUM_INSTANCES
+    assert entries == max_entries
+    assert retained < unbounded
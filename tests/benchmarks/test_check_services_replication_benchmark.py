@@ -0,0 +1,131 @@
+"""Run time of check_services_replication over a large cluster, with the pods
+passed as a plain list (every instance scans every pod) and as a PodIndex.
+
+To get meaningful numbers, run it with more pods, e.g.:
+
+    PAASTA_RUN_BENCHMARKS=1 PAASTA_BENCHMARK_PODS=50000 \\
+    py.test -o log_cli=true --log-cli-level=INFO tests/benchmarks/test_check_services_replication_benchmark.py
+"""
+import logging
+import os
+import time
+from types import SimpleNamespace
+
+import mock
+import pytest
+
+from paasta_tools import check_services_replication_tools
+from paasta_tools.check_kubernetes_services_replication import (
+    check_kubernetes_pod_replication,
+)
+from paasta_tools.kubernetes_tools import KubernetesDeploymentConfig
+from paasta_tools.kubernetes_tools import PodIndex
+
+log = logging.getLogger(__name__)
+
+NUM_PODS = int(os.environ.get("PAASTA_BENCHMARK_PODS", 2000))
+PODS_PER_INSTANCE = 10
+INSTANCES_PER_SERVICE = 5
+
+
+def make_pod(service, instance, ready):
+    return SimpleNamespace(
+        metadata=SimpleNamespace(
+            namespace=f"paastasvc-{service}",
+            labels={
+                "paasta.yelp.com/service": service,
+                "paasta.yelp.com/instance": instance,
+            },
+        ),
+        status=SimpleNamespace(
+            conditions=[SimpleNamespace(type="Ready", status=str(ready))]
+        ),
+    )
+
+
+def make_cluster(num_pods):
+    num_instances = num_pods // PODS_PER_INSTANCE
+    services = {}
+    pods = []
+    for i in range(num_instances):
+        service = f"service{i // INSTANCES_PER_SERVICE}"
+        instance = f"instance{i % INSTANCES_PER_SERVICE}"
+        services.setdefault(service, []).append(
+            KubernetesDeploymentConfig(
+                service=service,
+                cluster="fake_cluster",
+                instance=instance,
+                config_dict={"instances": PODS_PER_INSTANCE},
+                branch_dict={"docker_image": "image", "desired_state": "start"},
+                soa_dir="/fake/soa",
+            )
+        )
+        pods.extend(
+            make_pod(service, instance, ready=j > 0) for j in range(PODS_PER_INSTANCE)
+        )
+    return services, pods
+
+
+@pytest.fixture
+def cluster():
+    services, pods = make_cluster(NUM_PODS)
+
+    def fake_config_loader(service, soa_dir):
+        return mock.Mock(instance_configs=mock.Mock(return_value=services[service]))
+
+    with mock.patch(
+        "paasta_tools.check_services_replication_tools.list_services",
+        autospec=True,
+        return_value=list(services),
+    ), mock.patch(
+        "paasta_tools.check_services_replication_tools.PaastaServiceConfigLoader",
+        autospec=True,
+        side_effect=fake_config_loader,
+    ), mock.patch(
+        "paasta_tools.check_kubernetes_services_replication.get_proxy_port_for_instance",
+        autospec=True,
+        return_value=None,
+    ), mock.patch(
+        "paasta_tools.monitoring_tools.send_replication_event_if_under_replication",
+        autospec=True,
+    ) as mock_send_replication_event:
+        yield pods, mock_send_replication_event
+
+
+def run_check(pods):
+    start = time.perf_counter()
+    check_services_replication_tools.check_services_replication(
+        soa_dir="/fake/soa",
+        cluster="fake_cluster",
+        service_instances=[],
+        instance_type_class=KubernetesDeploymentConfig,
+        check_service_replication=check_kubernetes_pod_replication,
+        replication_checker=mock.Mock(),
+        all_tasks_or_pods=pods,
+        dry_run=True,
+    )
+    return time.perf_counter() - start
+
+
+def test_check_services_replication_benchmark(cluster):
+    pods, mock_send_replication_event = cluster
+    num_instances = len(pods) // PODS_PER_INSTANCE
+
+    unindexed = run_check(pods)
+    unindexed_calls = mock_send_replication_event.call_args_list
+    mock_send_replication_event.reset_mock()
+
+    start = time.perf_counter()
+    pod_index = PodIndex(pods)
+    index_build = time.perf_counter() - start
+    indexed = run_check(pod_index)
+
+    log.info(
+        f"{len(pods)} pods, {num_instances} instances: "
+        f"list {unindexed:.3f}s, index {index_build + indexed:.3f}s "
+        f"({index_build:.3f}s to build)"
+    )
+    assert mock_send_replication_event.call_args_list == unindexed_calls
+    assert all(
+        call[1]["num_available"] == PODS_PER_INSTANCE - 1 for call in unindexed_calls
+    )
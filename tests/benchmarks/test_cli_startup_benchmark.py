@@ -0,0 +1,88 @@
+"""Import time of what the paasta CLI loads before doing anything, measured with
+``python -X importtime``, for tab completion and for a few simple subcommands.
+
+Timings on shared CI machines are too noisy to assert on, so by default this
+only checks that none of these entry points import the heavy client libraries
+(that's what used to make them slow), and logs how long the imports took.
+To also enforce a budget, e.g. while working on startup time:
+
+    PAASTA_RUN_BENCHMARKS=1 PAASTA_BENCHMARK_CLI_IMPORT_BUDGET_MS=200 \\
+    py.test -o log_cli=true --log-cli-level=INFO tests/benchmarks/test_cli_startup_benchmark.py
+"""
+import logging
+import os
+import subprocess
+import sys
+
+import pytest
+
+log = logging.getLogger(__name__)
+
+IMPORT_BUDGET_MS = os.environ.get("PAASTA_BENCHMARK_CLI_IMPORT_BUDGET_MS")
+
+HEAVY_MODULES = {
+    "aiohttp",
+    "boto3",
+    "docker",
+    "kubernetes",
+    "ldap3",
+    "marathon",
+    "paasta_tools.kubernetes_tools",
+    "paasta_tools.marathon_tools",
+    "paasta_tools.paastaapi",
+    "requests_cache",
+}
+
+
+def importtime(modules):
+    """Returns the modules imported when importing modules, and the total
+    time that took in microseconds."""
+    output = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {', '.join(modules)}"],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        check=True,
+        env=dict(os.environ, PYTHONPATH=os.getcwd()),
+    ).stderr.decode()
+    imported = set()
+    total = 0
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            imported.add(name.strip())
+            if not name.startswith("  "):
+                total += int(cumulative)
+    return imported, total
+
+
+@pytest.mark.parametrize(
+    "entry_point,modules",
+    [
+        # completing subcommand names, and their arguments from the argspec
+        ("completion", ["paasta_tools.cli.cli"]),
+        ("completion of service names", ["paasta_tools.cli.cli", "paasta_tools.utils"]),
+        ("paasta list", ["paasta_tools.cli.cli", "paasta_tools.cli.cmds.list"]),
+        (
+            "paasta list-clusters",
+            ["paasta_tools.cli.cli", "paasta_tools.cli.cmds.list_clusters"],
+        ),
+        (
+            "paasta get-docker-image",
+            ["paasta_tools.cli.cli", "paasta_tools.cli.cmds.get_docker_image"],
+        ),
+    ],
+)
+def test_cli_startup_benchmark(entry_point, modules):
+    imported, total = importtime(modules)
+    log.info(f"{entry_point}: {total / 1000:.0f}ms of imports")
+
+    assert not {
+        heavy
+        for heavy in HEAVY_MODULES
+        for module in imported
+        if module == heavy or module.startswith(f"{heavy}.")
+    }
+    if IMPORT_BUDGET_MS:
+        assert total / 1000 < float(IMPORT_BUDGET_MS)
@@ -0,0 +1,102 @@
+"""How long paasta logs --from/--to takes with the file log reader, reading a
+few minutes out of a large log file written like FileLogWriter writes it:
+the first time, when the file has to be indexed, once it's indexed, and by
+scanning the whole file as if there were no index.
+
+To use a bigger file, or enforce a budget for the indexed read:
+
+    PAASTA_RUN_BENCHMARKS=1 PAASTA_BENCHMARK_LOG_LINES=2000000 PAASTA_BENCHMARK_FILE_LOG_BUDGET_S=0.5 \\
+    py.test -o log_cli=true --log-cli-level=INFO tests/benchmarks/test_file_log_reader_benchmark.py
+"""
+import datetime
+import logging
+import os
+import time
+
+import mock
+import pytz
+
+from paasta_tools.cli.cmds import logs
+from paasta_tools.utils import format_log_line
+
+log = logging.getLogger(__name__)
+
+NUM_LINES = int(os.environ.get("PAASTA_BENCHMARK_LOG_LINES", 20000))
+BUDGET_S = os.environ.get("PAASTA_BENCHMARK_FILE_LOG_BUDGET_S")
+# a line every 50ms, so 1200 lines a minute
+LINE_INTERVAL = datetime.timedelta(milliseconds=50)
+START = datetime.datetime(2021, 6, 8, 0, 0, 0)
+
+
+def write_log_file(path):
+    with open(path, "w") as f:
+        for i in range(NUM_LINES):
+            f.write(
+                format_log_line(
+                    "event",
+                    "norcal-prod",
+                    "fake_service",
+                    ["main", "canary"][i % 2],
+                    "deploy",
+                    f"Deploy step {i} of fake_service.main finished",
+                    timestamp=(START + i * LINE_INTERVAL).isoformat(),
+                )
+                + "\n"
+            )
+
+
+def timed_print_logs_by_time(reader, start_time, end_time):
+    with mock.patch(
+        "paasta_tools.cli.cmds.logs.print_log", autospec=True
+    ) as mock_print_log:
+        start = time.perf_counter()
+        reader.print_logs_by_time(
+            service="fake_service",
+            start_time=start_time,
+            end_time=end_time,
+            levels=["event"],
+            components=["deploy"],
+            clusters=["norcal-prod"],
+            instances=["main"],
+            pods=None,
+            raw_mode=True,
+            strip_headers=False,
+        )
+        return mock_print_log.call_count, time.perf_counter() - start
+
+
+def test_file_log_reader_benchmark(tmpdir):
+    path = str(tmpdir.join("fake_service.log"))
+    write_log_file(path)
+    reader = logs.FileLogReader(path_format=str(tmpdir.join("{service}.log")))
+
+    # five minutes from the middle of the file
+    # (which doesn't include its ends)
+    start_time = pytz.utc.localize(
+        START + NUM_LINES // 2 * LINE_INTERVAL - datetime.timedelta(milliseconds=1)
+    )
+    end_time = start_time + datetime.timedelta(minutes=5)
+
+    first_lines, first_duration = timed_print_logs_by_time(reader, start_time, end_time)
+    indexed_lines, indexed_duration = timed_print_logs_by_time(
+        reader, start_time, end_time
+    )
+    with mock.patch.object(
+        logs.LogFileIndex,
+        "offset_range",
+        autospec=True,
+        side_effect=lambda index, start_time, end_time: (0, index.size),
+    ):
+        scanned_lines, scan_duration = timed_print_logs_by_time(
+            reader, start_time, end_time
+        )
+
+    log.info(
+        f"{indexed_lines} lines out of {NUM_LINES}: "
+        f"{first_duration:.3f}s indexing, {indexed_duration:.3f}s indexed, "
+        f"{scan_duration:.3f}s scanning the whole file"
+    )
+    assert first_lines == indexed_lines == scanned_lines
+    assert indexed_lines == 5 * 1200 // 2
+    if BUDGET_S:
+        assert indexed_duration < float(BUDGET_S)
@@ -0,0 +1,122 @@
+"""Formatting throughput of KubernetesDeploymentConfig.format_kubernetes_app,
+with and without the formatted app cache.
+
+To get meaningful numbers, run it with more instances, e.g.:
+
+    PAASTA_RUN_BENCHMARKS=1 PAASTA_BENCHMARK_INSTANCES=5000 \\
+    py.test -o log_cli=true --log-cli-level=INFO tests/benchmarks/test_format_kubernetes_app_benchmark.py
+"""
+import logging
+import os
+import time
+
+import mock
+import pytest
+
+from paasta_tools import kubernetes_tools
+from paasta_tools.kubernetes_tools import KubernetesDeploymentConfig
+from paasta_tools.utils import SystemPaastaConfig
+
+log = logging.getLogger(__name__)
+
+NUM_INSTANCES = int(os.environ.get("PAASTA_BENCHMARK_INSTANCES", 50))
+
+
+def make_instance_configs(soa_dir, num_instances):
+    return [
+        KubernetesDeploymentConfig(
+            service=f"service{i % 100}",
+            cluster="fake_cluster",
+            instance=f"instance{i}",
+            config_dict={
+                "cpus": 0.5,
+                "mem": 1024,
+                "instances": 3,
+                "env": {"FOO": "bar", "INDEX": str(i)},
+                "healthcheck_mode": "http",
+                "extra_volumes": [
+                    {
+                        "hostPath": "/nail/srv",
+                        "containerPath": "/nail/srv",
+                        "mode": "RO",
+                    }
+                ],
+                "registrations": [f"service{i % 100}.main"],
+            },
+            branch_dict={
+                "docker_image": f"services-service{i % 100}:paasta-{i:040x}",
+                "git_sha": f"{i:040x}",
+                "image_version": None,
+                "desired_state": "start",
+                "force_bounce": None,
+            },
+            soa_dir=soa_dir,
+        )
+        for i in range(num_instances)
+    ]
+
+
+def format_all(instance_configs):
+    start = time.perf_counter()
+    apps = [config.format_kubernetes_app() for config in instance_configs]
+    return apps, time.perf_counter() - start
+
+
+def report(label, elapsed, num_instances):
+    log.info(
+        f"{label}: {num_instances} instances in {elapsed:.3f}s "
+        f"({num_instances / elapsed:.0f} instances/s)"
+    )
+
+
+@pytest.fixture
+def benchmark_env(tmpdir):
+    system_paasta_config = SystemPaastaConfig(
+        {
+            "cluster": "fake_cluster",
+            "docker_registry": "fake_registry",
+            "volumes": [
+                {
+                    "hostPath": "/etc/boto_cfg",
+                    "containerPath": "/etc/boto_cfg",
+                    "mode": "RO",
+                }
+            ],
+            "hacheck_sidecar_volumes": [],
+            "service_discovery_providers": {"smartstack": {}, "envoy": {}},
+        },
+        "/fake_dir/",
+    )
+    with mock.patch(
+        "paasta_tools.kubernetes_tools.load_system_paasta_config",
+        autospec=True,
+        return_value=system_paasta_config,
+    ), mock.patch(
+        "paasta_tools.utils.load_system_paasta_config",
+        autospec=True,
+        return_value=system_paasta_config,
+    ), mock.patch(
+        "paasta_tools.kubernetes_tools.load_service_namespace_config",
+        autospec=True,
+        return_value=kubernetes_tools.ServiceNamespaceConfig(),
+    ):
+        yield str(tmpdir)
+    kubernetes_tools.disable_formatted_app_cache()
+
+
+def test_format_kubernetes_app_benchmark(benchmark_env):
+    instance_configs = make_instance_configs(benchmark_env, NUM_INSTANCES)
+
+    uncached_apps, uncached = format_all(instance_configs)
+    report("uncached", uncached, NUM_INSTANCES)
+
+    cache = kubernetes_tools.enable_formatted_app_cache()
+    _, cold = format_all(instance_configs)
+    report("cold cache", cold, NUM_INSTANCES)
+    cached_apps, warm = format_all(instance_configs)
+    report("warm cache", warm, NUM_INSTANCES)
+
+    assert cache.hits == NUM_INSTANCES
+    assert cached_apps == uncached_apps
+    for config, app in zip(instance_configs, cached_apps):
+        assert app.metadata.labels["paasta.yelp.com/instance"] == config.instance
@@ -0,0 +1,106 @@
+"""Run time of parsing a large haproxy stats CSV with csv.DictReader over the
+whole text (how get_multiple_backends used to do it) and with
+smartstack_tools.parse_haproxy_csv, both for a single service and for all of
+them.
+
+To get meaningful numbers, run it with more rows, e.g.:
+
+    PAASTA_RUN_BENCHMARKS=1 PAASTA_BENCHMARK_HAPROXY_ROWS=500000 \\
+    py.test -o log_cli=true --log-cli-level=INFO tests/benchmarks/test_haproxy_csv_benchmark.py
+"""
+import csv
+import io
+import logging
+import os
+import time
+
+import pytest
+
+from paasta_tools.smartstack_tools import HAPROXY_CSV_CHUNK_SIZE
+from paasta_tools.smartstack_tools import parse_haproxy_csv
+
+log = logging.getLogger(__name__)
+
+NUM_ROWS = int(os.environ.get("PAASTA_BENCHMARK_HAPROXY_ROWS", 20000))
+BACKENDS_PER_SERVICE = 20
+
+HEADER = (
+    "# pxname,svname,qcur,qmax,scur,smax,slim,stot,bin,bout,dreq,dresp,ereq,"
+    "econ,eresp,wretr,wredis,status,weight,act,bck,chkfail,chkdown,lastchg,"
+    "downtime,qlimit,pid,iid,sid,throttle,lbtot,tracked,type,rate,rate_lim,"
+    "rate_max,check_status,check_code,check_duration,hrsp_1xx,hrsp_2xx,"
+    "hrsp_3xx,hrsp_4xx,hrsp_5xx,hrsp_other,hanafail,req_rate,req_rate_max,"
+    "req_tot,cli_abrt,srv_abrt,comp_in,comp_out,comp_byp,comp_rsp,lastsess,"
+)
+ROW = (
+    "{pxname},{svname},0,0,0,0,,0,0,0,,0,,0,0,0,0,UP,1,1,0,0,2,15223,2,,1,142,"
+    "1,,0,,2,0,,0,L7OK,200,1,0,0,0,0,0,0,0,,,,0,0,,,,,-1,"
+)
+
+
+def make_haproxy_csv(num_rows):
+    lines = [HEADER]
+    for i in range(num_rows // (BACKENDS_PER_SERVICE + 2)):
+        pxname = f"service{i}.main"
+        lines.append(ROW.format(pxname=pxname, svname="FRONTEND"))
+        for j in range(BACKENDS_PER_SERVICE):
+            svname = f"10.{i // 256 % 256}.{i % 256}.{j}:31000_host{j}"
+            lines.append(ROW.format(pxname=pxname, svname=svname))
+        lines.append(ROW.format(pxname=pxname, svname="BACKEND"))
+    return "\n".join(lines) + "\n"
+
+
+def dict_reader_backends(haproxy_data, services):
+    backends = []
+    for line in csv.DictReader(haproxy_data.splitlines()):
+        line["pxname"] = line.pop("# pxname")
+        line.pop("")
+        ha_slave, ha_service = line["svname"], line["pxname"]
+        if (services is None or ha_service in services) and ha_slave not in (
+            "FRONTEND",
+            "BACKEND",
+        ):
+            backends.append(line)
+    return backends
+
+
+def iter_chunked_lines(haproxy_bytes):
+    """Splits the CSV into lines the way requests' Response.iter_lines does,
+    without a network round trip."""
+    stream = io.BytesIO(haproxy_bytes)
+    pending = ""
+    for chunk in iter(lambda: stream.read(HAPROXY_CSV_CHUNK_SIZE), b""):
+        lines = (pending + chunk.decode("utf-8")).split("\n")
+        pending = lines.pop()
+        yield from lines
+    if pending:
+        yield pending
+
+
+def _time(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+@pytest.mark.parametrize("services", [None, ["service3.main"]])
+def test_haproxy_csv_benchmark(services):
+    haproxy_data = make_haproxy_csv(NUM_ROWS)
+    haproxy_bytes = haproxy_data.encode("utf-8")
+
+    dict_reader_time, expected = _time(
+        lambda: dict_reader_backends(haproxy_data, services)
+    )
+    streaming_time, actual = _time(
+        lambda: list(parse_haproxy_csv(iter_chunked_lines(haproxy_bytes), services))
+    )
+
+    assert len(actual) == len(expected)
+    for backend, expected_backend in zip(actual, expected):
+        assert backend == {key: expected_backend[key] for key in backend}
+
+    log.info(
+        f"{NUM_ROWS} rows ({len(haproxy_bytes) / 2 ** 20:.1f}MiB), "
+        f"services={services}: DictReader {dict_reader_time:.3f}s, "
+        f"parse_haproxy_csv {streaming_time:.3f}s"
+    )
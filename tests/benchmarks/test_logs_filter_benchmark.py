@@ -0,0 +1,129 @@
+"""How many lines per second paasta logs gets through when filtering a scribe
+stream for one cluster and instance of a service, decoding each line with
+json and isodate in the filter and again for sorting (as it used to), and
+decoding each line once into a LogRecord, after a substring pre-check.
+
+Uses a synthetic stream of a service's stdout in several clusters by default.
+To filter a recorded one, with one JSON log line per line:
+
+    PAASTA_RUN_BENCHMARKS=1 PAASTA_BENCHMARK_SCRIBE_LOG=/path/to/stream.log \\
+    PAASTA_BENCHMARK_CLUSTER=norcal-prod PAASTA_BENCHMARK_INSTANCE=main \\
+    py.test -o log_cli=true --log-cli-level=INFO tests/benchmarks/test_logs_filter_benchmark.py
+"""
+import contextlib
+import datetime
+import json
+import logging
+import os
+import time
+
+import isodate
+import mock
+import pytz
+
+from paasta_tools.cli.cmds import logs
+
+log = logging.getLogger(__name__)
+
+SCRIBE_LOG = os.environ.get("PAASTA_BENCHMARK_SCRIBE_LOG")
+NUM_LINES = int(os.environ.get("PAASTA_BENCHMARK_LINES", 20000))
+CLUSTER = os.environ.get("PAASTA_BENCHMARK_CLUSTER", "norcal-prod")
+INSTANCE = os.environ.get("PAASTA_BENCHMARK_INSTANCE", "main")
+
+CLUSTERS = ["norcal-prod", "nova-prod", "pnw-prod", "norcal-devc"]
+INSTANCES = ["main", "canary", "batch", "worker"]
+
+
+def synthetic_scribe_log(num_lines):
+    start = datetime.datetime(2021, 6, 8, 6, 0, 0)
+    return [
+        json.dumps(
+            {
+                # nanoseconds, like the timestamps of app output
+                "timestamp": (
+                    start + datetime.timedelta(microseconds=1234 * i)
+                ).strftime("%Y-%m-%dT%H:%M:%S.%f")
+                + f"{i % 1000:03d}Z",
+                "level": "event",
+                "cluster": CLUSTERS[i % len(CLUSTERS)],
+                "service": "fake_service",
+                "instance": INSTANCES[(i // len(CLUSTERS)) % len(INSTANCES)],
+                "component": "stdout",
+                "pod_name": f"fake-service-main-{i % 7}",
+                "message": f"GET /status/{i} 200 took {i % 97}ms",
+            }
+        )
+        for i in range(num_lines)
+    ]
+
+
+def old_filter_scribe_logs(lines, start_time, end_time):
+    """filter_scribe_logs as it was, with the line filter decoding each line
+    and the timestamp being decoded again to sort by."""
+    for line in lines:
+        if logs.paasta_app_output_passes_filter(
+            line,
+            [],
+            "fake_service",
+            ["stdout"],
+            [CLUSTER],
+            [INSTANCE],
+            start_time=start_time,
+            end_time=end_time,
+        ):
+            try:
+                timestamp = isodate.parse_datetime(json.loads(line).get("timestamp"))
+                if not timestamp.tzinfo:
+                    timestamp = pytz.utc.localize(timestamp)
+            except ValueError:
+                timestamp = pytz.utc.localize(datetime.datetime.min)
+            yield {"raw_line": line, "sort_key": timestamp}
+
+
+def new_filter_scribe_logs(lines, start_time, end_time):
+    with mock.patch("paasta_tools.cli.cmds.logs.scribereader", autospec=True):
+        scribe_log_reader = logs.ScribeLogReader(cluster_map={})
+    return scribe_log_reader.filter_scribe_logs(
+        contextlib.nullcontext(lines),
+        "fake_env",
+        "stream_paasta_app_output_fake_service",
+        [],
+        "fake_service",
+        ["stdout"],
+        [CLUSTER],
+        [INSTANCE],
+        filter_fn=logs.paasta_app_output_passes_filter,
+        record_filter_fn=logs.paasta_app_output_record_passes_filter,
+        start_time=start_time,
+        end_time=end_time,
+    )
+
+
+def timed(filter_scribe_logs, lines):
+    start_time = pytz.utc.localize(datetime.datetime(2000, 1, 1))
+    end_time = pytz.utc.localize(datetime.datetime(2100, 1, 1))
+    start = time.perf_counter()
+    filtered = list(filter_scribe_logs(lines, start_time, end_time))
+    return filtered, time.perf_counter() - start
+
+
+def test_logs_filter_benchmark():
+    if SCRIBE_LOG:
+        with open(SCRIBE_LOG) as f:
+            lines = f.read().splitlines()
+    else:
+        lines = synthetic_scribe_log(NUM_LINES)
+
+    old, old_duration = timed(old_filter_scribe_logs, lines)
+    new, new_duration = timed(new_filter_scribe_logs, lines)
+
+    log.info(
+        f"filtered {len(new)} of {len(lines)} lines: "
+        f"{len(lines) / old_duration:.0f} lines/s decoding each line twice, "
+        f"{len(lines) / new_duration:.0f} lines/s decoding it once"
+    )
+    # the sort keys may differ by a microsecond, as isodate 0.5 rounds the
+    # nanoseconds where parse_log_timestamp truncates them
+    assert [line["raw_line"] for line in new] == [line["raw_line"] for line in old]
+    if not SCRIBE_LOG:
+        assert len(new) == NUM_LINES // (len(CLUSTERS) * len(INSTANCES))
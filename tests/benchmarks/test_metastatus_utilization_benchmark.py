@@ -0,0 +1,166 @@
+"""How long paasta metastatus -vv/-vvv takes to work out resource utilization by
+pool and region, and by host, for a large synthetic cluster, both from
+Kubernetes nodes and pods and from a mesos state.
+
+Only the utilization calculations are timed: the nodes, pods and state are
+built up front. Timings are logged rather than asserted on, since they're too
+noisy on shared CI machines. To try a bigger cluster, or enforce a budget:
+
+    PAASTA_RUN_BENCHMARKS=1 PAASTA_BENCHMARK_NODES=5000 PAASTA_BENCHMARK_PODS=100000 \\
+    PAASTA_BENCHMARK_UTILIZATION_BUDGET_S=10 \\
+    py.test -o log_cli=true --log-cli-level=INFO tests/benchmarks/test_metastatus_utilization_benchmark.py
+"""
+import logging
+import os
+import time
+from types import SimpleNamespace
+
+import mock
+import pytest
+
+from paasta_tools.metrics import metastatus_lib
+
+log = logging.getLogger(__name__)
+
+NUM_NODES = int(os.environ.get("PAASTA_BENCHMARK_NODES", 500))
+NUM_PODS = int(os.environ.get("PAASTA_BENCHMARK_PODS", 10000))
+BUDGET_S = os.environ.get("PAASTA_BENCHMARK_UTILIZATION_BUDGET_S")
+
+POOLS = ["default", "batch", "spark", "stateful"]
+REGIONS = ["uswest1-prod", "useast1-prod", "euwest1-prod"]
+GROUPINGS = [["pool", "region"], ["pool", "region", "hostname"]]
+
+
+def synthetic_nodes():
+    # the metastatus calculations only look at these attributes, and building
+    # this many real V1Nodes would take longer than what's being measured
+    return [
+        SimpleNamespace(
+            metadata=SimpleNamespace(
+                name=f"node{i}",
+                labels={
+                    "yelp.com/pool": POOLS[i % len(POOLS)],
+                    "yelp.com/region": REGIONS[i % len(REGIONS)],
+                    "yelp.com/hostname": f"node{i}",
+                },
+            ),
+            status=SimpleNamespace(
+                allocatable={
+                    "cpu": "64",
+                    "memory": "256Gi",
+                    "ephemeral-storage": "500Gi",
+                    "pods": "110",
+                }
+            ),
+        )
+        for i in range(NUM_NODES)
+    ]
+
+
+def synthetic_pods():
+    return [
+        SimpleNamespace(
+            spec=SimpleNamespace(
+                node_name=f"node{i % NUM_NODES}",
+                containers=[
+                    SimpleNamespace(
+                        resources=SimpleNamespace(
+                            requests={
+                                "cpu": f"{100 * (1 + i % 10)}m",
+                                "memory": f"{512 * (1 + i % 4)}Mi",
+                                "ephemeral-storage": "1Gi",
+                            }
+                        )
+                    ),
+                    # a sidecar without any requests
+                    SimpleNamespace(resources=SimpleNamespace(requests=None)),
+                ],
+            )
+        )
+        for i in range(NUM_PODS)
+    ]
+
+
+def synthetic_mesos_state():
+    slaves = [
+        {
+            "id": f"slave{i}",
+            "hostname": f"host{i}",
+            "resources": {"cpus": 64, "mem": 262144, "disk": 512000},
+            "reserved_resources": {},
+            "attributes": {
+                "pool": POOLS[i % len(POOLS)],
+                "region": REGIONS[i % len(REGIONS)],
+            },
+        }
+        for i in range(NUM_NODES)
+    ]
+    tasks = [
+        {
+            "state": "TASK_RUNNING",
+            "slave_id": f"slave{i % NUM_NODES}",
+            "resources": {"cpus": 0.5, "mem": 1024, "disk": 1024},
+        }
+        for i in range(NUM_PODS)
+    ]
+    return {"slaves": slaves, "frameworks": [{"tasks": tasks}]}
+
+
+def assert_groups_add_up(utilization_by_group):
+    cpus = sum(u["total"].cpus for u in utilization_by_group.values())
+    count = sum(u["slave_count"] for u in utilization_by_group.values())
+    assert count == NUM_NODES
+    assert cpus == 64 * NUM_NODES
+
+
+def report(what, groupings, duration):
+    log.info(
+        f"{what} by {', '.join(groupings)}: {duration:.2f}s "
+        f"({NUM_NODES} nodes, {NUM_PODS} pods)"
+    )
+    if BUDGET_S:
+        assert duration < float(BUDGET_S)
+
+
+@pytest.fixture(scope="module")
+def kube_cluster():
+    return synthetic_nodes(), synthetic_pods()
+
+
+@pytest.mark.parametrize("groupings", GROUPINGS)
+def test_kube_utilization_benchmark(kube_cluster, groupings):
+    nodes, pods = kube_cluster
+    metastatus_lib.suffixed_number_value.cache_clear()
+    with mock.patch(
+        "paasta_tools.metrics.metastatus_lib.get_all_nodes_cached",
+        autospec=True,
+        return_value=nodes,
+    ), mock.patch(
+        "paasta_tools.metrics.metastatus_lib.get_all_pods_cached",
+        autospec=True,
+        return_value=pods,
+    ):
+        start = time.perf_counter()
+        utilization = metastatus_lib.get_resource_utilization_by_grouping_kube(
+            grouping_func=metastatus_lib.key_func_for_attribute_multi_kube(groupings),
+            kube_client=mock.Mock(),
+        )
+        duration = time.perf_counter() - start
+
+    report("kubernetes", groupings, duration)
+    assert_groups_add_up(utilization)
+
+
+@pytest.mark.parametrize("groupings", GROUPINGS)
+def test_mesos_utilization_benchmark(groupings):
+    mesos_state = synthetic_mesos_state()
+
+    start = time.perf_counter()
+    utilization = metastatus_lib.get_resource_utilization_by_grouping(
+        grouping_func=metastatus_lib.key_func_for_attribute_multi(groupings),
+        mesos_state=mesos_state,
+    )
+    duration = time.perf_counter() - start
+
+    report("mesos", groupings, duration)
+    assert_groups_add_up(utilization)
@@ -0,0 +1,86 @@
+"""Replays a kern.log through paasta_oom_logger's capture loop, while emitting
+the events it captures is stuck, to check that capturing never waits for
+emitting and to measure how many lines per second it gets through.
+
+Uses a synthetic log of OOM storms by default. To replay a recorded one, in the
+format the syslog-ng destination writes ("${UNIXTIME} ${HOST} ${MESSAGE}"):
+
+    PAASTA_RUN_BENCHMARKS=1 PAASTA_BENCHMARK_KERN_LOG=/path/to/kern.log \\
+    py.test -o log_cli=true --log-cli-level=INFO tests/benchmarks/test_oom_logger_replay_benchmark.py
+"""
+import io
+import logging
+import os
+import threading
+import time
+
+import mock
+
+from paasta_tools import oom_logger
+
+log = logging.getLogger(__name__)
+
+KERN_LOG = os.environ.get("PAASTA_BENCHMARK_KERN_LOG")
+NUM_OOMS = int(os.environ.get("PAASTA_BENCHMARK_OOMS", 1000))
+
+# what the kernel logs around every cgroup OOM kill
+OOM_TEMPLATE = """\
+{ts} dev37-devc [30533610.306528] apache2 invoked oom-killer: gfp_mask=0x24000c0, order=0, oom_score_adj=0
+{ts} dev37-devc [30533610.306529] CPU: 3 PID: 1757658 Comm: apache2 Not tainted 5.4.0-1045-aws #47-Ubuntu
+{ts} dev37-devc [30533610.306530] Call Trace:
+{ts} dev37-devc [30533610.306531]  dump_stack+0x6d/0x8b
+{ts} dev37-devc [30533610.306532] memory: usage 524288kB, limit 524288kB, failcnt 1234
+{ts} dev37-devc [30533610.306533] Memory cgroup stats for /kubepods/burstable/pod{n:08x}-4741-4ef4-8f5a-182c5683df8b: cache:0KB rss:524288KB
+{ts} dev37-devc [30533610.306534] [  pid  ]   uid  tgid total_vm      rss pgtables_bytes swapents oom_score_adj name
+{ts} dev37-devc [30533610.306535] [1757658]     0 1757658   140321   131072  1130496        0           999 apache2
+{ts} dev37-devc [30533610.306536] oom-kill:constraint=CONSTRAINT_MEMCG,nodemask=(null),cpuset={n:012x}cdc2bb6944078eaefd3278f8f9b3a9725c4ddffb722752a2279,mems_allowed=0-1,oom_memcg=/kubepods/burstable/pod{n:08x}-4741-4ef4-8f5a-182c5683df8b/{n:012x}cdc2bb6944078eaefd3278f8f9b3a9725c4ddffb722752a2279,task_memcg=/kubepods/burstable/pod{n:08x}-4741-4ef4-8f5a-182c5683df8b/{n:012x}cdc2bb6944078eaefd3278f8f9b3a9725c4ddffb722752a2279,task=apache2,pid=1757658,uid=0
+{ts} dev37-devc [30533610.306537] Memory cgroup out of memory: Killed process 1757658 (apache2) total-vm:561284kB, anon-rss:524288kB, file-rss:0kB, shmem-rss:0kB
+"""
+
+
+def synthetic_kern_log(num_ooms):
+    # the same few containers OOM over and over
+    return "".join(
+        OOM_TEMPLATE.format(ts=1500316300 + i, n=i % 20) for i in range(num_ooms)
+    )
+
+
+def test_oom_logger_replay_benchmark():
+    if KERN_LOG:
+        with open(KERN_LOG) as f:
+            kern_log = f.read()
+    else:
+        kern_log = synthetic_kern_log(NUM_OOMS)
+    num_lines = kern_log.count("\n")
+
+    captured = threading.Event()
+
+    # emitting is stuck until everything has been captured
+    def emit_batch(events):
+        captured.wait()
+
+    emitter = oom_logger.OOMEventEmitter(
+        "fake_cluster", mock.Mock(), max_queued=num_lines
+    )
+    with mock.patch.object(
+        emitter, "emit_batch", autospec=True, side_effect=emit_batch
+    ), mock.patch(
+        "paasta_tools.oom_logger.sys.stdin", io.StringIO(kern_log), autospec=None
+    ):
+        emitter.start()
+        start = time.perf_counter()
+        events = 0
+        for event in oom_logger.capture_oom_events_from_stdin():
+            emitter.put(event)
+            events += 1
+        duration = time.perf_counter() - start
+        captured.set()
+        emitter.stop()
+
+    log.info(
+        f"captured {events} OOM events from {num_lines} lines in {duration:.2f}s "
+        f"({num_lines / duration:.0f} lines/s)"
+    )
+    assert emitter.dropped == 0
+    if not KERN_LOG:
+        assert events == NUM_OOMS
@@ -0,0 +1,136 @@
+import argparse
+
+import mock
+import pytest
+
+from paasta_tools.cli import argspec
+from paasta_tools.cli.cli import get_argparser
+from paasta_tools.cli.cli import get_completing_command
+from paasta_tools.cli.cli import PAASTA_SUBCOMMANDS
+from paasta_tools.cli.utils import lazy_choices_completer
+
+
+def _structure(spec):
+    """The parts of an argspec that tab completion depends on."""
+    return {
+        "arguments": [
+            (
+                tuple(argument["option_strings"]),
+                argument["dest"],
+                argument["action"],
+                argument.get("nargs"),
+            )
+            for argument in spec["arguments"]
+        ],
+        "subcommands": {
+            name: _structure(subcommand)
+            for name, subcommand in spec.get("subcommands", {}).items()
+        },
+    }
+
+
+@pytest.fixture
+def mock_list_external_commands():
+    with mock.patch(
+        "paasta_tools.cli.cli.list_external_commands", autospec=True, return_value=set()
+    ):
+        yield
+
+
+def test_argspec_is_up_to_date(mock_list_external_commands):
+    # if this fails, run `make cli-argspec` and check in the result
+    checked_in = argspec.load_argspec()
+    generated = argspec.generate_argspec()
+    assert sorted(checked_in) == sorted(PAASTA_SUBCOMMANDS)
+    assert {name: _structure(spec) for name, spec in checked_in.items()} == {
+        name: _structure(spec) for name, spec in generated.items()
+    }
+
+
+@pytest.mark.parametrize("command", sorted(PAASTA_SUBCOMMANDS))
+def test_parser_from_argspec(command, mock_list_external_commands):
+    spec = argspec.load_argspec()
+    parser = get_argparser(commands=[command], argspec=spec)
+    (subparsers,) = [
+        action
+        for action in parser._actions
+        if isinstance(action, argparse._SubParsersAction)
+    ]
+    assert _structure(argspec.describe_parser(subparsers.choices[command])) == (
+        _structure(spec[command])
+    )
+
+
+def test_describe_parser_completers():
+    def list_things():
+        return ["b", "a"]
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--service").completer = lazy_choices_completer(
+        argspec.load_argspec
+    )
+    parser.add_argument("--thing").completer = lazy_choices_completer(list_things)
+    parser.add_argument("--other").completer = argspec.load_argspec
+    parser.add_argument("--local").completer = list_things
+    parser.add_argument("--flag", action="store_true")
+
+    arguments = {a["dest"]: a for a in argspec.describe_parser(parser)["arguments"]}
+    assert arguments["service"]["choices_from"] == (
+        "paasta_tools.cli.argspec:load_argspec"
+    )
+    assert arguments["thing"]["completion_choices"] == ["a", "b"]
+    assert arguments["other"]["completer"] == "paasta_tools.cli.argspec:load_argspec"
+    assert "completer" not in arguments["local"]
+    assert arguments["flag"]["action"] == "store_true"
+    assert "const" not in arguments["flag"]
+
+
+def test_lazy_completers():
+    parser = argparse.ArgumentParser()
+    argspec.add_arguments_from_spec(
+        parser,
+        {
+            "arguments": [
+                {
+                    "option_strings": ["-s"],
+                    "dest": "service",
+                    "action": "store",
+                    "help": None,
+                    "choices_from": "paasta_tools.utils:list_services",
+                },
+                {
+                    "option_strings": ["-c"],
+                    "dest": "component",
+                    "action": "store",
+                    "help": None,
+                    "completion_choices": ["build", "deploy"],
+                },
+            ]
+        },
+    )
+    service_action, component_action = parser._actions[1:]
+    with mock.patch(
+        "paasta_tools.utils.list_services",
+        autospec=True,
+        return_value=["foo", "bar"],
+    ):
+        assert service_action.completer("f") == ["foo"]
+    assert component_action.completer("d") == ["deploy"]
+
+
+@pytest.mark.parametrize(
+    "comp_line,expected",
+    [
+        ("paasta ", None),
+        ("paasta sta", None),
+        ("paasta status", None),
+        ("paasta status ", "status"),
+        ("paasta status -s fo", "status"),
+        ("paasta -v logs --comp", "logs"),
+    ],
+)
+def test_get_completing_command(comp_line, expected):
+    with mock.patch.dict(
+        "os.environ", {"COMP_LINE": comp_line, "COMP_POINT": str(len(comp_line))}
+    ):
+        assert get_completing_command() == expected
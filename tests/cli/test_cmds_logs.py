@@ -14,6 +14,7 @@
 import contextlib
 import datetime
 import json
+import mmap
 from multiprocessing import Queue
 from queue import Empty
 
@@ -426,6 +427,144 @@ def test_marathon_log_line_passes_filter_fails_invalid_json():
     )
 
 
+@pytest.mark.parametrize(
+    "timestamp",
+    [
+        "2016-06-08T06:31:52.706609135Z",
+        "2016-06-08T06:31:52.706609Z",
+        "2016-06-08T06:31:52.706609",
+        "2016-06-08T06:31:52Z",
+        "2016-06-08T06:31:52",
+        "2016-06-08T06:31:52.5Z",
+        # not the fixed format, so parsed by isodate
+        "2015-07-22T10:38:46-07:00",
+        "2015-07-22T10:38:46.123+02:00",
+        "20150722T103846Z",
+    ],
+)
+def test_parse_log_timestamp_same_as_isodate(timestamp):
+    expected = isodate.parse_datetime(timestamp)
+    actual = logs.parse_log_timestamp(timestamp)
+    assert actual == expected
+    assert actual.utcoffset() == expected.utcoffset()
+
+
+@pytest.mark.parametrize(
+    "timestamp,microsecond",
+    [
+        ("2016-06-08T06:31:52.0000005Z", 0),
+        ("2016-06-08T06:31:52.0000015Z", 1),
+        ("2016-06-08T06:31:52.00000050001Z", 0),
+        ("2016-06-08T06:31:52.9999996Z", 999999),
+    ],
+)
+def test_parse_log_timestamp_truncates_to_microseconds(timestamp, microsecond):
+    # isodate 0.5 rounds these instead, and can round up to the next second
+    assert logs.parse_log_timestamp(timestamp) == datetime.datetime(
+        2016, 6, 8, 6, 31, 52, microsecond, tzinfo=datetime.timezone.utc
+    )
+
+
+def test_parse_log_timestamp_invalid():
+    with raises(ValueError):
+        logs.parse_log_timestamp("2016-06-08T06:31:99Z")
+    with raises(ValueError):
+        logs.parse_log_timestamp("not a timestamp")
+
+
+def test_decode_log_line():
+    line = json.dumps({"timestamp": "2016-06-08T06:31:52.706609135Z", "a": 1})
+    assert logs.decode_log_line(line) == logs.LogRecord(
+        raw_line=line,
+        fields={"timestamp": "2016-06-08T06:31:52.706609135Z", "a": 1},
+        timestamp=datetime.datetime(
+            2016, 6, 8, 6, 31, 52, 706609, tzinfo=datetime.timezone.utc
+        ),
+    )
+    assert logs.decode_log_line('{"a": 1}').timestamp is None
+    assert logs.decode_log_line('{"timestamp": "yesterday"}').timestamp is None
+    assert logs.decode_log_line("{ abcd }") is None
+    assert logs.decode_log_line("[1, 2]") is None
+
+
+def test_log_line_may_pass_filter():
+    line = format_log_line(
+        "event", "fake_cluster1", "fake_service", "main", "build", "fake_line"
+    )
+    assert logs.log_line_may_pass_filter(line, ["fake_cluster1"], ["main"])
+    assert logs.log_line_may_pass_filter(line, ["other", "fake_cluster1"], None)
+    assert not logs.log_line_may_pass_filter(line, ["fake_cluster2"], ["main"])
+    assert not logs.log_line_may_pass_filter(line, ["fake_cluster1"], ["canary"])
+
+    any_cluster_line = format_log_line(
+        "event", ANY_CLUSTER, "fake_service", "main", "build", "fake_line"
+    )
+    assert logs.log_line_may_pass_filter(any_cluster_line, ["fake_cluster2"], None)
+
+
+@pytest.mark.parametrize(
+    "record_filter_fn,line_filter_fn",
+    [
+        (logs.paasta_log_record_passes_filter, logs.paasta_log_line_passes_filter),
+        (
+            logs.paasta_app_output_record_passes_filter,
+            logs.paasta_app_output_passes_filter,
+        ),
+    ],
+)
+def test_log_record_filters_same_as_line_filters(record_filter_fn, line_filter_fn):
+    levels = ["event"]
+    components = ["build", "stdout"]
+    clusters = ["fake_cluster1"]
+    start_time = isodate.parse_datetime("2016-06-08T06:00:00Z")
+    end_time = isodate.parse_datetime("2016-06-08T07:00:00Z")
+    lines = [
+        json.dumps(
+            {
+                "timestamp": timestamp,
+                "level": level,
+                "cluster": cluster,
+                "service": "fake_service",
+                "instance": instance,
+                "component": component,
+                "message": "fake_line",
+            }
+        )
+        for timestamp in ["2016-06-08T06:31:52.706609135Z", "2016-06-08T08:00:00Z"]
+        for level in ["event", "debug"]
+        for cluster in ["fake_cluster1", "fake_cluster2", ANY_CLUSTER]
+        for instance in ["main", "canary"]
+        for component in ["build", "stdout", "deploy"]
+    ]
+    for instances in [["main"], None]:
+        for line in lines:
+            record = logs.decode_log_line(line)
+            assert record_filter_fn(
+                record,
+                levels,
+                "fake_service",
+                components,
+                clusters,
+                instances,
+                start_time=start_time,
+                end_time=end_time,
+            ) == line_filter_fn(
+                line,
+                levels,
+                "fake_service",
+                components,
+                clusters,
+                instances,
+                start_time=start_time,
+                end_time=end_time,
+            )
+
+
+def test_paasta_app_output_passes_filter_true_when_invalid_timestamp():
+    line = json.dumps({"timestamp": "yesterday", "component": "stdout"})
+    assert logs.paasta_app_output_passes_filter(line, [], "fake_service", [], [], None)
+
+
 def test_extract_utc_timestamp_from_log_line_ok():
     fake_timestamp = "2015-07-22T10:38:46-07:00"
     fake_utc_timestamp = isodate.parse_datetime("2015-07-22T17:38:46.000000")
@@ -702,6 +841,127 @@ def test_scribereader_print_logs_by_time():
         assert mock_scribereader.get_stream_reader.call_count == 10 * 2
 
 
+def test_scribereader_print_logs_by_time_out_of_order():
+    def scribe_line(second, message):
+        return json.dumps(
+            {
+                "cluster": "fake_cluster1",
+                "component": "stderr",
+                "instance": "main",
+                "level": "debug",
+                "message": message,
+                "timestamp": f"2016-06-08T06:31:{second:02d}.706609135Z",
+            }
+        ).encode()
+
+    with mock.patch(
+        "paasta_tools.cli.cmds.logs.scribereader", autospec=True
+    ) as mock_scribereader, mock.patch(
+        "paasta_tools.cli.cmds.logs.ScribeLogReader.determine_scribereader_envs",
+        autospec=True,
+        return_value=["env1"],
+    ), mock.patch(
+        "paasta_tools.cli.cmds.logs.print_log", autospec=True
+    ) as mock_print_log:
+        mock_scribereader.get_tail_host_and_port.return_value = "fake_host", "fake_port"
+        # written by several hosts, so a little out of order, with a copy
+        mock_scribereader.get_stream_reader.return_value = contextlib.nullcontext(
+            [
+                scribe_line(52, "c"),
+                scribe_line(50, "a"),
+                scribe_line(52, "c"),
+                scribe_line(51, "b"),
+            ]
+        )
+
+        start_time, end_time = logs.generate_start_end_time(
+            "2016-06-08T06:00:00", "2016-06-08T07:00:00"
+        )
+        logs.ScribeLogReader(cluster_map={}).print_logs_by_time(
+            "fake_service",
+            start_time,
+            end_time,
+            ["debug"],
+            ["stderr"],
+            ["fake_cluster1"],
+            ["main"],
+            pods=None,
+            raw_mode=False,
+            strip_headers=False,
+        )
+
+    assert printed_messages(mock_print_log) == ["a", "b", "c"]
+
+
+def make_log_line(minute, message):
+    return {
+        "raw_line": f"{minute} {message}",
+        "sort_key": datetime.datetime(
+            2016, 6, 8, 6, minute, tzinfo=datetime.timezone.utc
+        ),
+    }
+
+
+def test_merge_log_streams():
+    streams = [
+        [make_log_line(1, "a"), make_log_line(4, "a"), make_log_line(5, "a")],
+        [],
+        [make_log_line(2, "c"), make_log_line(3, "c"), make_log_line(6, "c")],
+    ]
+    merged = logs.merge_log_streams(
+        [lambda stream=stream: iter(stream) for stream in streams], buffer_lines=1
+    )
+    assert [line["raw_line"] for line in merged] == [
+        "1 a",
+        "2 c",
+        "3 c",
+        "4 a",
+        "5 a",
+        "6 c",
+    ]
+
+
+def test_merge_log_streams_raises_errors_from_streams():
+    def broken_stream():
+        yield make_log_line(1, "a")
+        raise ValueError("connection reset")
+
+    merged = logs.merge_log_streams(
+        [broken_stream, lambda: iter([make_log_line(2, "b")])]
+    )
+    with raises(ValueError):
+        list(merged)
+
+
+def test_dedup_log_lines():
+    def line(minute, raw_line):
+        return dict(make_log_line(minute, ""), raw_line=raw_line)
+
+    no_timestamp = {
+        "raw_line": "no timestamp",
+        "sort_key": datetime.datetime.min.replace(tzinfo=datetime.timezone.utc),
+    }
+    lines = [
+        no_timestamp,
+        no_timestamp,
+        line(1, "a"),
+        line(1, "b"),
+        line(1, "a"),
+        line(2, "b"),
+        line(3, "c"),
+        # far enough from the first copy that it's been forgotten
+        line(30, "c"),
+    ]
+    deduped = logs.dedup_log_lines(lines, window=datetime.timedelta(minutes=10))
+    assert [line["raw_line"] for line in deduped] == [
+        "no timestamp",
+        "a",
+        "b",
+        "c",
+        "c",
+    ]
+
+
 def test_tail_paasta_logs_ctrl_c_in_queue_get():
     service = "fake_service"
     levels = ["fake_level1", "fake_level2"]
@@ -1030,6 +1290,24 @@ def test_get_log_reader():
         assert isinstance(actual, logs.ScribeLogReader)
 
 
+def test_get_log_reader_file():
+    mock_system_paasta_config = mock.Mock(
+        autospec="paasta_tools.utils.SystemPaastaConfig"
+    )
+    mock_system_paasta_config.get_log_reader.return_value = {
+        "driver": "file",
+        "options": {"path_format": "/var/log/paasta_logs/{service}.log"},
+    }
+    with mock.patch(
+        "paasta_tools.cli.cmds.logs.load_system_paasta_config",
+        autospec=True,
+        return_value=mock_system_paasta_config,
+    ):
+        actual = logs.get_log_reader()
+    assert isinstance(actual, logs.FileLogReader)
+    assert actual.path_format == "/var/log/paasta_logs/{service}.log"
+
+
 def test_generate_start_end_time():
     start_time, end_time = logs.generate_start_end_time()
 
@@ -1206,3 +1484,270 @@ def test_pick_default_log_mode():
 
         # Supports tailing , time and line counts. Line counts should be prioritized
         assert logs_by_lines.call_count == 1
+
+
+def write_log_file(path, lines):
+    with open(str(path), "a") as f:
+        for timestamp, cluster, instance, message in lines:
+            f.write(
+                format_log_line(
+                    "event",
+                    cluster,
+                    "fake_service",
+                    instance,
+                    "deploy",
+                    message,
+                    timestamp=timestamp,
+                )
+                + "\n"
+            )
+
+
+def make_file_log_lines(minutes):
+    return [
+        (f"2021-06-08T06:{minute:02d}:{second:02d}.000001", cluster, "main", message)
+        for minute in minutes
+        for second, cluster, message in [
+            (10, "fake_cluster1", f"{minute} a"),
+            (20, "fake_cluster2", f"{minute} b"),
+            (30, ANY_CLUSTER, f"{minute} c"),
+        ]
+    ]
+
+
+def test_log_file_index(tmpdir):
+    log_file = tmpdir.join("fake_service.log")
+    write_log_file(log_file, make_file_log_lines([1, 2]))
+    # out of order, and without a timestamp
+    write_log_file(log_file, make_file_log_lines([1]))
+    log_file.write("not json\n", mode="a")
+    write_log_file(log_file, make_file_log_lines([4]))
+    log_file.write('{"timestamp": "2021-06-08T06:05', mode="a")
+    contents = log_file.read_binary()
+
+    def offset_of(message):
+        return contents.index(b"{", contents.index(message.encode()) - 200)
+
+    index = logs.LogFileIndex()
+    with open(str(log_file), "rb") as f:
+        log_mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        assert index.update(log_mmap, inode=1, delimiter=b"\n")
+        assert not index.update(log_mmap, inode=1, delimiter=b"\n")
+
+    assert index.minutes == [
+        "2021-06-08T06:01",
+        "2021-06-08T06:02",
+        "2021-06-08T06:04",
+    ]
+    assert index.offsets == [0, offset_of("2 a"), offset_of("4 a")]
+    # the partial last line isn't indexed yet
+    assert index.size == contents.rindex(b"\n") + 1
+    assert index.segments() == [
+        (0, offset_of("2 a")),
+        (offset_of("2 a"), offset_of("4 a")),
+        (offset_of("4 a"), index.size),
+    ]
+
+    def time(minute):
+        return datetime.datetime(2021, 6, 8, 6, minute, tzinfo=datetime.timezone.utc)
+
+    assert index.offset_range(None, None) == (0, index.size)
+    assert index.offset_range(time(2), time(2)) == (
+        offset_of("2 a"),
+        offset_of("4 a"),
+    )
+    assert index.offset_range(time(3), time(3)) == (offset_of("4 a"), index.size)
+    assert index.offset_range(time(0), time(0)) == (0, offset_of("2 a"))
+    assert index.offset_range(time(6), None) == (index.size, index.size)
+
+    index.save(str(tmpdir.join("index")))
+    assert vars(logs.LogFileIndex.load(str(tmpdir.join("index")))) == vars(index)
+    assert vars(logs.LogFileIndex.load(str(tmpdir.join("missing")))) == vars(
+        logs.LogFileIndex()
+    )
+
+    # a new file in its place
+    log_file.write("")
+    write_log_file(log_file, make_file_log_lines([7]))
+    with open(str(log_file), "rb") as f:
+        log_mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        assert index.update(log_mmap, inode=2, delimiter=b"\n")
+    assert index.minutes == ["2021-06-08T06:07"]
+    assert index.offsets == [0]
+
+
+@pytest.fixture
+def file_log_reader(tmpdir):
+    for cluster in ["fake_cluster1", "fake_cluster2", ANY_CLUSTER]:
+        tmpdir.ensure_dir(cluster)
+    return logs.FileLogReader(
+        path_format=str(tmpdir.join("{cluster}", "{service}.{instance}.log"))
+    )
+
+
+def test_file_log_reader_log_paths(tmpdir, file_log_reader):
+    for path in [
+        "fake_cluster1/fake_service.main.log",
+        "fake_cluster1/fake_service.canary.log",
+        "fake_cluster2/fake_service.main.log",
+        "N/A/fake_service.main.log",
+        "fake_cluster1/other_service.main.log",
+    ]:
+        tmpdir.join(path).write("")
+
+    assert file_log_reader.log_paths(
+        "fake_service", ["event"], ["deploy"], ["fake_cluster1"], ["main"]
+    ) == [
+        str(tmpdir.join("N/A/fake_service.main.log")),
+        str(tmpdir.join("fake_cluster1/fake_service.main.log")),
+    ]
+    assert file_log_reader.log_paths(
+        "fake_service", ["event"], ["deploy"], ["fake_cluster1"], None
+    ) == [
+        str(tmpdir.join("N/A/fake_service.main.log")),
+        str(tmpdir.join("fake_cluster1/fake_service.canary.log")),
+        str(tmpdir.join("fake_cluster1/fake_service.main.log")),
+    ]
+
+
+def printed_messages(mock_print_log):
+    return [json.loads(call[0][0])["message"] for call in mock_print_log.call_args_list]
+
+
+def test_file_log_reader_print_logs_by_time(tmpdir, file_log_reader):
+    log_file = tmpdir.join("fake_cluster1/fake_service.main.log")
+    write_log_file(log_file, make_file_log_lines(range(10)))
+    write_log_file(
+        tmpdir.join("N/A/fake_service.main.log"),
+        [("2021-06-08T06:05:15", ANY_CLUSTER, "main", "any cluster")],
+    )
+
+    with mock.patch(
+        "paasta_tools.cli.cmds.logs.print_log", autospec=True
+    ) as mock_print_log:
+        file_log_reader.print_logs_by_time(
+            service="fake_service",
+            start_time=isodate.parse_datetime("2021-06-08T06:05:00Z"),
+            end_time=isodate.parse_datetime("2021-06-08T06:06:15Z"),
+            levels=["event"],
+            components=["deploy"],
+            clusters="fake_cluster1",
+            instances=["main"],
+            pods=None,
+            raw_mode=False,
+            strip_headers=False,
+        )
+
+    assert printed_messages(mock_print_log) == [
+        "5 a",
+        "any cluster",
+        "5 c",
+        "6 a",
+    ]
+    assert tmpdir.join("fake_cluster1/.fake_service.main.log.index").check()
+
+
+def test_file_log_reader_print_logs_by_time_out_of_order(tmpdir, file_log_reader):
+    # written a little out of order, e.g. by several commands at once
+    write_log_file(
+        tmpdir.join("fake_cluster1/fake_service.main.log"),
+        [
+            ("2021-06-08T06:05:30", "fake_cluster1", "main", "5:30"),
+            ("2021-06-08T06:05:10", "fake_cluster1", "main", "5:10"),
+            ("2021-06-08T06:06:10", "fake_cluster1", "main", "6:10"),
+            ("2021-06-08T06:05:50", "fake_cluster1", "main", "5:50"),
+        ],
+    )
+    write_log_file(
+        tmpdir.join("N/A/fake_service.main.log"),
+        [("2021-06-08T06:05:20", ANY_CLUSTER, "main", "5:20")],
+    )
+
+    with mock.patch(
+        "paasta_tools.cli.cmds.logs.print_log", autospec=True
+    ) as mock_print_log:
+        file_log_reader.print_logs_by_time(
+            service="fake_service",
+            start_time=isodate.parse_datetime("2021-06-08T06:05:00Z"),
+            end_time=isodate.parse_datetime("2021-06-08T06:07:00Z"),
+            levels=["event"],
+            components=["deploy"],
+            clusters="fake_cluster1",
+            instances=["main"],
+            pods=None,
+            raw_mode=False,
+            strip_headers=False,
+        )
+
+    assert printed_messages(mock_print_log) == ["5:10", "5:20", "5:30", "5:50", "6:10"]
+
+
+def test_file_log_reader_print_last_n_logs(tmpdir, file_log_reader):
+    write_log_file(
+        tmpdir.join("fake_cluster1/fake_service.main.log"),
+        make_file_log_lines(range(10)),
+    )
+    write_log_file(
+        tmpdir.join("N/A/fake_service.main.log"),
+        [("2021-06-08T06:09:15", ANY_CLUSTER, "main", "any cluster")],
+    )
+
+    with mock.patch(
+        "paasta_tools.cli.cmds.logs.print_log", autospec=True
+    ) as mock_print_log:
+        file_log_reader.print_last_n_logs(
+            service="fake_service",
+            line_count=4,
+            levels=["event"],
+            components=["deploy"],
+            clusters=["fake_cluster1"],
+            instances=["main"],
+            pods=None,
+            raw_mode=False,
+            strip_headers=False,
+        )
+
+    assert printed_messages(mock_print_log) == ["8 c", "9 a", "any cluster", "9 c"]
+
+
+def test_file_log_reader_tail_logs(tmpdir, file_log_reader):
+    log_file = tmpdir.join("fake_cluster1/fake_service.main.log")
+    write_log_file(log_file, make_file_log_lines([1]))
+    log_file.write('{"timestamp": "2021-06-08T06:02', mode="a")
+
+    def fake_sleep(seconds):
+        if fake_sleep.calls == 0:
+            # finish the partial line, and start logging to a new file
+            log_file.write(
+                '", "cluster": "fake_cluster1", "instance": "main", '
+                '"level": "event", "component": "deploy", "message": "2 a"}\n',
+                mode="a",
+            )
+            write_log_file(
+                tmpdir.join("N/A/fake_service.main.log"),
+                [("2021-06-08T06:02:15", ANY_CLUSTER, "main", "any cluster")],
+            )
+        elif fake_sleep.calls == 1:
+            # rotated
+            log_file.write("")
+            write_log_file(log_file, make_file_log_lines([3]))
+        else:
+            raise KeyboardInterrupt
+        fake_sleep.calls += 1
+
+    fake_sleep.calls = 0
+
+    with mock.patch(
+        "paasta_tools.cli.cmds.logs.print_log", autospec=True
+    ) as mock_print_log, mock.patch(
+        "paasta_tools.cli.cmds.logs.sleep", autospec=True, side_effect=fake_sleep
+    ):
+        file_log_reader.tail_logs(
+            service="fake_service",
+            levels=["event"],
+            components=["deploy"],
+            clusters=["fake_cluster1"],
+            instances=["main"],
+        )
+
+    assert printed_messages(mock_print_log) == ["2 a", "any cluster", "3 a", "3 c"]
@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import datetime
+import json
 from collections import defaultdict
 from typing import Any
 from typing import Dict
@@ -27,6 +28,7 @@ from mock import patch
 
 import paasta_tools.paastaapi.models as paastamodels
 from paasta_tools import marathon_tools
+from paasta_tools import paastaapi
 from paasta_tools import utils
 from paasta_tools.cli.cmds import status
 from paasta_tools.cli.cmds.status import append_pod_status
@@ -49,6 +51,7 @@ from paasta_tools.cli.cmds.status import marathon_mesos_status_human
 from paasta_tools.cli.cmds.status import marathon_mesos_status_summary
 from paasta_tools.cli.cmds.status import missing_deployments_message
 from paasta_tools.cli.cmds.status import paasta_status
+from paasta_tools.cli.cmds.status import paasta_status_for_service_on_api_endpoint
 from paasta_tools.cli.cmds.status import paasta_status_on_api_endpoint
 from paasta_tools.cli.cmds.status import print_cassandra_status
 from paasta_tools.cli.cmds.status import print_flink_status
@@ -60,6 +63,7 @@ from paasta_tools.cli.cmds.status import recent_container_restart
 from paasta_tools.cli.cmds.status import report_invalid_whitelist_values
 from paasta_tools.cli.utils import NoSuchService
 from paasta_tools.cli.utils import PaastaColors
+from paasta_tools.kubernetes_tools import KubernetesDeploymentConfig
 from paasta_tools.paastaapi import ApiException
 from paasta_tools.utils import DeploymentVersion
 from paasta_tools.utils import remove_ansi_escape_sequences
@@ -1720,6 +1724,166 @@ def test_paasta_status_exception(system_paasta_config):
         )
 
 
+@mock.patch("paasta_tools.cli.cmds.status.paasta_status_on_api_endpoint", autospec=True)
+@mock.patch("paasta_tools.cli.cmds.status.print_paasta_status_from_api", autospec=True)
+@mock.patch("paasta_tools.cli.cmds.status.get_paasta_oapi_client", autospec=True)
+def test_paasta_status_for_service_on_api_endpoint(
+    mock_get_paasta_oapi_client,
+    mock_print_paasta_status_from_api,
+    mock_paasta_status_on_api_endpoint,
+    system_paasta_config,
+    capfd,
+):
+    mock_api = mock_get_paasta_oapi_client.return_value
+    mock_api.api_error = ApiException
+    mock_api.service.api_client.configuration = paastaapi.Configuration(
+        discard_unknown_keys=True
+    )
+    mock_response = MagicMock()
+    mock_response.__iter__.return_value = iter(
+        [
+            json.dumps(
+                {"service": "fake_service", "instance": "main", "version": "abc"}
+            ).encode()
+            + b"\n",
+            json.dumps(
+                {"service": "fake_service", "instance": "not_asked_for"}
+            ).encode()
+            + b"\n",
+            json.dumps(
+                {
+                    "service": "fake_service",
+                    "instance": "canary",
+                    "error_message": "Deployment key not found",
+                    "error_code": 404,
+                }
+            ).encode()
+            + b"\n",
+        ]
+    )
+    mock_api.service.status_service.return_value = mock_response
+    mock_print_paasta_status_from_api.return_value = 0
+    mock_paasta_status_on_api_endpoint.return_value = 0
+
+    return_codes = paasta_status_for_service_on_api_endpoint(
+        cluster="fake_cluster",
+        service="fake_service",
+        instances=["main", "canary", "batch"],
+        system_paasta_config=system_paasta_config,
+        lock=MagicMock(),
+        verbose=0,
+    )
+
+    assert return_codes == [0, 404, 0]
+    mock_api.service.status_service.assert_called_once_with(
+        service="fake_service",
+        verbose=0,
+        new=False,
+        include_smartstack=False,
+        _preload_content=False,
+    )
+    assert mock_print_paasta_status_from_api.call_count == 1
+    status_arg = mock_print_paasta_status_from_api.call_args[1]["status"]
+    assert isinstance(status_arg, paastamodels.InstanceStatus)
+    assert status_arg.version == "abc"
+    assert "Deployment key not found" in capfd.readouterr().out
+    # anything the stream didn't include is asked for separately
+    mock_paasta_status_on_api_endpoint.assert_called_once_with(
+        cluster="fake_cluster",
+        service="fake_service",
+        instance="batch",
+        system_paasta_config=system_paasta_config,
+        lock=ANY,
+        verbose=0,
+        new=False,
+    )
+    mock_response.release_conn.assert_called_once_with()
+
+
+@mock.patch("paasta_tools.cli.cmds.status.get_paasta_oapi_client", autospec=True)
+def test_paasta_status_for_service_on_api_endpoint_unsupported(
+    mock_get_paasta_oapi_client, system_paasta_config
+):
+    mock_api = mock_get_paasta_oapi_client.return_value
+    mock_api.api_error = ApiException
+    mock_api.connection_error = ApiException
+    mock_api.timeout_error = ApiException
+    mock_api.service.status_service.side_effect = ApiException(
+        status=404, reason="Not Found"
+    )
+    assert (
+        paasta_status_for_service_on_api_endpoint(
+            cluster="fake_cluster",
+            service="fake_service",
+            instances=["main", "canary"],
+            system_paasta_config=system_paasta_config,
+            lock=MagicMock(),
+            verbose=0,
+        )
+        is None
+    )
+
+
+@mock.patch("paasta_tools.cli.cmds.status.paasta_status_on_api_endpoint", autospec=True)
+@mock.patch("paasta_tools.cli.cmds.status.get_paasta_oapi_client", autospec=True)
+def test_paasta_status_for_service_on_api_endpoint_logs_unexpected_errors(
+    mock_get_paasta_oapi_client,
+    mock_paasta_status_on_api_endpoint,
+    system_paasta_config,
+):
+    mock_api = mock_get_paasta_oapi_client.return_value
+    mock_api.api_error = ApiException
+    mock_api.service.status_service.return_value = MagicMock(
+        __iter__=Mock(return_value=iter([b"not json\n"]))
+    )
+    mock_paasta_status_on_api_endpoint.return_value = 0
+
+    with mock.patch("paasta_tools.cli.cmds.status.log", autospec=True) as mock_log:
+        return_codes = paasta_status_for_service_on_api_endpoint(
+            cluster="fake_cluster",
+            service="fake_service",
+            instances=["main"],
+            system_paasta_config=system_paasta_config,
+            lock=MagicMock(),
+            verbose=0,
+        )
+
+    assert return_codes == [0]
+    assert mock_log.exception.call_count == 1
+    assert mock_paasta_status_on_api_endpoint.call_count == 1
+
+
+@patch("paasta_tools.cli.cmds.status.paasta_status_on_api_endpoint", autospec=True)
+@patch(
+    "paasta_tools.cli.cmds.status.paasta_status_for_service_on_api_endpoint",
+    autospec=True,
+)
+def test_report_status_for_cluster_falls_back_to_instance_endpoint(
+    mock_paasta_status_for_service_on_api_endpoint,
+    mock_paasta_status_on_api_endpoint,
+    system_paasta_config,
+):
+    mock_paasta_status_for_service_on_api_endpoint.return_value = None
+    mock_paasta_status_on_api_endpoint.return_value = 0
+    instance_whitelist = {
+        "instance1": KubernetesDeploymentConfig,
+        "instance2": KubernetesDeploymentConfig,
+    }
+
+    return_code, _ = status.report_status_for_cluster(
+        service="fake_service",
+        cluster="cluster",
+        deploy_pipeline=["cluster.instance1", "cluster.instance2"],
+        actual_deployments={},
+        instance_whitelist=instance_whitelist,
+        system_paasta_config=system_paasta_config,
+        lock=MagicMock(),
+    )
+    assert return_code == 0
+    assert mock_paasta_status_for_service_on_api_endpoint.call_count == 1
+    assert mock_paasta_status_on_api_endpoint.call_count == 2
+
+
 def test_format_kubernetes_replicaset_table_in_non_verbose(mock_kubernetes_status):
     with mock.patch(
         "paasta_tools.cli.cmds.status.format_kubernetes_replicaset_table", autospec=True
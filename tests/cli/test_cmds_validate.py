@@ -11,7 +11,9 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import argparse
 import datetime
+import json
 import os
 
 import mock
@@ -22,10 +24,13 @@ from paasta_tools.cli.cmds.validate import check_secrets_for_instance
 from paasta_tools.cli.cmds.validate import check_service_path
 from paasta_tools.cli.cmds.validate import get_config_file_dict
 from paasta_tools.cli.cmds.validate import get_schema
+from paasta_tools.cli.cmds.validate import get_schema_validator
 from paasta_tools.cli.cmds.validate import get_service_path
 from paasta_tools.cli.cmds.validate import list_upcoming_runs
 from paasta_tools.cli.cmds.validate import paasta_validate
+from paasta_tools.cli.cmds.validate import paasta_validate_all
 from paasta_tools.cli.cmds.validate import paasta_validate_soa_configs
+from paasta_tools.cli.cmds.validate import positive_int
 from paasta_tools.cli.cmds.validate import SCHEMA_INVALID
 from paasta_tools.cli.cmds.validate import SCHEMA_VALID
 from paasta_tools.cli.cmds.validate import UNKNOWN_SERVICE
@@ -37,6 +42,7 @@ from paasta_tools.cli.cmds.validate import validate_paasta_objects
 from paasta_tools.cli.cmds.validate import validate_rollback_bounds
 from paasta_tools.cli.cmds.validate import validate_schema
 from paasta_tools.cli.cmds.validate import validate_secrets
+from paasta_tools.cli.cmds.validate import validate_service
 from paasta_tools.cli.cmds.validate import validate_tron
 from paasta_tools.cli.cmds.validate import validate_unique_instance_names
 from paasta_tools.utils import SystemPaastaConfig
@@ -87,6 +93,7 @@ def test_paasta_validate_calls_everything(
     args = mock.MagicMock()
     args.service = "test"
     args.soa_dir = None
+    args.validate_all = False
 
     paasta_validate(args)
 
@@ -142,6 +149,7 @@ def test_validate_unknown_service():
     args = mock.MagicMock()
     args.service = None
     args.yelpsoa_config_root = "unused"
+    args.validate_all = False
     paasta_validate(args) == 1
 
 
@@ -149,6 +157,7 @@ def test_validate_service_name():
     args = mock.MagicMock()
     args.service = "aa________________________________a"
     args.yelpsoa_config_root = "unused"
+    args.validate_all = False
     paasta_validate(args) == 1
 
 
@@ -240,6 +249,13 @@ def test_get_schema_missing():
     assert get_schema("fake_schema") is None
 
 
+def test_get_schema_validator():
+    validator = get_schema_validator("tron")
+    assert validator.schema == get_schema("tron")
+    assert get_schema_validator("tron") is validator
+    assert get_schema_validator("fake_schema") is None
+
+
 @patch("paasta_tools.cli.cmds.validate.get_file_contents", autospec=True)
 def test_marathon_validate_schema_list_hashes_good(mock_get_file_contents, capsys):
     marathon_content = """
@@ -1168,3 +1184,159 @@ fake_instance1:
         return_value=("fake_soa_dir", "fake_service"),
     ):
         assert validate_cpu_burst("fake-service-path") is expected
+
+
+def test_paasta_validate_soa_configs_check_results():
+    check_results = {}
+    with patch(
+        "paasta_tools.cli.cmds.validate.check_service_path",
+        autospec=True,
+        return_value=True,
+    ), patch(
+        "paasta_tools.cli.cmds.validate.validate_service_name",
+        autospec=True,
+        return_value=True,
+    ), patch(
+        "paasta_tools.cli.cmds.validate.validate_all_schemas",
+        autospec=True,
+        return_value=False,
+    ), patch(
+        "paasta_tools.cli.cmds.validate.validate_tron", autospec=True, return_value=True
+    ), patch(
+        "paasta_tools.cli.cmds.validate.validate_paasta_objects",
+        autospec=True,
+        return_value=True,
+    ), patch(
+        "paasta_tools.cli.cmds.validate.validate_unique_instance_names",
+        autospec=True,
+        return_value=True,
+    ), patch(
+        "paasta_tools.cli.cmds.validate.validate_autoscaling_configs",
+        autospec=True,
+        return_value=True,
+    ), patch(
+        "paasta_tools.cli.cmds.validate.validate_secrets",
+        autospec=True,
+        return_value=True,
+    ), patch(
+        "paasta_tools.cli.cmds.validate.validate_min_max_instances",
+        autospec=True,
+        return_value=True,
+    ), patch(
+        "paasta_tools.cli.cmds.validate.validate_cpu_burst",
+        autospec=True,
+        return_value=True,
+    ) as mock_validate_cpu_burst:
+        assert not paasta_validate_soa_configs(
+            "fake_service", "fake_path", check_results=check_results
+        )
+
+    # a failing check doesn't stop the others from running
+    assert mock_validate_cpu_burst.called
+    assert list(check_results) == [
+        "validate_all_schemas",
+        "validate_tron",
+        "validate_paasta_objects",
+        "validate_unique_instance_names",
+        "validate_autoscaling_configs",
+        "validate_secrets",
+        "validate_min_max_instances",
+        "validate_cpu_burst",
+    ]
+    assert not check_results["validate_all_schemas"]["valid"]
+    assert check_results["validate_tron"]["valid"]
+    assert all(r["duration_seconds"] >= 0 for r in check_results.values())
+
+
+def fake_paasta_validate_soa_configs(
+    service, service_path, verbose=False, check_results=None
+):
+    print(f"validating {service}")
+    if service == "broken":
+        raise ValueError("oops")
+    check_results["validate_all_schemas"] = {
+        "valid": service != "invalid",
+        "duration_seconds": 1.0,
+    }
+    return service != "invalid"
+
+
+@patch(
+    "paasta_tools.cli.cmds.validate.paasta_validate_soa_configs",
+    autospec=True,
+    side_effect=fake_paasta_validate_soa_configs,
+)
+def test_validate_service(mock_paasta_validate_soa_configs, capsys):
+    result = validate_service("/fake/soa_dir", "fake_service")
+    mock_paasta_validate_soa_configs.assert_called_once_with(
+        "fake_service",
+        "/fake/soa_dir/fake_service",
+        verbose=False,
+        check_results=result["checks"],
+    )
+    assert result["valid"]
+    assert result["output"] == "validating fake_service\n"
+    assert result["error"] is None
+    # the output is returned, not printed
+    assert capsys.readouterr().out == ""
+
+    result = validate_service("/fake/soa_dir", "broken")
+    assert not result["valid"]
+    assert result["error"] == "ValueError('oops')"
+    assert "Failed to validate broken" in result["output"]
+
+
+@patch(
+    "paasta_tools.cli.cmds.validate.paasta_validate_soa_configs",
+    autospec=True,
+    side_effect=fake_paasta_validate_soa_configs,
+)
+def test_paasta_validate_all(mock_paasta_validate_soa_configs, tmpdir, capsys):
+    for service in ("valid", "invalid", ".git"):
+        tmpdir.mkdir(service)
+    tmpdir.join("README.md").write("not a service")
+    results_file = tmpdir.join("results.json")
+
+    assert not paasta_validate_all(str(tmpdir), jobs=1, results_file=str(results_file))
+
+    output = capsys.readouterr().out
+    assert output.index("validating invalid") < output.index("validating valid")
+    assert "1 of 2 services failed validation" in output
+    assert "validate_all_schemas: 2.00s" in output
+
+    results = json.loads(results_file.read())
+    assert results["soa_dir"] == str(tmpdir)
+    assert not results["valid"]
+    assert [(r["service"], r["valid"]) for r in results["services"]] == [
+        ("invalid", False),
+        ("valid", True),
+    ]
+    assert results["services"][1]["checks"] == {
+        "validate_all_schemas": {"valid": True, "duration_seconds": 1.0}
+    }
+
+
+@patch("paasta_tools.cli.cmds.validate.paasta_validate_all", autospec=True)
+def test_paasta_validate_all_args(mock_paasta_validate_all):
+    args = mock.MagicMock(
+        validate_all=True,
+        yelpsoa_config_root="/fake/soa_dir",
+        verbose=False,
+        jobs=4,
+        results_file=None,
+    )
+    mock_paasta_validate_all.return_value = False
+    assert paasta_validate(args) == 1
+    mock_paasta_validate_all.assert_called_once_with(
+        "/fake/soa_dir", verbose=False, jobs=4, results_file=None
+    )
+
+    mock_paasta_validate_all.return_value = True
+    assert paasta_validate(args) == 0
+
+
+def test_positive_int():
+    assert positive_int("4") == 4
+    for value in ("0", "-1", "four"):
+        with pytest.raises(argparse.ArgumentTypeError):
+            positive_int(value)
@@ -151,7 +151,13 @@ def test_check_if_instance_is_done(
 @patch(
     "paasta_tools.cli.cmds.mark_for_deployment.check_if_instance_is_done", autospec=True
 )
+@patch(
+    "paasta_tools.cli.cmds.mark_for_deployment.get_bulk_bounce_status",
+    autospec=True,
+    side_effect=mark_for_deployment.BulkBounceStatusUnsupported,
+)
 def test_wait_for_deployment(
+    mock_get_bulk_bounce_status,
     mock_check_if_instance_is_done,
     mock__log,
     mock_get_instance_configs_for_service_in_deploy_group_all_clusters,
@@ -229,6 +235,99 @@ def test_wait_for_deployment(
         )
 
 
+def fake_bounce_status_result(instance, status_code=200, **kwargs):
+    return Mock(
+        instance=instance,
+        status_code=status_code,
+        get={"status": fake_bounce_status_resp(**kwargs), "error_message": ""}.get,
+    )
+
+
+@patch(
+    "paasta_tools.cli.cmds.mark_for_deployment.check_if_instance_is_done", autospec=True
+)
+@patch(
+    "paasta_tools.cli.cmds.mark_for_deployment.get_bulk_bounce_status", autospec=True
+)
+def test_bounce_status_poller(
+    mock_get_bulk_bounce_status, mock_check_if_instance_is_done
+):
+    version = DeploymentVersion(sha="abc123", image_version=None)
+    mock_get_bulk_bounce_status.side_effect = [
+        {
+            "instance1": fake_bounce_status_result("instance1"),
+            "instance2": fake_bounce_status_result(
+                "instance2", active_versions=[["wrong1", None, "cfg"]]
+            ),
+            "instance3": fake_bounce_status_result("instance3", status_code=404),
+        },
+        {"instance2": fake_bounce_status_result("instance2")},
+        {"instance3": fake_bounce_status_result("instance3")},
+    ]
+
+    async def wait_until_done(poller, instance):
+        checks = 1
+        while not await poller.is_instance_done(
+            instance, version, mock_marathon_instance_config(instance)
+        ):
+            checks += 1
+        return checks
+
+    async def wait_for_instances():
+        poller = mark_for_deployment.BounceStatusPoller(
+            None, "service", "cluster1", polling_interval=0
+        )
+        try:
+            return await asyncio.gather(
+                *(wait_until_done(poller, f"instance{i}") for i in range(1, 4))
+            )
+        finally:
+            poller.stop()
+
+    with patch("paasta_tools.cli.cmds.mark_for_deployment.log", autospec=True):
+        assert asyncio.run(wait_for_instances()) == [1, 2, 2]
+
+    # one request per round, only for the instances that aren't done yet; the
+    # instance that couldn't be found sits out a round before being retried
+    assert [call[0][2] for call in mock_get_bulk_bounce_status.call_args_list] == [
+        ["instance1", "instance2", "instance3"],
+        ["instance2"],
+        ["instance3"],
+    ]
+    assert mock_check_if_instance_is_done.call_count == 0
+
+
+@patch(
+    "paasta_tools.cli.cmds.mark_for_deployment.check_if_instance_is_done", autospec=True
+)
+@patch(
+    "paasta_tools.cli.cmds.mark_for_deployment.get_bulk_bounce_status",
+    autospec=True,
+    side_effect=mark_for_deployment.BulkBounceStatusUnsupported,
+)
+def test_bounce_status_poller_falls_back_without_bulk_endpoint(
+    mock_get_bulk_bounce_status, mock_check_if_instance_is_done
+):
+    mock_check_if_instance_is_done.side_effect = [False, True]
+
+    async def wait_for_instance():
+        poller = mark_for_deployment.BounceStatusPoller(
+            None, "service", "cluster1", polling_interval=0
+        )
+        instance_config = mock_marathon_instance_config("instance1")
+        try:
+            while not await poller.is_instance_done(
+                "instance1", Mock(), instance_config
+            ):
+                pass
+        finally:
+            poller.stop()
+
+    asyncio.run(wait_for_instance())
+    assert mock_get_bulk_bounce_status.call_count == 1
+    assert mock_check_if_instance_is_done.call_count == 2
+
+
 @patch(
     "paasta_tools.cli.cmds.mark_for_deployment.load_system_paasta_config", autospec=True
 )
@@ -18,6 +18,7 @@ import a_sync
 import asynctest
 import mock
 import pytest
+from kubernetes.client.rest import ApiException
 
 import paasta_tools.instance.kubernetes as pik
 from paasta_tools import utils
@@ -165,6 +166,97 @@ def test_instance_status_cr_and_kubernetes(mock_kubernetes_status, mock_cr_statu
     assert len(mock_kubernetes_status.mock_calls) == 1
 
 
+def _labelled(instance, namespace="paasta"):
+    return Struct(
+        metadata=Struct(
+            namespace=namespace,
+            labels={
+                "paasta.yelp.com/service": "service",
+                "paasta.yelp.com/instance": instance,
+            },
+        )
+    )
+
+
+def test_service_kube_objects_lists_once_per_kind_and_namespace():
+    mock_kube_client = mock.Mock()
+    main, canary = _labelled("main"), _labelled("canary")
+    mock_kube_client.core.list_namespaced_pod.return_value = Struct(
+        items=[main, canary]
+    )
+    mock_kube_client.deployments.list_namespaced_replica_set.return_value = Struct(
+        items=[canary]
+    )
+    service_objects = pik.ServiceKubeObjects("service", mock_kube_client)
+
+    assert service_objects.pods("main", ["paasta"]) == [main]
+    assert service_objects.pods("canary", ["paasta"]) == [canary]
+    assert service_objects.replicasets("main", ["paasta"]) == []
+    assert service_objects.replicasets("canary", ["paasta"]) == [canary]
+    mock_kube_client.core.list_namespaced_pod.assert_called_once_with(
+        label_selector="paasta.yelp.com/service=service", namespace="paasta"
+    )
+    mock_kube_client.deployments.list_namespaced_replica_set.assert_called_once_with(
+        label_selector="paasta.yelp.com/service=service", namespace="paasta"
+    )
+
+
+def test_service_kube_objects_shares_errors():
+    mock_kube_client = mock.Mock()
+    mock_kube_client.core.list_namespaced_pod.side_effect = ApiException(status=500)
+    service_objects = pik.ServiceKubeObjects("service", mock_kube_client)
+
+    for instance in ("main", "canary"):
+        with pytest.raises(ApiException):
+            service_objects.pods(instance, ["paasta"])
+    assert mock_kube_client.core.list_namespaced_pod.call_count == 1
+
+
+@mock.patch(
+    "paasta_tools.instance.kubernetes.kubernetes_tools.list_deployments_in_managed_namespaces",
+    autospec=True,
+)
+def test_service_kube_objects_relevant_namespaces(
+    mock_list_deployments_in_managed_namespaces,
+):
+    mock_list_deployments_in_managed_namespaces.return_value = [
+        mock.Mock(instance="main", namespace="paastasvc-service"),
+        mock.Mock(instance="canary", namespace="paasta"),
+    ]
+    mock_job_config = mock.Mock(
+        get_kubernetes_namespace=mock.Mock(return_value="paasta")
+    )
+    service_objects = pik.ServiceKubeObjects("service", mock.Mock())
+
+    assert service_objects.relevant_namespaces("main", mock_job_config) == {
+        "paasta",
+        "paastasvc-service",
+    }
+    assert service_objects.relevant_namespaces("canary", mock_job_config) == {"paasta"}
+    mock_list_deployments_in_managed_namespaces.assert_called_once_with(
+        kube_client=service_objects.kube_client,
+        label_selector="paasta.yelp.com/service=service",
+    )
+
+
+def test_get_pods_for_service_instance_multiple_namespaces_with_service_objects():
+    mock_service_objects = mock.Mock(spec=pik.ServiceKubeObjects)
+    with asynctest.patch(
+        "paasta_tools.kubernetes_tools.pods_for_service_instance", autospec=True
+    ) as mock_pods_for_service_instance:
+        pods = a_sync.block(
+            pik.get_pods_for_service_instance_multiple_namespaces,
+            service="service",
+            instance="main",
+            kube_client=mock.Mock(),
+            namespaces=["paasta"],
+            service_objects=mock_service_objects,
+        )
+    assert pods == mock_service_objects.pods.return_value
+    mock_service_objects.pods.assert_called_once_with("main", ["paasta"])
+    assert mock_pods_for_service_instance.call_count == 0
+
+
 def test_kubernetes_status():
     with asynctest.patch(
         "paasta_tools.instance.kubernetes.job_status",
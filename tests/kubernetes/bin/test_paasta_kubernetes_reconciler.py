@@ -0,0 +1,244 @@
+import os
+
+import mock
+import pytest
+
+from paasta_tools.kubernetes.bin.paasta_kubernetes_reconciler import (
+    KubernetesReconciler,
+)
+from paasta_tools.kubernetes.bin.paasta_kubernetes_reconciler import (
+    ServiceInputWatcher,
+)
+from paasta_tools.kubernetes_tools import KubeDeployment
+
+
+def _controller(service, config_sha="config123", replicas=1):
+    item = mock.Mock()
+    item.metadata.namespace = "paastasvc-" + service
+    item.metadata.name = service + "-main"
+    item.metadata.labels = {
+        "paasta.yelp.com/service": service,
+        "paasta.yelp.com/instance": "main",
+        "paasta.yelp.com/git_sha": "abc123",
+        "paasta.yelp.com/config_sha": config_sha,
+    }
+    item.spec.replicas = replicas
+    return item
+
+
+@pytest.fixture
+def reconciler(tmpdir):
+    tmpdir.mkdir("foo")
+    tmpdir.mkdir("bar")
+    with mock.patch(
+        "paasta_tools.kubernetes.bin.paasta_kubernetes_reconciler.KubeInformer",
+        autospec=True,
+    ):
+        yield KubernetesReconciler(
+            kube_client=mock.Mock(), cluster="fake_cluster", soa_dir=str(tmpdir)
+        )
+
+
+def test_service_input_watcher_changed_services(tmpdir):
+    tmpdir.mkdir("foo").join("deployments.json").write("{}")
+    tmpdir.mkdir("bar")
+    watcher = ServiceInputWatcher(soa_dir=str(tmpdir), cluster="fake_cluster")
+
+    assert watcher.changed_services() == {"foo", "bar"}
+    assert watcher.changed_services() == set()
+
+    tmpdir.join("bar").join("kubernetes-fake_cluster.yaml").write("main: {}")
+    assert watcher.changed_services() == {"bar"}
+
+    deployments_json = tmpdir.join("foo").join("deployments.json")
+    deployments_json.write('{"v2": {}}')
+    os.utime(str(deployments_json), (1, 1))
+    assert watcher.changed_services() == {"foo"}
+    assert watcher.changed_services() == set()
+
+    tmpdir.join("foo").mkdir("secrets").join("token.json").write("{}")
+    assert watcher.changed_services() == {"foo"}
+    assert str(tmpdir.join("foo", "secrets", "token.json")) in watcher.input_files(
+        "foo"
+    )
+
+
+def test_service_input_watcher_shared_inputs(tmpdir):
+    soa_dir = tmpdir.mkdir("soa")
+    soa_dir.mkdir("foo").join("smartstack.yaml").write("main: {}")
+    soa_dir.mkdir("bar")
+    system_paasta_config_dir = tmpdir.mkdir("paasta")
+    watcher = ServiceInputWatcher(
+        soa_dir=str(soa_dir),
+        cluster="fake_cluster",
+        system_paasta_config_dir=str(system_paasta_config_dir),
+    )
+    assert watcher.changed_services() == {"foo", "bar"}
+
+    # other services can register into foo's namespaces
+    soa_dir.join("foo", "smartstack.yaml").write("main: {proxy_port: 1}")
+    assert watcher.changed_services() == {"foo", "bar"}
+    assert watcher.changed_services() == set()
+
+    system_paasta_config_dir.join("volumes.json").write("{}")
+    assert watcher.changed_services() == {"foo", "bar"}
+    assert watcher.changed_services() == set()
+
+    soa_dir.mkdir("_shared").mkdir("secrets").join("token.json").write("{}")
+    assert watcher.changed_services() == {"foo", "bar", "_shared"}
+
+
+def test_handle_controller_event(reconciler):
+    reconciler.handle_controller_event("ADDED", None, _controller("foo"))
+    assert reconciler.pop_dirty_services() == set()
+
+    # status-only updates don't change anything we manage
+    reconciler.handle_controller_event(
+        "MODIFIED", _controller("foo"), _controller("foo")
+    )
+    assert reconciler.pop_dirty_services() == set()
+
+    reconciler.handle_controller_event(
+        "MODIFIED", _controller("foo"), _controller("foo", config_sha="other")
+    )
+    reconciler.handle_controller_event(
+        "DELETED", _controller("bar"), _controller("bar")
+    )
+    assert reconciler.pop_dirty_services() == {"foo", "bar"}
+    assert reconciler.pop_dirty_services() == set()
+
+
+def _secret_signature(service, signature):
+    config_map = mock.Mock()
+    config_map.metadata.labels = {"paasta.yelp.com/service": service}
+    config_map.data = {"signature": signature}
+    return config_map
+
+
+def test_handle_secret_signature_event(reconciler):
+    reconciler.handle_secret_signature_event(
+        "MODIFIED", _secret_signature("foo", "a"), _secret_signature("foo", "a")
+    )
+    assert reconciler.pop_dirty_services() == set()
+
+    reconciler.handle_secret_signature_event(
+        "MODIFIED", _secret_signature("foo", "a"), _secret_signature("foo", "b")
+    )
+    reconciler.handle_secret_signature_event(
+        "ADDED", None, _secret_signature("baz", "a")
+    )
+    assert reconciler.pop_dirty_services() == {"foo"}
+
+    reconciler.handle_secret_signature_event(
+        "ADDED", None, _secret_signature("underscore-shared", "a")
+    )
+    assert reconciler.pop_dirty_services() == {"foo", "bar"}
+
+
+def test_existing_kube_deployments(reconciler):
+    reconciler.informers = [mock.Mock(), mock.Mock()]
+    reconciler.informers[0].list.return_value = [_controller("foo")]
+    reconciler.informers[1].list.return_value = [_controller("bar", replicas=3)]
+    assert reconciler.existing_kube_deployments() == {
+        KubeDeployment(
+            service="foo",
+            instance="main",
+            git_sha="abc123",
+            image_version=None,
+            config_sha="config123",
+            namespace="paastasvc-foo",
+            replicas=1,
+        ),
+        KubeDeployment(
+            service="bar",
+            instance="main",
+            git_sha="abc123",
+            image_version=None,
+            config_sha="config123",
+            namespace="paastasvc-bar",
+            replicas=3,
+        ),
+    }
+
+
+def test_reconcile(reconciler):
+    mock_config = mock.Mock()
+    mock_config.get_namespace.return_value = "paastasvc-foo"
+    with mock.patch(
+        "paasta_tools.kubernetes.bin.paasta_kubernetes_reconciler.get_service_instance_list_no_cache",
+        autospec=True,
+        return_value=[("foo", "main"), ("foo", "canary")],
+    ), mock.patch(
+        "paasta_tools.kubernetes.bin.paasta_kubernetes_reconciler.get_kubernetes_deployment_config",
+        autospec=True,
+        return_value=[(True, mock_config), (True, None)],
+    ) as mock_get_kubernetes_deployment_config, mock.patch(
+        "paasta_tools.kubernetes.bin.paasta_kubernetes_reconciler.ensure_namespace",
+        autospec=True,
+    ) as mock_ensure_namespace, mock.patch(
+        "paasta_tools.kubernetes.bin.paasta_kubernetes_reconciler.setup_kube_deployments",
+        autospec=True,
+    ) as mock_setup_kube_deployments, mock.patch.object(
+        reconciler, "existing_kube_deployments", autospec=True
+    ) as mock_existing_kube_deployments:
+        assert reconciler.reconcile({"foo"}) == mock_setup_kube_deployments.return_value
+        assert reconciler.reconcile({"foo"}) == mock_setup_kube_deployments.return_value
+
+    mock_get_kubernetes_deployment_config.assert_called_with(
+        service_instances_with_valid_names=[
+            ("foo", "main", None, None),
+            ("foo", "canary", None, None),
+        ],
+        cluster="fake_cluster",
+        soa_dir=reconciler.soa_dir,
+    )
+    # namespaces are only ensured the first time we see them
+    mock_ensure_namespace.assert_called_once_with(
+        reconciler.kube_client, namespace="paastasvc-foo"
+    )
+    mock_setup_kube_deployments.assert_called_with(
+        kube_client=reconciler.kube_client,
+        cluster="fake_cluster",
+        service_instance_configs_list=[(True, mock_config), (True, None)],
+        soa_dir=reconciler.soa_dir,
+        metrics_interface=reconciler.metrics_interface,
+        existing_kube_deployments=mock_existing_kube_deployments.return_value,
+    )
+
+
+def test_run_once(reconciler):
+    with mock.patch.object(reconciler, "reconcile", autospec=True) as mock_reconcile:
+        reconciler.run_once()
+        mock_reconcile.assert_called_with({"foo", "bar"})
+
+        reconciler.run_once()
+        mock_reconcile.assert_called_with(set())
+
+        reconciler.handle_controller_event(
+            "DELETED", _controller("foo"), _controller("foo")
+        )
+        reconciler.run_once()
+        mock_reconcile.assert_called_with({"foo"})
+
+        reconciler.run_once(full_resync=True)
+        mock_reconcile.assert_called_with({"foo", "bar"})
+
+
+def test_run_once_retries_failed_services(reconciler):
+    with mock.patch.object(reconciler, "reconcile", autospec=True) as mock_reconcile:
+        mock_reconcile.return_value = False
+        assert not reconciler.run_once()
+        mock_reconcile.assert_called_with({"foo", "bar"})
+
+        mock_reconcile.side_effect = Exception("the API server is down")
+        with pytest.raises(Exception):
+            reconciler.run_once()
+        mock_reconcile.assert_called_with({"foo", "bar"})
+
+        mock_reconcile.side_effect = None
+        mock_reconcile.return_value = True
+        assert reconciler.run_once()
+        mock_reconcile.assert_called_with({"foo", "bar"})
+
+        reconciler.run_once()
+        mock_reconcile.assert_called_with(set())
@@ -10,6 +10,7 @@ from paasta_tools.kubernetes.bin.paasta_secrets_sync import (
 )
 from paasta_tools.kubernetes.bin.paasta_secrets_sync import main
 from paasta_tools.kubernetes.bin.paasta_secrets_sync import parse_args
+from paasta_tools.kubernetes.bin.paasta_secrets_sync import SecretSignatureIndex
 from paasta_tools.kubernetes.bin.paasta_secrets_sync import sync_all_secrets
 from paasta_tools.kubernetes.bin.paasta_secrets_sync import sync_boto_secrets
 from paasta_tools.kubernetes.bin.paasta_secrets_sync import sync_crypto_secrets
@@ -32,12 +33,15 @@ def test_main():
     ), mock.patch(
         "paasta_tools.kubernetes.bin.paasta_secrets_sync.load_system_paasta_config",
         autospec=True,
-    ), mock.patch(
+    ) as mock_load_system_paasta_config, mock.patch(
         "paasta_tools.kubernetes.bin.paasta_secrets_sync.KubeClient", autospec=True
     ), mock.patch(
         "paasta_tools.kubernetes.bin.paasta_secrets_sync.sync_all_secrets",
         autospec=True,
     ) as mock_sync_all_secrets:
+        mock_load_system_paasta_config.return_value.get_soa_config_index_path.return_value = (
+            None
+        )
         mock_sync_all_secrets.return_value = True
         with pytest.raises(SystemExit) as e:
             main()
@@ -94,6 +98,115 @@ def test_sync_all_secrets():
         )
 
 
+def test_sync_all_secrets_concurrency():
+    with mock.patch(
+        "paasta_tools.kubernetes.bin.paasta_secrets_sync.sync_secrets", autospec=True
+    ) as mock_sync_secrets, mock.patch(
+        "paasta_tools.kubernetes.bin.paasta_secrets_sync.sync_boto_secrets",
+        autospec=True,
+        return_value=True,
+    ), mock.patch(
+        "paasta_tools.kubernetes.bin.paasta_secrets_sync.sync_crypto_secrets",
+        autospec=True,
+        return_value=True,
+    ), mock.patch(
+        "paasta_tools.kubernetes.bin.paasta_secrets_sync.get_secret_provider",
+        autospec=True,
+    ) as mock_get_secret_provider:
+        mock_sync_secrets.side_effect = lambda **kwargs: kwargs["namespace"] != "bad"
+        sync_kwargs = dict(
+            kube_client=mock.Mock(),
+            cluster="westeros-prod",
+            secret_provider_name="vaulty",
+            vault_cluster_config={},
+            soa_dir="/nail/blah",
+            vault_token_file="./vault-token",
+            concurrency=4,
+        )
+
+        assert sync_all_secrets(
+            services_to_k8s_namespaces_to_allowlist={
+                "foo": {"paastasvc-foo": None, "paasta": None},
+                "bar": {"paastasvc-bar": None},
+            },
+            **sync_kwargs,
+        )
+        assert not sync_all_secrets(
+            services_to_k8s_namespaces_to_allowlist={
+                "foo": {"paastasvc-foo": None},
+                "bar": {"bad": None},
+            },
+            **sync_kwargs,
+        )
+
+        # all of a service's namespaces share one secret provider and every
+        # call shares the same signature index
+        foo_calls = [
+            kwargs
+            for _, kwargs in mock_sync_secrets.call_args_list[:3]
+            if kwargs["service"] == "foo"
+        ]
+        assert len(foo_calls) == 2
+        assert (
+            foo_calls[0]["get_service_secret_provider"]
+            is foo_calls[1]["get_service_secret_provider"]
+        )
+        assert foo_calls[0]["get_service_secret_provider"]() is (
+            foo_calls[1]["get_service_secret_provider"]()
+        )
+        assert mock_get_secret_provider.call_count == 1
+        assert (
+            len(
+                {
+                    id(kwargs["signature_index"])
+                    for _, kwargs in mock_sync_secrets.call_args_list[:3]
+                }
+            )
+            == 1
+        )
+
+
+def test_secret_signature_index():
+    with mock.patch(
+        "paasta_tools.kubernetes.bin.paasta_secrets_sync.get_secret_signatures",
+        autospec=True,
+    ) as mock_get_secret_signatures, mock.patch(
+        "paasta_tools.kubernetes.bin.paasta_secrets_sync.get_secret_signature",
+        autospec=True,
+        return_value=None,
+    ) as mock_get_secret_signature:
+        mock_get_secret_signatures.return_value = {"foo-signature": "abc"}
+        index = SecretSignatureIndex(kube_client=mock.Mock())
+
+        assert index.get("paasta", "foo-signature") == "abc"
+        assert index.get("paasta", "bar-signature") is None
+        index.set("paasta", "bar-signature", "def")
+        assert index.get("paasta", "bar-signature") == "def"
+
+        assert mock_get_secret_signatures.call_count == 1
+        mock_get_secret_signature.assert_called_once_with(
+            kube_client=index.kube_client,
+            signature_name="bar-signature",
+            namespace="paasta",
+        )
+
+
+def test_secret_signature_index_lists_outside_of_the_lock():
+    index = SecretSignatureIndex(kube_client=mock.Mock())
+
+    def fake_get_secret_signatures(kube_client, namespace):
+        assert not index._lock.locked()
+        return {f"{namespace}-signature": "abc"}
+
+    with mock.patch(
+        "paasta_tools.kubernetes.bin.paasta_secrets_sync.get_secret_signatures",
+        autospec=True,
+        side_effect=fake_get_secret_signatures,
+    ):
+        assert index.get("paasta", "paasta-signature") == "abc"
+        assert index.get("paastasvc-foo", "paastasvc-foo-signature") == "abc"
+
+
 def test_sync_shared():
     with mock.patch(
         "paasta_tools.kubernetes.bin.paasta_secrets_sync.PaastaServiceConfigLoader",
@@ -366,6 +479,55 @@ def test_sync_secrets_signatures_match(paasta_secrets_patches, namespace):
     assert not mock_update_kubernetes_secret_signature.called
 
 
+def test_sync_secrets_with_signature_index(paasta_secrets_patches):
+    (
+        mock_get_secret_provider,
+        mock_scandir,
+        mock_get_kubernetes_secret_signature,
+        mock_create_secret,
+        mock_create_kubernetes_secret_signature,
+        mock_update_secret,
+        mock_update_kubernetes_secret_signature,
+    ) = paasta_secrets_patches
+
+    mock_secret_provider = mock.Mock(
+        get_secret_signature_from_data=mock.Mock(return_value="123abc"),
+        decrypt_secret_raw=mock.Mock(return_value=b""),
+    )
+    mock_file = mock.Mock(path="./some_file.json")
+    mock_file.name = "some_file.json"
+    mock_scandir.return_value.__enter__.return_value = [mock_file]
+    mock_signature_index = mock.Mock(spec=SecretSignatureIndex)
+    sync_kwargs = dict(
+        kube_client=mock.Mock(),
+        cluster="westeros-prod",
+        service="universe",
+        secret_provider_name="vaulty",
+        vault_cluster_config={},
+        soa_dir="/nail/blah",
+        namespace="paasta",
+        vault_token_file="./vault-token",
+        secret_allowlist=None,
+        get_service_secret_provider=lambda: mock_secret_provider,
+        signature_index=mock_signature_index,
+    )
+
+    mock_signature_index.get.return_value = "123abc"
+    assert sync_secrets(**sync_kwargs)
+    assert not mock_get_secret_provider.called
+    assert not mock_get_kubernetes_secret_signature.called
+    assert not mock_secret_provider.decrypt_secret_raw.called
+    assert not mock_update_secret.called
+
+    mock_signature_index.get.return_value = "old"
+    assert sync_secrets(**sync_kwargs)
+    assert mock_update_secret.called
+    assert mock_update_kubernetes_secret_signature.called
+    mock_signature_index.set.assert_called_once_with(
+        "paasta", "paasta-secret-universe-some--file-signature", "123abc"
+    )
+
+
 @pytest.mark.parametrize("namespace", namespaces)
 def test_sync_secrets_signature_changed(paasta_secrets_patches, namespace):
     (
@@ -0,0 +1,216 @@
+import mock
+import pytest
+from kubernetes.client.rest import ApiException
+
+from paasta_tools.kubernetes.informer import KubeInformer
+from paasta_tools.kubernetes.informer import WATCH_REQUEST_TIMEOUT_SLACK_SECONDS
+
+
+def _obj(name, resource_version, namespace="paasta"):
+    obj = mock.Mock()
+    obj.metadata.namespace = namespace
+    obj.metadata.name = name
+    obj.metadata.resource_version = resource_version
+    return obj
+
+
+def _list_response(items, resource_version):
+    response = mock.Mock(items=items)
+    response.metadata.resource_version = resource_version
+    return response
+
+
+@pytest.fixture
+def mock_list_func():
+    list_func = mock.Mock(__name__="list_deployment_for_all_namespaces")
+    list_func.return_value = _list_response([_obj("a", "1"), _obj("b", "2")], "2")
+    return list_func
+
+
+def test_relist(mock_list_func):
+    on_event = mock.Mock()
+    informer = KubeInformer(mock_list_func, label_selector="foo", on_event=on_event)
+    assert not informer.has_synced()
+
+    informer.relist()
+
+    mock_list_func.assert_called_once_with(
+        label_selector="foo", _request_timeout=informer.list_timeout_seconds
+    )
+    assert informer.has_synced()
+    assert informer.resource_version == "2"
+    assert {o.metadata.name for o in informer.list()} == {"a", "b"}
+    assert on_event.call_count == 2
+
+    on_event.reset_mock()
+    b = _obj("b", "3")
+    mock_list_func.return_value = _list_response([b], "3")
+    informer.relist()
+    assert informer.list() == [b]
+    assert sorted(call[0][0] for call in on_event.call_args_list) == [
+        "DELETED",
+        "MODIFIED",
+    ]
+
+
+def test_handle_event(mock_list_func):
+    on_event = mock.Mock()
+    informer = KubeInformer(mock_list_func, on_event=on_event)
+    informer.relist()
+    old_a = informer.get("paasta", "a")
+    on_event.reset_mock()
+
+    new_a = _obj("a", "5")
+    informer.handle_event("MODIFIED", new_a)
+    assert informer.get("paasta", "a") is new_a
+    assert informer.resource_version == "5"
+    on_event.assert_called_once_with("MODIFIED", old_a, new_a)
+
+    informer.handle_event("DELETED", _obj("b", "6"))
+    assert informer.get("paasta", "b") is None
+    assert informer.resource_version == "6"
+
+    informer.handle_event("ADDED", _obj("c", "7", namespace="paastasvc-foo"))
+    assert informer.get("paastasvc-foo", "c") is not None
+
+
+def test_watch_once(mock_list_func):
+    informer = KubeInformer(mock_list_func, label_selector="foo")
+    informer.relist()
+    with mock.patch(
+        "paasta_tools.kubernetes.informer.watch.Watch", autospec=True
+    ) as mock_watch:
+        mock_watch.return_value.stream.return_value = [
+            {"type": "ADDED", "object": _obj("c", "3")},
+            {"type": "DELETED", "object": _obj("a", "4")},
+        ]
+        informer.watch_once()
+
+    mock_watch.return_value.stream.assert_called_once_with(
+        mock_list_func,
+        label_selector="foo",
+        resource_version="2",
+        timeout_seconds=informer.watch_timeout_seconds,
+        _request_timeout=informer.watch_timeout_seconds
+        + WATCH_REQUEST_TIMEOUT_SLACK_SECONDS,
+    )
+    assert {o.metadata.name for o in informer.list()} == {"b", "c"}
+    assert informer.resource_version == "4"
+
+
+def test_namespaced_informer():
+    list_func = mock.Mock(__name__="list_namespaced_pod")
+    list_func.return_value = _list_response([_obj("a", "1")], "1")
+    informer = KubeInformer(list_func, label_selector="foo", namespace="paasta")
+
+    informer.relist()
+    list_func.assert_called_once_with(
+        "paasta", label_selector="foo", _request_timeout=informer.list_timeout_seconds
+    )
+
+    with mock.patch(
+        "paasta_tools.kubernetes.informer.watch.Watch", autospec=True
+    ) as mock_watch:
+        mock_watch.return_value.stream.return_value = []
+        informer.watch_once()
+    mock_watch.return_value.stream.assert_called_once_with(
+        list_func,
+        "paasta",
+        label_selector="foo",
+        resource_version="1",
+        timeout_seconds=informer.watch_timeout_seconds,
+        _request_timeout=informer.watch_timeout_seconds
+        + WATCH_REQUEST_TIMEOUT_SLACK_SECONDS,
+    )
+
+
+def test_watch_once_relists_when_gone(mock_list_func):
+    informer = KubeInformer(mock_list_func)
+    informer.relist()
+    mock_list_func.return_value = _list_response([_obj("z", "100")], "100")
+    with mock.patch(
+        "paasta_tools.kubernetes.informer.watch.Watch", autospec=True
+    ) as mock_watch:
+        mock_watch.return_value.stream.side_effect = ApiException(status=410)
+        informer.watch_once()
+
+    assert [o.metadata.name for o in informer.list()] == ["z"]
+    assert informer.resource_version == "100"
+
+
+def test_watch_once_raises_other_errors(mock_list_func):
+    informer = KubeInformer(mock_list_func)
+    informer.relist()
+    with mock.patch(
+        "paasta_tools.kubernetes.informer.watch.Watch", autospec=True
+    ) as mock_watch:
+        mock_watch.return_value.stream.side_effect = ApiException(status=500)
+        with pytest.raises(ApiException):
+            informer.watch_once()
+
+
+def test_by_index(mock_list_func):
+    def _labelled(name, resource_version, app):
+        obj = _obj(name, resource_version)
+        obj.metadata.labels = {"app": app}
+        return obj
+
+    mock_list_func.return_value = _list_response(
+        [_labelled("a", "1", "foo"), _labelled("b", "2", "foo")], "2"
+    )
+    informer = KubeInformer(
+        mock_list_func, index_func=lambda obj: obj.metadata.labels["app"]
+    )
+    informer.relist()
+    assert sorted(o.metadata.name for o in informer.by_index("foo")) == ["a", "b"]
+
+    # an object whose index key changes moves to its new key
+    a = _labelled("a", "3", "bar")
+    informer.handle_event("MODIFIED", a)
+    assert informer.by_index("bar") == [a]
+    assert [o.metadata.name for o in informer.by_index("foo")] == ["b"]
+
+    informer.handle_event("DELETED", _labelled("b", "4", "foo"))
+    assert informer.by_index("foo") == []
+
+
+def test_staleness(mock_list_func):
+    informer = KubeInformer(mock_list_func, error_backoff_seconds=0)
+    assert informer.staleness() == float("inf")
+
+    informer.relist()
+    assert informer.staleness() == 0
+
+    def fail_once():
+        informer._stopped.set()
+        raise Exception("watch failed")
+
+    with mock.patch.object(
+        informer, "watch_once", autospec=True, side_effect=fail_once
+    ), mock.patch(
+        "paasta_tools.kubernetes.informer.time.time", autospec=True, return_value=100
+    ):
+        informer.run()
+    with mock.patch(
+        "paasta_tools.kubernetes.informer.time.time", autospec=True, return_value=130
+    ):
+        assert informer.staleness() == 30
+
+    informer.handle_event("ADDED", _obj("c", "7"))
+    assert informer.staleness() == 0
+
+
+def test_staleness_of_a_quiet_watch(mock_list_func):
+    informer = KubeInformer(mock_list_func, watch_timeout_seconds=300)
+    with mock.patch(
+        "paasta_tools.kubernetes.informer.time.time", autospec=True, return_value=100
+    ):
+        informer.relist()
+    with mock.patch(
+        "paasta_tools.kubernetes.informer.time.time", autospec=True
+    ) as mock_time:
+        # the watch should have ended by 400, so it may have hung since then
+        mock_time.return_value = 400
+        assert informer.staleness() == 0
+        mock_time.return_value = 430
+        assert informer.staleness() == 30
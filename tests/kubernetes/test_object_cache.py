@@ -0,0 +1,108 @@
+import mock
+
+from paasta_tools.kubernetes.object_cache import KubeObjectCache
+
+
+def _labelled(name, namespace, service, instance):
+    obj = mock.Mock()
+    obj.metadata.name = name
+    obj.metadata.namespace = namespace
+    obj.metadata.resource_version = "1"
+    obj.metadata.labels = {
+        "paasta.yelp.com/service": service,
+        "paasta.yelp.com/instance": instance,
+    }
+    return obj
+
+
+def _list_response(items):
+    response = mock.Mock(items=items)
+    response.metadata.resource_version = "1"
+    return response
+
+
+def test_list_for_service_instance():
+    mock_kube_client = mock.Mock()
+    main = _labelled("main-1", "paasta", "svc", "main")
+    main_other_namespace = _labelled("main-2", "paastasvc-svc", "svc", "main")
+    canary = _labelled("canary-1", "paasta", "svc", "canary")
+    mock_kube_client.core.list_pod_for_all_namespaces.return_value = _list_response(
+        [main, main_other_namespace, canary]
+    )
+    cache = KubeObjectCache(mock_kube_client)
+
+    # not listed yet: callers have to ask the API server
+    assert cache.list_for_service_instance("pods", "svc", "main", "paasta") is None
+
+    cache.informers["pods"][None].relist()
+    assert cache.list_for_service_instance("pods", "svc", "main", "paasta") == [main]
+    assert cache.list_for_service_instance("pods", "svc", "main", "paastasvc-svc") == [
+        main_other_namespace
+    ]
+    assert cache.list_for_service_instance("pods", "svc", "batch", "paasta") == []
+    mock_kube_client.core.list_pod_for_all_namespaces.assert_called_once_with(
+        label_selector="paasta.yelp.com/service",
+        _request_timeout=cache.informers["pods"][None].list_timeout_seconds,
+    )
+
+
+def test_stale_cache_is_not_used():
+    mock_kube_client = mock.Mock()
+    mock_kube_client.autoscaling.list_horizontal_pod_autoscaler_for_all_namespaces.return_value = _list_response(
+        [_labelled("svc-main", "paasta", "svc", "main")]
+    )
+    cache = KubeObjectCache(mock_kube_client, max_staleness_seconds=60)
+    assert cache.get("hpas", "paasta", "svc-main") == (False, None)
+
+    cache.informers["hpas"][None].relist()
+    fresh, hpa = cache.get("hpas", "paasta", "svc-main")
+    assert fresh and hpa.metadata.name == "svc-main"
+    assert cache.get("hpas", "paasta", "svc-canary") == (True, None)
+
+    with mock.patch.object(
+        cache.informers["hpas"][None], "staleness", autospec=True, return_value=61
+    ):
+        assert cache.get("hpas", "paasta", "svc-main") == (False, None)
+
+
+def test_report_staleness():
+    mock_kube_client = mock.Mock()
+    mock_kube_client.core.list_pod_for_all_namespaces.return_value = _list_response([])
+    mock_metrics = mock.Mock()
+    mock_metrics.create_gauge.side_effect = lambda name, kind: mock.Mock(kind=kind)
+    cache = KubeObjectCache(mock_kube_client, metrics_interface=mock_metrics)
+    cache.informers["pods"][None].relist()
+
+    cache.report_staleness()
+
+    for kind, gauge in cache.staleness_gauges.items():
+        # only the pods have been listed so far
+        gauge.set.assert_called_once_with(0 if kind == "pods" else -1)
+    assert set(cache.staleness_gauges) == {
+        "pods",
+        "replicasets",
+        "controller_revisions",
+        "hpas",
+    }
+
+
+def test_namespaced_cache():
+    mock_kube_client = mock.Mock()
+    main = _labelled("main-1", "paasta", "svc", "main")
+    mock_kube_client.core.list_namespaced_pod.return_value = _list_response([main])
+    cache = KubeObjectCache(mock_kube_client, namespaces=["paasta"])
+    assert set(cache.informers["pods"]) == {"paasta"}
+
+    cache.informers["pods"]["paasta"].relist()
+    assert cache.list_for_service_instance("pods", "svc", "main", "paasta") == [main]
+    # other namespaces are never cached, so callers ask the API server
+    assert (
+        cache.list_for_service_instance("pods", "svc", "main", "paastasvc-svc") is None
+    )
+    assert cache.get("hpas", "paastasvc-svc", "svc-main") == (False, None)
+    mock_kube_client.core.list_namespaced_pod.assert_called_once_with(
+        "paasta",
+        label_selector="paasta.yelp.com/service",
+        _request_timeout=cache.informers["pods"]["paasta"].list_timeout_seconds,
+    )
+    assert not mock_kube_client.core.list_pod_for_all_namespaces.called
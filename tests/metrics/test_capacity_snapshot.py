@@ -0,0 +1,199 @@
+import threading
+
+import mock
+from kubernetes.client import V1Container
+from kubernetes.client import V1Node
+from kubernetes.client import V1NodeStatus
+from kubernetes.client import V1ObjectMeta
+from kubernetes.client import V1Pod
+from kubernetes.client import V1PodSpec
+from kubernetes.client import V1ResourceRequirements
+
+from paasta_tools.metrics import metastatus_lib
+from paasta_tools.metrics.capacity_snapshot import capacity_snapshot_from_kube
+from paasta_tools.metrics.capacity_snapshot import (
+    capacity_snapshot_from_mesos_state,
+)
+from paasta_tools.metrics.capacity_snapshot import CapacitySnapshot
+from paasta_tools.metrics.capacity_snapshot import CapacitySnapshotCache
+from paasta_tools.metrics.capacity_snapshot import NodeCapacity
+from paasta_tools.metrics.metastatus_lib import ResourceInfo
+
+
+def make_slave(slave_id, pool, region):
+    return {
+        "id": slave_id,
+        "hostname": f"{slave_id}.example.com",
+        "resources": {"disk": 100, "cpus": 10, "mem": 50},
+        "attributes": {"pool": pool, "region": region},
+        "reserved_resources": {},
+    }
+
+
+MESOS_STATE = {
+    "slaves": [
+        make_slave("foo1", "default", "top"),
+        make_slave("bar1", "default", "bottom"),
+        make_slave("foo2", "other", "top"),
+        make_slave("bar2", "other", "bottom"),
+        make_slave("foo3", "other", "top"),
+    ],
+    "frameworks": [
+        {
+            "tasks": [
+                {
+                    "state": "TASK_RUNNING",
+                    "resources": {"cpus": 1, "mem": 10, "disk": 10},
+                    "slave_id": "foo1",
+                },
+                {
+                    "state": "TASK_RUNNING",
+                    "resources": {"cpus": 1, "mem": 10, "disk": 10},
+                    "slave_id": "foo3",
+                },
+                {
+                    "state": "TASK_FINISHED",
+                    "resources": {"cpus": 1, "mem": 10, "disk": 10},
+                    "slave_id": "foo3",
+                },
+            ]
+        }
+    ],
+}
+
+
+def test_capacity_snapshot_matches_get_resource_utilization_by_grouping():
+    snapshot = capacity_snapshot_from_mesos_state(MESOS_STATE)
+    for groupings, filters in [
+        (["superregion"], {}),
+        (["region", "pool"], {}),
+        (["pool", "hostname"], {}),
+        (["pool"], {"region": ["top"]}),
+        (["pool"], {"region": ["top", "bottom"], "pool": ["other"]}),
+        (["pool"], {"region": ["nowhere"]}),
+    ]:
+        assert snapshot.utilization(
+            groupings, filters
+        ) == metastatus_lib.get_resource_utilization_by_grouping(
+            grouping_func=metastatus_lib.key_func_for_attribute_multi(groupings),
+            mesos_state=MESOS_STATE,
+            filters=[
+                metastatus_lib.make_filter_slave_func(attribute, values)
+                for attribute, values in filters.items()
+            ],
+        )
+
+
+def test_capacity_snapshot_utilization():
+    snapshot = CapacitySnapshot(
+        [
+            NodeCapacity(
+                attributes={"pool": "default", "region": "top"},
+                total=ResourceInfo(cpus=10, mem=100, disk=1000, gpus=1),
+                free=ResourceInfo(cpus=5, mem=50, disk=500, gpus=1),
+            ),
+            NodeCapacity(
+                attributes={"pool": "default"},
+                total=ResourceInfo(cpus=10, mem=100, disk=1000),
+                free=ResourceInfo(cpus=1, mem=2, disk=3),
+            ),
+        ]
+    )
+    assert snapshot.utilization(["pool"]) == {
+        (("pool", "default"),): {
+            "total": ResourceInfo(cpus=20, mem=200, disk=2000, gpus=1),
+            "free": ResourceInfo(cpus=6, mem=52, disk=503, gpus=1),
+            "slave_count": 2,
+        }
+    }
+    assert snapshot.utilization(["region"], {"pool": ["default"]}) == {
+        (("region", "top"),): {
+            "total": ResourceInfo(cpus=10, mem=100, disk=1000, gpus=1),
+            "free": ResourceInfo(cpus=5, mem=50, disk=500, gpus=1),
+            "slave_count": 1,
+        },
+        (("region", "unknown"),): {
+            "total": ResourceInfo(cpus=10, mem=100, disk=1000),
+            "free": ResourceInfo(cpus=1, mem=2, disk=3),
+            "slave_count": 1,
+        },
+    }
+
+
+def test_capacity_snapshot_from_kube():
+    nodes = [
+        V1Node(
+            metadata=V1ObjectMeta(
+                name=f"node{i}",
+                labels={"yelp.com/pool": "default", "yelp.com/region": region},
+            ),
+            status=V1NodeStatus(
+                allocatable={"cpu": "4", "ephemeral-storage": "10Mi", "memory": "8Mi"}
+            ),
+        )
+        for i, region in enumerate(["top", "top", "bottom"])
+    ]
+    pods = [
+        V1Pod(
+            spec=V1PodSpec(
+                node_name="node0",
+                containers=[
+                    V1Container(
+                        name="main",
+                        resources=V1ResourceRequirements(
+                            requests={
+                                "cpu": "1",
+                                "ephemeral-storage": "1Mi",
+                                "memory": "1Mi",
+                            }
+                        ),
+                    )
+                ],
+            )
+        )
+    ]
+    mock_kube_client = mock.Mock()
+    mock_kube_client.core.list_pod_for_all_namespaces.return_value.items = pods
+    with mock.patch(
+        "paasta_tools.metrics.capacity_snapshot.get_all_nodes",
+        autospec=True,
+        return_value=nodes,
+    ):
+        snapshot = capacity_snapshot_from_kube(mock_kube_client)
+
+    assert snapshot.utilization(["region"], {"pool": ["default"]}) == {
+        (("region", "bottom"),): {
+            "total": ResourceInfo(cpus=4, mem=8, disk=10),
+            "free": ResourceInfo(cpus=4, mem=8, disk=10),
+            "slave_count": 1,
+        },
+        (("region", "top"),): {
+            "total": ResourceInfo(cpus=8, mem=16, disk=20),
+            "free": ResourceInfo(cpus=7, mem=15, disk=19),
+            "slave_count": 2,
+        },
+    }
+
+
+def test_capacity_snapshot_cache():
+    snapshots = [CapacitySnapshot([]), CapacitySnapshot([])]
+    refreshed = threading.Event()
+
+    def build_snapshot():
+        if not snapshots:
+            refreshed.set()
+            raise Exception("mesos is down")
+        return snapshots.pop(0)
+
+    cache = CapacitySnapshotCache(build_snapshot, refresh_interval_seconds=0)
+    assert cache.get() is None
+
+    cache.refresh()
+    first = cache.get()
+    cache.start()
+    refreshed.wait(timeout=10)
+    cache.stop()
+
+    # the last snapshot that could be taken is kept when taking one fails
+    assert cache.get() is not first
+    assert cache.get() is not None
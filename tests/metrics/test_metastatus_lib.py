@@ -926,3 +926,25 @@ def test_suffixed_number_value():
     assert metastatus_lib.suffixed_number_value("5Gi") == 5 * 1024**3
     assert metastatus_lib.suffixed_number_value("5Ti") == 5 * 1024**4
     assert metastatus_lib.suffixed_number_value("5Pi") == 5 * 1024**5
+
+
+def test_group_pods_by_node():
+    pods = [
+        V1Pod(spec=V1PodSpec(node_name=node_name, containers=[]))
+        for node_name in ["node1", "node2", "node1"]
+    ]
+    pods_by_node = metastatus_lib.group_pods_by_node(pods)
+    assert pods_by_node == {"node1": [pods[0], pods[2]], "node2": [pods[1]]}
+
+
+def test_group_tasks_by_slave():
+    tasks = [
+        {"slave_id": "foo", "resources": {}},
+        {"slave_id": "bar", "resources": {}},
+        {"slave_id": "foo", "resources": {}},
+    ]
+    assert metastatus_lib.group_tasks_by_slave(tasks) == {
+        "foo": [tasks[0], tasks[2]],
+        "bar": [tasks[1]],
+    }
+    assert metastatus_lib.filter_tasks_for_slaves([{"id": "bar"}], tasks) == [tasks[1]]
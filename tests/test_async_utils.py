@@ -7,6 +7,8 @@ import mock
 import pytest
 
 from paasta_tools.async_utils import async_ttl_cache
+from paasta_tools.async_utils import ASYNC_TTL_CACHES
+from paasta_tools.async_utils import report_async_ttl_cache_metrics
 
 
 @pytest.mark.asyncio
@@ -199,3 +201,84 @@ async def test_async_ttl_cache_for_class_members_doesnt_leak_mem():
     assert len(instance_caches) == 1
     del o3
     assert len(instance_caches) == 0
+
+
+@pytest.mark.asyncio
+async def test_async_ttl_cache_maxsize():
+    cache = {}
+
+    @async_ttl_cache(ttl=None, cache=cache, maxsize=2)
+    async def identity(x):
+        return x
+
+    await identity(1)
+    await identity(2)
+    await identity(1)
+    await identity(3)
+    # 2 was the least recently used
+    assert list(cache) == [1, 3]
+    stats = identity.cache_stats
+    assert (stats.hits, stats.misses, stats.evictions) == (1, 3, 1)
+    assert stats.hit_rate() == 0.25
+    assert stats.size() == 2
+
+
+@pytest.mark.asyncio
+async def test_async_ttl_cache_sweeps_expired_entries():
+    cache = {}
+    with mock.patch("paasta_tools.async_utils.time", autospec=True) as mock_time:
+        mock_time.time.return_value = 0
+
+        @async_ttl_cache(ttl=10, cache=cache)
+        async def identity(x):
+            return x
+
+        await identity(1)
+        mock_time.time.return_value = 5
+        await identity(2)
+        assert len(cache) == 2
+
+        # only 1 has expired, and it's gone even though nobody asked for it again
+        mock_time.time.return_value = 12
+        await identity(3)
+        assert list(cache) == [2, 3]
+        assert identity.cache_stats.expirations == 1
+
+
+@pytest.mark.asyncio
+async def test_async_ttl_cache_sweeps_instance_caches():
+    instance_caches = defaultdict(dict)
+    with mock.patch("paasta_tools.async_utils.time", autospec=True) as mock_time:
+        mock_time.time.return_value = 0
+
+        class TestClass:
+            @async_ttl_cache(ttl=10, cleanup_self=True, cache=instance_caches)
+            async def f(self, x):
+                return x
+
+        o1, o2 = TestClass(), TestClass()
+        await o1.f(1)
+        await o1.f(2)
+        assert TestClass.f.cache_stats.size() == 2
+
+        mock_time.time.return_value = 11
+        await o2.f(1)
+        assert [len(c) for c in instance_caches.values()] == [0, 1]
+        assert TestClass.f.cache_stats.size() == 1
+
+
+def test_report_async_ttl_cache_metrics():
+    @async_ttl_cache(ttl=None)
+    async def identity(x):
+        return x
+
+    mock_metrics = mock.Mock()
+    with mock.patch.dict(
+        ASYNC_TTL_CACHES, {"identity": identity.cache_stats}, clear=True
+    ):
+        report_async_ttl_cache_metrics(mock_metrics)
+    assert mock_metrics.create_gauge.call_args_list == [
+        mock.call("async_ttl_cache.size", cache="identity"),
+        mock.call("async_ttl_cache.hit_rate", cache="identity"),
+    ]
+    mock_metrics.create_gauge.return_value.set.assert_called_with(0.0)
@@ -0,0 +1,202 @@
+import json
+
+import mock
+import pytest
+import requests
+
+from paasta_tools.cgroup_oom_collector import collect_oom_kills
+from paasta_tools.cgroup_oom_collector import find_container_cgroups
+from paasta_tools.cgroup_oom_collector import find_pod_cgroups
+from paasta_tools.cgroup_oom_collector import get_kubelet_pod_resolver
+from paasta_tools.cgroup_oom_collector import get_pod_uid
+from paasta_tools.cgroup_oom_collector import main
+from paasta_tools.cgroup_oom_collector import OOMEventStore
+from paasta_tools.cgroup_oom_collector import read_oom_kills
+
+CONTAINER_A = "0e4a814eda03622476ff47871e6c397e5b8747af209b44f3b3e1c5289b0f9772"
+CONTAINER_B = "e7ba37bd37089f8b1fda33c6f1fe753421ca6216518594bc73bca2ead7c13ba0"
+PAUSE = "a687af92e281725daf5b4cda0b487f20d2055d2bb6814b76d0e39c18a52a4e79"
+
+CGROUPFS_POD = "kubepods/burstable/podf91e9681-4741-4ef4-8f5a-182c5683df8b"
+SYSTEMD_POD = (
+    "kubepods.slice/kubepods-burstable.slice/"
+    "kubepods-burstable-pod8a0a7a03_d305_4ebc_83ad_91180c9d5ef9.slice"
+)
+GUARANTEED_POD = "kubepods/pod3c4d5e6f-4741-4ef4-8f5a-182c5683df8b"
+
+
+def write_memory_events(cgroup, oom_kill):
+    cgroup.ensure(dir=True)
+    cgroup.join("memory.events").write(
+        f"low 0\nhigh 0\nmax 12\noom {oom_kill}\noom_kill {oom_kill}\n"
+    )
+
+
+@pytest.fixture
+def cgroup_root(tmpdir):
+    write_memory_events(tmpdir.join(CGROUPFS_POD), 0)
+    write_memory_events(tmpdir.join(CGROUPFS_POD, CONTAINER_A), 0)
+    write_memory_events(tmpdir.join(CGROUPFS_POD, PAUSE), 0)
+    write_memory_events(tmpdir.join(SYSTEMD_POD), 0)
+    write_memory_events(tmpdir.join(SYSTEMD_POD, f"docker-{CONTAINER_B}.scope"), 0)
+    write_memory_events(tmpdir.join(GUARANTEED_POD), 0)
+    # not pods
+    write_memory_events(tmpdir.join("system.slice/docker.service"), 3)
+    write_memory_events(tmpdir.join("kubepods/burstable"), 0)
+    return tmpdir
+
+
+def resolve(pod_uid):
+    return {
+        "f91e9681-4741-4ef4-8f5a-182c5683df8b": ("service_a", "main"),
+        "8a0a7a03-d305-4ebc-83ad-91180c9d5ef9": ("service_b", "canary"),
+        "11111111-2222": ("service_b", "canary"),
+    }.get(pod_uid)
+
+
+def test_find_cgroups(cgroup_root):
+    assert sorted(find_pod_cgroups(str(cgroup_root))) == sorted(
+        str(cgroup_root.join(pod))
+        for pod in (CGROUPFS_POD, SYSTEMD_POD, GUARANTEED_POD)
+    )
+    assert sorted(find_container_cgroups(str(cgroup_root.join(CGROUPFS_POD)))) == [
+        (CONTAINER_A[:12], str(cgroup_root.join(CGROUPFS_POD, CONTAINER_A))),
+        (PAUSE[:12], str(cgroup_root.join(CGROUPFS_POD, PAUSE))),
+    ]
+    assert list(find_container_cgroups(str(cgroup_root.join(SYSTEMD_POD)))) == [
+        (
+            CONTAINER_B[:12],
+            str(cgroup_root.join(SYSTEMD_POD, f"docker-{CONTAINER_B}.scope")),
+        )
+    ]
+
+
+def test_read_oom_kills(tmpdir):
+    write_memory_events(tmpdir, 4)
+    assert read_oom_kills(str(tmpdir)) == 4
+    assert read_oom_kills(str(tmpdir.join("gone"))) is None
+
+
+def test_collect_oom_kills(cgroup_root, tmpdir):
+    store_path = str(tmpdir.join("store", "oom_events.json"))
+    store = OOMEventStore(store_path)
+
+    # kills from before the collector started are only used as a baseline
+    write_memory_events(cgroup_root.join(CGROUPFS_POD), 5)
+    assert collect_oom_kills(str(cgroup_root), store, resolve, now=1000) == 0
+    assert store.events == []
+
+    write_memory_events(cgroup_root.join(CGROUPFS_POD), 7)
+    write_memory_events(cgroup_root.join(CGROUPFS_POD, CONTAINER_A), 2)
+    # the killed container has already been restarted
+    write_memory_events(cgroup_root.join(SYSTEMD_POD), 1)
+    cgroup_root.join(SYSTEMD_POD, f"docker-{CONTAINER_B}.scope").remove()
+    write_memory_events(
+        cgroup_root.join(SYSTEMD_POD, f"docker-{CONTAINER_B[::-1]}.scope"), 0
+    )
+    # not a paasta pod
+    write_memory_events(cgroup_root.join(GUARANTEED_POD), 1)
+    assert collect_oom_kills(str(cgroup_root), store, resolve, now=1010) == 3
+    assert store.events == [
+        [960, "service_a", "main", CONTAINER_A[:12], 2],
+        [960, "service_b", "canary", "", 1],
+    ]
+
+    store.save()
+    store = OOMEventStore(store_path)
+    assert store.pod_oom_kills[CGROUPFS_POD] == 7
+
+    # a new pod, and more kills in the same minute
+    write_memory_events(cgroup_root.join(CGROUPFS_POD), 8)
+    new_pod = cgroup_root.join("kubepods/besteffort/pod11111111-2222")
+    write_memory_events(new_pod, 1)
+    write_memory_events(new_pod.join(CONTAINER_B), 1)
+    assert collect_oom_kills(str(cgroup_root), store, resolve, now=1015) == 2
+    assert store.events == [
+        [960, "service_a", "main", CONTAINER_A[:12], 3],
+        [960, "service_b", "canary", "", 1],
+        [960, "service_b", "canary", CONTAINER_B[:12], 1],
+    ]
+
+
+def test_oom_event_store(tmpdir):
+    store = OOMEventStore(str(tmpdir.join("oom_events.json")), retention_seconds=600)
+    store.record(1000, "service_a", "main", "c1", 1)
+    store.record(1200, "service_a", "main", "c2", 1)
+    store.record(1250, "service_b", "main", "c3", 2)
+
+    # kills whose container isn't known are still counted one by one
+    store.record(1250, "service_b", "main", "", 1)
+
+    assert store.latest_oom_events(now=1260, interval=60) == {
+        ("service_a", "main"): ["c2"],
+        ("service_b", "main"): ["c3", "c3", ""],
+    }
+    assert store.latest_oom_events(now=1260, interval=600) == {
+        ("service_a", "main"): ["c1", "c2"],
+        ("service_b", "main"): ["c3", "c3", ""],
+    }
+    assert store.service_instances() == {("service_a", "main"), ("service_b", "main")}
+
+    store.prune(now=1700)
+    store.save()
+    with open(str(tmpdir.join("oom_events.json"))) as f:
+        assert json.load(f)["events"] == [
+            [1200, "service_a", "main", "c2", 1],
+            [1200, "service_b", "main", "c3", 2],
+            [1200, "service_b", "main", "", 1],
+        ]
+
+
+def test_get_pod_uid(cgroup_root):
+    assert get_pod_uid(str(cgroup_root.join(CGROUPFS_POD))) == (
+        "f91e9681-4741-4ef4-8f5a-182c5683df8b"
+    )
+    assert get_pod_uid(str(cgroup_root.join(SYSTEMD_POD))) == (
+        "8a0a7a03-d305-4ebc-83ad-91180c9d5ef9"
+    )
+
+
+def test_get_kubelet_pod_resolver():
+    def pod(uid, labels):
+        return {"metadata": {"uid": uid, "labels": labels}}
+
+    with mock.patch(
+        "paasta_tools.cgroup_oom_collector.get_k8s_pods", autospec=True
+    ) as mock_get_k8s_pods:
+        mock_get_k8s_pods.return_value = {
+            "items": [
+                pod(
+                    "uid-a",
+                    {
+                        "paasta.yelp.com/service": "service_a",
+                        "paasta.yelp.com/instance": "main",
+                    },
+                ),
+                pod("uid-kube-proxy", {"k8s-app": "kube-proxy"}),
+                pod("uid-no-labels", None),
+            ]
+        }
+        resolve = get_kubelet_pod_resolver()
+        assert resolve("uid-a") == ("service_a", "main")
+        assert resolve("uid-kube-proxy") is None
+        assert mock_get_k8s_pods.call_count == 2
+
+        # pods we already know about don't need another request
+        assert resolve("uid-a") == ("service_a", "main")
+        assert mock_get_k8s_pods.call_count == 2
+
+        mock_get_k8s_pods.side_effect = requests.exceptions.ConnectionError
+        assert resolve("uid-b") is None
+
+
+def test_main_survives_failed_collection(tmpdir):
+    with mock.patch(
+        "paasta_tools.cgroup_oom_collector.collect_oom_kills",
+        autospec=True,
+        side_effect=OSError,
+    ) as mock_collect_oom_kills, mock.patch(
+        "paasta_tools.cgroup_oom_collector.get_kubelet_pod_resolver", autospec=True
+    ):
+        main(["--store", str(tmpdir.join("oom_events.json")), "--once"])
+    assert mock_collect_oom_kills.call_count == 1
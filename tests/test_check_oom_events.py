@@ -4,6 +4,7 @@ import mock
 import pytest
 from pysensu_yelp import Status
 
+from paasta_tools.cgroup_oom_collector import OOMEventStore
 from paasta_tools.check_oom_events import compose_sensu_status
 from paasta_tools.check_oom_events import latest_oom_events
 from paasta_tools.check_oom_events import main
@@ -192,3 +193,48 @@ def test_main(
         superregion="some_superregion",
         interval=180,
     )
+
+
+@mock.patch("paasta_tools.check_oom_events.latest_oom_events", autospec=True)
+@mock.patch("paasta_tools.check_oom_events.get_services_for_cluster", autospec=True)
+@mock.patch("paasta_tools.check_oom_events.send_sensu_event", autospec=True)
+@mock.patch("paasta_tools.check_oom_events.get_instance_config", autospec=True)
+def test_main_from_oom_events_store(
+    mock_get_instance_config,
+    mock_send_sensu_event,
+    mock_get_services_for_cluster,
+    mock_latest_oom_events,
+    tmpdir,
+):
+    store = OOMEventStore(str(tmpdir.join("oom_events.json")))
+    store.record(time.time(), "fake_service1", "fake_instance1", "baaab5a3a9fa", 2)
+    store.record(time.time() - 600, "fake_service2", "fake_instance2", "", 1)
+    store.save()
+    mock_get_services_for_cluster.return_value = [
+        ("fake_service1", "fake_instance1"),
+        ("fake_service2", "fake_instance2"),
+        ("fake_service3", "fake_instance3"),
+    ]
+
+    main(["", "--oom-events-store", str(tmpdir.join("oom_events.json"))])
+
+    assert not mock_latest_oom_events.called
+    # fake_instance3 never had a kill on this host, so its alert is left to
+    # the hosts where it did
+    assert mock_send_sensu_event.call_args_list == [
+        mock.call(
+            mock_get_instance_config.return_value,
+            ["baaab5a3a9fa", "baaab5a3a9fa"],
+            mock.ANY,
+        ),
+        mock.call(mock_get_instance_config.return_value, [], mock.ANY),
+    ]
+    assert [c[1]["instance"] for c in mock_get_instance_config.call_args_list] == [
+        "fake_instance1",
+        "fake_instance2",
+    ]
+
+
+def test_main_requires_a_source():
+    with pytest.raises(SystemExit):
+        main(["", "-d", "soa_dir"])
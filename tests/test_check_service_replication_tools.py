@@ -23,6 +23,9 @@ def test_main_kubernetes():
         "paasta_tools.check_services_replication_tools.sys.exit",
         autospec=True,
     ) as mock_sys_exit:
+        mock_load_system_paasta_config.return_value.get_soa_config_index_path.return_value = (
+            None
+        )
         mock_parse_args.return_value.under_replicated_crit_pct = 5
         mock_parse_args.return_value.min_count_critical = 1
         mock_parse_args.return_value.dry_run = False
@@ -98,3 +101,35 @@ def test_check_services_replication():
         )
         assert count_under_replicated == 0
         assert total == 1
+
+
+def test_get_kubernetes_pods_and_nodes():
+    with mock.patch(
+        "paasta_tools.check_services_replication_tools.KubeClient", autospec=True
+    ) as mock_kube_client, mock.patch(
+        "paasta_tools.check_services_replication_tools.get_all_namespaces",
+        autospec=True,
+        return_value=["paasta", "paastasvc-a", "paastasvc-b", "kube-system"],
+    ), mock.patch(
+        "paasta_tools.check_services_replication_tools.get_all_pods_slim_in_namespaces",
+        autospec=True,
+    ) as mock_get_all_pods_slim_in_namespaces, mock.patch(
+        "paasta_tools.check_services_replication_tools.get_all_nodes", autospec=True
+    ) as mock_get_all_nodes:
+        assert check_services_replication_tools.get_kubernetes_pods_and_nodes(
+            namespace_prefix="paastasvc-", additional_namespaces=["paasta"]
+        ) == (
+            mock_get_all_pods_slim_in_namespaces.return_value,
+            mock_get_all_nodes.return_value,
+        )
+        mock_get_all_pods_slim_in_namespaces.assert_called_once_with(
+            mock_kube_client.return_value,
+            ["paasta", "paastasvc-a", "paastasvc-b"],
+        )
+
+        check_services_replication_tools.get_kubernetes_pods_and_nodes(
+            namespace="paasta-cassandraclusters"
+        )
+        mock_get_all_pods_slim_in_namespaces.assert_called_with(
+            mock_kube_client.return_value, ["paasta-cassandraclusters"]
+        )
@@ -20,6 +20,7 @@ import requests
 
 from paasta_tools.envoy_tools import are_namespaces_up_in_eds
 from paasta_tools.envoy_tools import are_services_up_in_pod
+from paasta_tools.envoy_tools import EnvoyClustersSnapshot
 from paasta_tools.envoy_tools import get_backends
 from paasta_tools.envoy_tools import get_backends_from_eds
 from paasta_tools.envoy_tools import get_casper_endpoints
@@ -76,6 +77,32 @@ def test_get_backends():
             assert expected == get_backends("service1.main", "host", 123, "something")
 
 
+def test_envoy_clusters_snapshot():
+    testdir = os.path.dirname(os.path.realpath(__file__))
+    testdata = os.path.join(testdir, "envoy_admin_clusters_snapshot.txt")
+    with open(testdata, "r") as fd:
+        mock_envoy_admin_clusters_data = json.load(fd)
+
+    snapshot = EnvoyClustersSnapshot(mock_envoy_admin_clusters_data)
+    assert "service1.main" in snapshot.service_names()
+
+    with mock.patch(
+        "socket.gethostbyaddr",
+        side_effect=lambda x: ("host" + x.split(".")[-1] + ".example.com", None, None),
+        autospec=True,
+    ) as mock_gethostbyaddr:
+        backends = snapshot.get_backends(["service1.main", "not_a_service.main"])
+        assert list(backends) == ["service1.main"]
+        assert [b["hostname"] for b, _ in backends["service1.main"]] == [
+            "host88",
+            "host90",
+        ]
+        # only the requested service's backends get resolved, and only once
+        assert mock_gethostbyaddr.call_count == 2
+        assert snapshot.get_backends(["service1.main"]) == backends
+        assert mock_gethostbyaddr.call_count == 2
+
+
 def test_get_casper_endpoints():
     testdir = os.path.dirname(os.path.realpath(__file__))
     testdata = os.path.join(testdir, "envoy_admin_clusters_snapshot.txt")
@@ -1,4 +1,6 @@
+import datetime
 import functools
+import json
 from base64 import b64encode
 from typing import Any
 from typing import Dict
@@ -15,6 +17,8 @@ from kubernetes.client import V1Affinity
 from kubernetes.client import V1AWSElasticBlockStoreVolumeSource
 from kubernetes.client import V1beta1PodDisruptionBudget
 from kubernetes.client import V1Capabilities
+from kubernetes.client import V1ConfigMap
+from kubernetes.client import V1ConfigMapList
 from kubernetes.client import V1Container
 from kubernetes.client import V1ContainerPort
 from kubernetes.client import V1DeleteOptions
@@ -95,6 +99,8 @@ from paasta_tools.kubernetes_tools import force_delete_pods
 from paasta_tools.kubernetes_tools import get_active_versions_for_service
 from paasta_tools.kubernetes_tools import get_all_nodes
 from paasta_tools.kubernetes_tools import get_all_pods
+from paasta_tools.kubernetes_tools import get_all_pods_slim
+from paasta_tools.kubernetes_tools import get_all_pods_slim_in_namespaces
 from paasta_tools.kubernetes_tools import get_annotations_for_kubernetes_service
 from paasta_tools.kubernetes_tools import get_kubernetes_app_by_name
 from paasta_tools.kubernetes_tools import get_kubernetes_app_deploy_status
@@ -109,6 +115,7 @@ from paasta_tools.kubernetes_tools import get_paasta_secret_signature_name
 from paasta_tools.kubernetes_tools import get_secret
 from paasta_tools.kubernetes_tools import get_secret_name_from_ref
 from paasta_tools.kubernetes_tools import get_secret_signature
+from paasta_tools.kubernetes_tools import get_secret_signatures
 from paasta_tools.kubernetes_tools import InvalidKubernetesConfig
 from paasta_tools.kubernetes_tools import is_node_ready
 from paasta_tools.kubernetes_tools import is_pod_ready
@@ -2400,6 +2407,63 @@ class TestKubernetesDeploymentConfig:
         # not be affected. if this is no longer true, this will cause a big bounce.
         assert no_sha_ret == with_sha_ret
 
+    def test_format_kubernetes_app_cached(self):
+        with mock.patch(
+            "paasta_tools.kubernetes_tools.load_system_paasta_config", autospec=True
+        ) as mock_load_system_config, mock.patch(
+            "paasta_tools.kubernetes_tools.KubernetesDeploymentConfig.get_secret_hashes",
+            autospec=True,
+        ) as mock_get_secret_hashes, mock.patch(
+            "paasta_tools.kubernetes_tools.KubernetesDeploymentConfig.get_formatted_app_cache_key",
+            autospec=True,
+            return_value="fake_key",
+        ) as mock_get_formatted_app_cache_key, mock.patch(
+            "paasta_tools.kubernetes_tools.KubernetesDeploymentConfig._format_kubernetes_app",
+            autospec=True,
+            return_value=_fake_deployment("kurupt-fm"),
+        ) as mock_format_kubernetes_app:
+            kubernetes_tools.enable_formatted_app_cache()
+            try:
+                first = self.deployment.format_kubernetes_app()
+                first.metadata.name = "mutated"
+                second = self.deployment.format_kubernetes_app()
+            finally:
+                kubernetes_tools.disable_formatted_app_cache()
+
+            mock_get_formatted_app_cache_key.assert_called_with(
+                self.deployment,
+                system_paasta_config=mock_load_system_config.return_value,
+                secret_hashes=mock_get_secret_hashes.return_value,
+            )
+            mock_format_kubernetes_app.assert_called_once_with(
+                self.deployment,
+                system_paasta_config=mock_load_system_config.return_value,
+                secret_hashes=mock_get_secret_hashes.return_value,
+            )
+            assert second == _fake_deployment("kurupt-fm")
+
+    def test_get_formatted_app_cache_key(self, system_paasta_config):
+        with mock.patch(
+            "paasta_tools.kubernetes_tools.load_service_namespace_config",
+            autospec=True,
+            return_value={},
+        ):
+            key = self.deployment.get_formatted_app_cache_key(
+                system_paasta_config, secret_hashes={}
+            )
+            assert key == self.deployment.copy().get_formatted_app_cache_key(
+                system_paasta_config, secret_hashes={}
+            )
+
+            changed = self.deployment.copy()
+            changed.config_dict["cpus"] = 42
+            assert key != changed.get_formatted_app_cache_key(
+                system_paasta_config, secret_hashes={}
+            )
+            assert key != self.deployment.get_formatted_app_cache_key(
+                system_paasta_config, secret_hashes={"SECRET(foo)": "new_signature"}
+            )
+
     def test_get_kubernetes_secret_env_vars(self):
         assert self.deployment.get_kubernetes_secret_env_vars(
             secret_env_vars={"SOME": "SECRET(a_ref)"},
@@ -2509,6 +2573,43 @@ class TestKubernetesDeploymentConfig:
         assert pv_name == "pv--slash-blahslash-what"
 
 
+def _fake_deployment(name, labels=None):
+    return V1Deployment(
+        metadata=V1ObjectMeta(name=name, labels=labels),
+        spec=V1DeploymentSpec(
+            selector=V1LabelSelector(match_labels={"freq": "108.9"}),
+            template=V1PodTemplateSpec(
+                spec=V1PodSpec(containers=[V1Container(name="fake_container")])
+            ),
+        ),
+    )
+
+
+def test_copy_kube_object():
+    deployment = _fake_deployment("kurupt-fm", labels={"mc": "grindah"})
+    copied = kubernetes_tools.copy_kube_object(deployment)
+    assert copied == deployment
+
+    copied.metadata.labels["mc"] = "kurupt"
+    copied.spec.template.spec.containers[0].name = "other_container"
+    assert deployment.metadata.labels == {"mc": "grindah"}
+    assert deployment.spec.template.spec.containers[0].name == "fake_container"
+
+
+def test_formatted_app_cache_evicts_least_recently_used():
+    cache = kubernetes_tools.FormattedAppCache(max_size=2)
+    for name in ("a", "b"):
+        cache.put(name, _fake_deployment(name))
+    assert cache.get("a").metadata.name == "a"
+
+    cache.put("c", _fake_deployment("c"))
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+    assert (cache.hits, cache.misses) == (3, 1)
+
+
 def test_get_kubernetes_services_running_here():
     with mock.patch(
         "paasta_tools.kubernetes_tools.requests.get", autospec=True
@@ -3453,6 +3554,54 @@ async def test_pods_for_service_instance():
     )
 
 
+@pytest.mark.asyncio
+async def test_pods_for_service_instance_uses_kube_object_cache():
+    mock_client = mock.Mock()
+    mock_cache = mock.Mock(spec=kubernetes_tools.KubeObjectCache)
+    with mock.patch(
+        "paasta_tools.kubernetes_tools._kube_object_cache", mock_cache, autospec=None
+    ):
+        assert (
+            await pods_for_service_instance("kurupt", "fm", mock_client)
+            == mock_cache.list_for_service_instance.return_value
+        )
+        mock_cache.list_for_service_instance.assert_called_once_with(
+            "pods", "kurupt", "fm", "paasta"
+        )
+        assert mock_client.core.list_namespaced_pod.call_count == 0
+
+        # a stale cache falls back to asking the API server
+        mock_cache.list_for_service_instance.return_value = None
+        assert (
+            await pods_for_service_instance("kurupt", "fm", mock_client)
+            == mock_client.core.list_namespaced_pod.return_value.items
+        )
+
+
+@pytest.mark.asyncio
+async def test_get_hpa_uses_kube_object_cache():
+    mock_client = mock.Mock()
+    mock_cache = mock.Mock(spec=kubernetes_tools.KubeObjectCache)
+    mock_hpa = mock.Mock()
+    with mock.patch(
+        "paasta_tools.kubernetes_tools._kube_object_cache", mock_cache, autospec=None
+    ):
+        mock_cache.get.return_value = (True, mock_hpa)
+        assert await kubernetes_tools.get_hpa(mock_client, "svc-main", "paasta") is (
+            mock_hpa
+        )
+        mock_cache.get.assert_called_once_with("hpas", "paasta", "svc-main")
+        assert (
+            mock_client.autoscaling.read_namespaced_horizontal_pod_autoscaler.call_count
+            == 0
+        )
+
+        mock_cache.get.return_value = (False, None)
+        assert await kubernetes_tools.get_hpa(mock_client, "svc-main", "paasta") is (
+            mock_client.autoscaling.read_namespaced_horizontal_pod_autoscaler.return_value
+        )
+
+
 def test_get_active_versions_for_service():
     mock_pod_list = [
         mock.Mock(
@@ -3512,12 +3661,126 @@ def test_get_all_pods():
     )
 
 
+POD_DICT = {
+    "metadata": {
+        "name": "kurupt-fm-6d7b9c5c4f-x2x7k",
+        "namespace": "paasta",
+        "labels": {
+            "paasta.yelp.com/service": "kurupt",
+            "paasta.yelp.com/instance": "fm",
+        },
+        "ownerReferences": [{"kind": "ReplicaSet", "name": "kurupt-fm-6d7b9c5c4f"}],
+        "annotations": {"lots": "of stuff the checks don't need"},
+    },
+    "spec": {"nodeName": "node1", "containers": [{"name": "kurupt-fm"}]},
+    "status": {
+        "phase": "Running",
+        "podIP": "10.1.2.3",
+        "startTime": "2021-03-04T05:06:07Z",
+        "conditions": [
+            {"type": "Ready", "status": "True"},
+            {"type": "ContainersReady", "status": "False", "reason": "Unhealthy"},
+        ],
+    },
+}
+
+
+def test_slim_pod_from_dict():
+    pod = kubernetes_tools.slim_pod_from_dict(POD_DICT)
+    assert pod.metadata.name == "kurupt-fm-6d7b9c5c4f-x2x7k"
+    assert pod.metadata.namespace == "paasta"
+    assert pod.metadata.owner_references[0].kind == "ReplicaSet"
+    assert pod.spec.node_name == "node1"
+    assert pod.status.pod_ip == "10.1.2.3"
+    assert pod.status.start_time == datetime.datetime(
+        2021, 3, 4, 5, 6, 7, tzinfo=datetime.timezone.utc
+    )
+    assert is_pod_ready(pod)
+    assert kubernetes_tools.get_pod_condition(pod, "ContainersReady").reason == (
+        "Unhealthy"
+    )
+    assert filter_pods_by_service_instance(
+        kubernetes_tools.PodIndex([pod]), "kurupt", "fm"
+    ) == [pod]
+
+    pending = kubernetes_tools.slim_pod_from_dict(
+        {"metadata": {"name": "pending", "namespace": "paasta"}, "status": {}}
+    )
+    assert pending.metadata.labels == {}
+    assert pending.spec.node_name is None
+    assert pending.status.start_time is None
+    assert not is_pod_ready(pending)
+
+
+def mock_list_namespaced_pod(pages_by_namespace):
+    """A list_namespaced_pod that returns raw responses, a page at a time."""
+
+    def list_namespaced_pod(namespace, limit, _continue, _preload_content):
+        assert not _preload_content
+        page = int(_continue or 0)
+        items = pages_by_namespace[namespace][page]
+        more = page + 1 < len(pages_by_namespace[namespace])
+        return mock.Mock(
+            data=json.dumps(
+                {
+                    "items": items,
+                    "metadata": {"continue": str(page + 1) if more else ""},
+                }
+            ).encode()
+        )
+
+    return list_namespaced_pod
+
+
+def make_pod_dict(name, namespace):
+    return dict(
+        POD_DICT, metadata=dict(POD_DICT["metadata"], name=name, namespace=namespace)
+    )
+
+
+def test_get_all_pods_slim():
+    mock_client = mock.Mock()
+    mock_client.core.list_namespaced_pod.side_effect = mock_list_namespaced_pod(
+        {
+            "paasta": [
+                [make_pod_dict("a", "paasta"), make_pod_dict("b", "paasta")],
+                [make_pod_dict("c", "paasta")],
+            ]
+        }
+    )
+    pods = get_all_pods_slim(mock_client, namespace="paasta", page_size=2)
+    assert [pod.metadata.name for pod in pods] == ["a", "b", "c"]
+    assert mock_client.core.list_namespaced_pod.call_args_list == [
+        mock.call(namespace="paasta", limit=2, _continue=None, _preload_content=False),
+        mock.call(namespace="paasta", limit=2, _continue="1", _preload_content=False),
+    ]
+
+
+def test_get_all_pods_slim_in_namespaces():
+    mock_client = mock.Mock()
+    mock_client.core.list_namespaced_pod.side_effect = mock_list_namespaced_pod(
+        {
+            "paastasvc-a": [[make_pod_dict("a1", "paastasvc-a")]],
+            "paastasvc-b": [[], []],
+            "paasta": [
+                [make_pod_dict("p1", "paasta")],
+                [make_pod_dict("p2", "paasta")],
+            ],
+        }
+    )
+    pods = get_all_pods_slim_in_namespaces(
+        mock_client, ["paastasvc-a", "paastasvc-b", "paasta"], concurrency=2
+    )
+    assert [pod.metadata.name for pod in pods] == ["a1", "p1", "p2"]
+
+
 def test_get_all_nodes():
     mock_client = mock.Mock()
     assert get_all_nodes(mock_client) == mock_client.core.list_node.return_value.items
 
 
-def test_filter_pods_for_service_instance():
+@pytest.mark.parametrize("pod_list_type", [list, kubernetes_tools.PodIndex])
+def test_filter_pods_for_service_instance(pod_list_type):
     mock_pod_1 = mock.MagicMock(
         metadata=mock.MagicMock(
             labels={
@@ -3540,7 +3803,7 @@ def test_filter_pods_for_service_instance():
     )
     mock_pod_3 = mock.MagicMock(metadata=mock.MagicMock(labels=None))
     mock_pod_4 = mock.MagicMock(metadata=mock.MagicMock(labels={"some": "thing"}))
-    mock_pods = [mock_pod_1, mock_pod_2, mock_pod_3, mock_pod_4]
+    mock_pods = pod_list_type([mock_pod_1, mock_pod_2, mock_pod_3, mock_pod_4])
     assert filter_pods_by_service_instance(mock_pods, "kurupt", "fm") == [mock_pod_1]
     assert filter_pods_by_service_instance(mock_pods, "kurupt", "garage") == [
         mock_pod_2
@@ -3548,6 +3811,31 @@ def test_filter_pods_for_service_instance():
     assert filter_pods_by_service_instance(mock_pods, "kurupt", "non-existing") == []
 
 
+def test_pod_index():
+    def make_pod(service, instance, namespace):
+        return mock.MagicMock(
+            metadata=mock.MagicMock(
+                namespace=namespace,
+                labels={
+                    "paasta.yelp.com/service": service,
+                    "paasta.yelp.com/instance": instance,
+                },
+            )
+        )
+
+    pod_1 = make_pod("kurupt", "fm", "paasta")
+    pod_2 = make_pod("kurupt", "fm", "paastasvc-kurupt")
+    pod_3 = make_pod("kurupt", "garage", "paastasvc-kurupt")
+    index = kubernetes_tools.PodIndex([pod_1, pod_2, pod_3])
+
+    assert len(index) == 3
+    assert list(index) == [pod_1, pod_2, pod_3]
+    assert index[-1] is pod_3
+    assert index.get_pods("kurupt", "fm") == [pod_1, pod_2]
+    assert index.get_pods("kurupt", "fm", namespace="paastasvc-kurupt") == [pod_2]
+    assert index.get_pods("kurupt", "nope") == []
+
+
 def test_is_pod_ready():
     mock_pod = mock.MagicMock(
         status=mock.MagicMock(
@@ -3799,6 +4087,29 @@ def test_get_kubernetes_secret_signature_401():
         )
 
 
+def test_get_secret_signatures():
+    mock_client = mock.Mock()
+    mock_client.core.list_namespaced_config_map.return_value = V1ConfigMapList(
+        items=[
+            V1ConfigMap(
+                metadata=V1ObjectMeta(name="paasta-secret-foo-signature"),
+                data={"signature": "abc"},
+            ),
+            V1ConfigMap(
+                metadata=V1ObjectMeta(name="some-other-configmap"),
+                data={"foo": "bar"},
+            ),
+            V1ConfigMap(metadata=V1ObjectMeta(name="empty-configmap"), data=None),
+        ]
+    )
+    assert get_secret_signatures(kube_client=mock_client, namespace="paasta") == {
+        "paasta-secret-foo-signature": "abc"
+    }
+    mock_client.core.list_namespaced_config_map.assert_called_once_with(
+        namespace="paasta", label_selector="paasta.yelp.com/service"
+    )
+
+
 @pytest.mark.parametrize(
     "namespace, secret, secret_data",
     [
@@ -14,13 +14,18 @@
 import json
 
 import pytest
+from docker.errors import APIError
+from mock import call
 from mock import Mock
 from mock import patch
 
 from paasta_tools.oom_logger import capture_oom_events_from_stdin
+from paasta_tools.oom_logger import ContainerMetadata
+from paasta_tools.oom_logger import get_container_metadata
 from paasta_tools.oom_logger import log_to_clog
 from paasta_tools.oom_logger import LogLine
 from paasta_tools.oom_logger import main
+from paasta_tools.oom_logger import OOMEventEmitter
 from paasta_tools.oom_logger import send_sfx_event
 
 
@@ -375,5 +380,102 @@ def test_main(
     mock_log_to_paasta.assert_called_once_with(log_line)
     mock_log_to_clog.assert_called_once_with(log_line)
     mock_send_sfx_event.assert_called_once_with(
-        "fake_service", "fake_instance", "fake_cluster"
+        "fake_service", "fake_instance", "fake_cluster", 1
     )
+
+
+def test_get_container_metadata(docker_inspect):
+    docker_client = Mock(inspect_container=Mock(return_value=docker_inspect))
+    for _ in range(3):
+        assert get_container_metadata(docker_client, "a687af92e281") == (
+            ContainerMetadata(
+                service="fake_service",
+                instance="fake_instance",
+                mesos_container_id="mesos-a04c14a6-83ea-4047-a802-92b850b1624e",
+                mem_limit="512",
+            )
+        )
+    docker_client.inspect_container.assert_called_once_with(resource_id="a687af92e281")
+
+
+@patch("paasta_tools.oom_logger.send_sfx_event", autospec=True)
+@patch("paasta_tools.oom_logger.log_to_clog", autospec=True)
+@patch("paasta_tools.oom_logger.log_to_paasta", autospec=True)
+def test_oom_event_emitter(
+    mock_log_to_paasta, mock_log_to_clog, mock_send_sfx_event, docker_inspect
+):
+    def inspect_container(resource_id):
+        if resource_id == "gone":
+            raise APIError("No such container", Mock())
+        return docker_inspect
+
+    docker_client = Mock(inspect_container=Mock(side_effect=inspect_container))
+    emitter = OOMEventEmitter("fake_cluster", docker_client, max_batch_size=10)
+    for i in range(3):
+        emitter.put((1500316300 + i, "dev37-devc", "c0ffee000000", "apache2"))
+    emitter.put((1500316303, "dev37-devc", "gone", "apache2"))
+    # events queued before starting the emitter all go into the same batch
+    emitter.start()
+    emitter.stop()
+
+    assert [c[0][0].timestamp for c in mock_log_to_clog.call_args_list] == [
+        1500316300,
+        1500316301,
+        1500316302,
+    ]
+    assert mock_log_to_paasta.call_count == 3
+    mock_send_sfx_event.assert_called_once_with(
+        "fake_service", "fake_instance", "fake_cluster", 3
+    )
+
+
+@patch("paasta_tools.oom_logger.send_sfx_event", autospec=True)
+@patch("paasta_tools.oom_logger.log_to_clog", autospec=True)
+@patch("paasta_tools.oom_logger.log_to_paasta", autospec=True)
+def test_oom_event_emitter_carries_on_after_errors(
+    mock_log_to_paasta, mock_log_to_clog, mock_send_sfx_event, docker_inspect, capsys
+):
+    other_inspect = {
+        "Config": {
+            "Env": ["PAASTA_SERVICE=other_service", "PAASTA_INSTANCE=fake_instance"]
+        }
+    }
+    inspects = {"c0ffee000000": docker_inspect, "c0ffee000001": other_inspect}
+    docker_client = Mock(
+        inspect_container=Mock(side_effect=lambda resource_id: inspects[resource_id])
+    )
+    mock_log_to_clog.side_effect = [Exception("clog is down"), None, None]
+    mock_send_sfx_event.side_effect = lambda service, *args: (
+        None if service == "other_service" else 1 / 0
+    )
+    emitter = OOMEventEmitter("fake_cluster", docker_client)
+    emitter.emit_batch(
+        [
+            (1500316300, "dev37-devc", "c0ffee000000", "apache2"),
+            (1500316301, "dev37-devc", "c0ffee000000", "apache2"),
+            (1500316302, "dev37-devc", "c0ffee000001", "apache2"),
+        ]
+    )
+
+    assert mock_log_to_clog.call_count == 3
+    assert [c[0][0].timestamp for c in mock_log_to_paasta.call_args_list] == [
+        1500316301,
+        1500316302,
+    ]
+    assert mock_send_sfx_event.call_args_list == [
+        call("fake_service", "fake_instance", "fake_cluster", 2),
+        call("other_service", "fake_instance", "fake_cluster", 1),
+    ]
+    err = capsys.readouterr().err
+    assert "Failed to log OOM event (1500316300," in err
+    assert "1500316301" not in err
+    assert "fake_service.fake_instance to SignalFx" in err
+
+
+def test_oom_event_emitter_drops_events_when_full(capsys):
+    emitter = OOMEventEmitter("fake_cluster", Mock(), max_queued=2)
+    for i in range(3):
+        emitter.put((i, "dev37-devc", "c0ffee000000", "apache2"))
+    assert emitter.dropped == 1
+    assert emitter.queue.qsize() == 2
+    assert "Dropped an OOM event" in capsys.readouterr().err
@@ -8,9 +8,11 @@ from paasta_tools.kubernetes.application.controller_wrappers import Application
 from paasta_tools.kubernetes_tools import InvalidKubernetesConfig
 from paasta_tools.kubernetes_tools import KubeDeployment
 from paasta_tools.kubernetes_tools import KubernetesDeploymentConfig
+from paasta_tools.setup_kubernetes_job import ApiUpdateBudget
 from paasta_tools.setup_kubernetes_job import create_application_object
 from paasta_tools.setup_kubernetes_job import get_kubernetes_deployment_config
 from paasta_tools.setup_kubernetes_job import get_service_instances_with_valid_names
+from paasta_tools.setup_kubernetes_job import interleave_by_namespace
 from paasta_tools.setup_kubernetes_job import main
 from paasta_tools.setup_kubernetes_job import parse_args
 from paasta_tools.setup_kubernetes_job import setup_kube_deployments
@@ -41,8 +43,13 @@ def test_main_logging():
     ), mock.patch(
         "paasta_tools.setup_kubernetes_job.setup_kube_deployments", autospec=True
     ) as mock_setup_kube_deployments, mock.patch(
+        "paasta_tools.setup_kubernetes_job.load_system_paasta_config", autospec=True
+    ) as mock_load_system_paasta_config, mock.patch(
         "paasta_tools.setup_kubernetes_job.logging", autospec=True
     ) as mock_logging:
+        mock_load_system_paasta_config.return_value.get_soa_config_index_path.return_value = (
+            None
+        )
         mock_setup_kube_deployments.return_value = True
         mock_parse_args.return_value.verbose = True
         mock_kube_deploy_config = KubernetesDeploymentConfig(
@@ -85,7 +92,12 @@ def test_main():
         "paasta_tools.setup_kubernetes_job.ensure_namespace", autospec=True
     ) as mock_ensure_namespace, mock.patch(
         "paasta_tools.setup_kubernetes_job.setup_kube_deployments", autospec=True
-    ) as mock_setup_kube_deployments:
+    ) as mock_setup_kube_deployments, mock.patch(
+        "paasta_tools.setup_kubernetes_job.load_system_paasta_config", autospec=True
+    ) as mock_load_system_paasta_config:
+        mock_load_system_paasta_config.return_value.get_soa_config_index_path.return_value = (
+            None
+        )
         mock_setup_kube_deployments.return_value = True
         mock_metrics_interface = mock_get_metrics_interface.return_value
         mock_kube_deploy_config = KubernetesDeploymentConfig(
@@ -109,6 +121,7 @@ def test_main():
             rate_limit=mock_parse_args.return_value.rate_limit,
             service_instance_configs_list=mock_service_instance_configs_list.return_value,
             metrics_interface=mock_metrics_interface,
+            concurrency=mock_parse_args.return_value.concurrency,
         )
         mock_setup_kube_deployments.return_value = False
         with raises(SystemExit) as e:
@@ -607,6 +620,153 @@ def test_setup_kube_deployments_rate_limit():
         assert fake_app.create.call_count == 3
 
 
+def test_setup_kube_deployments_concurrency():
+    with mock.patch(
+        "paasta_tools.setup_kubernetes_job.create_application_object",
+        autospec=True,
+    ) as mock_create_application_object, mock.patch(
+        "paasta_tools.setup_kubernetes_job.list_all_paasta_deployments", autospec=True
+    ) as mock_list_all_paasta_deployments:
+        mock_client = mock.Mock()
+        mock_service_instance_configs_list = []
+        apps = []
+        for namespace in ("paastasvc-a", "paastasvc-b"):
+            for instance in ("main", "canary", "batch"):
+                mock_service_instance_configs_list.append(
+                    (
+                        True,
+                        KubernetesDeploymentConfig(
+                            service=namespace,
+                            instance=instance,
+                            cluster="fake_cluster",
+                            config_dict={},
+                            branch_dict=None,
+                        ),
+                    )
+                )
+                app = mock.Mock()
+                app.kube_deployment = KubeDeployment(
+                    service=namespace,
+                    instance=instance,
+                    git_sha="1",
+                    image_version=None,
+                    config_sha="1",
+                    namespace=namespace,
+                    replicas=1,
+                )
+                apps.append((True, app))
+        mock_create_application_object.side_effect = apps
+        # one of the apps is already up to date
+        mock_list_all_paasta_deployments.return_value = [apps[0][1].kube_deployment]
+
+        assert setup_kube_deployments(
+            kube_client=mock_client,
+            service_instance_configs_list=mock_service_instance_configs_list,
+            cluster="fake_cluster",
+            soa_dir="/nail/blah",
+            concurrency=4,
+        )
+        assert apps[0][1].create.call_count == 0
+        for _, app in apps[1:]:
+            app.create.assert_called_once_with(mock_client)
+        for _, app in apps:
+            app.update_related_api_objects.assert_called_once_with(mock_client)
+
+        # the rate limit is shared by all the workers
+        for _, app in apps:
+            app.reset_mock()
+        mock_create_application_object.side_effect = apps
+        setup_kube_deployments(
+            kube_client=mock_client,
+            service_instance_configs_list=mock_service_instance_configs_list,
+            cluster="fake_cluster",
+            soa_dir="/nail/blah",
+            rate_limit=2,
+            concurrency=4,
+        )
+        assert sum(app.create.call_count for _, app in apps) == 2
+
+
+def test_setup_kube_deployments_failed_creates_do_not_use_the_rate_limit():
+    with mock.patch(
+        "paasta_tools.setup_kubernetes_job.create_application_object",
+        autospec=True,
+    ) as mock_create_application_object, mock.patch(
+        "paasta_tools.setup_kubernetes_job.list_all_paasta_deployments",
+        autospec=True,
+        return_value=[],
+    ):
+        service_instance_configs_list = [
+            (
+                True,
+                KubernetesDeploymentConfig(
+                    service="kurupt",
+                    instance=instance,
+                    cluster="fake_cluster",
+                    config_dict={},
+                    branch_dict=None,
+                ),
+            )
+            for instance in ("fm", "garage", "radio")
+        ]
+        broken_app = mock.Mock()
+        broken_app.create.side_effect = Exception("can't create this")
+        working_apps = [mock.Mock(), mock.Mock()]
+        mock_create_application_object.side_effect = [
+            (True, broken_app),
+            (True, working_apps[0]),
+            (True, working_apps[1]),
+        ]
+
+        setup_kube_deployments(
+            kube_client=mock.Mock(),
+            service_instance_configs_list=service_instance_configs_list,
+            cluster="fake_cluster",
+            soa_dir="/nail/blah",
+            rate_limit=2,
+        )
+        assert broken_app.create.call_count == 1
+        for app in working_apps:
+            assert app.create.call_count == 1
+
+
+def test_api_update_budget():
+    budget = ApiUpdateBudget(rate_limit=2)
+    assert not budget.exhausted()
+    assert budget.try_acquire()
+    assert budget.try_acquire()
+    assert budget.exhausted()
+    assert not budget.try_acquire()
+    assert budget.used == 2
+    budget.release()
+    assert not budget.exhausted()
+    assert budget.try_acquire()
+
+    unlimited = ApiUpdateBudget(rate_limit=0)
+    for _ in range(10):
+        assert unlimited.try_acquire()
+    assert not unlimited.exhausted()
+
+
+def test_interleave_by_namespace():
+    def app(namespace, instance):
+        return mock.Mock(
+            kube_deployment=mock.Mock(namespace=namespace, instance=instance)
+        )
+
+    a1, a2, a3 = app("a", "1"), app("a", "2"), app("a", "3")
+    b1 = app("b", "1")
+    c1, c2 = app("c", "1"), app("c", "2")
+    assert interleave_by_namespace([a1, a2, a3, b1, c1, c2]) == [
+        a1,
+        b1,
+        c1,
+        a2,
+        c2,
+        a3,
+    ]
+
+
 def test_setup_kube_deployments_skip_malformed_apps():
     with mock.patch(
         "paasta_tools.setup_kubernetes_job.create_application_object",
@@ -85,14 +85,21 @@ def test_get_smartstack_replication_for_attribute(system_paasta_config):
         )
 
 
+def _mock_haproxy_response(haproxy_data):
+    mock_response = mock.Mock(spec=requests.Response, encoding="utf-8")
+    mock_response.iter_lines.side_effect = lambda **kwargs: iter(
+        haproxy_data.splitlines()
+    )
+    return mock_response
+
+
 def test_get_replication_for_service():
     testdir = os.path.dirname(os.path.realpath(__file__))
     testdata = os.path.join(testdir, "haproxy_snapshot.txt")
     with open(testdata, "r") as fd:
         mock_haproxy_data = fd.read()
 
-    mock_response = mock.Mock()
-    mock_response.text = mock_haproxy_data
+    mock_response = _mock_haproxy_response(mock_haproxy_data)
     mock_get = mock.Mock(return_value=(mock_response))
 
     with mock.patch.object(requests.Session, "get", mock_get):
@@ -106,6 +113,76 @@ def test_get_replication_for_service():
         assert expected == replication_result
 
 
+def test_parse_haproxy_csv():
+    lines = [
+        "# pxname,svname,status,weight,lastchg,check_status,check_code,check_duration,last_chk,",
+        "service1,FRONTEND,OPEN,,,,,,,",
+        "service1,10.1.1.1:31000_box1,UP,1,15,L7OK,200,1,OK,",
+        'service1,10.1.1.2:31000_box2,DOWN,1,20,L7STS,503,2,"Service Unavailable, try later",',
+        "service1,BACKEND,UP,1,15,,,,,",
+        "",
+        "service2,10.1.1.3:31000_box3,UP,1,30,L7OK,200,3,OK,",
+    ]
+    assert list(smartstack_tools.parse_haproxy_csv(lines)) == [
+        {
+            "pxname": "service1",
+            "svname": "10.1.1.1:31000_box1",
+            "status": "UP",
+            "lastchg": "15",
+            "check_status": "L7OK",
+            "check_code": "200",
+            "check_duration": "1",
+        },
+        {
+            "pxname": "service1",
+            "svname": "10.1.1.2:31000_box2",
+            "status": "DOWN",
+            "lastchg": "20",
+            "check_status": "L7STS",
+            "check_code": "503",
+            "check_duration": "2",
+        },
+        {
+            "pxname": "service2",
+            "svname": "10.1.1.3:31000_box3",
+            "status": "UP",
+            "lastchg": "30",
+            "check_status": "L7OK",
+            "check_code": "200",
+            "check_duration": "3",
+        },
+    ]
+    assert [
+        b["svname"] for b in smartstack_tools.parse_haproxy_csv(lines, ["service2"])
+    ] == ["10.1.1.3:31000_box3"]
+    assert list(smartstack_tools.parse_haproxy_csv([])) == []
+
+
+def test_stream_haproxy_backends_gives_up_after_deadline():
+    lines = [
+        "# pxname,svname,status,",
+        "service1,10.1.1.1:31000_box1,UP,",
+        "service1,10.1.1.2:31000_box2,UP,",
+    ]
+    mock_response = _mock_haproxy_response("\n".join(lines))
+    mock_session = mock.Mock(get=mock.Mock(return_value=mock_response))
+    with mock.patch("paasta_tools.smartstack_tools.time", autospec=True) as mock_time:
+        # each line arrives in time, but the download as a whole is too slow
+        mock_time.monotonic.side_effect = [0, 4, 8, 12]
+        backends = smartstack_tools.stream_haproxy_backends(
+            "fake_host",
+            6666,
+            DEFAULT_SYNAPSE_HAPROXY_URL_FORMAT,
+            scope="",
+            session=mock_session,
+            deadline_seconds=10,
+        )
+        assert next(backends)["svname"] == "10.1.1.1:31000_box1"
+        with pytest.raises(requests.exceptions.Timeout):
+            next(backends)
+    mock_response.close.assert_called_once_with()
+
+
 def test_get_registered_marathon_tasks():
     backends = [
         {
@@ -551,6 +628,15 @@ def test_kube_get_allowed_locations_and_hosts(mock_kube_replication_checker):
             ]
         }
 
+        # nodes are only grouped once per discover location type
+        assert (
+            mock_kube_replication_checker.get_allowed_locations_and_hosts(
+                mock.Mock(service="other", instance="main", soa_dir="/nail/thing")
+            )
+            == ret
+        )
+        assert mock_get_nodes_grouped_by_attribute.call_count == 1
+
 
 def test_get_allowed_locations_and_hosts(mock_replication_checker):
     mock_replication_checker.get_allowed_locations_and_hosts(
@@ -633,3 +719,102 @@ def test_get_replication_info(mock_replication_checker):
             mock_service_discovery_provider.NAME,
         ): mock_service_discovery_provider.get_replication_for_all_services.return_value
     }
+
+
+@pytest.fixture
+def mock_haproxy_response():
+    testdir = os.path.dirname(os.path.realpath(__file__))
+    testdata = os.path.join(testdir, "haproxy_snapshot.txt")
+    with open(testdata, "r") as fd:
+        return _mock_haproxy_response(fd.read())
+
+
+def test_discovery_snapshot_cache_haproxy(system_paasta_config, mock_haproxy_response):
+    snapshot_cache = smartstack_tools.DiscoverySnapshotCache(system_paasta_config)
+    mock_get = mock.Mock(return_value=mock_haproxy_response)
+    with mock.patch.object(requests.Session, "get", mock_get):
+        snapshot_cache.prefetch_haproxy(["host1", "host2"])
+        replication = snapshot_cache.get_haproxy_replication_for_all_services("host1")
+        assert {
+            sn: replication[sn]
+            for sn in ["service1", "service2", "service3", "service4"]
+        } == {"service1": 18, "service2": 19, "service3": 0, "service4": 3}
+        backends = snapshot_cache.get_haproxy_backends("host2", ["service4"])
+        assert len(backends) == 3
+        assert {b["pxname"] for b in backends} == {"service4"}
+        assert snapshot_cache.get_haproxy_backends(
+            "host1", ["service4"]
+        ) == smartstack_tools.get_multiple_backends(
+            ["service4"], "host1", 6666, DEFAULT_SYNAPSE_HAPROXY_URL_FORMAT
+        )
+    snapshot_cache.close()
+
+    # one fetch per host, plus the one made by get_multiple_backends
+    assert mock_get.call_count == 3
+
+
+def test_discovery_snapshot_cache_retries_failed_fetch(
+    system_paasta_config, mock_haproxy_response
+):
+    snapshot_cache = smartstack_tools.DiscoverySnapshotCache(system_paasta_config)
+    mock_get = mock.Mock(
+        side_effect=[requests.exceptions.ConnectionError(), mock_haproxy_response]
+    )
+    with mock.patch.object(requests.Session, "get", mock_get):
+        with pytest.raises(requests.exceptions.ConnectionError):
+            snapshot_cache.get_haproxy_backends("host1")
+        assert snapshot_cache.get_haproxy_backends("host1", ["service4"])
+        assert snapshot_cache.get_haproxy_backends("host1", ["service4"])
+    snapshot_cache.close()
+    assert mock_get.call_count == 2
+
+
+def test_get_replication_for_instance_prefetches_locations():
+    smartstack_tools.BaseReplicationChecker.__abstractmethods__ = frozenset()
+    mock_snapshot_cache = mock.Mock(spec=smartstack_tools.DiscoverySnapshotCache)
+    mock_snapshot_cache.get_haproxy_replication_for_all_services.return_value = {
+        "thing.main": 3
+    }
+    system_paasta_config = mock.Mock()
+    checker = smartstack_tools.BaseReplicationChecker(
+        system_paasta_config=system_paasta_config,
+        service_discovery_providers=[
+            smartstack_tools.SmartstackServiceDiscovery(
+                system_paasta_config=system_paasta_config,
+                snapshot_cache=mock_snapshot_cache,
+            )
+        ],
+    )
+    with mock.patch(
+        "paasta_tools.smartstack_tools.BaseReplicationChecker.get_allowed_locations_and_hosts",
+        autospec=True,
+        return_value={
+            "westeros-prod": [DiscoveredHost(hostname="host1", pool="default")],
+            "middleearth-prod": [
+                DiscoveredHost(hostname="host2", pool="other"),
+                DiscoveredHost(hostname="host3", pool="default"),
+            ],
+        },
+    ):
+        instance_config = mock.Mock(service="thing", instance="main")
+        instance_config.get_pool.return_value = "default"
+        assert checker.get_replication_for_instance(instance_config) == {
+            "Smartstack": {
+                "westeros-prod": {"thing.main": 3},
+                "middleearth-prod": {"thing.main": 3},
+            }
+        }
+        checker.get_replication_for_instance(instance_config)
+
+    prefetched = [
+        list(call[0][0]) for call in mock_snapshot_cache.prefetch_haproxy.call_args_list
+    ]
+    # every location is prefetched the first time, and never again
+    assert prefetched == [["host1", "host3"], []]
+    assert (
+        mock_snapshot_cache.get_haproxy_replication_for_all_services.call_args_list
+        == [
+            mock.call("host1"),
+            mock.call("host3"),
+        ]
+    )
@@ -0,0 +1,156 @@
+import datetime
+import os
+
+import mock
+import service_configuration_lib
+
+from paasta_tools import soa_config_index
+from paasta_tools.utils import load_service_instance_configs
+
+
+def _write_config(soa_dir, service, name, contents):
+    service_dir = soa_dir.join(service)
+    if not service_dir.check():
+        service_dir.mkdir()
+    path = service_dir.join(f"{name}.yaml")
+    path.write(contents)
+    # make sure the file looks like it was written before this run started
+    os.utime(str(path), (1, 1))
+    return str(path)
+
+
+def _load_configs(soa_dir):
+    with mock.patch(
+        "paasta_tools.utils.load_service_instance_auto_configs",
+        autospec=True,
+        return_value={},
+    ):
+        return load_service_instance_configs(
+            service="fake_service",
+            instance_type="kubernetes",
+            cluster="fake_cluster",
+            soa_dir=str(soa_dir),
+        )
+
+
+def test_use_soa_config_index_disabled():
+    with mock.patch.object(
+        soa_config_index, "SoaConfigIndex", autospec=True
+    ) as mock_index:
+        with soa_config_index.use_soa_config_index(
+            index_path=None, soa_dir="/nail/etc/services"
+        ) as index:
+            assert index is None
+    assert mock_index.call_count == 0
+
+
+def test_use_soa_config_index_roundtrip(tmpdir):
+    soa_dir = tmpdir.mkdir("soa")
+    index_path = str(tmpdir.join("soa_config_index"))
+    config_path = _write_config(
+        soa_dir, "fake_service", "kubernetes-fake_cluster", "main: {cpus: 1}\n"
+    )
+
+    with mock.patch.object(service_configuration_lib, "_yaml_cache", {}):
+        with soa_config_index.use_soa_config_index(index_path, str(soa_dir)):
+            assert _load_configs(soa_dir) == {"main": {"cpus": 1}}
+    assert os.path.exists(index_path)
+
+    with mock.patch.object(
+        service_configuration_lib, "_yaml_cache", {}
+    ), mock.patch.object(
+        service_configuration_lib, "load_yaml", autospec=True
+    ) as mock_load_yaml:
+        with soa_config_index.use_soa_config_index(index_path, str(soa_dir)) as index:
+            assert config_path in index.entries
+            assert _load_configs(soa_dir) == {"main": {"cpus": 1}}
+        assert mock_load_yaml.call_count == 0
+
+
+def test_use_soa_config_index_reparses_changed_files(tmpdir):
+    soa_dir = tmpdir.mkdir("soa")
+    index_path = str(tmpdir.join("soa_config_index"))
+    _write_config(
+        soa_dir, "fake_service", "kubernetes-fake_cluster", "main: {cpus: 1}\n"
+    )
+
+    with mock.patch.object(service_configuration_lib, "_yaml_cache", {}):
+        with soa_config_index.use_soa_config_index(index_path, str(soa_dir)):
+            _load_configs(soa_dir)
+
+    _write_config(
+        soa_dir, "fake_service", "kubernetes-fake_cluster", "main: {cpus: 2.5}\n"
+    )
+    with mock.patch.object(service_configuration_lib, "_yaml_cache", {}):
+        with soa_config_index.use_soa_config_index(index_path, str(soa_dir)):
+            assert _load_configs(soa_dir) == {"main": {"cpus": 2.5}}
+
+
+def test_soa_config_index_ignores_index_for_other_soa_dir(tmpdir):
+    soa_dir = tmpdir.mkdir("soa")
+    index_path = str(tmpdir.join("soa_config_index"))
+    config_path = _write_config(
+        soa_dir, "fake_service", "kubernetes-fake_cluster", "main: {}\n"
+    )
+    index = soa_config_index.SoaConfigIndex(index_path, str(soa_dir))
+    index.entries[config_path] = (1, 1, {})
+    index.save()
+
+    other_index = soa_config_index.SoaConfigIndex(index_path, str(tmpdir))
+    other_index.load()
+    assert other_index.entries == {}
+
+
+def test_soa_config_index_save_keeps_entries_from_other_runs(tmpdir):
+    index_path = str(tmpdir.join("soa_config_index"))
+    a_path = _write_config(tmpdir, "fake_service", "a", "a: 1\n")
+    b_path = _write_config(tmpdir, "fake_service", "b", "b: 2\n")
+    c_path = _write_config(tmpdir, "fake_service", "c", "c: 3\n")
+    a_signature = soa_config_index._file_signature(a_path)
+    b_signature = soa_config_index._file_signature(b_path)
+    c_signature = soa_config_index._file_signature(c_path)
+
+    first = soa_config_index.SoaConfigIndex(index_path, str(tmpdir))
+    first.entries[a_path] = (*a_signature, {"a": 1})
+    first.entries[b_path] = (*b_signature, {"b": 2})
+    first.entries[c_path] = (*c_signature, {"c": 3})
+    first.save()
+
+    # since the first save, b has been deleted and c has been modified
+    os.remove(b_path)
+    _write_config(tmpdir, "fake_service", "c", "c: 30\n")
+    second = soa_config_index.SoaConfigIndex(index_path, str(tmpdir))
+    second.entries["/d.yaml"] = (2, 2, {4: "d"})
+    second.save()
+
+    merged = soa_config_index.SoaConfigIndex(index_path, str(tmpdir))
+    merged.load()
+    assert merged.entries == {
+        a_path: (*a_signature, {"a": 1}),
+        "/d.yaml": (2, 2, {4: "d"}),
+    }
+
+
+def test_soa_config_index_does_not_index_unmarshallable_files(tmpdir):
+    soa_dir = tmpdir.mkdir("soa")
+    config_path = _write_config(
+        soa_dir, "fake_service", "kubernetes-fake_cluster", "main: {}\n"
+    )
+    index = soa_config_index.SoaConfigIndex(
+        str(tmpdir.join("soa_config_index")), str(soa_dir)
+    )
+    with mock.patch.object(
+        service_configuration_lib,
+        "_yaml_cache",
+        {config_path: {"main": {"date": datetime.date(2021, 1, 1)}}},
+    ):
+        assert index.harvest_yaml_cache() == 0
+    assert index.entries == {}
+
+
+def test_soa_config_index_load_unreadable(tmpdir):
+    index_path = tmpdir.join("soa_config_index")
+    index_path.write("definitely not an index")
+    index = soa_config_index.SoaConfigIndex(str(index_path), str(tmpdir))
+    index.load()
+    assert index.entries == {}
@@ -16,6 +16,7 @@ import json
 import os
 import stat
 import sys
+import threading
 import time
 import warnings
 from typing import Any
@@ -28,6 +29,7 @@ from freezegun import freeze_time
 from pytest import raises
 
 from paasta_tools import utils
+from paasta_tools.metrics import metrics_lib
 
 
 def test_get_git_url_provided_by_serviceyaml():
@@ -2754,3 +2756,128 @@ def test_is_secrets_for_teams_enabled():
         # if not present
         mock_read_extra_service_information.return_value = {"description": "something"}
         assert not utils.is_secrets_for_teams_enabled(service)
+
+
+def _cache_of(cached_func) -> utils.time_cache:
+    return cached_func.time_cache
+
+
+def _expire(cached_func, seconds):
+    for entry in _cache_of(cached_func).configs.values():
+        entry["fetch_time"] -= seconds
+
+
+def test_time_cache():
+    calls = []
+
+    @utils.time_cache(ttl=10)
+    def double(x):
+        calls.append(x)
+        return x * 2
+
+    assert double(1) == 2
+    assert double(1) == 2
+    assert calls == [1]
+    assert double(1, ttl=0) == 2
+    assert calls == [1, 1]
+
+    _expire(double, 11)
+    assert double(1) == 2
+    assert calls == [1, 1, 1]
+    assert _cache_of(double).stats == {"hits": 1, "misses": 3, "evictions": 0}
+
+
+def test_time_cache_maxsize():
+    @utils.time_cache(ttl=10, maxsize=2)
+    def identity(x):
+        return x
+
+    identity(1)
+    identity(2)
+    identity(1)
+    identity(3)
+    # 2 was the least recently used
+    assert list(_cache_of(identity).configs) == [(1,), (3,)]
+    assert _cache_of(identity).stats == {"hits": 1, "misses": 3, "evictions": 1}
+
+
+def test_time_cache_single_flight():
+    release = threading.Event()
+    calls = []
+
+    @utils.time_cache(ttl=10)
+    def load(x):
+        calls.append(x)
+        release.wait()
+        return x
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(load("a"))) for _ in range(3)
+    ]
+    for thread in threads:
+        thread.start()
+    while _cache_of(load).stats["misses"] < 3:
+        release.wait(0.001)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert calls == ["a"]
+    assert results == ["a", "a", "a"]
+
+
+def test_time_cache_single_flight_error():
+    @utils.time_cache(ttl=10)
+    def fail():
+        raise ValueError("oops")
+
+    with raises(ValueError):
+        fail()
+    # errors aren't cached
+    assert not _cache_of(fail).configs
+    assert not _cache_of(fail).loading
+
+
+def test_time_cache_stale_while_revalidate():
+    release = threading.Event()
+    values = iter(["old", "new"])
+
+    @utils.time_cache(ttl=10, stale_ttl=10)
+    def load():
+        if _cache_of(load).configs:
+            release.wait()
+        return next(values)
+
+    assert load() == "old"
+    _expire(load, 15)
+    # the stale value is returned straight away, and reloaded in the background
+    assert load() == "old"
+    (reload,) = _cache_of(load).loading.values()
+    release.set()
+    assert reload.result() == "new"
+    assert load() == "new"
+
+    # too stale to return
+    _expire(load, 25)
+    with raises(StopIteration):
+        load()
+
+
+def test_time_cache_export_metrics():
+    cache = utils.time_cache(ttl=10, name="test_time_cache_export_metrics")
+    assert utils.TIME_CACHES["test_time_cache_export_metrics"] is cache
+
+    @cache
+    def identity(x):
+        return x
+
+    mock_metrics = mock.Mock()
+    with mock.patch.dict(utils.TIME_CACHES, {"test": cache}, clear=True):
+        metrics_lib.export_time_cache_metrics(mock_metrics)
+    mock_metrics.create_counter.assert_any_call(
+        "time_cache.hits", cache="test_time_cache_export_metrics"
+    )
+    identity(1)
+    identity(1)
+    assert mock_metrics.create_counter.return_value.count.call_count == 2